@@ -19,6 +19,7 @@ final class AppStore: ObservableObject {
     @Published var history: [RunHistoryItem] = []
     @Published var jobs: [AppJob] = []
     @Published var activeJob: AppJob?
+    @Published var liveProgress: AppJobProgress?
     @Published var providerCatalog: ProviderCatalogResponse?
     @Published var diagnostics: DiagnosticsResponse?
     @Published var plugins: [JSONValue] = []
@@ -210,9 +211,9 @@ final class AppStore: ObservableObject {
         }
     }
 
-    func refreshOutputs() async {
+    func refreshOutputs(rescan: Bool = false) async {
         do {
-            let response = try await apiClient.outputs()
+            let response = try await apiClient.outputs(rescan: rescan)
             outputs = response.outputs
         } catch {
             append("output refresh failed: \(error.localizedDescription)", kind: "error")
@@ -353,6 +354,15 @@ final class AppStore: ObservableObject {
             append("start: \(event.data)")
         case "end_prompt":
             append("end:   \(event.data)")
+        case "progress":
+            // coalesced server-side to a few frames a second; no log line
+            if let data = event.data.data(using: .utf8),
+               let progress = try? JSONDecoder().decode(AppJobProgress.self, from: data) {
+                liveProgress = progress
+            }
+        case "snapshot":
+            // the server dropped events this stream was behind on; refetch job state
+            Task { if let runID { await reconcileJob(id: runID, reason: "snapshot") } }
         default:
             append(event.data)
         }
@@ -408,6 +418,9 @@ final class AppStore: ObservableObject {
 
     private func apply(_ job: AppJob) {
         activeJob = job
+        if job.status.isTerminal {
+            liveProgress = nil
+        }
         upsertJob(job)
         isRunning = !job.status.isTerminal
         statusMessage = job.status.displayName
@@ -161,7 +161,7 @@ private struct StatusCardsView: View {
     }
 
     private var progressText: String {
-        guard let progress = store.activeJob?.progress else { return "-" }
+        guard let progress = store.liveProgress ?? store.activeJob?.progress else { return "-" }
         if progress.total > 0 {
             return "\(progress.completed)/\(progress.total)"
         }
@@ -362,7 +362,7 @@ private struct OutputStripView: View {
                     .font(.headline)
                 Spacer()
                 Button {
-                    Task { await store.refreshOutputs() }
+                    Task { await store.refreshOutputs(rescan: true) }
                 } label: {
                     Label("Refresh", systemImage: "arrow.clockwise")
                 }
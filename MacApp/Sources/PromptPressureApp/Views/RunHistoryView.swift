@@ -49,6 +49,12 @@ struct RunHistoryView: View {
 
                                     Spacer()
 
+                                    if let summary = item.summary {
+                                        Text(summaryLine(summary))
+                                            .font(.caption.monospacedDigit())
+                                            .foregroundStyle(.secondary)
+                                    }
+
                                     Text(item.status)
                                         .font(.caption.weight(.semibold))
                                         .foregroundStyle(statusColor(item.status))
@@ -74,6 +80,20 @@ struct RunHistoryView: View {
         .navigationTitle("History")
     }
 
+    private func summaryLine(_ summary: RunSummary) -> String {
+        var parts = ["\(summary.successes)/\(summary.total) ok"]
+        if summary.errors > 0 {
+            parts.append("\(summary.errors) err")
+        }
+        if let p50 = summary.latencyP50MS {
+            parts.append(String(format: "p50 %.1fs", p50 / 1000))
+        }
+        if summary.costUSD > 0 {
+            parts.append(String(format: "$%.4f", summary.costUSD))
+        }
+        return parts.joined(separator: " · ")
+    }
+
     private func statusColor(_ status: String) -> Color {
         switch status.lowercased() {
         case "completed", "complete", "success":
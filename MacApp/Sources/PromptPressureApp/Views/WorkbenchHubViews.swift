@@ -190,7 +190,7 @@ struct ReportsWorkbenchView: View {
             HStack {
                 Spacer()
                 Button {
-                    Task { await store.refreshOutputs() }
+                    Task { await store.refreshOutputs(rescan: true) }
                 } label: {
                     Label("Refresh", systemImage: "arrow.clockwise")
                 }
@@ -211,7 +211,7 @@ struct ReportsWorkbenchView: View {
                                     .font(.caption)
                                     .foregroundStyle(.secondary)
                                     .lineLimit(1)
-                                Text(output.files.isEmpty ? "no indexed files" : "\(output.files.count) indexed files")
+                                Text(outputDetail(output))
                                     .font(.caption2)
                                     .foregroundStyle(.secondary)
                             }
@@ -225,6 +225,14 @@ struct ReportsWorkbenchView: View {
             }
         }
     }
+
+    private func outputDetail(_ output: OutputItem) -> String {
+        var parts = [output.files.isEmpty ? "no indexed files" : "\(output.files.count) indexed files"]
+        if let model = output.model { parts.insert(model, at: 0) }
+        if let tier = output.tier { parts.append(tier) }
+        if let size = output.sizeBytes { parts.append(ByteCountFormatter.string(fromByteCount: Int64(size), countStyle: .file)) }
+        return parts.joined(separator: " · ")
+    }
 }
 
 struct PluginsWorkbenchView: View {
@@ -553,7 +561,7 @@ private struct JobList: View {
                             Spacer()
                             VStack(alignment: .trailing, spacing: 4) {
                                 JobStatusChip(status: job.status)
-                                Text(progressLabel(job.progress))
+                                Text(progressLabel(job))
                                     .font(.caption2)
                                     .foregroundStyle(.secondary)
                                     .lineLimit(1)
@@ -603,7 +611,14 @@ private struct JobList: View {
         }
     }
 
-    private func progressLabel(_ progress: AppJobProgress) -> String {
+    private func progressLabel(_ job: AppJob) -> String {
+        if let position = job.queuePosition {
+            if let eta = job.queueEtaS {
+                return "#\(position) in queue, ~\(Int(eta.rounded()))s"
+            }
+            return "#\(position) in queue"
+        }
+        let progress = job.progress
         if progress.total > 0 {
             return "\(progress.completed)/\(progress.total) prompts"
         }
@@ -201,6 +201,30 @@ public struct RunHistoryItem: Identifiable, Codable, Hashable {
     public let id: String
     public let status: String
     public let timestamp: String
+    public let summary: RunSummary?
+}
+
+/// Whole-run rollup from evaluation_summaries; nil until the run finishes.
+public struct RunSummary: Codable, Hashable {
+    public let total: Int
+    public let successes: Int
+    public let errors: Int
+    public let refusals: Int
+    public let successRate: Double?
+    public let latencyP50MS: Double?
+    public let latencyP95MS: Double?
+    public let costUSD: Double
+
+    enum CodingKeys: String, CodingKey {
+        case total
+        case successes
+        case errors
+        case refusals
+        case successRate = "success_rate"
+        case latencyP50MS = "latency_p50_ms"
+        case latencyP95MS = "latency_p95_ms"
+        case costUSD = "cost_usd"
+    }
 }
 
 public struct EvaluationDetail: Identifiable, Codable, Equatable {
@@ -260,6 +284,20 @@ public struct AppPaths: Codable, Equatable {
 
 public struct AppOutputsResponse: Codable, Equatable {
     public let outputs: [OutputItem]
+    public let nextCursor: String?
+
+    enum CodingKeys: String, CodingKey {
+        case outputs
+        case nextCursor = "next_cursor"
+    }
+}
+
+public struct OutputEntriesPage: Codable, Equatable {
+    public let path: String
+    public let total: Int
+    public let offset: Int
+    public let limit: Int
+    public let entries: [JSONValue]
 }
 
 public struct OutputItem: Identifiable, Codable, Equatable {
@@ -272,6 +310,9 @@ public struct OutputItem: Identifiable, Codable, Equatable {
     public let reportHTML: String?
     public let reportMarkdown: String?
     public let metricsJSON: String?
+    public let model: String?
+    public let tier: String?
+    public let sizeBytes: Int?
 
     public init(
         name: String,
@@ -281,7 +322,10 @@ public struct OutputItem: Identifiable, Codable, Equatable {
         files: [String],
         reportHTML: String?,
         reportMarkdown: String?,
-        metricsJSON: String?
+        metricsJSON: String?,
+        model: String? = nil,
+        tier: String? = nil,
+        sizeBytes: Int? = nil
     ) {
         self.name = name
         self.path = path
@@ -291,6 +335,9 @@ public struct OutputItem: Identifiable, Codable, Equatable {
         self.reportHTML = reportHTML
         self.reportMarkdown = reportMarkdown
         self.metricsJSON = metricsJSON
+        self.model = model
+        self.tier = tier
+        self.sizeBytes = sizeBytes
     }
 
     public init(from decoder: Decoder) throws {
@@ -303,6 +350,9 @@ public struct OutputItem: Identifiable, Codable, Equatable {
         reportHTML = try container.decodeIfPresent(String.self, forKey: .reportHTML)
         reportMarkdown = try container.decodeIfPresent(String.self, forKey: .reportMarkdown)
         metricsJSON = try container.decodeIfPresent(String.self, forKey: .metricsJSON)
+        model = try container.decodeIfPresent(String.self, forKey: .model)
+        tier = try container.decodeIfPresent(String.self, forKey: .tier)
+        sizeBytes = try container.decodeIfPresent(Int.self, forKey: .sizeBytes)
     }
 
     enum CodingKeys: String, CodingKey {
@@ -314,6 +364,9 @@ public struct OutputItem: Identifiable, Codable, Equatable {
         case reportHTML = "report_html"
         case reportMarkdown = "report_markdown"
         case metricsJSON = "metrics_json"
+        case model
+        case tier
+        case sizeBytes = "size_bytes"
     }
 }
 
@@ -420,6 +473,8 @@ public struct AppJob: Identifiable, Codable, Equatable {
     public let outputs: [OutputItem]
     public let error: String?
     public let config: [String: JSONValue]
+    public let queuePosition: Int?
+    public let queueEtaS: Double?
 
     enum CodingKeys: String, CodingKey {
         case id
@@ -433,11 +488,19 @@ public struct AppJob: Identifiable, Codable, Equatable {
         case outputs
         case error
         case config
+        case queuePosition = "queue_position"
+        case queueEtaS = "queue_eta_s"
     }
 }
 
 public struct AppJobsResponse: Codable, Equatable {
     public let jobs: [AppJob]
+    public let nextCursor: String?
+
+    enum CodingKeys: String, CodingKey {
+        case jobs
+        case nextCursor = "next_cursor"
+    }
 }
 
 public struct AppEvaluationJobRequest: Encodable {
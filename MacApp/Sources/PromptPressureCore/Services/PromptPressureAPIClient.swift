@@ -49,8 +49,18 @@ public final class PromptPressureAPIClient {
         try await get("/eval-sets")
     }
 
-    public func outputs() async throws -> AppOutputsResponse {
-        try await get("/app/outputs")
+    public func outputs(rescan: Bool = false) async throws -> AppOutputsResponse {
+        try await get(rescan ? "/app/outputs?refresh=true" : "/app/outputs")
+    }
+
+    public func outputEntries(path: String, offset: Int = 0, limit: Int = 50) async throws -> OutputEntriesPage {
+        var query = URLComponents()
+        query.queryItems = [
+            URLQueryItem(name: "path", value: path),
+            URLQueryItem(name: "offset", value: String(offset)),
+            URLQueryItem(name: "limit", value: String(limit)),
+        ]
+        return try await get("/app/outputs/entries?\(query.percentEncodedQuery ?? "")")
     }
 
     public func themes() async throws -> ThemeCatalogResponse {
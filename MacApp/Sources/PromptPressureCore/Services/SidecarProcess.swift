@@ -68,6 +68,7 @@ public final class SidecarProcess: ObservableObject {
         environment["PROMPTPRESSURE_OUTPUT_DIR"] = paths.outputs.path
         environment["PROMPTPRESSURE_THEMES_DIR"] = paths.themes.path
         environment["DATABASE_URL"] = "sqlite+aiosqlite:///\(paths.data.appendingPathComponent("promptpressure.db").path)"
+        environment["PROMPTPRESSURE_EVAL_WORKER"] = "process"
         environment.merge(extraEnvironment) { _, new in new }
         process.environment = environment
 
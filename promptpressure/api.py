@@ -10,20 +10,30 @@ import sys
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Any, AsyncGenerator, Optional, List, Literal
+from typing import Dict, Any, AsyncGenerator, Awaitable, Callable, Optional, List, Literal
 from uuid import uuid4
 
 import yaml as _yaml
 
-from cachetools import TTLCache
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Header, Depends, Request, Query
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Header, Depends, Request, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, model_validator
 
 from promptpressure.config import Settings
 from promptpressure.cli import run_evaluation_suite
+from promptpressure.fanout import fan_out
 from promptpressure.launcher_translate import LauncherRequest, launcher_to_settings_dict
-from promptpressure.run_bus import RunBus, RunCancelled
+from promptpressure.app_jobs import AppJobStore
+from promptpressure.cache import SignatureCache, all_stats as cache_stats, file_signature
+from promptpressure.http_cache import CompressionMiddleware, cached_json, etag
+from promptpressure import monitoring
+from promptpressure import output_catalog
+from promptpressure.result_reader import ResultIndex, ResultReader
+from promptpressure.progress import ProgressCoalescer
+from promptpressure.scheduler import JobScheduler, parse_provider_limits
+from promptpressure.worker import run_in_worker
+from promptpressure.run_bus import RunCancelled, create_bus, parse_last_event_id
 
 # Module-import auth gate (Finding #4 in the spec).
 # Either PROMPTPRESSURE_API_SECRET or PROMPTPRESSURE_DEV_NO_AUTH=1 must be set
@@ -33,12 +43,27 @@ if not os.getenv("PROMPTPRESSURE_API_SECRET") and os.getenv("PROMPTPRESSURE_DEV_
         "PROMPTPRESSURE_API_SECRET is required, or set PROMPTPRESSURE_DEV_NO_AUTH=1 for local dev."
     )
 
-bus = RunBus()
-
-_providers_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
-_models_cache: TTLCache = TTLCache(maxsize=64, ttl=60)
-_eval_sets_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
-_app_configs_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+# in-memory by default; PROMPTPRESSURE_BUS=sqlite shares runs between
+# API worker processes (uvicorn --workers N)
+bus = create_bus()
+# max progress frames per second per run stream; 0 sends every prompt event
+PROGRESS_HZ = float(os.getenv("PROMPTPRESSURE_PROGRESS_HZ") or 5)
+# "process" runs each evaluation in a supervised worker process (worker.py);
+# "inline" runs it on the server's event loop
+EVAL_WORKER = os.getenv("PROMPTPRESSURE_EVAL_WORKER", "inline")
+
+# listing caches (cache.py): entries stay valid while the files they were
+# read from are unchanged. provider status also depends on the network, so it
+# is re-probed in the background once PROVIDER_STATUS_TTL has passed, and
+# ollama's model list expires after OLLAMA_MODELS_TTL.
+PROVIDER_STATUS_TTL = 15.0
+PROVIDER_STATUS_STALE = 300.0
+OLLAMA_MODELS_TTL = 60.0
+_providers_cache = SignatureCache("providers", ttl=PROVIDER_STATUS_TTL)
+_custom_providers_cache = SignatureCache("custom_providers", maxsize=8)
+_models_cache = SignatureCache("models", maxsize=64)
+_eval_sets_cache = SignatureCache("eval_sets", maxsize=8)
+_app_configs_cache = SignatureCache("app_configs", maxsize=8)
 
 APP_THEME_SUFFIX = ".pp-theme.json"
 APP_PROVIDER_SUFFIX = ".pp-provider.json"
@@ -116,11 +141,18 @@ def _suggestions_from_configs(provider: str) -> List[str]:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from promptpressure.database import init_db, dispose_db
+    # one engine + sessionmaker for the whole server; schema created once here
+    await init_db()
+    await app_jobs.start()
     await bus.start_reaper()
     try:
         yield
     finally:
+        await scheduler.close()
         await bus.stop_reaper()
+        await app_jobs.close()
+        await dispose_db()
 
 
 app = FastAPI(title="PromptPressure API", version="3.2.1", lifespan=lifespan)
@@ -134,8 +166,10 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in _cors_origins if o.strip()],
     allow_methods=["GET", "POST", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match", "Range"],
+    expose_headers=["ETag", "Content-Range", "X-Next-Cursor"],
 )
+app.add_middleware(CompressionMiddleware)
 
 API_SECRET = os.getenv("PROMPTPRESSURE_API_SECRET")
 
@@ -181,6 +215,7 @@ class EvalRequest(BaseModel):
 
     config: Optional[Dict[str, Any]] = None
     launcher_request: Optional[LauncherRequest] = None
+    priority: int = 0  # higher starts first when runs are queued
 
     @model_validator(mode="after")
     def exactly_one(self):
@@ -260,6 +295,7 @@ class AppEvaluationJobRequest(BaseModel):
     eval_set_ids: List[str]
     tier: Literal["smoke", "quick", "full", "deep"] = "full"
     batch: bool = False
+    priority: int = 0
 
 
 class DriftRunJobRequest(BaseModel):
@@ -270,6 +306,7 @@ class DriftRunJobRequest(BaseModel):
     concurrency: int = 3
     turn_delay: float = 0.0
     timeout: float = 90.0
+    priority: int = 0
 
 
 class DriftCalibrateJobRequest(BaseModel):
@@ -282,138 +319,85 @@ class DriftCalibrateJobRequest(BaseModel):
     bootstrap: int = 2000
     seed: int = 0
     transcripts: Optional[str] = None
+    batch: bool = False
+    priority: int = 0
 
 
-class AppJobStore:
-    def __init__(self) -> None:
-        self._jobs: Dict[str, Dict[str, Any]] = {}
-
-    def create(self, job_type: str, config: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
-        now = _utcnow()
-        job_id = job_id or str(uuid4())
-        job = {
-            "id": job_id,
-            "type": job_type,
-            "status": "queued",
-            "phase": "queued",
-            "created_at": now,
-            "updated_at": now,
-            "progress": {"completed": 0, "total": 0, "current": None},
-            "summary": {},
-            "outputs": [],
-            "error": None,
-            "config": _safe_config(config),
-            "events": [],
-        }
-        self._jobs[job_id] = job
-        return job
+class FanoutTarget(BaseModel):
+    model_config = ConfigDict(extra="forbid")
 
-    def has(self, job_id: str) -> bool:
-        return job_id in self._jobs
+    adapter: str
+    model: str
+    label: Optional[str] = None
 
-    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
-        job = self._jobs.get(job_id)
-        return _public_job(job) if job else None
 
-    def list(self) -> List[Dict[str, Any]]:
-        return [
-            _public_job(job)
-            for job in sorted(self._jobs.values(), key=lambda item: item["created_at"], reverse=True)
-        ]
+class FanoutRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
 
-    def update(self, job_id: str, **updates: Any) -> None:
-        job = self._jobs.get(job_id)
-        if not job:
-            return
-        for key, value in updates.items():
-            if value is not None:
-                job[key] = value
-        job["updated_at"] = _utcnow()
-
-    def merge_summary(self, job_id: str, values: Dict[str, Any]) -> None:
-        job = self._jobs.get(job_id)
-        if not job:
-            return
-        job["summary"].update(values)
-        job["updated_at"] = _utcnow()
+    targets: List[FanoutTarget]
+    prompt: Optional[str] = None
+    messages: Optional[List[Dict[str, Any]]] = None
+    policy: Literal["all", "first_k"] = "all"
+    k: int = 1
+    timeout: Optional[float] = None
+    temperature: Optional[float] = None
 
-    def record_event(self, job_id: str, event: str, data: Any) -> None:
-        job = self._jobs.get(job_id)
-        if not job:
-            return
-        if isinstance(data, str):
-            raw = data
-            parsed = _try_json(raw)
-        else:
-            parsed = data
-            raw = json.dumps(data, default=str)
-        job["events"].append({"event": event, "data": raw, "timestamp": _utcnow()})
-        if event == "start_prompt":
-            job["status"] = "running"
-            job["phase"] = "running"
-            _merge_progress(job, parsed)
-        elif event == "end_prompt":
-            job["status"] = "running"
-            job["phase"] = "running"
-            _merge_progress(job, parsed, increment=True)
-        job["updated_at"] = _utcnow()
-
-    def complete(self, job_id: str, summary: Dict[str, Any], outputs: List[Dict[str, Any]]) -> None:
-        self.update(job_id, status="completed", phase="completed", error=None, outputs=outputs)
-        self.merge_summary(job_id, summary)
-
-    def fail(self, job_id: str, error: str) -> None:
-        self.update(job_id, status="failed", phase="failed", error=error)
-
-    def cancel(self, job_id: str) -> None:
-        self.update(job_id, status="cancelled", phase="cancelled", error=None)
+    @model_validator(mode="after")
+    def prompt_or_messages(self):
+        if not self.targets:
+            raise ValueError("targets must not be empty")
+        if not self.prompt and not self.messages:
+            raise ValueError("specify prompt or messages")
+        return self
 
 
 app_jobs = AppJobStore()
+outputs_catalog = output_catalog.OutputCatalog()
+# runs submitted through the API queue here instead of all starting at once:
+# PROMPTPRESSURE_MAX_JOBS in total, PROMPTPRESSURE_PROVIDER_JOBS per provider
+# ("1" or "2,ollama=1,openrouter=4")
+_provider_default, _provider_limits = parse_provider_limits(os.getenv("PROMPTPRESSURE_PROVIDER_JOBS"))
+scheduler = JobScheduler(
+    max_concurrent=int(os.getenv("PROMPTPRESSURE_MAX_JOBS") or 2),
+    default_per_provider=_provider_default or 1,
+    per_provider=_provider_limits,
+)
+monitoring.watch_scheduler(scheduler)
+
+
+def _schedule(
+    job_id: str,
+    provider: str,
+    run: Callable[[], Awaitable[Any]],
+    priority: int = 0,
+    kind: Optional[str] = None,
+    snapshot: Optional[Callable[[], Any]] = None,
+) -> None:
+    async def start():
+        if not bus.has(job_id):  # reaped while it sat in the queue
+            bus.start(job_id, snapshot=snapshot)
+        elif bus.is_cancelled(job_id):  # cancelled through another API worker
+            if app_jobs.has(job_id):
+                app_jobs.cancel(job_id)
+            await bus.mark_completed(job_id, {"event": "cancelled", "data": "Job cancelled before it started"})
+            return
+        await run()
 
-
-def _utcnow() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def _safe_config(config: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        key: value
-        for key, value in config.items()
-        if not key.startswith("_")
-        and not any(secret in key.lower() for secret in ("api_key", "secret", "token", "password"))
-    }
+    scheduler.submit(job_id, provider or "default", start, priority=priority, kind=kind)
 
 
-def _public_job(job: Dict[str, Any]) -> Dict[str, Any]:
-    return {key: value for key, value in job.items() if key != "events"}
+def _with_queue(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add queue_position / queue_eta_s to jobs still waiting for a slot."""
+    view = scheduler.queue_view()
+    for job in jobs:
+        if job["id"] in view:
+            job["queue_position"] = view[job["id"]]["position"]
+            job["queue_eta_s"] = view[job["id"]]["eta_s"]
+    return jobs
 
 
-def _try_json(value: str) -> Any:
-    try:
-        return json.loads(value)
-    except Exception:
-        return value
-
-
-def _merge_progress(job: Dict[str, Any], data: Any, increment: bool = False) -> None:
-    progress = dict(job.get("progress") or {})
-    if isinstance(data, dict):
-        if "total" in data:
-            progress["total"] = data["total"]
-        if "current" in data:
-            if isinstance(data["current"], int):
-                if increment:
-                    progress["completed"] = data["current"]
-                else:
-                    progress["current_index"] = data["current"]
-            else:
-                progress["current"] = data["current"]
-        if "id" in data:
-            progress["current"] = data["id"]
-    if increment:
-        progress["completed"] = max(int(progress.get("completed") or 0), 1)
-    job["progress"] = progress
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 def _default_app_support_dir() -> Path:
@@ -481,7 +465,17 @@ def _read_provider_file(path: Path) -> Dict[str, Any]:
     }
 
 
+def _custom_providers_signature() -> tuple:
+    pattern = str(_app_paths()["providers"] / f"*{APP_PROVIDER_SUFFIX}")
+    return pattern, file_signature(pattern)
+
+
 def _custom_provider_catalog() -> tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    signature = _custom_providers_signature()
+    return _custom_providers_cache.get(signature[0], _read_custom_providers, signature=signature)
+
+
+def _read_custom_providers() -> tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
     providers_dir = _app_paths()["providers"]
     custom: List[Dict[str, Any]] = []
     invalid: List[Dict[str, str]] = []
@@ -546,7 +540,7 @@ async def health_check():
 
 
 @app.post("/evaluate", dependencies=[Depends(require_auth)])
-async def trigger_evaluation(request: EvalRequest, background_tasks: BackgroundTasks):
+async def trigger_evaluation(request: EvalRequest):
     import uuid
     run_id = str(uuid.uuid4())
 
@@ -562,12 +556,46 @@ async def trigger_evaluation(request: EvalRequest, background_tasks: BackgroundT
         raise HTTPException(status_code=400, detail=str(e))
 
     bus.start(run_id)
-    background_tasks.add_task(run_eval_background, run_id, config_dict)
-    return {"run_id": run_id, "status": "started", "stream_url": f"/stream/{run_id}"}
+    _schedule(run_id, config_dict.get("provider_id") or config_dict.get("adapter"),
+              lambda: run_eval_background(run_id, config_dict), priority=request.priority, kind="evaluate")
+    position = scheduler.position(run_id)
+    return {
+        "run_id": run_id,
+        "status": "queued" if position else "started",
+        "queue_position": position,
+        "stream_url": f"/stream/{run_id}",
+    }
+
+
+@app.post("/fanout", dependencies=[Depends(require_auth)])
+async def fanout(request: FanoutRequest):
+    """Send one prompt or conversation to several models concurrently."""
+    targets = []
+    for target in request.targets:
+        mapped = _apply_custom_provider_config({"adapter": target.adapter, "model": target.model})
+        mapped["label"] = target.label or f"{target.adapter}:{target.model}"
+        targets.append(mapped)
+    config: Dict[str, Any] = {}
+    if request.temperature is not None:
+        config["temperature"] = request.temperature
+    prompt = request.prompt or ""
+    try:
+        return await fan_out(
+            prompt, targets, config,
+            messages=request.messages,
+            policy=request.policy,
+            k=request.k,
+            timeout=request.timeout,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/evaluations/{run_id}/cancel", dependencies=[Depends(require_auth)])
 async def cancel_evaluation(run_id: str):
+    if scheduler.cancel(run_id):
+        await bus.mark_completed(run_id, {"event": "cancelled", "data": "Evaluation cancelled before it started"})
+        return {"run_id": run_id, "status": "cancelled"}
     if not bus.has(run_id):
         raise HTTPException(status_code=404, detail="Run ID not found")
     if not bus.cancel(run_id):
@@ -576,14 +604,16 @@ async def cancel_evaluation(run_id: str):
 
 
 @app.get("/stream/{run_id}")
-async def stream_events(run_id: str):
+async def stream_events(run_id: str, last_event_id: Optional[str] = Header(None)):
+    """SSE events of a run. Every frame has an ``id:``; a reconnect that sends
+    ``Last-Event-ID`` resumes after it (EventSource does this on its own)."""
     from sse_starlette.sse import EventSourceResponse
     if not bus.has(run_id):
         raise HTTPException(status_code=404, detail="Run ID not found")
 
     async def event_generator() -> AsyncGenerator[dict, None]:
         try:
-            async for item in bus.subscribe(run_id):
+            async for item in bus.subscribe(run_id, parse_last_event_id(last_event_id)):
                 yield item
         except KeyError:
             return  # run was reaped between has() and subscribe()
@@ -591,46 +621,382 @@ async def stream_events(run_id: str):
     return EventSourceResponse(event_generator())
 
 
+# Result columns the results endpoints can project. prompt_text and
+# response_text are the heavy ones and are only sent when asked for.
+_RESULT_FIELDS = (
+    "id", "prompt_id", "model", "adapter", "success", "latency_ms",
+    "error_message", "prompt_text", "response_text", "reasoning_text",
+)
+_RESULT_TEXT_FIELDS = ("prompt_text", "response_text", "reasoning_text")
+_RESULT_DEFAULT_FIELDS = tuple(f for f in _RESULT_FIELDS if f not in _RESULT_TEXT_FIELDS)
+
+
+def _encode_cursor(*parts: Any) -> str:
+    import base64
+    raw = json.dumps(parts, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, *shape: Any) -> List[Any]:
+    """The parts of a cursor made by ``_encode_cursor``. ``shape`` is the type
+    (or tuple of types) each part must have; a cursor of any other shape is a
+    400, not a failure further down."""
+    import base64
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    if not isinstance(parts, list) or len(parts) != len(shape) or not all(
+        isinstance(part, kind) and not isinstance(part, bool) for part, kind in zip(parts, shape)
+    ):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return parts
+
+
+_TURN_FIELDS = (
+    "id", "result_id", "prompt_id", "model", "turn", "role", "latency_ms",
+    "prompt_tokens", "completion_tokens", "reasoning_chars", "batch", "success",
+    "error_message", "metrics", "user_content", "assistant_content", "reasoning_text",
+)
+_TURN_DEFAULT_FIELDS = tuple(
+    f for f in _TURN_FIELDS if f not in ("user_content", "assistant_content", "reasoning_text")
+)
+
+
+def _parse_fields(fields: Optional[str], allowed: tuple = _RESULT_FIELDS,
+                  default: tuple = _RESULT_DEFAULT_FIELDS) -> tuple:
+    if not fields:
+        return default
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})",
+        )
+    # id is the pagination key; always include it
+    return requested if "id" in requested else ("id",) + requested
+
+
 @app.get("/evaluations", dependencies=[Depends(require_auth)])
-async def list_evaluations():
-    from promptpressure.database import get_db_session, init_db, Evaluation
+async def list_evaluations(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Newest-first run list. Keyset-paginated with ``limit``: when more runs
+    exist, the X-Next-Cursor header carries the cursor for the next page.
+    Without ``limit`` every run is returned, as clients that predate paging
+    (the macOS run history) expect.
+
+    Each run carries its whole-run ``summary`` (counts, success rate,
+    latency percentiles, tokens, cost) from evaluation_summaries, or None
+    until the run has finished. One summary row per run, no result scan.
+    """
+    from promptpressure.database import db_session, Evaluation, EvaluationSummary
+    from promptpressure.summary import ALL, summary_dict
+    from sqlalchemy import and_, or_, select
+
+    query = select(Evaluation.id, Evaluation.status, Evaluation.timestamp, EvaluationSummary).outerjoin(
+        EvaluationSummary,
+        and_(EvaluationSummary.evaluation_id == Evaluation.id,
+             EvaluationSummary.model == ALL, EvaluationSummary.category == ALL),
+    )
+    if status:
+        query = query.where(Evaluation.status == status)
+    if cursor:
+        ts, last_id = _decode_cursor(cursor, str, str)
+        try:
+            ts = datetime.fromisoformat(ts)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        query = query.where(or_(
+            Evaluation.timestamp < ts,
+            and_(Evaluation.timestamp == ts, Evaluation.id < last_id),
+        ))
+    query = query.order_by(Evaluation.timestamp.desc(), Evaluation.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    async with db_session() as session:
+        rows = (await session.execute(query)).all()
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].timestamp.isoformat(), rows[-1].id)
+    return [{
+        "id": r.id,
+        "status": r.status,
+        "timestamp": r.timestamp.isoformat(),
+        "summary": summary_dict(r.EvaluationSummary) if r.EvaluationSummary is not None else None,
+    } for r in rows]
+
+
+@app.get("/evaluations/{eval_id}/summary", dependencies=[Depends(require_auth)])
+async def get_evaluation_summary(eval_id: str):
+    """Per (model, category) summary rows of a run, rollups ("*") included.
+
+    Runs recorded before summaries existed get theirs built from their
+    results on first request (without tokens, cost or refusals)."""
+    from promptpressure.database import db_session, Evaluation, EvaluationSummary
+    from promptpressure.summary import summarize_results, summary_dict
     from sqlalchemy import select
-    engine = await init_db()
-    async for session in get_db_session(engine):
-        result = await session.execute(select(Evaluation).order_by(Evaluation.timestamp.desc()))
-        evals = result.scalars().all()
-        return [{"id": e.id, "status": e.status, "timestamp": e.timestamp.isoformat()} for e in evals]
+    from sqlalchemy.exc import IntegrityError
+
+    stored = (
+        select(EvaluationSummary).where(EvaluationSummary.evaluation_id == eval_id)
+        .order_by(EvaluationSummary.model, EvaluationSummary.category)
+    )
+    async with db_session() as session:
+        evaluation = await session.get(Evaluation, eval_id)
+        if not evaluation:
+            raise HTTPException(status_code=404, detail="Evaluation not found")
+        status = evaluation.status
+        rows = (await session.execute(stored)).scalars().all()
+        if not rows and status in ("completed", "failed", "cancelled"):
+            rows = await summarize_results(session, eval_id)
+            session.add_all(rows)
+            try:
+                await session.commit()
+            except IntegrityError:
+                # a concurrent first request stored them first: serve those
+                await session.rollback()
+                rows = (await session.execute(stored)).scalars().all()
+        return {"id": eval_id, "status": status, "rows": [summary_dict(r) for r in rows]}
 
 
 @app.get("/evaluations/{eval_id}", dependencies=[Depends(require_auth)])
-async def get_evaluation(eval_id: str):
-    from promptpressure.database import get_db_session, init_db, Evaluation, Result
+async def get_evaluation(eval_id: str, include_text: bool = True):
+    """Run detail with every result. ``include_text=false`` leaves out the
+    prompt/response bodies; page through /evaluations/{id}/results and fetch
+    single results for those instead."""
+    from promptpressure import blobs
+    from promptpressure.database import db_session, Evaluation, Result
     from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    engine = await init_db()
-    async for session in get_db_session(engine):
-        query = select(Evaluation).where(Evaluation.id == eval_id).options(selectinload(Evaluation.results))
-        result = await session.execute(query)
-        evaluation = result.scalar_one_or_none()
 
+    fields = ["id", "model", "success", "latency_ms"]
+    if include_text:
+        fields[1:1] = ["prompt_text", "response_text"]
+    columns = fields + blobs.ref_columns(fields)
+    async with db_session() as session:
+        evaluation = await session.get(Evaluation, eval_id)
         if not evaluation:
             raise HTTPException(status_code=404, detail="Evaluation not found")
+        rows = (await session.execute(
+            select(*[getattr(Result, c) for c in columns]).where(Result.evaluation_id == eval_id).order_by(Result.id)
+        )).all()
+        results = await blobs.resolve(session, [dict(zip(columns, row)) for row in rows])
 
         return {
             "id": evaluation.id,
             "status": evaluation.status,
             "timestamp": evaluation.timestamp.isoformat(),
-            "results": [{
-                "id": r.id,
-                "prompt_text": r.prompt_text,
-                "response_text": r.response_text,
-                "model": r.model,
-                "success": r.success,
-                "latency_ms": r.latency_ms,
-            } for r in evaluation.results]
+            "results": results,
         }
 
 
+@app.get("/evaluations/{eval_id}/results", dependencies=[Depends(require_auth)])
+async def list_evaluation_results(
+    eval_id: str,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    model: Optional[str] = None,
+    success: Optional[bool] = None,
+    prompt_id: Optional[str] = None,
+):
+    """One page of a run's results, keyset-paginated on result id.
+
+    ``fields`` projects columns (``?fields=id,success,latency_ms``); the
+    default leaves out prompt_text/response_text. Filters: model, success,
+    prompt_id.
+    """
+    from promptpressure import blobs
+    from promptpressure.database import db_session, Evaluation, Result
+    from sqlalchemy import select
+
+    selected = _parse_fields(fields)
+    columns = selected + tuple(blobs.ref_columns(selected))
+    query = select(*[getattr(Result, c) for c in columns]).where(Result.evaluation_id == eval_id)
+    if model is not None:
+        query = query.where(Result.model == model)
+    if success is not None:
+        query = query.where(Result.success == success)
+    if prompt_id is not None:
+        query = query.where(Result.prompt_id == prompt_id)
+    if cursor:
+        (after_id,) = _decode_cursor(cursor, int)
+        query = query.where(Result.id > int(after_id))
+    query = query.order_by(Result.id).limit(limit + 1)
+
+    async with db_session() as session:
+        if not await session.get(Evaluation, eval_id):
+            raise HTTPException(status_code=404, detail="Evaluation not found")
+        rows = (await session.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].id)
+        items = await blobs.resolve(session, [dict(zip(columns, row)) for row in rows])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@app.get("/evaluations/{eval_id}/results/{result_id}", dependencies=[Depends(require_auth)])
+async def get_evaluation_result(eval_id: str, result_id: int):
+    """A single result with its full prompt and response text."""
+    from promptpressure import blobs
+    from promptpressure.database import db_session, Result
+    from sqlalchemy import select
+
+    columns = _RESULT_FIELDS + tuple(blobs.ref_columns(_RESULT_FIELDS))
+    async with db_session() as session:
+        row = (await session.execute(
+            select(*[getattr(Result, c) for c in columns])
+            .where(Result.evaluation_id == eval_id, Result.id == result_id)
+        )).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Result not found")
+        (item,) = await blobs.resolve(session, [dict(zip(columns, row))])
+    return item
+
+
+@app.get("/evaluations/{eval_id}/turns", dependencies=[Depends(require_auth)])
+async def list_evaluation_turns(
+    eval_id: str,
+    limit: int = Query(200, ge=1, le=2000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    prompt_id: Optional[str] = None,
+    model: Optional[str] = None,
+    turn: Optional[int] = None,
+    success: Optional[bool] = None,
+):
+    """Per-turn rows of a run's multi-turn sequences, ordered by sequence
+    (result id) then turn, keyset-paginated on (result id, turn, turn id).
+    Same ``fields`` projection as the results endpoint; turn text is left out
+    unless requested."""
+    from promptpressure import blobs
+    from promptpressure.database import db_session, Evaluation, Turn
+    from sqlalchemy import and_, or_, select
+
+    selected = _parse_fields(fields, _TURN_FIELDS, _TURN_DEFAULT_FIELDS)
+    columns = selected + tuple(blobs.ref_columns(selected))
+    query = select(*[getattr(Turn, c) for c in columns], Turn.result_id.label("_result_id"),
+                   Turn.turn.label("_turn")).where(Turn.evaluation_id == eval_id)
+    if prompt_id is not None:
+        query = query.where(Turn.prompt_id == prompt_id)
+    if model is not None:
+        query = query.where(Turn.model == model)
+    if turn is not None:
+        query = query.where(Turn.turn == turn)
+    if success is not None:
+        query = query.where(Turn.success == success)
+    if cursor:
+        result_id, after_turn, after_id = _decode_cursor(cursor, int, int, int)
+        query = query.where(or_(
+            Turn.result_id > result_id,
+            and_(Turn.result_id == result_id, or_(
+                Turn.turn > after_turn,
+                and_(Turn.turn == after_turn, Turn.id > after_id),
+            )),
+        ))
+    query = query.order_by(Turn.result_id, Turn.turn, Turn.id).limit(limit + 1)
+
+    async with db_session() as session:
+        if not await session.get(Evaluation, eval_id):
+            raise HTTPException(status_code=404, detail="Evaluation not found")
+        rows = (await session.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(last._result_id, last._turn, last.id)
+        items = await blobs.resolve(session, [dict(zip(columns, row)) for row in rows])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@app.get("/turns/stats", dependencies=[Depends(require_auth)])
+async def turn_stats(
+    evaluation_id: Optional[str] = None,
+    model: Optional[str] = None,
+    turn: Optional[int] = None,
+):
+    """Turn-level aggregates grouped by (model, turn), across runs unless
+    ``evaluation_id`` narrows it: count, failures, mean latency and tokens,
+    mean reasoning length."""
+    from promptpressure.database import db_session, Turn
+    from sqlalchemy import case, func, select
+
+    query = select(
+        Turn.model,
+        Turn.turn,
+        func.count(Turn.id),
+        func.sum(case((Turn.success.is_(False), 1), else_=0)),
+        func.avg(Turn.latency_ms),
+        func.avg(Turn.prompt_tokens),
+        func.avg(Turn.completion_tokens),
+        func.avg(Turn.reasoning_chars),
+    )
+    if evaluation_id is not None:
+        query = query.where(Turn.evaluation_id == evaluation_id)
+    if model is not None:
+        query = query.where(Turn.model == model)
+    if turn is not None:
+        query = query.where(Turn.turn == turn)
+    query = query.group_by(Turn.model, Turn.turn).order_by(Turn.model, Turn.turn)
+
+    async with db_session() as session:
+        rows = (await session.execute(query)).all()
+
+    def _round(value):
+        return round(value, 2) if value is not None else None
+
+    return [{
+        "model": r[0],
+        "turn": r[1],
+        "count": r[2],
+        "failures": int(r[3] or 0),
+        "avg_latency_ms": _round(r[4]),
+        "avg_prompt_tokens": _round(r[5]),
+        "avg_completion_tokens": _round(r[6]),
+        "avg_reasoning_chars": _round(r[7]),
+    } for r in rows]
+
+
+@app.get("/search", dependencies=[Depends(require_auth)])
+async def search_results(
+    q: str = Query(..., min_length=1),
+    model: Optional[str] = None,
+    eval: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+):
+    """Full-text search over prompts, responses and reasoning, across runs
+    unless ``eval`` narrows it. ``q`` is an FTS5 query (``refus*``,
+    ``"as an ai"``, ``response:sorry NOT apolog*``). Hits are ranked by bm25
+    and carry a ``<mark>``-highlighted snippet; the rest of the snippet is
+    HTML-escaped."""
+    from promptpressure import search
+    from promptpressure.database import db_session
+    from sqlalchemy.exc import OperationalError
+
+    offset = 0
+    if cursor:
+        (offset,) = _decode_cursor(cursor, int)
+    async with db_session() as session:
+        try:
+            hits, has_more = await search.search(
+                session, q, model=model, evaluation_id=eval, limit=limit, offset=int(offset),
+            )
+        except search.SearchUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except OperationalError as e:
+            raise HTTPException(status_code=400, detail=f"bad search query: {e.orig}")
+    next_cursor = _encode_cursor(int(offset) + limit) if has_more else None
+    return {"items": hits, "next_cursor": next_cursor}
+
+
 @app.get("/schema")
 async def get_schema():
     return Settings.model_json_schema()
@@ -655,10 +1021,10 @@ async def app_metadata():
 
 @app.get("/app/configs")
 async def app_configs():
-    cache_key = "app_configs"
-    if cache_key in _app_configs_cache:
-        return _app_configs_cache[cache_key]
+    return _app_configs_cache.get("app_configs", _read_app_configs, signature=file_signature("configs/*.yaml"))
 
+
+def _read_app_configs() -> Dict[str, Any]:
     configs: List[Dict[str, Any]] = []
     for path in sorted(Path("configs").glob("*.yaml")):
         try:
@@ -685,48 +1051,163 @@ async def app_configs():
             "dataset": raw.get("dataset"),
         })
 
-    _app_configs_cache[cache_key] = {"configs": configs}
-    return _app_configs_cache[cache_key]
+    return {"configs": configs}
 
 
 def _output_entry(path: Path) -> Dict[str, Any]:
-    files = []
-    if path.is_dir():
-        for child in sorted(path.iterdir()):
-            if child.is_file():
-                files.append(child.name)
-    stat = path.stat()
-    return {
-        "name": path.name,
-        "path": _safe_rel(path),
-        "kind": "directory" if path.is_dir() else "file",
-        "modified_at": stat.st_mtime,
-        "files": files,
-        "report_html": _safe_rel(path / "report.html") if (path / "report.html").exists() else None,
-        "report_markdown": _safe_rel(path / "report.md") if (path / "report.md").exists() else None,
-        "metrics_json": _safe_rel(path / "metrics.json") if (path / "metrics.json").exists() else None,
-    }
+    return output_catalog.describe(path)
+
+
+async def _outputs_page(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "modified",
+    order: str = "desc",
+    refresh: bool = False,
+) -> tuple:
+    """(payload, ETag) for a page of the output catalog."""
+    paths = _app_paths()
+    roots = list(dict.fromkeys(_safe_rel(root) for root in (Path("outputs"), paths["outputs"])))
+    await outputs_catalog.sync(roots, force=refresh)
+    entries, next_key = await outputs_catalog.list(
+        roots, limit=limit, cursor=tuple(_decode_cursor(cursor, (str, int, float), str)) if cursor else None,
+        sort=sort, descending=order == "desc",
+    )
+    body = {"outputs": entries, "next_cursor": _encode_cursor(*next_key) if next_key else None}
+    tag = etag("outputs", [[e[c] for c in _OUTPUT_REVISION] for e in entries], body["next_cursor"])
+    return body, tag
+
+
+# what identifies a catalog row's revision: it is rewritten whenever one changes
+_OUTPUT_REVISION = ("path", "modified_at", "size_bytes", "file_count", "model", "tier", "prompts", "succeeded", "errors")
 
 
 @app.get("/app/outputs")
-async def app_outputs():
+async def app_outputs(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: str = Query("modified", pattern="^(modified|name|size)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    refresh: bool = False,
+):
+    """Run outputs from the catalog, newest first by default; ``next_cursor``
+    is set when more exist. The catalog re-checks the outputs roots at most
+    every 30s (``refresh=true`` forces it); finished runs are added right away."""
+    body, tag = await _outputs_page(limit, cursor, sort, order, refresh)
+    return cached_json(request, tag, body)
+
+async def _result_index(path: str) -> ResultIndex:
+    """The offset index of a result file under one of the outputs roots."""
     paths = _app_paths()
-    roots = [Path("outputs"), paths["outputs"]]
-    seen: set[str] = set()
-    entries: List[Dict[str, Any]] = []
-    for root in roots:
-        if not root.exists():
-            continue
-        for child in sorted(root.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True):
-            if child.name.startswith("."):
-                continue
-            key = _safe_rel(child)
-            if key in seen:
-                continue
-            seen.add(key)
-            if child.is_dir() or child.suffix.lower() in {".csv", ".json", ".html", ".md"}:
-                entries.append(_output_entry(child))
-    return {"outputs": entries}
+    target = Path(path).expanduser().resolve()
+    roots = [root.resolve() for root in (Path("outputs"), paths["outputs"])]
+    if not any(target.is_relative_to(root) for root in roots) or not target.is_file():
+        raise HTTPException(status_code=404, detail="Result file not found")
+    try:
+        return await asyncio.to_thread(ResultReader(paths["data"] / "result_index").open, target)
+    except OSError as e:
+        raise HTTPException(status_code=404, detail=f"Result file not readable: {e}")
+
+
+async def _entry_position(index: ResultIndex, id: Optional[str], position: Optional[int]) -> int:
+    if id is not None:
+        found = await asyncio.to_thread(index.find, id)
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"No entry with id {id}")
+        return found
+    if position is None:
+        raise HTTPException(status_code=400, detail="specify id or index")
+    if not 0 <= position < index.count:
+        raise HTTPException(status_code=404, detail=f"No entry at index {position}")
+    return position
+
+
+def _byte_range(header: Optional[str], length: int) -> Optional[tuple]:
+    """(start, end inclusive) of a single ``bytes=`` range, None without one."""
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    start_s, sep, end_s = spec.strip().partition("-")
+    try:
+        if unit.strip() != "bytes" or not sep or "," in spec:
+            raise ValueError
+        if start_s:
+            start, end = int(start_s), int(end_s) if end_s else length - 1
+        else:
+            start, end = max(0, length - int(end_s)), length - 1
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Unsupported range",
+                            headers={"Content-Range": f"bytes */{length}"})
+    if start > end or start >= length:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{length}"})
+    return start, min(end, length - 1)
+
+
+@app.get("/app/outputs/entries")
+async def app_output_entries(
+    path: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """A page of a results file's entries, streamed from their byte ranges
+    (the file is indexed once, never loaded whole)."""
+    index = await _result_index(path)
+    spans = await asyncio.to_thread(index.spans, offset, offset + limit)
+
+    def body():
+        yield (
+            f'{{"path": {json.dumps(str(index.path))}, "total": {index.count}, '
+            f'"offset": {offset}, "limit": {limit}, "entries": ['
+        ).encode()
+        for i, (start, length) in enumerate(spans):
+            if i:
+                yield b", "
+            yield from index.read(start, length)
+        yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.get("/app/outputs/entry")
+async def app_output_entry(
+    path: str,
+    id: Optional[str] = None,
+    index: Optional[int] = None,
+    range_header: Optional[str] = Header(None, alias="Range"),
+):
+    """One entry of a results file by ``id`` or ``index``, as its raw JSON
+    bytes. Honours a single ``Range: bytes=`` header over the entry."""
+    result_index = await _result_index(path)
+    position = await _entry_position(result_index, id, index)
+    start, length = await asyncio.to_thread(result_index.span, position)
+    headers = {"Accept-Ranges": "bytes", "X-Entry-Index": str(position), "X-Entry-Count": str(result_index.count)}
+    byte_range = _byte_range(range_header, length)
+    if byte_range is None:
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(result_index.read(start, length), media_type="application/json", headers=headers)
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{length}"
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(
+        result_index.read(start + first, last - first + 1),
+        status_code=206, media_type="application/json", headers=headers,
+    )
+
+
+@app.get("/app/outputs/turns")
+async def app_output_turns(
+    path: str,
+    id: Optional[str] = None,
+    index: Optional[int] = None,
+    start: int = Query(0, ge=0),
+    end: Optional[int] = Query(None, ge=0),
+):
+    """``turn_responses[start:end]`` of one multi-turn entry."""
+    result_index = await _result_index(path)
+    position = await _entry_position(result_index, id, index)
+    return await asyncio.to_thread(result_index.turns, position, start, end)
 
 
 @app.get("/app/themes")
@@ -762,32 +1243,87 @@ async def app_providers():
     }
 
 
+def _job_revision(job: Dict[str, Any]) -> list:
+    return [job["id"], job.get("version"), job["updated_at"], job.get("queue_position"), job.get("queue_eta_s")]
+
+
+async def _jobs_page(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    job_type: Optional[str] = None,
+) -> tuple:
+    """(payload, ETag) for a page of sidecar jobs."""
+    jobs, next_key = await app_jobs.list(
+        limit=limit, cursor=tuple(_decode_cursor(cursor, str, str)) if cursor else None, status=status, job_type=job_type,
+    )
+    body = {"jobs": _with_queue(jobs), "next_cursor": _encode_cursor(*next_key) if next_key else None}
+    return body, etag("jobs", [_job_revision(job) for job in body["jobs"]], body["next_cursor"])
+
+
 @app.get("/app/jobs")
-async def app_job_list():
-    return {"jobs": app_jobs.list()}
+async def app_job_list(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+):
+    """Newest-first sidecar jobs; ``next_cursor`` is set when more exist."""
+    body, tag = await _jobs_page(limit, cursor, status, type)
+    return cached_json(request, tag, body)
 
 
 @app.get("/app/jobs/{job_id}")
-async def app_job_detail(job_id: str):
-    job = app_jobs.get(job_id)
+async def app_job_detail(request: Request, job_id: str, events: bool = False):
+    """One job. ``events=true`` adds the recent event tail and the progress
+    snapshots taken along the way."""
+    job = await app_jobs.get(job_id, events=events)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    job = _with_queue([job])[0]
+    return cached_json(request, etag("job", _job_revision(job), events), job)
+
+
+@app.get("/app/snapshot")
+async def app_snapshot(
+    request: Request,
+    jobs_limit: int = Query(50, ge=1, le=1000),
+    outputs_limit: int = Query(50, ge=1, le=1000),
+    refresh: bool = False,
+):
+    """The first page of jobs, the first page of outputs and provider status
+    in one round trip, for clients that poll all three. ``etags`` holds each
+    part's tag as its own endpoint would send it."""
+    (jobs, jobs_tag), (outputs, outputs_tag), (providers, providers_tag) = await asyncio.gather(
+        _jobs_page(jobs_limit), _outputs_page(outputs_limit, refresh=refresh), _providers_page(),
+    )
+    body = {
+        "jobs": jobs,
+        "outputs": outputs,
+        "providers": providers,
+        "etags": {"jobs": jobs_tag, "outputs": outputs_tag, "providers": providers_tag},
+    }
+    return cached_json(request, etag("snapshot", jobs_tag, outputs_tag, providers_tag), body)
 
 
 @app.get("/app/jobs/{job_id}/events")
-async def app_job_events(job_id: str):
+async def app_job_events(job_id: str, last_event_id: Optional[str] = Header(None)):
     from sse_starlette.sse import EventSourceResponse
 
-    job = app_jobs.get(job_id)
+    job = await app_jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     async def event_generator() -> AsyncGenerator[dict, None]:
         if bus.has(job_id):
-            async for item in bus.subscribe(job_id):
-                yield item
-            return
+            try:
+                async for item in bus.subscribe(job_id, parse_last_event_id(last_event_id)):
+                    yield item
+            except KeyError:
+                pass  # reaped between has() and subscribe(); fall through to the stored state
+            else:
+                return
         if job["status"] in _TERMINAL_JOB_STATUSES:
             yield {"event": job["status"], "data": job.get("error") or "Job finished"}
 
@@ -796,19 +1332,23 @@ async def app_job_events(job_id: str):
 
 @app.post("/app/jobs/{job_id}/cancel")
 async def app_job_cancel(job_id: str):
-    job = app_jobs.get(job_id)
+    job = await app_jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     if job["status"] in _TERMINAL_JOB_STATUSES:
         raise HTTPException(status_code=409, detail="Job is already terminal")
+    if scheduler.cancel(job_id):
+        app_jobs.cancel(job_id)
+        await bus.mark_completed(job_id, {"event": "cancelled", "data": "Job cancelled before it started"})
+        return await app_jobs.get(job_id)
     if bus.has(job_id):
         bus.cancel(job_id)
     app_jobs.update(job_id, phase="cancelling")
-    return app_jobs.get(job_id)
+    return await app_jobs.get(job_id)
 
 
 @app.post("/app/jobs/evaluations")
-async def app_evaluation_job(request: AppEvaluationJobRequest, background_tasks: BackgroundTasks):
+async def app_evaluation_job(request: AppEvaluationJobRequest):
     job_id = str(uuid4())
     launcher = LauncherRequest(
         provider=request.provider,
@@ -833,36 +1373,45 @@ async def app_evaluation_job(request: AppEvaluationJobRequest, background_tasks:
         "model": request.model,
         "eval_sets": list(request.eval_set_ids),
     })
-    bus.start(job_id)
-    background_tasks.add_task(run_eval_background, job_id, config_dict, "completed")
-    return app_jobs.get(job["id"])
+    await app_jobs.flush()  # visible to the other API workers straight away
+    snapshot = lambda: app_jobs.live(job_id)  # noqa: E731
+    bus.start(job_id, snapshot=snapshot)
+    _schedule(job_id, request.provider, lambda: run_eval_background(job_id, config_dict, "completed"),
+              priority=request.priority, kind="evaluation", snapshot=snapshot)
+    return _with_queue([app_jobs.live(job_id)])[0]
 
 
 @app.post("/app/jobs/drift/run")
-async def app_drift_run_job(request: DriftRunJobRequest, background_tasks: BackgroundTasks):
-    config = request.model_dump()
-    job = app_jobs.create("drift_run", config)
-    bus.start(job["id"])
-    background_tasks.add_task(_run_app_drift_job, job["id"], "drift_run", config)
-    return app_jobs.get(job["id"])
+async def app_drift_run_job(request: DriftRunJobRequest):
+    config = request.model_dump(exclude={"priority"})
+    job_id = app_jobs.create("drift_run", config)["id"]
+    await app_jobs.flush()
+    snapshot = lambda: app_jobs.live(job_id)  # noqa: E731
+    bus.start(job_id, snapshot=snapshot)
+    _schedule(job_id, request.provider, lambda: _run_app_drift_job(job_id, "drift_run", config),
+              priority=request.priority, kind="drift_run", snapshot=snapshot)
+    return _with_queue([app_jobs.live(job_id)])[0]
 
 
 @app.post("/app/jobs/drift/calibrate")
-async def app_drift_calibrate_job(request: DriftCalibrateJobRequest, background_tasks: BackgroundTasks):
-    config = request.model_dump()
-    job = app_jobs.create("drift_calibrate", config)
-    bus.start(job["id"])
-    background_tasks.add_task(_run_app_drift_job, job["id"], "drift_calibrate", config)
-    return app_jobs.get(job["id"])
+async def app_drift_calibrate_job(request: DriftCalibrateJobRequest):
+    config = request.model_dump(exclude={"priority"})
+    job_id = app_jobs.create("drift_calibrate", config)["id"]
+    await app_jobs.flush()
+    snapshot = lambda: app_jobs.live(job_id)  # noqa: E731
+    bus.start(job_id, snapshot=snapshot)
+    _schedule(job_id, request.judge_provider, lambda: _run_app_drift_job(job_id, "drift_calibrate", config),
+              priority=request.priority, kind="drift_calibrate", snapshot=snapshot)
+    return _with_queue([app_jobs.live(job_id)])[0]
 
 
 async def _run_app_drift_job(job_id: str, job_type: str, payload: Dict[str, Any]):
     app_jobs.update(job_id, status="running", phase="running")
     try:
         if job_type == "drift_run":
-            result = await _execute_drift_run_job(app_jobs.get(job_id), payload)
+            result = await _execute_drift_run_job(app_jobs.live(job_id), payload)
         else:
-            result = await _execute_drift_calibrate_job(app_jobs.get(job_id), payload)
+            result = await _execute_drift_calibrate_job(app_jobs.live(job_id), payload)
         outputs = result.get("outputs") or []
         summary = result.get("summary") or {
             key: value for key, value in result.items()
@@ -936,6 +1485,7 @@ async def _execute_drift_calibrate_job(job: Dict[str, Any], payload: Dict[str, A
         payload.get("temperature", 0.0),
         payload.get("runs", 3),
         payload.get("concurrency", 4),
+        batch=bool(payload.get("batch")),
     )
     result = pipeline.run_calibration(
         suite,
@@ -964,15 +1514,14 @@ async def _execute_drift_calibrate_job(job: Dict[str, Any], payload: Dict[str, A
 
 @app.get("/diagnostics", dependencies=[Depends(require_auth)])
 async def get_diagnostics():
-    from promptpressure.database import init_db, get_db_session
+    from promptpressure.database import db_session
     from sqlalchemy import text
     import importlib.util
     import shutil
 
     checks = {}
     try:
-        engine = await init_db()
-        async for session in get_db_session(engine):
+        async with db_session() as session:
             await session.execute(text("SELECT 1"))
         checks["database"] = "ok"
     except Exception as e:
@@ -985,7 +1534,15 @@ async def get_diagnostics():
         "status": "ok" if free > 1024**2 * 100 else "low"
     }
 
-    return {"status": "ok", "checks": checks}
+    return {"status": "ok", "checks": checks, "caches": cache_stats()}
+
+
+@app.get("/metrics", dependencies=[Depends(require_auth)])
+async def get_metrics():
+    """Prometheus exposition, served here instead of from a second server
+    (scrape with the API token as a bearer token when auth is on)."""
+    body, content_type = monitoring.render()
+    return Response(body, media_type=content_type)
 
 
 async def _provider_status(definition: Dict[str, Any]) -> Dict[str, Any]:
@@ -1036,9 +1593,29 @@ async def _provider_status(definition: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
+def _provider_signature() -> tuple:
+    """What provider status depends on besides the network: which keys are set."""
+    envs = []
+    for definition in _provider_definitions():
+        envs += [definition["env"]] if definition.get("env") else definition.get("env_any", [])
+    return _custom_providers_signature(), tuple(bool(os.getenv(env)) for env in envs)
+
+
+async def _probe_providers() -> tuple:
+    providers = list(await asyncio.gather(*(_provider_status(d) for d in _provider_definitions())))
+    return providers, etag("providers", providers)
+
+
+async def _providers_page() -> tuple:
+    return await _providers_cache.get_async(
+        "providers", _probe_providers, signature=_provider_signature(), stale_ttl=PROVIDER_STATUS_STALE,
+    )
+
+
 @app.get("/providers")
-async def list_providers():
-    return [await _provider_status(d) for d in _provider_definitions()]
+async def list_providers(request: Request):
+    providers, tag = await _providers_page()
+    return cached_json(request, tag, providers)
 
 
 @app.get("/models")
@@ -1047,10 +1624,18 @@ async def list_models(provider: str):
     if definition is None:
         raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
 
-    cache_key = ("models", provider)
-    if cache_key in _models_cache:
-        return _models_cache[cache_key]
+    if provider == "ollama":
+        return await _models_cache.get_async(
+            ("models", provider), lambda: _list_models(provider, definition),
+            signature=_custom_providers_signature(), ttl=OLLAMA_MODELS_TTL,
+        )
+    return await _models_cache.get_async(
+        ("models", provider), lambda: _list_models(provider, definition),
+        signature=(_custom_providers_signature(), file_signature("configs/*.yaml")),
+    )
 
+
+async def _list_models(provider: str, definition: Dict[str, Any]) -> Dict[str, Any]:
     if provider == "ollama":
         from promptpressure.adapters import ollama_adapter
         try:
@@ -1073,16 +1658,16 @@ async def list_models(provider: str):
             "note": "Type any model id this provider accepts. Suggestions come from existing configs/*.yaml.",
             "free_text": True,
         }
-
-    _models_cache[cache_key] = payload
     return payload
 
 
 @app.get("/eval-sets")
-async def list_eval_sets():
-    cache_key = "eval_sets"
-    if cache_key in _eval_sets_cache:
-        return _eval_sets_cache[cache_key]
+async def list_eval_sets(request: Request):
+    out, tag = _eval_sets_cache.get("eval_sets", _eval_sets, signature=file_signature("evals_*.json"))
+    return cached_json(request, tag, out)
+
+
+def _eval_sets() -> tuple:
 
     out: List[Dict[str, Any]] = []
     for path in sorted(glob.glob("evals_*.json")):
@@ -1095,9 +1680,7 @@ async def list_eval_sets():
             count = 0
         label = path.removeprefix("evals_").removesuffix(".json").replace("_", " ").title()
         out.append({"id": path, "label": label, "count": count})
-
-    _eval_sets_cache[cache_key] = out
-    return out
+    return out, etag("eval-sets", out)
 
 
 # Ollama model management (local only)
@@ -1191,14 +1774,12 @@ def _outputs_from_run_result(result: Any) -> List[Dict[str, Any]]:
 
 async def _set_evaluation_status(eval_id: str, status: str) -> None:
     try:
-        from promptpressure.database import get_db_session, init_db, Evaluation
-        engine = await init_db()
-        async for session in get_db_session(engine):
+        from promptpressure.database import db_session, Evaluation
+        async with db_session() as session:
             record = await session.get(Evaluation, eval_id)
             if record:
                 record.status = status
                 await session.commit()
-        await engine.dispose()
     except Exception as e:
         logging.warning("Failed to update evaluation %s status to %s: %s", eval_id, status, e)
 
@@ -1208,21 +1789,27 @@ async def run_eval_background(run_id: str, config_dict: Dict[str, Any], completi
     if app_jobs.has(run_id):
         app_jobs.update(run_id, status="running", phase="starting")
 
+    progress = ProgressCoalescer(lambda event: bus.publish(run_id, event), max_hz=PROGRESS_HZ)
+
     async def log_callback(event_type: str, data: Any):
         bus.raise_if_cancelled(run_id)
         if app_jobs.has(run_id):
             app_jobs.record_event(run_id, event_type, data)
-        # JSON-encode dict/list payloads so SSE clients can parse cleanly.
-        # sse-starlette serializes via str() by default, which yields Python repr
-        # for dicts (single-quoted), breaking the frontend's JSON.parse(ev.data).
-        if isinstance(data, (dict, list)):
-            data = json.dumps(data, default=str)
-        await bus.publish(run_id, {"event": event_type, "data": data})
+        await progress.feed(event_type, data)
+
+    async def finish(completion_event: Dict[str, Any]) -> None:
+        # the last progress frame has to go out before the terminal event
+        await progress.close()
+        await bus.mark_completed(run_id, completion_event)
 
     try:
-        config_dict["_callback"] = log_callback
-        config_dict["_is_cancelled"] = lambda: bus.is_cancelled(run_id)
-        result = await run_evaluation_suite(config_dict, config_dict.get("adapter"))
+        if EVAL_WORKER == "process":
+            # blocking report/file work happens in the child, not on this loop
+            result = await run_in_worker(config_dict, log_callback)
+        else:
+            config_dict["_callback"] = log_callback
+            config_dict["_is_cancelled"] = lambda: bus.is_cancelled(run_id)
+            result = await run_evaluation_suite(config_dict, config_dict.get("adapter"))
         if app_jobs.has(run_id):
             app_jobs.complete(
                 run_id,
@@ -1233,13 +1820,13 @@ async def run_eval_background(run_id: str, config_dict: Dict[str, Any], completi
                 },
                 outputs=_outputs_from_run_result(result),
             )
-        await bus.mark_completed(run_id, {"event": completion_event_name, "data": "Evaluation finished"})
+        await finish({"event": completion_event_name, "data": "Evaluation finished"})
     except (asyncio.CancelledError, RunCancelled):
         logging.info("Run %s cancelled", run_id)
         if app_jobs.has(run_id):
             app_jobs.cancel(run_id)
         await _set_evaluation_status(config_dict.get("_evaluation_id") or run_id, "cancelled")
-        await bus.mark_completed(run_id, {"event": "cancelled", "data": "Evaluation cancelled"})
+        await finish({"event": "cancelled", "data": "Evaluation cancelled"})
     except (Exception, SystemExit) as e:
         # SystemExit is BaseException, not Exception — without catching it
         # explicitly, sys.exit() inside the eval pipeline (e.g., cli.py's
@@ -1254,7 +1841,7 @@ async def run_eval_background(run_id: str, config_dict: Dict[str, Any], completi
         if app_jobs.has(run_id):
             app_jobs.fail(run_id, msg)
         await _set_evaluation_status(config_dict.get("_evaluation_id") or run_id, "failed")
-        await bus.mark_completed(run_id, {"event": "error", "data": msg})
+        await finish({"event": "error", "data": msg})
     finally:
         bus.unregister_task(run_id)
 
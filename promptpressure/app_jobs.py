@@ -0,0 +1,372 @@
+"""
+Persistent job store for the app sidecar.
+
+Jobs used to live in a process-local dict together with every SSE event
+they produced (one entry per start_prompt/end_prompt, re-serialized on the
+way in), so the dict grew for the lifetime of the sidecar and was gone
+after a restart. ``AppJobStore`` keeps in memory only the jobs that are
+still running and persists every job to the ``app_jobs`` table:
+
+- writers (create/update/record_event/complete/...) stay synchronous and
+  only mark the job dirty. ``flush`` upserts the dirty jobs in one
+  transaction; the task ``start`` launches runs it every
+  ``flush_interval`` seconds, and ``list`` runs it before reading.
+- a job that reached a terminal status is dropped from memory once it has
+  been flushed, so memory is bounded by the jobs actually running.
+- events are compacted: the last ``EVENT_TAIL`` are kept verbatim, and
+  every ``SNAPSHOT_EVERY`` events (and at the end) the job's progress is
+  recorded as a snapshot. Past ``MAX_SNAPSHOTS`` every other snapshot is
+  dropped, so they keep spanning the whole job.
+- ``get`` / ``list`` answer from indexed rows (``list`` is keyset-paginated
+  on (created_at, id)); jobs still in memory are served from memory.
+
+Every store has an ``owner`` id and heartbeats the unfinished jobs it
+holds (``heartbeat_at``, every ``HEARTBEAT_INTERVAL`` seconds). Unfinished
+jobs whose heartbeat is older than ``STALE_AFTER`` were left by a process
+that is gone and are marked failed, by ``start`` and then periodically, so
+a job a crashed worker or a restarted sidecar left behind fails within
+``STALE_AFTER``, while jobs of live workers sharing the database are left
+alone.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, or_, select, update
+
+from promptpressure.database import AppJob, db_session
+
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+EVENT_TAIL = 50
+SNAPSHOT_EVERY = 50
+MAX_SNAPSHOTS = 100
+HEARTBEAT_INTERVAL = 5.0
+STALE_AFTER = 30.0
+
+_LIST_COLUMNS = tuple(
+    c for c in AppJob.__table__.columns.keys() if c not in ("events", "snapshots", "owner", "heartbeat_at")
+)
+
+
+class AppJobStore:
+    def __init__(self, flush_interval: float = 1.0) -> None:
+        self._jobs: Dict[str, Dict[str, Any]] = {}  # live jobs, plus finished ones until flushed
+        self._dirty: set = set()
+        self._flush_interval = flush_interval
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self._task: Optional[asyncio.Task] = None
+        self.owner = uuid4().hex
+
+    def create(self, job_type: str, config: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        now = _utcnow()
+        job_id = job_id or str(uuid4())
+        job = {
+            "id": job_id,
+            "type": job_type,
+            "status": "queued",
+            "phase": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "progress": {"completed": 0, "total": 0, "current": None},
+            "summary": {},
+            "outputs": [],
+            "error": None,
+            "config": _safe_config(config),
+            "event_count": 0,
+            "events": deque(maxlen=EVENT_TAIL),
+            "snapshots": [],
+            "version": 1,
+        }
+        self._jobs[job_id] = job
+        self._dirty.add(job_id)
+        return _public_job(job)
+
+    def has(self, job_id: str) -> bool:
+        """True for a job created by this process that is still in memory."""
+        return job_id in self._jobs
+
+    def live(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public view of an in-memory job, without touching the database."""
+        job = self._jobs.get(job_id)
+        return _public_job(job) if job else None
+
+    async def get(self, job_id: str, events: bool = False) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return _public_job(job, events)
+        async with db_session() as session:
+            row = await session.get(AppJob, job_id)
+        return _row_job(row, events) if row is not None else None
+
+    async def list(
+        self,
+        limit: int = 100,
+        cursor: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Newest-first page of jobs and the (created_at, id) key of the next
+        page, or None on the last page."""
+        await self.flush()
+        query = select(*[getattr(AppJob, c) for c in _LIST_COLUMNS])
+        if status:
+            query = query.where(AppJob.status == status)
+        if job_type:
+            query = query.where(AppJob.type == job_type)
+        if cursor:
+            created_at, last_id = cursor
+            query = query.where(or_(
+                AppJob.created_at < created_at,
+                and_(AppJob.created_at == created_at, AppJob.id < last_id),
+            ))
+        query = query.order_by(AppJob.created_at.desc(), AppJob.id.desc()).limit(limit + 1)
+        async with db_session() as session:
+            rows = (await session.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1].created_at, rows[-1].id)
+        jobs = []
+        for row in rows:
+            job = self._jobs.get(row.id)  # changed since the flush above
+            jobs.append(_public_job(job) if job else dict(zip(_LIST_COLUMNS, row)))
+        return jobs, next_cursor
+
+    def update(self, job_id: str, **updates: Any) -> None:
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        for key, value in updates.items():
+            if value is not None:
+                job[key] = value
+        self._touch(job)
+
+    def merge_summary(self, job_id: str, values: Dict[str, Any]) -> None:
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        job["summary"].update(values)
+        self._touch(job)
+
+    def record_event(self, job_id: str, event: str, data: Any) -> None:
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        parsed = _try_json(data) if isinstance(data, str) else data
+        job["events"].append({"event": event, "data": data, "timestamp": _utcnow()})
+        job["event_count"] += 1
+        if event == "run_started":
+            _merge_progress(job, parsed)
+        elif event == "start_prompt":
+            job["status"] = "running"
+            job["phase"] = "running"
+            _merge_progress(job, parsed)
+        elif event == "end_prompt":
+            job["status"] = "running"
+            job["phase"] = "running"
+            _merge_progress(job, parsed, increment=True)
+        if job["event_count"] % SNAPSHOT_EVERY == 0:
+            _snapshot(job)
+        self._touch(job)
+
+    def complete(self, job_id: str, summary: Dict[str, Any], outputs: List[Dict[str, Any]]) -> None:
+        self.update(job_id, status="completed", phase="completed", error=None, outputs=outputs)
+        self.merge_summary(job_id, summary)
+        self._finish(job_id)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self.update(job_id, status="failed", phase="failed", error=error)
+        self._finish(job_id)
+
+    def cancel(self, job_id: str) -> None:
+        self.update(job_id, status="cancelled", phase="cancelled", error=None)
+        self._finish(job_id)
+
+    def _touch(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = _utcnow()
+        job["version"] = (job.get("version") or 0) + 1
+        self._dirty.add(job["id"])
+
+    def _finish(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            _snapshot(job)
+
+    async def flush(self) -> None:
+        """Write dirty jobs to the database; forget finished ones once written."""
+        if not self._dirty:
+            return
+        async with self._lock():
+            if not self._dirty:
+                return
+            ids, self._dirty = self._dirty, set()
+            now = time.time()
+            rows = [{**_job_row(self._jobs[i]), "owner": self.owner, "heartbeat_at": now}
+                    for i in ids if i in self._jobs]
+            try:
+                async with db_session() as session:
+                    for row in rows:
+                        await session.merge(AppJob(**row))
+                    await session.commit()
+            except Exception as e:
+                self._dirty |= ids
+                logging.warning("Failed to persist %d app jobs: %s", len(rows), e)
+                return
+            for row in rows:
+                job = self._jobs.get(row["id"])
+                if job is not None and job["status"] in TERMINAL_STATUSES and row["id"] not in self._dirty:
+                    del self._jobs[row["id"]]
+
+    def _lock(self) -> asyncio.Lock:
+        # one flush at a time, so an older snapshot of a job can't land after
+        # a newer one. Created on first use: the module-level store outlives
+        # the event loops of test clients.
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._lock_loop is not loop:
+            self._flush_lock, self._lock_loop = asyncio.Lock(), loop
+        return self._flush_lock
+
+    async def start(self) -> None:
+        """Fail jobs a dead process left unfinished and start the flush task."""
+        await self.fail_orphans()
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def heartbeat(self) -> None:
+        """Mark the unfinished jobs this store holds as alive."""
+        live = [i for i, job in self._jobs.items() if job["status"] not in TERMINAL_STATUSES]
+        if not live:
+            return
+        async with db_session() as session:
+            await session.execute(
+                update(AppJob).where(AppJob.owner == self.owner, AppJob.id.in_(live))
+                .values(heartbeat_at=time.time())
+            )
+            await session.commit()
+
+    async def fail_orphans(self) -> int:
+        """Fail unfinished jobs nobody has heartbeated for ``STALE_AFTER`` seconds."""
+        async with db_session() as session:
+            unfinished = (await session.execute(
+                select(AppJob.id).where(
+                    AppJob.status.not_in(TERMINAL_STATUSES),
+                    or_(AppJob.heartbeat_at.is_(None), AppJob.heartbeat_at < time.time() - STALE_AFTER),
+                )
+            )).scalars().all()
+            orphans = [i for i in unfinished if i not in self._jobs]
+            if orphans:
+                await session.execute(
+                    update(AppJob)
+                    .where(AppJob.id.in_(orphans))
+                    .values(status="failed", phase="failed", updated_at=_utcnow(),
+                            error="sidecar stopped before the job finished")
+                )
+                await session.commit()
+        return len(orphans)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        beat = time.monotonic()
+        try:
+            while True:
+                await asyncio.sleep(self._flush_interval)
+                await self.flush()
+                if time.monotonic() - beat >= HEARTBEAT_INTERVAL:
+                    beat = time.monotonic()
+                    try:
+                        await self.heartbeat()
+                        await self.fail_orphans()
+                    except Exception as e:
+                        logging.warning("App job heartbeat failed: %s", e)
+        except asyncio.CancelledError:
+            return
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _safe_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in config.items()
+        if not key.startswith("_")
+        and not any(secret in key.lower() for secret in ("api_key", "secret", "token", "password"))
+    }
+
+
+def _public_job(job: Dict[str, Any], events: bool = False) -> Dict[str, Any]:
+    public = {key: value for key, value in job.items() if key not in ("events", "snapshots")}
+    if events:
+        public["events"] = list(job["events"])
+        public["snapshots"] = list(job["snapshots"])
+    return public
+
+
+def _job_row(job: Dict[str, Any]) -> Dict[str, Any]:
+    # a JSON round trip copies the mutable parts (the job keeps changing while
+    # the flush awaits) and stringifies anything json can't encode
+    return json.loads(json.dumps({**job, "events": list(job["events"])}, default=str))
+
+
+def _row_job(row: AppJob, events: bool = False) -> Dict[str, Any]:
+    job = {c: getattr(row, c) for c in _LIST_COLUMNS}
+    if events:
+        job["events"] = row.events or []
+        job["snapshots"] = row.snapshots or []
+    return job
+
+
+def _snapshot(job: Dict[str, Any]) -> None:
+    job["snapshots"].append({
+        "timestamp": _utcnow(),
+        "events": job["event_count"],
+        "phase": job["phase"],
+        "progress": dict(job["progress"]),
+    })
+    if len(job["snapshots"]) > MAX_SNAPSHOTS:
+        job["snapshots"] = job["snapshots"][::2]
+
+
+def _try_json(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except Exception:
+        return value
+
+
+def _merge_progress(job: Dict[str, Any], data: Any, increment: bool = False) -> None:
+    progress = dict(job.get("progress") or {})
+    if isinstance(data, dict):
+        if "total" in data:
+            progress["total"] = data["total"]
+        if "current" in data:
+            if isinstance(data["current"], int):
+                if increment:
+                    progress["completed"] = data["current"]
+                else:
+                    progress["current_index"] = data["current"]
+            else:
+                progress["current"] = data["current"]
+        if "id" in data:
+            progress["current"] = data["id"]
+    if increment:
+        progress["completed"] = max(int(progress.get("completed") or 0), 1)
+    job["progress"] = progress
@@ -6,11 +6,21 @@ Same auth pattern as the real-time litellm adapter: env vars per provider.
 
 Batch is the default path for all single-turn eval prompts. Real-time
 is the exception, reserved for:
-- Multi-turn sequences (each turn depends on previous model response)
+- Multi-turn sequences (each turn depends on previous model response),
+  unless turn-synchronous batching is opted into (--batch-multi-turn)
 - DeepSeek R1 (reasoning token preservation requires real-time)
 - Providers without batch API support
 - User override via --no-batch
 
+Turn-synchronous batching (run_multi_turn_batch) submits turn 1 of every
+multi-turn sequence as one batch, builds the turn 2 requests from those
+responses, submits again, and so on. It trades latency for the batch
+discount on long overnight runs.
+
+Judge traffic (post-analysis grading, drift judging/calibration) goes
+through complete_prompts: one batch for every judge call, real-time
+fallback per item.
+
 Provider batch support (direct API, no proxy):
 - anthropic: api.anthropic.com/v1/messages/batches, 50% off tokens
 - xai/grok: api.x.ai/v1/batches (OpenAI-compatible), 50% off tokens
@@ -26,6 +36,8 @@ import io
 import asyncio
 import httpx
 
+from promptpressure.monitoring import record_batch_poll
+
 
 # litellm is optional. only used for cost calculation, not for API calls.
 try:
@@ -123,7 +135,7 @@ class CostTracker:
             pass
 
     def record_from_usage(self, model, prompt_tokens, completion_tokens):
-        """Record a request and its cost from raw token counts.
+        """Record a request and its cost from raw token counts; returns the cost.
 
         Request counts are tracked even when litellm is unavailable; only the
         cost figure depends on litellm's pricing data (it stays 0 without it).
@@ -133,7 +145,7 @@ class CostTracker:
         self.costs[model]["requests"] += 1
 
         if not LITELLM_AVAILABLE:
-            return
+            return 0.0
 
         try:
             cost = litellm.completion_cost(
@@ -142,8 +154,9 @@ class CostTracker:
                 completion=str(completion_tokens),
             )
             self.costs[model]["total"] += cost
+            return cost
         except Exception:
-            pass
+            return 0.0
 
     def summary(self):
         """Return cost summary dict."""
@@ -176,18 +189,39 @@ def get_batch_support(model_name):
     return "unknown", {"status": "unknown", "discount": 1.0, "method": None, "note": "provider not in registry"}
 
 
-def should_use_realtime(entry, model_name):
+def judge_batch_model(provider, model_name):
+    """The model id to batch judge traffic against, or None.
+
+    Only when ``provider`` (the adapter the judge or grader runs through) is
+    itself a batch provider: a model called via groq or openrouter must never
+    be submitted to anthropic/xai directly, whatever its name says. litellm
+    calls the provider in the model's ``provider/`` prefix, or the one a bare
+    model id names.
+    """
+    provider = (provider or "").lower()
+    model = model_name or ""
+    if provider == "litellm":
+        prefix, sep, rest = model.partition("/")
+        provider, model = (prefix.lower(), rest) if sep else (get_provider_for_model(model), model)
+    if BATCH_PROVIDERS.get(provider, {}).get("status") != "active":
+        return None
+    if get_provider_for_model(model) != provider:
+        return None
+    return model
+
+
+def should_use_realtime(entry, model_name, multi_turn_batch=False):
     """Determine if an entry must use real-time instead of batch.
 
     Returns True (force real-time) for:
-    - Multi-turn sequences
+    - Multi-turn sequences (unless multi_turn_batch is set)
     - DeepSeek R1 models
     - Providers without active batch support
     """
     prompt = entry.get("prompt") or entry.get("input")
     if not prompt:
         return True
-    if isinstance(prompt, list):
+    if isinstance(prompt, list) and not multi_turn_batch:
         return True
 
     model_lower = (model_name or "").lower()
@@ -208,6 +242,25 @@ async def run_batch(entries, model_name, config, litellm_endpoint=None):
     Falls back to real-time (returns empty dict) if batch isn't supported
     or the submission fails.
     """
+    requests = {
+        entry.get("id", "unknown"): [{"role": "user", "content": entry.get("prompt") or entry.get("input", "")}]
+        for entry in entries
+    }
+    return await run_message_batch(requests, model_name, config)
+
+
+async def run_message_batch(requests, model_name, config):
+    """Route a batch of conversations through the appropriate provider batch API.
+
+    Args:
+        requests: dict of custom_id -> chat messages list.
+        model_name: model to run every request against.
+        config: eval config dict (temperature, litellm_api_key fallback).
+
+    Returns:
+        dict of custom_id -> {"content", "usage"} (plus "error" on per-request
+        failure). Empty dict if batch isn't supported or the submission fails.
+    """
     provider = get_provider_for_model(model_name)
     status, info = get_batch_support(model_name)
 
@@ -219,20 +272,142 @@ async def run_batch(entries, model_name, config, litellm_endpoint=None):
     method = info.get("method")
 
     if method == "anthropic_batch_api":
-        return await _run_anthropic_batch(entries, model_name, config)
+        return await _run_anthropic_batch(requests, model_name, config)
     elif method == "xai_batch_api":
-        return await _run_xai_batch(entries, model_name, config)
+        return await _run_xai_batch(requests, model_name, config)
     else:
         print(f"  batch: method '{method}' not implemented for {provider}. falling back to real-time.")
         return {}
 
 
+async def run_multi_turn_batch(entries, model_name, config):
+    """Run multi-turn sequences turn-synchronously through the batch API.
+
+    Round N submits turn N of every still-live sequence as one batch, with
+    the full conversation so far (user turns + batched assistant responses).
+    A sequence drops out of later rounds when its request errors; the whole
+    lane stops when a round's submission fails.
+
+    Returns:
+        dict of entry_id -> {"responses": [{"content", "usage"}, ...], "error": str|None}.
+        ``responses`` holds the turns answered by the batch, in order. Any
+        turns past that prefix were not answered and are left to real-time.
+    """
+    lanes = {}
+    for entry in entries:
+        turns = entry.get("prompt") or entry.get("input") or []
+        lanes[entry.get("id", "unknown")] = {
+            "turns": turns,
+            "conversation": [],
+            "responses": [],
+            "error": None,
+        }
+
+    max_turns = max((len(lane["turns"]) for lane in lanes.values()), default=0)
+    for turn_idx in range(1, max_turns + 1):
+        live = [
+            entry_id for entry_id, lane in lanes.items()
+            if lane["error"] is None and turn_idx <= len(lane["turns"])
+        ]
+        if not live:
+            break
+
+        requests = {}
+        for entry_id in live:
+            lane = lanes[entry_id]
+            turn = lane["turns"][turn_idx - 1]
+            requests[entry_id] = lane["conversation"] + [
+                {"role": turn.get("role", "user"), "content": turn.get("content", "")}
+            ]
+
+        print(f"  multi-turn batch: turn {turn_idx}/{max_turns}, {len(live)} sequences")
+        results = await run_message_batch(requests, model_name, config)
+        if not results:
+            print(f"  multi-turn batch: turn {turn_idx} returned nothing. "
+                  f"remaining turns fall back to real-time.")
+            break
+
+        for entry_id in live:
+            lane = lanes[entry_id]
+            result = results.get(entry_id)
+            if result is None or "error" in result:
+                lane["error"] = (result or {}).get("error") or "missing from batch results"
+                continue
+            lane["conversation"] = requests[entry_id] + [
+                {"role": "assistant", "content": result.get("content", "")}
+            ]
+            lane["responses"].append({
+                "content": result.get("content", ""),
+                "usage": result.get("usage", {}),
+            })
+
+    return {
+        entry_id: {"responses": lane["responses"], "error": lane["error"]}
+        for entry_id, lane in lanes.items()
+    }
+
+
+async def complete_prompts(prompts, realtime_fn, model_name=None, config=None, concurrency=4):
+    """Answer independent prompts, through the batch API where possible.
+
+    Built for latency-insensitive judge traffic (post-analysis grading, drift
+    judging). When ``model_name`` has an active batch API, every prompt goes
+    out as one batch. Prompts the batch did not answer (unsupported provider,
+    failed submission, per-request error) fall back to ``realtime_fn`` one by
+    one, behind a semaphore of ``concurrency``.
+
+    Args:
+        prompts: dict of custom_id -> prompt string. Anthropic requires ids
+            matching ``[a-zA-Z0-9_-]{1,64}``, so callers should use synthetic ids.
+        realtime_fn: ``async (prompt) -> str`` used for the real-time path.
+        model_name: judge model to batch against. None skips the batch API.
+        config: config dict handed to the batch submitter (temperature, keys).
+        concurrency: max in-flight real-time calls.
+
+    Returns:
+        dict of custom_id -> {"content": str, "batch": bool}, or
+        {"error": str, "batch": False} when the real-time call raised.
+    """
+    out = {}
+    if model_name and prompts:
+        status, _ = get_batch_support(model_name)
+        if status == "active":
+            requests = {cid: [{"role": "user", "content": p}] for cid, p in prompts.items()}
+            try:
+                batch_results = await run_message_batch(requests, model_name, config or {})
+            except Exception as e:
+                print(f"  judge batch failed: {e}. using real-time.")
+                batch_results = {}
+            for cid, result in batch_results.items():
+                if cid in prompts and "error" not in result:
+                    out[cid] = {"content": result.get("content", ""), "batch": True}
+            missing = len(prompts) - len(out)
+            if missing:
+                print(f"  judge batch: {len(out)}/{len(prompts)} answered, {missing} via real-time")
+        else:
+            print(f"  batch: judge model '{model_name}' has no batch API. using real-time.")
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def realtime(cid):
+        async with sem:
+            try:
+                return cid, {"content": await realtime_fn(prompts[cid]), "batch": False}
+            except Exception as e:
+                return cid, {"error": str(e), "batch": False}
+
+    pending = [cid for cid in prompts if cid not in out]
+    for cid, result in await asyncio.gather(*(realtime(cid) for cid in pending)):
+        out[cid] = result
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Anthropic — api.anthropic.com/v1/messages/batches (direct)
 # ---------------------------------------------------------------------------
 
-async def _run_anthropic_batch(entries, model_name, config):
-    """Submit single-turn entries to Anthropic batch API directly.
+async def _run_anthropic_batch(requests, model_name, config):
+    """Submit conversations (custom_id -> messages) to Anthropic batch API directly.
 
     50% discount on input+output tokens.
     Docs: https://docs.anthropic.com/en/docs/build-with-claude/batch-processing
@@ -253,16 +428,15 @@ async def _run_anthropic_batch(entries, model_name, config):
     temperature = config.get("temperature", 0.7)
 
     # build batch requests in Anthropic's format
-    requests = []
-    for entry in entries:
-        prompt_text = entry.get("prompt") or entry.get("input", "")
-        requests.append({
-            "custom_id": entry.get("id", "unknown"),
+    batch_requests = []
+    for custom_id, messages in requests.items():
+        batch_requests.append({
+            "custom_id": custom_id,
             "params": {
                 "model": anthropic_model,
                 "max_tokens": 4096,
                 "temperature": temperature,
-                "messages": [{"role": "user", "content": prompt_text}],
+                "messages": messages,
             }
         })
 
@@ -277,14 +451,14 @@ async def _run_anthropic_batch(entries, model_name, config):
             resp = await client.post(
                 f"{base_url}/messages/batches",
                 headers=headers,
-                json={"requests": requests},
+                json={"requests": batch_requests},
             )
             resp.raise_for_status()
             batch = resp.json()
             batch_id = batch["id"]
 
-        print(f"  anthropic batch submitted: {batch_id} ({len(requests)} requests, 50% off)")
-        return await _poll_anthropic_batch(base_url, headers, batch_id, len(requests))
+        print(f"  anthropic batch submitted: {batch_id} ({len(batch_requests)} requests, 50% off)")
+        return await _poll_anthropic_batch(base_url, headers, batch_id, len(batch_requests))
 
     except Exception as e:
         print(f"  anthropic batch failed: {e}. falling back to real-time.")
@@ -309,6 +483,8 @@ async def _poll_anthropic_batch(base_url, headers, batch_id, total_requests):
             )
             status_resp.raise_for_status()
             status = status_resp.json()
+            processing = status.get("request_counts", {}).get("processing", 0)
+            record_batch_poll("anthropic", total_requests - processing, total_requests, processing)
 
             processing_status = status.get("processing_status", "")
             if processing_status == "ended":
@@ -367,8 +543,8 @@ async def _poll_anthropic_batch(base_url, headers, batch_id, total_requests):
 # xAI/Grok — api.x.ai/v1/batches (OpenAI-compatible, direct)
 # ---------------------------------------------------------------------------
 
-async def _run_xai_batch(entries, model_name, config):
-    """Submit single-turn entries to xAI batch API directly.
+async def _run_xai_batch(requests, model_name, config):
+    """Submit conversations (custom_id -> messages) to xAI batch API directly.
 
     OpenAI-compatible batch format: upload JSONL, create batch, poll, download.
     50% discount on input+output tokens.
@@ -391,16 +567,15 @@ async def _run_xai_batch(entries, model_name, config):
 
     # build JSONL
     jsonl_lines = []
-    for entry in entries:
-        prompt_text = entry.get("prompt") or entry.get("input", "")
+    for custom_id, messages in requests.items():
         jsonl_lines.append(json.dumps({
-            "custom_id": entry.get("id", "unknown"),
+            "custom_id": custom_id,
             "method": "POST",
             "url": "/v1/chat/completions",
             "body": {
                 "model": xai_model,
                 "temperature": temperature,
-                "messages": [{"role": "user", "content": prompt_text}],
+                "messages": messages,
             }
         }))
 
@@ -432,8 +607,8 @@ async def _run_xai_batch(entries, model_name, config):
             batch_resp.raise_for_status()
             batch_id = batch_resp.json().get("id")
 
-        print(f"  xai batch submitted: {batch_id} ({len(entries)} requests, 50% off)")
-        return await _poll_openai_compatible_batch(base_url, headers, batch_id, len(entries), "xai")
+        print(f"  xai batch submitted: {batch_id} ({len(requests)} requests, 50% off)")
+        return await _poll_openai_compatible_batch(base_url, headers, batch_id, len(requests), "xai")
 
     except Exception as e:
         print(f"  xai batch failed: {e}. falling back to real-time.")
@@ -462,6 +637,8 @@ async def _poll_openai_compatible_batch(base_url, headers, batch_id, total_reque
             )
             status_resp.raise_for_status()
             status = status_resp.json()
+            counts = status.get("request_counts", {})
+            record_batch_poll(provider_name, counts.get("completed", 0), counts.get("total", total_requests))
 
             batch_status = status.get("status", "")
             if batch_status == "completed":
@@ -507,41 +684,25 @@ async def _poll_openai_compatible_batch(base_url, headers, batch_id, total_reque
 
 
 # ---------------------------------------------------------------------------
-# Multi-model parallel (litellm SDK, no proxy)
+# Multi-model parallel (async fan-out through the litellm adapter)
 # ---------------------------------------------------------------------------
 
 async def run_multi_model_parallel(prompt_text, models, config):
-    """Fire the same prompt at multiple models in parallel via litellm SDK.
+    """Fire the same prompt at multiple models in parallel.
 
-    Uses litellm.batch_completion_models (Python SDK, not the proxy server).
+    Thin wrapper over fanout.fan_out with every model on the litellm adapter.
+    Fully async: the fan-out never blocks the event loop.
     """
-    if not LITELLM_AVAILABLE:
-        raise RuntimeError("litellm not installed. run: pip install 'litellm[proxy]'")
+    from promptpressure.fanout import fan_out
 
-    messages = [{"role": "user", "content": prompt_text}]
-    temperature = config.get("temperature", 0.7)
+    targets = [{"adapter": "litellm", "model": model, "label": model} for model in models]
+    out = await fan_out(prompt_text, targets, config)
 
     results = {}
-    responses = litellm.batch_completion_models(
-        models=models,
-        messages=messages,
-        temperature=temperature,
-    )
-
-    for i, resp in enumerate(responses):
-        model = models[i] if i < len(models) else f"model_{i}"
-        if hasattr(resp, "choices") and resp.choices:
-            content = resp.choices[0].message.content or ""
-            usage = {}
-            if hasattr(resp, "usage") and resp.usage:
-                usage = {
-                    "prompt_tokens": resp.usage.prompt_tokens,
-                    "completion_tokens": resp.usage.completion_tokens,
-                }
-            results[model] = {"content": content, "usage": usage}
-        elif isinstance(resp, Exception):
-            results[model] = {"content": "", "error": str(resp), "usage": {}}
+    for model in models:
+        result = out["results"][model]
+        if result["status"] == "ok":
+            results[model] = {"content": result["content"] or "", "usage": result["usage"]}
         else:
-            results[model] = {"content": str(resp), "usage": {}}
-
+            results[model] = {"content": "", "error": result["error"] or result["status"], "usage": {}}
     return results
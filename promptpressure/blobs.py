@@ -0,0 +1,219 @@
+"""
+Content-addressed, compressed storage for large result texts.
+
+Prompt/response bodies and turn contents used to be inlined in every
+``results`` / ``turns`` row. Multi-turn prompts repeat the same user turns
+in every run and for every model, and long responses dominate the file.
+Texts of ``INLINE_MAX`` characters or more now go to the ``blobs`` table,
+keyed by the sha256 of the text, and the row keeps only the hash:
+
+    results.prompt_text   ""  + results.prompt_blob   -> blobs.hash
+    results.response_text ""  + results.response_blob -> blobs.hash
+    turns.user_content    ""  + turns.user_blob       -> blobs.hash
+    turns.assistant_content "" + turns.assistant_blob -> blobs.hash
+    *.reasoning_text      ""  + *.reasoning_blob      -> blobs.hash
+
+Blobs of ``COMPRESS_MIN`` bytes or more are compressed with zstd when the
+optional ``zstandard`` package is installed, zlib otherwise. The codec is
+stored per blob, so databases written with either stay readable (zstd
+blobs need ``zstandard`` to read).
+
+``externalize`` is applied by the DBWriter before insert, ``resolve`` by
+the API after select, so neither callers nor API clients see hashes.
+``migrate`` moves text already inlined in an existing database.
+"""
+
+import hashlib
+import zlib
+
+from sqlalchemy import delete, func, or_, select, union, update
+
+from promptpressure.database import Blob, Result, Turn
+
+# zstandard is optional. zlib is the fallback codec.
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# shorter texts stay inline: a 64-char hash plus a blob row isn't worth it
+INLINE_MAX = 256
+# smaller blobs are stored raw; compression gains little on them
+COMPRESS_MIN = 1024
+
+# text column -> blob ref column, per model
+TEXT_COLUMNS = {
+    Result: {"prompt_text": "prompt_blob", "response_text": "response_blob", "reasoning_text": "reasoning_blob"},
+    Turn: {"user_content": "user_blob", "assistant_content": "assistant_blob", "reasoning_text": "reasoning_blob"},
+}
+TEXT_REFS = {text: ref for columns in TEXT_COLUMNS.values() for text, ref in columns.items()}
+
+
+def pack(text, compress_min=COMPRESS_MIN):
+    """Return the ``blobs`` row for ``text`` as a dict."""
+    raw = text.encode("utf-8")
+    codec, data = "raw", raw
+    if len(raw) >= compress_min:
+        if ZSTD_AVAILABLE:
+            codec, data = "zstd", zstandard.ZstdCompressor(level=3).compress(raw)
+        else:
+            codec, data = "zlib", zlib.compress(raw, 6)
+        if len(data) >= len(raw):
+            codec, data = "raw", raw
+    return {"hash": hashlib.sha256(raw).hexdigest(), "codec": codec, "size": len(raw), "data": data}
+
+
+def unpack(codec, data):
+    if codec == "raw":
+        raw = data
+    elif codec == "zlib":
+        raw = zlib.decompress(data)
+    elif codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("blob is zstd-compressed; install zstandard to read it")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raise ValueError(f"unknown blob codec {codec!r}")
+    return bytes(raw).decode("utf-8")
+
+
+def externalize(rows, inline_max=INLINE_MAX, compress_min=COMPRESS_MIN):
+    """Move long texts of Result/Turn rows (and a Result's turns) to blobs.
+
+    Mutates the rows in place (text -> "", ref -> hash) and returns the
+    blob rows they need, deduplicated by hash. Rows already externalized
+    are left alone.
+    """
+    blobs = {}
+    pending = list(rows)
+    while pending:
+        row = pending.pop()
+        columns = TEXT_COLUMNS.get(type(row))
+        if columns is None:
+            continue
+        if isinstance(row, Result):
+            pending.extend(row.turns)
+        for text_col, ref_col in columns.items():
+            text = getattr(row, text_col)
+            if text is None or len(text) < inline_max or getattr(row, ref_col):
+                continue
+            blob = pack(text, compress_min)
+            blobs.setdefault(blob["hash"], blob)
+            setattr(row, text_col, "")
+            setattr(row, ref_col, blob["hash"])
+    return list(blobs.values())
+
+
+async def store(session, blobs):
+    """Insert blob rows, skipping hashes that already exist."""
+    if not blobs:
+        return
+    dialect = session.bind.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        await session.execute(insert(Blob).on_conflict_do_nothing(index_elements=["hash"]), blobs)
+        return
+    existing = set((await session.execute(
+        select(Blob.hash).where(Blob.hash.in_([b["hash"] for b in blobs]))
+    )).scalars())
+    missing = [b for b in blobs if b["hash"] not in existing]
+    if missing:
+        await session.execute(Blob.__table__.insert(), missing)
+
+
+async def load(session, hashes):
+    """Return {hash: text} for the given hashes."""
+    hashes = list(hashes)
+    texts = {}
+    for start in range(0, len(hashes), 500):  # stay under bind-parameter limits
+        chunk = hashes[start:start + 500]
+        rows = await session.execute(select(Blob.hash, Blob.codec, Blob.data).where(Blob.hash.in_(chunk)))
+        for h, codec, data in rows:
+            texts[h] = unpack(codec, data)
+    return texts
+
+
+def ref_columns(fields):
+    """The blob ref columns to select alongside the text ``fields``."""
+    return [TEXT_REFS[f] for f in fields if f in TEXT_REFS]
+
+
+async def resolve(session, items):
+    """Fill externalized texts into selected-row dicts, in place.
+
+    Each ``*_blob`` key present is popped; when it holds a hash the
+    matching text key gets the blob's text.
+    """
+    hashes = {item[ref] for item in items for ref in TEXT_REFS.values() if item.get(ref)}
+    texts = await load(session, hashes) if hashes else {}
+    for item in items:
+        for text_col, ref_col in TEXT_REFS.items():
+            if ref_col in item:
+                h = item.pop(ref_col)
+                if h:
+                    item[text_col] = texts[h]
+    return items
+
+
+async def prune(session):
+    """Delete blobs no result or turn refers to. Returns the count."""
+    referenced = union(*[
+        select(getattr(model, ref)).where(getattr(model, ref).is_not(None))
+        for model, columns in TEXT_COLUMNS.items() for ref in columns.values()
+    ]).subquery()
+    result = await session.execute(delete(Blob).where(Blob.hash.not_in(select(referenced.c[0]))))
+    return result.rowcount or 0
+
+
+async def migrate(sessionmaker, inline_max=INLINE_MAX, compress_min=COMPRESS_MIN, batch_size=500):
+    """Externalize texts already inlined in results/turns rows.
+
+    Works in id order, one transaction per batch, so it can be interrupted
+    and re-run. Returns {"rows", "blobs", "text_bytes", "blob_bytes"}.
+    """
+    stats = {"rows": 0, "blobs": 0, "text_bytes": 0, "blob_bytes": 0}
+    seen = set()
+    for model, columns in TEXT_COLUMNS.items():
+        text_cols = list(columns)
+        needs = or_(*[
+            (func.length(getattr(model, text)) >= inline_max) & getattr(model, ref).is_(None)
+            for text, ref in columns.items()
+        ])
+        last_id = 0
+        while True:
+            async with sessionmaker() as session:
+                rows = (await session.execute(
+                    select(model.id, *[getattr(model, c) for c in text_cols])
+                    .where(needs, model.id > last_id).order_by(model.id).limit(batch_size)
+                )).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                blobs, updates = {}, []
+                for row in rows:
+                    values = {}
+                    for text_col, text in zip(text_cols, row[1:]):
+                        if text is None or len(text) < inline_max:
+                            continue
+                        blob = pack(text, compress_min)
+                        blobs[blob["hash"]] = blob
+                        if blob["hash"] not in seen:
+                            seen.add(blob["hash"])
+                            stats["blobs"] += 1
+                            stats["blob_bytes"] += len(blob["data"])
+                        stats["text_bytes"] += blob["size"]
+                        values[text_col] = ""
+                        values[columns[text_col]] = blob["hash"]
+                    if values:
+                        updates.append((row[0], values))
+                await store(session, list(blobs.values()))
+                for row_id, values in updates:
+                    await session.execute(update(model).where(model.id == row_id).values(**values))
+                await session.commit()
+                stats["rows"] += len(updates)
+    return stats
@@ -0,0 +1,158 @@
+"""
+Signature-validated caches for the sidecar's listing endpoints.
+
+``/app/configs``, ``/eval-sets``, ``/models`` and ``/providers`` used to sit
+behind 60s ``TTLCache``s: a new YAML config or eval set showed up a minute
+late, and every expiry re-read everything (or re-probed every provider)
+while the request waited. ``SignatureCache`` keys each entry on what it was
+built from instead:
+
+- ``signature`` is any hashable snapshot of the inputs, usually
+  ``file_signature(pattern, ...)`` (path, mtime, size of each matching
+  file). An entry is served while the signature is unchanged and its
+  ``ttl`` (the cache's, or one passed for that entry), if any, hasn't run
+  out, so edits, additions and deletions are
+  seen on the next call and nothing is rebuilt otherwise.
+- ``get`` / ``get_async`` build on a miss; concurrent async misses for a
+  key share one build.
+- ``get_async(..., stale_ttl=...)`` is stale-while-revalidate: past ``ttl``
+  (with the signature unchanged) the old value is served for up to
+  ``stale_ttl`` more seconds while one background task rebuilds it. For
+  inputs a signature can't see, like provider health.
+- ``stats()`` counts hits, misses, stale serves, builds and failed
+  builds; ``all_stats()`` covers every named cache (the
+  ``/diagnostics`` endpoint reports them).
+"""
+import asyncio
+import glob
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_caches: Dict[str, "SignatureCache"] = {}
+_DEFAULT: Any = object()  # "use the cache's ttl"
+
+
+def file_signature(*patterns: str) -> Tuple[Tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) of every file matching the glob patterns."""
+    signature = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def all_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+class _Entry:
+    __slots__ = ("value", "signature", "ttl", "stored_at")
+
+    def __init__(self, value: Any, signature: Hashable, ttl: Optional[float]) -> None:
+        self.value = value
+        self.signature = signature
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    def age_ok(self, extra: float = 0.0) -> bool:
+        return self.ttl is None or time.monotonic() - self.stored_at < self.ttl + extra
+
+
+class SignatureCache:
+    def __init__(self, name: str, ttl: Optional[float] = None, maxsize: int = 128) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._builds: Dict[Hashable, asyncio.Task] = {}
+        self._counts = {"hits": 0, "misses": 0, "stale": 0, "builds": 0, "build_errors": 0}
+        _caches[name] = self
+
+    def get(
+        self, key: Hashable, build: Callable[[], Any], signature: Hashable = None, ttl: Optional[float] = _DEFAULT,
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature and entry.age_ok():
+            return self._hit(key, entry)
+        self._counts["misses"] += 1
+        return self._store(key, build(), signature, self.ttl if ttl is _DEFAULT else ttl)
+
+    async def get_async(
+        self,
+        key: Hashable,
+        build: Callable[[], Awaitable[Any]],
+        signature: Hashable = None,
+        ttl: Optional[float] = _DEFAULT,
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        ttl = self.ttl if ttl is _DEFAULT else ttl
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            if entry.age_ok():
+                return self._hit(key, entry)
+            if stale_ttl is not None and entry.age_ok(stale_ttl):
+                self._counts["stale"] += 1
+                self._build_task(key, build, signature, ttl)
+                return entry.value
+        self._counts["misses"] += 1
+        return await asyncio.shield(self._build_task(key, build, signature, ttl))
+
+    def stats(self) -> Dict[str, Any]:
+        served = self._counts["hits"] + self._counts["stale"] + self._counts["misses"]
+        return {
+            **self._counts,
+            "size": len(self._entries),
+            "hit_ratio": round((self._counts["hits"] + self._counts["stale"]) / served, 4) if served else None,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _build_task(
+        self, key: Hashable, build: Callable[[], Awaitable[Any]], signature: Hashable, ttl: Optional[float],
+    ) -> asyncio.Task:
+        # one build per key at a time; a task from a loop that has since
+        # closed (test clients) doesn't count
+        task = self._builds.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return task
+
+        async def run() -> Any:
+            try:
+                value = await build()
+            except Exception as e:
+                self._counts["build_errors"] += 1
+                logging.warning("Cache %s: rebuilding %r failed: %s", self.name, key, e)
+                raise
+            return self._store(key, value, signature, ttl)
+
+        task = asyncio.get_running_loop().create_task(run())
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())  # retrieved: no "never retrieved" noise
+        self._builds[key] = task
+        return task
+
+    def _store(self, key: Hashable, value: Any, signature: Hashable, ttl: Optional[float]) -> Any:
+        self._counts["builds"] += 1
+        self._entries[key] = _Entry(value, signature, ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def _hit(self, key: Hashable, entry: _Entry) -> Any:
+        self._counts["hits"] += 1
+        self._entries.move_to_end(key)
+        return entry.value
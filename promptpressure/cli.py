@@ -7,6 +7,7 @@ import csv
 import traceback
 import time
 import asyncio
+import contextlib
 from datetime import datetime
 from uuid import uuid4
 from dotenv import load_dotenv
@@ -19,14 +20,21 @@ from tqdm import tqdm
 from promptpressure.adapters import load_adapter
 from promptpressure.metrics import MetricsCollector, get_metrics_analyzer
 from promptpressure.monitoring import start_metrics_server, stop_metrics_server, record_api_request, record_evaluation_start, record_evaluation_end, record_prompt_processing, record_response, update_custom_metrics
+from promptpressure.monitoring import IN_FLIGHT, QUEUE_DEPTH, call_timer, record_model_call, run_gauge, run_scope
+from promptpressure import tracing
+from promptpressure.tracing import lane_span, span
 from promptpressure.reporting import ReportGenerator
-from promptpressure.database import init_db, get_db_session, Evaluation, Result, Metric, DATABASE_URL
+from promptpressure.blobs import INLINE_MAX
+from promptpressure.database import init_db, dispose_db, get_db_session, Evaluation, Result, Metric, Turn, DATABASE_URL
+from promptpressure.db_writer import DBWriter
 from promptpressure.per_turn_metrics import compute_turn_metrics
 from promptpressure.tier import filter_by_tier
-from promptpressure.batch import CostTracker, should_use_realtime, run_batch
+from promptpressure.batch import CostTracker, should_use_realtime, run_batch, run_multi_turn_batch
 from promptpressure.run_log import RunLog
+from promptpressure.output_catalog import record as record_output
+from promptpressure.summary import SummaryAccumulator
 from promptpressure.resilience import is_retryable, classify_error, retry_with_backoff
-from promptpressure.grading import post_analyze_groq, post_analyze_openrouter
+from promptpressure.grading import post_analyze_groq, post_analyze_litellm, post_analyze_openrouter
 
 def log_error(output_dir, error_msg):
     log_path = os.path.join(output_dir, "error.log")
@@ -46,6 +54,19 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         turn_delay: Seconds between turns in multi-turn sequences.
         max_retries: Max retries on retryable errors (429, 503).
     """
+    record_evaluation_start()
+    started = time.time()
+    try:
+        # hot-path metrics recorded during the run carry its evaluation id;
+        # with ``trace`` set, its spans go to the output dir when it ends
+        with run_scope() as run, tracing.trace_run(config.get("trace"), model=config.get("model_name", ""),
+                                                   adapter=adapter_name):
+            return await _run_suite(run, config, adapter_name, batch_mode, request_delay, turn_delay, max_retries)
+    finally:
+        record_evaluation_end(time.time() - started)
+
+
+async def _run_suite(run, config, adapter_name, batch_mode, request_delay, turn_delay, max_retries):
     # Load prompts. Native app jobs can pass multiple eval sets; keep the
     # existing single-dataset field as the primary label/output fallback.
     dataset_files = config.get("eval_set_ids") or [config.get("dataset", "evals_dataset.json")]
@@ -78,6 +99,9 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
     output_dir = os.path.join(base_output_dir, ts) if ts else base_output_dir
     os.makedirs(output_dir, exist_ok=True)
     run_log = RunLog(output_dir)
+    tracer = tracing.current()
+    if tracer is not None:
+        tracer.output_dir = output_dir
 
     results = []
     adapter_fn = load_adapter(adapter_name)
@@ -90,7 +114,7 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
     print(f"Evaluating model '{model_name}' using adapter '{adapter_name}' with {len(prompts)} prompts (Concurrency: {concurrency})...")
     
-    # DB Initialization
+    # DB Initialization (shared engine; schema is created once per process)
     engine = await init_db()
     
     # Check for Dynamic Adapter Config
@@ -135,8 +159,45 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         await session.commit()
         await session.refresh(db_eval)
         eval_id = db_eval.id
-    
-    record_evaluation_start()
+    run.bind(eval_id)
+
+    # Results and metrics go through one background writer (bulk inserts,
+    # one transaction per batch) instead of a session + commit per prompt.
+    db_writer = DBWriter(engine).start()
+    # per (model, category) rollups for run lists, written when the run ends
+    summary = SummaryAccumulator()
+    entry_usage = {}
+
+    def _record_usage(entry_id, prompt_tokens, completion_tokens):
+        cost = cost_tracker.record_from_usage(model_name, prompt_tokens, completion_tokens)
+        totals = entry_usage.setdefault(entry_id, [0, 0, 0.0])
+        totals[0] += prompt_tokens or 0
+        totals[1] += completion_tokens or 0
+        totals[2] += cost
+
+    async def _put_result(entry, row, error_type=None):
+        row.category = entry.get("category")
+        prompt_tokens, completion_tokens, cost = entry_usage.pop(entry.get("id"), (0, 0, 0.0))
+        # read the row before the writer owns it (its session may expire it)
+        if collect_metrics:
+            metrics_collector.record_entry(
+                row.latency_ms / 1000 if row.latency_ms is not None else None,
+                success=bool(row.success), model=row.model, adapter=row.adapter, category=row.category,
+                entry_type="multi_turn" if row.turns else "single", tokens=completion_tokens,
+                turns=[
+                    (t.turn, t.latency_ms / 1000 if t.latency_ms is not None else None,
+                     bool(t.success), t.completion_tokens or 0)
+                    for t in row.turns
+                ],
+            )
+        await db_writer.put(row)
+        summary.add(
+            row.model, row.category, success=row.success,
+            refusal=(entry.get("eval_criteria") or {}).get("refusal") is True,
+            error_type=error_type, latency_ms=row.latency_ms,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cost_usd=cost,
+        )
+
     eval_start_time = time.time()
 
     # Initialize Plugin Manager
@@ -146,6 +207,22 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
     # Semaphore for concurrency control
     sem = asyncio.Semaphore(concurrency)
+    queue_depth, in_flight = run_gauge(QUEUE_DEPTH), run_gauge(IN_FLIGHT)
+
+    @contextlib.asynccontextmanager
+    async def _worker_slot():
+        queue_depth.inc()
+        try:
+            with span("slot.wait"):
+                await sem.acquire()
+        finally:
+            queue_depth.dec()
+        in_flight.inc()
+        try:
+            yield
+        finally:
+            in_flight.dec()
+            sem.release()
 
     # Callback support for event streaming
     log_callback = config.get("_callback")
@@ -158,7 +235,14 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
             await log_callback(event_type, data)
 
     async def process_entry(entry):
-        async with sem:
+        batch_result = None
+        # Wait for the batch lanes outside the semaphore so real-time
+        # entries keep every worker slot while a batch is in flight.
+        if batch_task is not None and entry.get("id") in batch_entry_ids:
+            batch_result = (await asyncio.shield(batch_task)).get(entry.get("id"))
+        elif multi_turn_batch_task is not None and entry.get("id") in multi_turn_batch_ids:
+            batch_result = (await asyncio.shield(multi_turn_batch_task)).get(entry.get("id"))
+        async with _worker_slot():
             if is_cancelled():
                 raise asyncio.CancelledError()
             prompt_data = entry.get("prompt") or entry.get("input")
@@ -167,12 +251,16 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
             is_multi_turn = isinstance(prompt_data, list)
 
-            if is_multi_turn:
-                return await _process_multi_turn(entry, prompt_data)
-            else:
-                return await _process_single_turn(entry, prompt_data)
+            # the span starts once the entry holds a slot, so the trace has
+            # about max_workers tracks rather than one per queued entry
+            with lane_span("entry", id=str(entry.get("id")), multi_turn=is_multi_turn,
+                           batch=batch_result is not None):
+                if is_multi_turn:
+                    return await _process_multi_turn(entry, prompt_data, batch_result)
+                else:
+                    return await _process_single_turn(entry, prompt_data, batch_result)
 
-    async def _process_single_turn(entry, prompt_text):
+    async def _process_single_turn(entry, prompt_text, batch_result=None):
         if is_cancelled():
             raise asyncio.CancelledError()
         await emit_event("start_prompt", {"id": entry.get("id"), "prompt": prompt_text[:50]})
@@ -186,17 +274,16 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
         reasoning = ""
 
-        # Check if batch result exists for this entry
+        # Use the batch result if the batch lane produced one for this entry
         entry_id = entry.get("id")
-        if entry_id and entry_id in batch_results_map:
-            batch_result = batch_results_map[entry_id]
+        if batch_result is not None:
             if "error" not in batch_result:
                 response = batch_result.get("content", "")
                 success = True
                 usage = batch_result.get("usage", {})
                 if usage:
-                    cost_tracker.record_from_usage(
-                        model_name,
+                    _record_usage(
+                        entry_id,
                         usage.get("input_tokens", usage.get("prompt_tokens", 0)),
                         usage.get("output_tokens", usage.get("completion_tokens", 0)),
                     )
@@ -221,20 +308,17 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
                 await emit_event("end_prompt", {"id": entry_id, "success": True, "latency": duration, "error": None})
 
-                async for session in get_db_session(engine):
-                    db_result = Result(
-                        evaluation_id=eval_id,
-                        prompt_id=str(entry_id),
-                        prompt_text=prompt_text,
-                        response_text=response,
-                        model=model_name,
-                        adapter=adapter_name,
-                        latency_ms=duration * 1000,
-                        success=True,
-                        error_message=None,
-                    )
-                    session.add(db_result)
-                    await session.commit()
+                await _put_result(entry, Result(
+                    evaluation_id=eval_id,
+                    prompt_id=str(entry_id),
+                    prompt_text=prompt_text,
+                    response_text=response,
+                    model=model_name,
+                    adapter=adapter_name,
+                    latency_ms=duration * 1000,
+                    success=True,
+                    error_message=None,
+                ))
 
                 run_log.record(
                     entry_id=entry_id, model=model_name, provider=adapter_name,
@@ -247,18 +331,24 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
         retries_used = 0
         error_type = None
+        call_seconds = None
 
         try:
             # request delay to space out calls
             if request_delay > 0:
-                await asyncio.sleep(request_delay)
+                with span("request_delay", seconds=request_delay):
+                    await asyncio.sleep(request_delay)
             if is_cancelled():
                 raise asyncio.CancelledError()
 
             async def _do_call():
+                nonlocal call_seconds
                 if is_cancelled():
                     raise asyncio.CancelledError()
-                return await adapter_fn(prompt_text, config)
+                with span("adapter.call", adapter=adapter_name, model=model_name), call_timer() as timer:
+                    response = await adapter_fn(prompt_text, config)
+                call_seconds = timer.seconds
+                return response
 
             response, retries_used = await retry_with_backoff(
                 _do_call, max_retries=max_retries, base_delay=5.0, max_delay=60.0
@@ -279,17 +369,19 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
                     pass
 
             # Track cost from litellm usage data
+            usage = {}
             try:
                 from promptpressure.adapters.litellm_adapter import get_last_usage
-                usage = get_last_usage()
+                usage = get_last_usage() or {}
                 if usage:
-                    cost_tracker.record_from_usage(
-                        model_name,
+                    _record_usage(
+                        entry_id,
                         usage.get("prompt_tokens", 0),
                         usage.get("completion_tokens", 0),
                     )
             except (ImportError, Exception):
                 pass
+            record_model_call(model_name, call_seconds, usage.get("completion_tokens") or 0)
 
             if collect_metrics:
                 response_time = time.time() - start_time
@@ -305,7 +397,8 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
                 "adapter": adapter_name,
                 "config": config
             }
-            plugin_scores = await plugin_manager.run_scorers(prompt_text, response, metadata)
+            with span("plugins.score"):
+                plugin_scores = await plugin_manager.run_scorers(prompt_text, response, metadata)
 
         except Exception as e:
             error_msg = str(e)
@@ -351,20 +444,18 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
             "error": str(error_msg) if error_msg else None
         })
 
-        async for session in get_db_session(engine):
-            db_result = Result(
-                evaluation_id=eval_id,
-                prompt_id=str(entry.get("id")),
-                prompt_text=prompt_text,
-                response_text=response if success else "",
-                model=model_name,
-                adapter=adapter_name,
-                latency_ms=duration * 1000,
-                success=success,
-                error_message=error_msg
-            )
-            session.add(db_result)
-            await session.commit()
+        await _put_result(entry, Result(
+            evaluation_id=eval_id,
+            prompt_id=str(entry.get("id")),
+            prompt_text=prompt_text,
+            response_text=response if success else "",
+            reasoning_text=reasoning or None,
+            model=model_name,
+            adapter=adapter_name,
+            latency_ms=duration * 1000,
+            success=success,
+            error_message=error_msg
+        ), error_type)
 
         run_log.record(
             entry_id=entry.get("id"), model=model_name, provider=adapter_name,
@@ -373,8 +464,75 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         )
         return result_data
 
-    async def _process_multi_turn(entry, turns):
-        """Process a multi-turn prompt sequence, accumulating conversation history."""
+    async def _realtime_turn(entry_id, turn_idx, turn_content, conversation):
+        """Send one turn of a multi-turn sequence in real-time.
+
+        Returns (response_text, reasoning, usage). Records cost from usage data.
+        """
+        # Timeout scales with turn count, capped at 5x base
+        base_timeout = config.get("timeout", 60)
+        turn_timeout = min(base_timeout * (1 + turn_idx * 0.5), base_timeout * 5)
+
+        call_seconds = None
+
+        async def _do_turn_call():
+            nonlocal call_seconds
+            if is_cancelled():
+                raise asyncio.CancelledError()
+            try:
+                with span("adapter.call", adapter=adapter_name, model=model_name, turn=turn_idx), \
+                        call_timer() as timer:
+                    response = await asyncio.wait_for(
+                        adapter_fn(turn_content, config, messages=list(conversation)),
+                        timeout=turn_timeout
+                    )
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"Turn {turn_idx} timed out after {turn_timeout:.0f}s") from e
+            call_seconds = timer.seconds
+            return response
+
+        response_text, turn_retries = await retry_with_backoff(
+            _do_turn_call, max_retries=max_retries, base_delay=5.0, max_delay=60.0
+        )
+
+        # Capture reasoning tokens if available
+        turn_reasoning = ""
+        try:
+            from promptpressure.adapters.deepseek_r1_adapter import get_last_reasoning
+            turn_reasoning = get_last_reasoning()
+        except (ImportError, Exception):
+            pass
+        if not turn_reasoning:
+            try:
+                from promptpressure.adapters.litellm_adapter import get_last_reasoning as litellm_reasoning
+                turn_reasoning = litellm_reasoning()
+            except (ImportError, Exception):
+                pass
+
+        # Track cost from litellm usage data
+        turn_usage = {}
+        try:
+            from promptpressure.adapters.litellm_adapter import get_last_usage
+            turn_usage = get_last_usage() or {}
+            if turn_usage:
+                _record_usage(
+                    entry_id,
+                    turn_usage.get("prompt_tokens", 0),
+                    turn_usage.get("completion_tokens", 0),
+                )
+        except (ImportError, Exception):
+            pass
+        record_model_call(model_name, call_seconds, turn_usage.get("completion_tokens") or 0)
+
+        return response_text, turn_reasoning, turn_usage
+
+    async def _process_multi_turn(entry, turns, batch_transcript=None):
+        """Process a multi-turn prompt sequence, accumulating conversation history.
+
+        batch_transcript: turn-synchronous batch output for this entry. Turns it
+        answered are replayed without an adapter call; the sequence continues
+        in real-time from the first turn the batch did not answer.
+        """
         if is_cancelled():
             raise asyncio.CancelledError()
         await emit_event("start_prompt", {"id": entry.get("id"), "prompt": f"[multi-turn: {len(turns)} turns]"})
@@ -386,68 +544,42 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         success = True
         error_msg = None
         mt_error_type = None
+        batched_turns = (batch_transcript or {}).get("responses") or []
+        turn_rows = []
 
         for turn_idx, turn in enumerate(turns, 1):
             if is_cancelled():
                 raise asyncio.CancelledError()
             turn_content = turn.get("content", "")
             turn_role = turn.get("role", "user")
+            batched = batched_turns[turn_idx - 1] if turn_idx <= len(batched_turns) else None
 
             # Add user turn to conversation history
             conversation.append({"role": turn_role, "content": turn_content})
 
             # turn delay to avoid rate limits on rapid sequential requests
-            if turn_idx > 1 and turn_delay > 0:
-                await asyncio.sleep(turn_delay)
+            if batched is None and turn_idx > 1 and turn_delay > 0:
+                with span("turn_delay", seconds=turn_delay):
+                    await asyncio.sleep(turn_delay)
             if is_cancelled():
                 raise asyncio.CancelledError()
 
+            turn_start = time.time()
             try:
-                # Timeout scales with turn count, capped at 5x base
-                base_timeout = config.get("timeout", 60)
-                turn_timeout = min(base_timeout * (1 + turn_idx * 0.5), base_timeout * 5)
-
-                async def _do_turn_call():
-                    if is_cancelled():
-                        raise asyncio.CancelledError()
-                    try:
-                        return await asyncio.wait_for(
-                            adapter_fn(turn_content, config, messages=list(conversation)),
-                            timeout=turn_timeout
-                        )
-                    except asyncio.TimeoutError as e:
-                        raise TimeoutError(f"Turn {turn_idx} timed out after {turn_timeout:.0f}s") from e
-
-                response_text, turn_retries = await retry_with_backoff(
-                    _do_turn_call, max_retries=max_retries, base_delay=5.0, max_delay=60.0
-                )
-
-                # Capture reasoning tokens if available
-                turn_reasoning = ""
-                try:
-                    from promptpressure.adapters.deepseek_r1_adapter import get_last_reasoning
-                    turn_reasoning = get_last_reasoning()
-                except (ImportError, Exception):
-                    pass
-                if not turn_reasoning:
-                    try:
-                        from promptpressure.adapters.litellm_adapter import get_last_reasoning as litellm_reasoning
-                        turn_reasoning = litellm_reasoning()
-                    except (ImportError, Exception):
-                        pass
-
-                # Track cost from litellm usage data
-                try:
-                    from promptpressure.adapters.litellm_adapter import get_last_usage
-                    turn_usage = get_last_usage()
+                if batched is not None:
+                    response_text = batched.get("content", "")
+                    turn_reasoning = ""
+                    turn_usage = batched.get("usage") or {}
                     if turn_usage:
-                        cost_tracker.record_from_usage(
-                            model_name,
-                            turn_usage.get("prompt_tokens", 0),
-                            turn_usage.get("completion_tokens", 0),
+                        _record_usage(
+                            entry.get("id"),
+                            turn_usage.get("input_tokens", turn_usage.get("prompt_tokens", 0)),
+                            turn_usage.get("output_tokens", turn_usage.get("completion_tokens", 0)),
                         )
-                except (ImportError, Exception):
-                    pass
+                else:
+                    with span("turn", turn=turn_idx):
+                        response_text, turn_reasoning, turn_usage = await _realtime_turn(entry.get("id"), turn_idx, turn_content, conversation)
+                turn_latency_ms = None if batched is not None else (time.time() - turn_start) * 1000
 
                 # Add assistant response to conversation history
                 conversation.append({"role": "assistant", "content": response_text})
@@ -466,11 +598,30 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
                 }
                 if turn_reasoning:
                     turn_entry["reasoning"] = turn_reasoning
+                if batched is not None:
+                    turn_entry["batch"] = True
                 # Compute per-turn behavioral metrics
                 turn_entry["metrics"] = compute_turn_metrics(
                     turn_content, response_text, turn_number=turn_idx
                 )
                 turn_responses.append(turn_entry)
+                turn_rows.append(Turn(
+                    evaluation_id=eval_id,
+                    prompt_id=str(entry.get("id")),
+                    model=model_name,
+                    turn=turn_idx,
+                    role=turn_role,
+                    user_content=turn_content,
+                    assistant_content=response_text,
+                    reasoning_text=turn_reasoning or None,
+                    latency_ms=turn_latency_ms,
+                    prompt_tokens=turn_usage.get("prompt_tokens", turn_usage.get("input_tokens")),
+                    completion_tokens=turn_usage.get("completion_tokens", turn_usage.get("output_tokens")),
+                    reasoning_chars=len(turn_reasoning or ""),
+                    batch=batched is not None,
+                    success=True,
+                    metrics=turn_entry["metrics"],
+                ))
 
             except Exception as e:
                 error_msg = f"Turn {turn_idx}: {str(e)}"
@@ -483,6 +634,19 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
                     "error": str(e),
                     "error_type": mt_error_type,
                 })
+                turn_rows.append(Turn(
+                    evaluation_id=eval_id,
+                    prompt_id=str(entry.get("id")),
+                    model=model_name,
+                    turn=turn_idx,
+                    role=turn_role,
+                    user_content=turn_content,
+                    assistant_content=None,
+                    latency_ms=(time.time() - turn_start) * 1000,
+                    batch=False,
+                    success=False,
+                    error_message=str(e),
+                ))
                 log_error(output_dir, f"Error on '{entry.get('id')}' turn {turn_idx}: {e}")
                 break
 
@@ -529,6 +693,10 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
             "plugin_scores": {},
             "per_turn_metrics": per_turn_metrics,
         }
+        batch_turn_count = sum(1 for tr in turn_responses if tr.get("batch"))
+        if batch_turn_count:
+            result_data["batch"] = True
+            result_data["batch_turns"] = batch_turn_count
 
         await emit_event("end_prompt", {
             "id": entry.get("id"),
@@ -538,47 +706,77 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
             "error": str(error_msg) if error_msg else None
         })
 
-        async for session in get_db_session(engine):
-            db_result = Result(
-                evaluation_id=eval_id,
-                prompt_id=str(entry.get("id")),
-                prompt_text=prompt_serialized,
-                response_text=combined_response if success else "",
-                model=model_name,
-                adapter=adapter_name,
-                latency_ms=duration * 1000,
-                success=success,
-                error_message=error_msg
-            )
-            session.add(db_result)
-            await session.commit()
+        await _put_result(entry, Result(
+            evaluation_id=eval_id,
+            prompt_id=str(entry.get("id")),
+            prompt_text=prompt_serialized,
+            response_text=combined_response if success else "",
+            model=model_name,
+            adapter=adapter_name,
+            latency_ms=duration * 1000,
+            success=success,
+            error_message=error_msg,
+            turns=turn_rows,
+        ), seq_error_type)
 
         run_log.record(
             entry_id=entry.get("id"), model=model_name, provider=adapter_name,
             latency=duration, error=error_msg, error_type=seq_error_type,
-            multi_turn=True, turns=len(turn_responses),
+            multi_turn=True, turns=len(turn_responses), batch=bool(batch_turn_count),
         )
         return result_data
 
+    async def _run_batch_lane(batch_entries):
+        """Submit and poll the batch API. Never raises: any failure yields {}
+        so the waiting entries fall back to real-time."""
+        try:
+            with lane_span("batch", entries=len(batch_entries)):
+                results_map = await run_batch(batch_entries, model_name, config)
+        except Exception as e:
+            print(f"  batch submission failed: {e}")
+            print(f"  falling back to real-time for {len(batch_entries)} batch entries")
+            return {}
+        if not results_map:
+            print(f"  batch returned empty (provider may not support batch). using real-time.")
+        return results_map
+
+    async def _run_multi_turn_batch_lane(multi_turn_entries):
+        """Turn-synchronous batch lane. Never raises: any failure yields {}
+        so the waiting sequences run entirely in real-time."""
+        try:
+            with lane_span("batch.multi_turn", entries=len(multi_turn_entries)):
+                return await run_multi_turn_batch(multi_turn_entries, model_name, config)
+        except Exception as e:
+            print(f"  multi-turn batch failed: {e}")
+            print(f"  falling back to real-time for {len(multi_turn_entries)} sequences")
+            return {}
+
     # Batch routing: batch is the default path for single-turn entries.
     # Real-time is the exception (multi-turn, R1, unsupported providers, --no-batch).
-    batch_results_map = {}  # entry_id -> {"content": str, "usage": dict}
+    # The batch lanes run as background tasks so real-time entries start
+    # immediately; batch entries join the pipeline once their results land.
+    # Multi-turn sequences only batch when batch_multi_turn is opted into.
+    multi_turn_batch = bool(config.get("batch_multi_turn"))
+    batch_task = None
+    batch_entry_ids = set()
+    multi_turn_batch_task = None
+    multi_turn_batch_ids = set()
     if batch_mode and adapter_name == "litellm":
-        realtime_entries = [e for e in prompts if should_use_realtime(e, model_name)]
-        batch_entries = [e for e in prompts if not should_use_realtime(e, model_name)]
-
+        realtime_entries = [e for e in prompts if should_use_realtime(e, model_name, multi_turn_batch)]
+        batchable = [e for e in prompts if not should_use_realtime(e, model_name, multi_turn_batch)]
+        batch_entries = [e for e in batchable if not isinstance(e.get("prompt") or e.get("input"), list)]
+        multi_turn_batch_entries = [e for e in batchable if isinstance(e.get("prompt") or e.get("input"), list)]
+
+        if multi_turn_batch_entries:
+            print(f"batch: {len(multi_turn_batch_entries)} multi-turn sequences via turn-synchronous batch (background)")
+            multi_turn_batch_ids = {e.get("id") for e in multi_turn_batch_entries}
+            multi_turn_batch_task = asyncio.create_task(_run_multi_turn_batch_lane(multi_turn_batch_entries))
         if batch_entries:
-            print(f"batch: {len(batch_entries)} entries via batch API")
-            if realtime_entries:
-                print(f"real-time: {len(realtime_entries)} entries (multi-turn/R1/unsupported)")
-            try:
-                batch_results_map = await run_batch(batch_entries, model_name, config)
-                if not batch_results_map:
-                    print(f"  batch returned empty (provider may not support batch). using real-time.")
-            except Exception as e:
-                print(f"  batch submission failed: {e}")
-                print(f"  falling back to real-time for all entries")
-                batch_results_map = {}
+            print(f"batch: {len(batch_entries)} entries via batch API (background)")
+            batch_entry_ids = {e.get("id") for e in batch_entries}
+            batch_task = asyncio.create_task(_run_batch_lane(batch_entries))
+        if batchable and realtime_entries:
+            print(f"real-time: {len(realtime_entries)} entries (multi-turn/R1/unsupported)")
         elif realtime_entries:
             print(f"real-time: all {len(realtime_entries)} entries require real-time (multi-turn/R1)")
     elif batch_mode:
@@ -596,9 +794,21 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         pbar.update(1)
         return result
 
+    await emit_event("run_started", {"total": len(prompts), "model": model_name})
     tasks = [process_with_progress(p) for p in prompts]
-    processed_results = await asyncio.gather(*tasks)
-    pbar.close()
+    try:
+        processed_results = await asyncio.gather(*tasks)
+    except BaseException:
+        # cancelled or failed: keep the rows (and the summary of them) that
+        # finished before it
+        await db_writer.put_many(summary.rows(eval_id))
+        await db_writer.close()
+        raise
+    finally:
+        pbar.close()
+        for lane in (batch_task, multi_turn_batch_task):
+            if lane is not None and not lane.done():
+                lane.cancel()
     
     # Filter valid results
     results = [r for r in processed_results if r]
@@ -627,15 +837,20 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         with open(metrics_path, "w", encoding="utf-8") as mb:
             json.dump(metrics_data, mb, indent=2)
         
-        # Save metrics to DB
-        async for session in get_db_session(engine):
-            # Flatten metrics into key-value pairs
-            # Assuming simple structure for now
-            for k, v in metrics_data.get("errors_by_type", {}).items():
-                 session.add(Metric(evaluation_id=eval_id, name=f"error_count_{k}", value=float(v)))
-            session.add(Metric(evaluation_id=eval_id, name="total_requests", value=float(metrics_data.get("total_requests", 0))))
-            session.add(Metric(evaluation_id=eval_id, name="successful_requests", value=float(metrics_data.get("successful_requests", 0))))
-            await session.commit()
+        # Save metrics to DB, under the names MetricsCollector populates
+        for name in ("total_prompts", "successful_responses", "errors", "average_response_time"):
+            await db_writer.put(Metric(evaluation_id=eval_id, name=name, value=float(metrics_data.get(name, 0))))
+        for name in ("p50", "p90", "p99"):
+            if name in metrics_data["latency_s"]:
+                await db_writer.put(Metric(evaluation_id=eval_id, name=f"latency_{name}_s",
+                                           value=float(metrics_data["latency_s"][name])))
+        for k, v in metrics_data["errors_by_type"].items():
+            await db_writer.put(Metric(evaluation_id=eval_id, name=f"error_count_{k}", value=float(v)))
+
+    await db_writer.put_many(summary.rows(eval_id))
+    # Everything queued must be on disk before the run is marked completed
+    with span("db.drain"):
+        await db_writer.close()
 
     # Update DB status
     async for session in get_db_session(engine):
@@ -644,8 +859,6 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
             eval_record.status = "completed"
             await session.commit()
 
-    record_evaluation_end(time.time() - eval_start_time)
-    await engine.dispose()
     run_log.close()
 
     # Terminal summary
@@ -659,6 +872,7 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
     multi_turn_count = sum(1 for r in results if r.get("multi_turn"))
     total_turns = sum(r.get("turns_total", 0) for r in results if r.get("multi_turn"))
     avg_latency = metrics_collector.metrics.get("average_response_time", 0)
+    entry_types = metrics_collector.get_metrics()["breakdowns"].get("entry_type", {})
     elapsed = time.time() - eval_start_time
 
     print(f"\n{'='*60}")
@@ -681,7 +895,24 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
         print(f"  errors:   0")
     if total_retries:
         print(f"  retries:  {total_retries} total")
-    print(f"  avg lat:  {avg_latency:.2f}s")
+    if entry_types:
+        # single prompts, whole sequences and single turns each get their own
+        # percentiles; one average over all of them says little
+        label = "latency:"
+        for entry_type, name in (("single", "single"), ("multi_turn", "sequence"), ("turn", "per turn")):
+            lat = entry_types.get(entry_type, {}).get("latency_s", {})
+            if lat.get("count"):
+                print(f"  {label:<9} p50 {lat['p50']:.2f}s  p90 {lat['p90']:.2f}s  p99 {lat['p99']:.2f}s"
+                      f"  ({name}, n={lat['count']})")
+                label = ""
+        label = "tok/s:"
+        for entry_type, name in (("single", "single"), ("turn", "per turn")):
+            rate = entry_types.get(entry_type, {}).get("tokens_per_s")
+            if rate:
+                print(f"  {label:<9} {rate:.1f} ({name})")
+                label = ""
+    else:
+        print(f"  avg lat:  {avg_latency:.2f}s")
     print(f"  elapsed:  {elapsed:.1f}s")
     print(f"  output:   {output_dir}")
 
@@ -703,12 +934,140 @@ async def run_evaluation_suite(config, adapter_name, batch_mode=False, request_d
 
     print(f"{'='*60}\n")
 
+    try:
+        await record_output(output_dir, model=model_name, tier=tier)
+    except Exception as e:
+        print(f"  output catalog update failed: {e}")
+
     return results, output_dir, metrics_collector
 
+async def _run_fanout_command(args, parser):
+    """Handle `promptpressure fanout ADAPTER:MODEL ... --prompt TEXT`."""
+    from promptpressure.fanout import fan_out, parse_target
+
+    try:
+        targets = [parse_target(spec) for spec in args.targets]
+    except ValueError as e:
+        parser.error(str(e))
+    config = {}
+    if args.temperature is not None:
+        config["temperature"] = args.temperature
+
+    out = await fan_out(args.prompt, targets, config,
+                        policy=args.policy, k=args.k, timeout=args.timeout)
+    if args.json:
+        print(json.dumps(out, indent=2, default=str))
+        return
+
+    print(f"fan-out: {len(targets)} models, policy {out['policy']}, {out['elapsed']:.2f}s")
+    for label, result in out["results"].items():
+        usage = result["usage"] or {}
+        tokens = usage.get("total_tokens") or (usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0))
+        latency = f"{result['latency']:.2f}s" if result["latency"] is not None else "-"
+        detail = (result["content"] or "").replace("\n", " ")[:80] if result["status"] == "ok" else (result["error"] or "")
+        print(f"  {label:<40} {result['status']:<9} {latency:>8} {tokens or '-':>7}  {detail}")
+
+
+def _run_export_command(args, parser):
+    """Handle `promptpressure export SOURCE ... --out DIR --format parquet`."""
+    from promptpressure.export import PYARROW_AVAILABLE, export_runs
+
+    if not PYARROW_AVAILABLE:
+        parser.error("export needs pyarrow: pip install promptpressure-evals[parquet]")
+    try:
+        summary = export_runs(args.sources, args.out, fmt=args.format, force=args.force)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    print(f"export: {len(summary['exported'])} runs written, {len(summary['unchanged'])} unchanged"
+          f" -> {args.out} ({args.format})")
+    for table, n in summary["rows"].items():
+        if n:
+            print(f"  {table:<10} {n:>8} rows")
+    for path in summary["skipped"]:
+        print(f"  skipped (no results): {path}")
+
+
+async def _run_blobs_command(args):
+    """Handle `promptpressure blobs migrate|stats`."""
+    from sqlalchemy import func, select, text
+
+    from promptpressure import blobs
+    from promptpressure.database import Blob, db_session, get_sessionmaker
+
+    engine = await init_db()
+    if args.blobs_command == "migrate":
+        stats = await blobs.migrate(get_sessionmaker(engine), inline_max=args.inline_max)
+        async with db_session() as session:
+            pruned = await blobs.prune(session)
+            await session.commit()
+        print(f"blobs: moved {stats['rows']} rows, {stats['text_bytes']} text bytes "
+              f"-> {stats['blobs']} new blobs, {stats['blob_bytes']} bytes stored"
+              + (f", pruned {pruned} orphans" if pruned else ""))
+        if args.vacuum and engine.dialect.name == "sqlite":
+            async with engine.connect() as conn:
+                await conn.execute(text("VACUUM"))
+            print("blobs: vacuumed")
+        return
+
+    async with db_session() as session:
+        rows = (await session.execute(
+            select(Blob.codec, func.count(), func.sum(Blob.size), func.sum(func.length(Blob.data)))
+            .group_by(Blob.codec).order_by(Blob.codec)
+        )).all()
+    if not rows:
+        print("blobs: none stored")
+    for codec, count, size, stored in rows:
+        print(f"  {codec:<5} {count:>8} blobs  {size or 0:>12} bytes -> {stored or 0:>12} stored")
+
+
+async def _run_search_command(args, parser):
+    """Handle `promptpressure search QUERY [--model M] [--eval ID] [--reindex]`."""
+    from sqlalchemy.exc import OperationalError
+
+    from promptpressure import search
+    from promptpressure.database import db_session, get_sessionmaker
+
+    engine = await init_db()
+    if engine.dialect.name != "sqlite":
+        parser.error("search needs the sqlite backend")
+    if args.reindex:
+        count = await search.reindex(get_sessionmaker(engine))
+        print(f"search: indexed {count} documents")
+        if not args.query:
+            return
+    if not args.query:
+        parser.error("search needs a QUERY (or --reindex)")
+
+    try:
+        async with db_session() as session:
+            hits, has_more = await search.search(
+                session, args.query, model=args.model, evaluation_id=args.eval, limit=args.limit,
+                mark=("[", "]"), escape=str,
+            )
+    except OperationalError as e:
+        parser.error(f"bad search query: {e.orig}")
+
+    if args.json:
+        print(json.dumps({"hits": hits, "has_more": has_more}, indent=2))
+        return
+    if not hits:
+        print("search: no matches")
+        return
+    for hit in hits:
+        where = f"turn {hit['turn']}" if hit["turn"] is not None else "single"
+        model, prompt_id, field = hit["model"] or "-", hit["prompt_id"] or "-", hit["field"] or "-"
+        print(f"  {hit['evaluation_id']}  {model:<30} {prompt_id:<24} {where:<8} {field}")
+        if hit["snippet"]:
+            print(f"      {hit['snippet']}")
+    if has_more:
+        print(f"  ... more matches; raise --limit (now {args.limit})")
+
+
 async def main_async():
     parser = argparse.ArgumentParser(description="PromptPressure v3.0 - Behavioral LLM Eval")
     parser.add_argument("--multi-config", nargs='+', help="YAML config file(s)")
-    parser.add_argument("--post-analyze", choices=["groq", "openrouter"], help="Optional post-analysis adapter")
+    parser.add_argument("--post-analyze", choices=["groq", "openrouter", "litellm"], help="Optional post-analysis adapter")
     parser.add_argument("--schema", action="store_true", help="Dump JSON Schema for configuration and exit")
     parser.add_argument("--ci", action="store_true", help="CI mode: output machine-readable JSON summary, exit 1 on any failure")
     parser.add_argument("--tier", choices=["smoke", "quick", "full", "deep"],
@@ -718,12 +1077,21 @@ async def main_async():
     parser.add_argument("--no-batch", action="store_true",
                         help="Force real-time mode for all entries. Disables batch API routing "
                              "(default for smoke/quick tiers, litellm adapter auto-batches on full/deep).")
+    parser.add_argument("--batch-multi-turn", action="store_true",
+                        help="Opt in to turn-synchronous batching of multi-turn sequences "
+                             "(one batch per turn; slower, but gets the batch discount)")
+    parser.add_argument("--batch-grading", action="store_true",
+                        help="Send post-analysis grading calls through the grading model's batch API "
+                             "(--post-analyze litellm with an anthropic/xai scoring model; real-time fallback per item)")
     parser.add_argument("--request-delay", type=float, default=1.0,
                         help="Seconds between requests to avoid rate limits (default: 1.0)")
     parser.add_argument("--turn-delay", type=float, default=2.0,
                         help="Seconds between turns in multi-turn sequences (default: 2.0)")
     parser.add_argument("--max-retries", type=int, default=3,
                         help="Max retries on rate limit (429/503) errors with exponential backoff (default: 3)")
+    parser.add_argument("--trace", nargs="?", const="chrome", choices=["chrome", "otlp", "both"],
+                        help="Write a span trace of each run to its output dir: chrome (trace.json, open in "
+                             "Perfetto; the default), otlp (trace.otlp.json) or both")
 
     # Plugin CLI commands
     subparsers = parser.add_subparsers(dest="command", help="Sub-commands")
@@ -739,6 +1107,46 @@ async def main_async():
     install_parser = plugins_subparsers.add_parser("install", help="Install a plugin")
     install_parser.add_argument("name", help="Name of the plugin to install")
 
+    # 'fanout'
+    fanout_parser = subparsers.add_parser("fanout", help="Send one prompt to several models at once")
+    fanout_parser.add_argument("targets", nargs="+", metavar="ADAPTER:MODEL",
+                               help="Models to query, e.g. litellm:claude-sonnet-4-6 openrouter:openai/gpt-4o")
+    fanout_parser.add_argument("--prompt", required=True, help="Prompt text to send to every model")
+    fanout_parser.add_argument("--policy", choices=["all", "first_k"], default="all",
+                               help="Wait for all models, or return after the first k successes (default: all)")
+    fanout_parser.add_argument("--k", type=int, default=1, help="Successes to wait for with --policy first_k")
+    fanout_parser.add_argument("--timeout", type=float, default=None, help="Overall deadline in seconds")
+    fanout_parser.add_argument("--temperature", type=float, default=None)
+    fanout_parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+
+    # 'blobs migrate' / 'blobs stats'
+    blobs_parser = subparsers.add_parser("blobs", help="Manage compressed result-text storage")
+    blobs_subparsers = blobs_parser.add_subparsers(dest="blobs_command", required=True)
+    migrate_parser = blobs_subparsers.add_parser(
+        "migrate", help="Move long texts already inlined in results/turns into the blob table")
+    migrate_parser.add_argument("--inline-max", type=int, default=INLINE_MAX,
+                                help=f"Texts shorter than this many characters stay inline (default: {INLINE_MAX})")
+    migrate_parser.add_argument("--vacuum", action="store_true", help="VACUUM sqlite afterwards to reclaim space")
+    blobs_subparsers.add_parser("stats", help="Blob count and compressed size per codec")
+
+    # 'export'
+    export_parser = subparsers.add_parser("export", help="Export run outputs to partitioned Parquet/Arrow tables")
+    export_parser.add_argument("sources", nargs="+",
+                               help="Run output dirs, results JSON files, or directories holding them")
+    export_parser.add_argument("--out", default="exports", help="Export directory (default: exports)")
+    export_parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    export_parser.add_argument("--force", action="store_true", help="Re-export runs that have not changed")
+
+    # 'search'
+    search_parser = subparsers.add_parser("search", help="Full-text search over stored prompts, responses and reasoning")
+    search_parser.add_argument("query", nargs="?", help='FTS5 query, e.g. \'"as an ai" OR refus*\'')
+    search_parser.add_argument("--model", default=None, help="Only this model")
+    search_parser.add_argument("--eval", default=None, help="Only this evaluation id")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--reindex", action="store_true",
+                               help="Rebuild the index from stored results first (databases from older versions)")
+    search_parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+
     args = parser.parse_args()
 
     # Resolve tier from flags
@@ -777,6 +1185,28 @@ async def main_async():
                 print(f"Failed to install '{args.name}'. Check logs for details.")
             return
 
+    if args.command == "fanout":
+        await _run_fanout_command(args, parser)
+        return
+
+    if args.command == "blobs":
+        try:
+            await _run_blobs_command(args)
+        finally:
+            await dispose_db()
+        return
+
+    if args.command == "export":
+        _run_export_command(args, parser)
+        return
+
+    if args.command == "search":
+        try:
+            await _run_search_command(args, parser)
+        finally:
+            await dispose_db()
+        return
+
     if not args.multi_config:
         parser.error("--multi-config is required unless --schema or a subcommand is used")
 
@@ -800,6 +1230,12 @@ async def main_async():
         config_dict = config.model_dump()
         if tier_override:
             config_dict["tier"] = tier_override
+        if args.batch_multi_turn:
+            config_dict["batch_multi_turn"] = True
+        if args.batch_grading:
+            config_dict["batch_grading"] = True
+        if args.trace:
+            config_dict["trace"] = args.trace
         last_config = config_dict
 
         # batch is the default for litellm + full/deep tier.
@@ -823,12 +1259,17 @@ async def main_async():
         if metrics_collector:
             all_metrics.append(metrics_collector.get_metrics())
 
+    # every config in this process shared one engine; release it
+    await dispose_db()
+
     # Post Analysis
     if args.post_analyze:
         if args.post_analyze == "groq":
             await post_analyze_groq(all_results, last_config)
         elif args.post_analyze == "openrouter":
             await post_analyze_openrouter(all_results, last_config)
+        elif args.post_analyze == "litellm":
+            await post_analyze_litellm(all_results, last_config)
     elif len(args.multi_config) > 1:
         await post_analyze_openrouter(all_results, last_config)
 
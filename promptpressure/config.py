@@ -38,10 +38,14 @@ class Settings(BaseSettings):
 
     # Performance settings
     max_workers: int = Field(1, ge=1, le=10, description="Number of concurrent workers for prompt evaluation")
+    batch_multi_turn: bool = Field(False, description="Batch multi-turn sequences turn-synchronously (one batch per turn) when batch mode is on")
+    batch_grading: bool = Field(False, description="Send post-analysis grading calls through the grading model's batch API (--post-analyze litellm with an anthropic or xai scoring_model_name), with real-time fallback per item")
+    scoring_model_name: Optional[str] = Field(None, description="Grading model for --post-analyze openrouter (default openai/gpt-oss-20b:free) or litellm (default claude-sonnet-4-6)")
 
     # Metrics settings
     collect_metrics: bool = Field(True, description="Whether to collect detailed metrics during evaluation")
     custom_metrics: List[str] = Field(default_factory=list, description="List of custom metrics to collect")
+    trace: Optional[Literal["chrome", "otlp", "both"]] = Field(None, description="Write a span trace of the run to its output dir: chrome (trace.json, for Perfetto), otlp (trace.otlp.json) or both")
 
     # Reporting settings
     report_formats: List[str] = Field(default_factory=lambda: ['html', 'markdown'], description="Formats to generate reports in")
@@ -1,10 +1,12 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, DateTime, Float, ForeignKey, Integer, Boolean, JSON
+from sqlalchemy import String, Text, DateTime, Float, ForeignKey, Integer, Boolean, JSON, Index, LargeBinary, event, inspect
 
 # Use SQLite by default, but allow override for PostgreSQL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///data/promptpressure.db")
@@ -21,6 +23,10 @@ class Base(DeclarativeBase):
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (
+        # run list: newest first, keyset-paginated on (timestamp, id)
+        Index("ix_evaluations_timestamp_id", "timestamp", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), nullable=True)
@@ -31,6 +37,8 @@ class Evaluation(Base):
     
     results: Mapped[list["Result"]] = relationship(back_populates="evaluation", cascade="all, delete-orphan")
     metrics: Mapped[list["Metric"]] = relationship(back_populates="evaluation", cascade="all, delete-orphan")
+    summaries: Mapped[list["EvaluationSummary"]] = relationship(back_populates="evaluation",
+                                                                cascade="all, delete-orphan")
 
 class AdapterConfig(Base):
     __tablename__ = "adapter_configs"
@@ -56,10 +64,17 @@ class Project(Base):
 
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (
+        # per-run result pages are keyset-paginated on (evaluation_id, id)
+        Index("ix_results_evaluation_id_id", "evaluation_id", "id"),
+        Index("ix_results_evaluation_id_prompt_id", "evaluation_id", "prompt_id"),
+        Index("ix_results_model", "model"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     evaluation_id: Mapped[int] = mapped_column(ForeignKey("evaluations.id"))
     prompt_id: Mapped[str] = mapped_column(String, nullable=True) # ID from the dataset
+    category: Mapped[str] = mapped_column(String, nullable=True)  # dataset category
     prompt_text: Mapped[str] = mapped_column(Text)
     response_text: Mapped[str] = mapped_column(Text, nullable=True, default="")
     model: Mapped[str] = mapped_column(String)
@@ -67,9 +82,91 @@ class Result(Base):
     latency_ms: Mapped[float] = mapped_column(Float)
     success: Mapped[bool] = mapped_column(Boolean, default=True)
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
-    
+    # set when the text lives in `blobs`; the text column is then ""
+    prompt_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+    response_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+    reasoning_text: Mapped[str] = mapped_column(Text, nullable=True)
+    reasoning_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+
     evaluation: Mapped["Evaluation"] = relationship(back_populates="results")
     comments: Mapped[list["Comment"]] = relationship(back_populates="result", cascade="all, delete-orphan")
+    turns: Mapped[list["Turn"]] = relationship(back_populates="result", cascade="all, delete-orphan",
+                                               order_by="Turn.turn")
+
+
+class Turn(Base):
+    """One row per turn of a multi-turn sequence.
+
+    Normalizes what Result stores as a JSON turn list + concatenated
+    "[Turn N]" transcript, so turn-level questions (latency at turn 12
+    across models, where drift began) are plain indexed queries.
+    """
+    __tablename__ = "turns"
+    __table_args__ = (
+        Index("ix_turns_result_id_turn", "result_id", "turn"),
+        Index("ix_turns_evaluation_id_turn", "evaluation_id", "turn"),
+        # /evaluations/{id}/turns pages in (sequence, turn) order
+        Index("ix_turns_evaluation_id_result_id_turn", "evaluation_id", "result_id", "turn", "id"),
+        Index("ix_turns_model_turn", "model", "turn"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    result_id: Mapped[int] = mapped_column(ForeignKey("results.id"))
+    evaluation_id: Mapped[str] = mapped_column(ForeignKey("evaluations.id"))
+    prompt_id: Mapped[str] = mapped_column(String, nullable=True)
+    model: Mapped[str] = mapped_column(String)
+    turn: Mapped[int] = mapped_column(Integer)
+    role: Mapped[str] = mapped_column(String, default="user")
+    user_content: Mapped[str] = mapped_column(Text, default="")
+    assistant_content: Mapped[str] = mapped_column(Text, nullable=True)
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=True)  # None for batch-answered turns
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
+    reasoning_chars: Mapped[int] = mapped_column(Integer, default=0)
+    batch: Mapped[bool] = mapped_column(Boolean, default=False)
+    success: Mapped[bool] = mapped_column(Boolean, default=True)
+    error_message: Mapped[str] = mapped_column(Text, nullable=True)
+    metrics: Mapped[dict] = mapped_column(JSON, nullable=True)
+    user_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+    assistant_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+    reasoning_text: Mapped[str] = mapped_column(Text, nullable=True)
+    reasoning_blob: Mapped[str] = mapped_column(ForeignKey("blobs.hash"), nullable=True)
+
+    result: Mapped["Result"] = relationship(back_populates="turns")
+
+
+class SearchDoc(Base):
+    """One full-text search document: a single-turn result, or one turn of a
+    multi-turn sequence. Its id is the rowid of the matching row in the
+    ``search_fts`` FTS5 table (sqlite only; see promptpressure/search.py).
+    """
+    __tablename__ = "search_docs"
+    __table_args__ = (
+        Index("ix_search_docs_evaluation_id", "evaluation_id"),
+        Index("ix_search_docs_model", "model"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    evaluation_id: Mapped[str] = mapped_column(ForeignKey("evaluations.id"))
+    result_id: Mapped[int] = mapped_column(ForeignKey("results.id"))
+    turn_id: Mapped[int] = mapped_column(ForeignKey("turns.id"), nullable=True)
+    turn: Mapped[int] = mapped_column(Integer, nullable=True)
+    prompt_id: Mapped[str] = mapped_column(String, nullable=True)
+    model: Mapped[str] = mapped_column(String)
+
+
+class Blob(Base):
+    """Content-addressed text storage (see promptpressure/blobs.py).
+
+    Keyed by the sha256 of the uncompressed UTF-8 text, so a user turn
+    repeated across every run and model is stored once.
+    """
+    __tablename__ = "blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(8))  # raw, zlib, zstd
+    size: Mapped[int] = mapped_column(Integer)  # uncompressed bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary)
 
 class Team(Base):
     __tablename__ = "teams"
@@ -106,6 +203,9 @@ class Comment(Base):
 
 class Metric(Base):
     __tablename__ = "metrics"
+    __table_args__ = (
+        Index("ix_metrics_evaluation_id", "evaluation_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     evaluation_id: Mapped[int] = mapped_column(ForeignKey("evaluations.id"))
@@ -115,6 +215,106 @@ class Metric(Base):
 
     evaluation: Mapped["Evaluation"] = relationship(back_populates="metrics")
 
+class EvaluationSummary(Base):
+    """Per-run rollup, one row per (model, category), written once when the
+    run finishes (see promptpressure/summary.py).
+
+    ``model`` / ``category`` of "*" mark the per-model and whole-run
+    rollups, so run lists read one row per run instead of scanning results.
+    Latency percentiles are computed on each row's own results.
+    """
+    __tablename__ = "evaluation_summaries"
+    __table_args__ = (
+        Index("ix_evaluation_summaries_key", "evaluation_id", "model", "category", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    evaluation_id: Mapped[str] = mapped_column(ForeignKey("evaluations.id"))
+    model: Mapped[str] = mapped_column(String)
+    category: Mapped[str] = mapped_column(String)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    successes: Mapped[int] = mapped_column(Integer, default=0)
+    refusals: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    infra_errors: Mapped[int] = mapped_column(Integer, default=0)
+    model_errors: Mapped[int] = mapped_column(Integer, default=0)
+    latency_mean_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    latency_p50_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    latency_p95_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    latency_p99_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+
+    evaluation: Mapped["Evaluation"] = relationship(back_populates="summaries")
+
+
+class AppJob(Base):
+    """A sidecar job (native evaluation, drift run, drift calibration); see
+    promptpressure/app_jobs.py. ``events`` holds only a capped tail of the
+    job's SSE events and ``snapshots`` periodic progress snapshots, so a
+    row stays small however long the job ran."""
+    __tablename__ = "app_jobs"
+    __table_args__ = (
+        # job list: newest first, keyset-paginated on (created_at, id)
+        Index("ix_app_jobs_created_at_id", "created_at", "id"),
+        Index("ix_app_jobs_status", "status"),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    type: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(String)
+    phase: Mapped[str] = mapped_column(String)
+    # ISO-8601 UTC strings, as the API returns them; they sort chronologically
+    created_at: Mapped[str] = mapped_column(String)
+    updated_at: Mapped[str] = mapped_column(String)
+    progress: Mapped[dict] = mapped_column(JSON, default=dict)
+    summary: Mapped[dict] = mapped_column(JSON, default=dict)
+    outputs: Mapped[list] = mapped_column(JSON, default=list)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    config: Mapped[dict] = mapped_column(JSON, default=dict)
+    event_count: Mapped[int] = mapped_column(Integer, default=0)
+    events: Mapped[list] = mapped_column(JSON, default=list)
+    snapshots: Mapped[list] = mapped_column(JSON, default=list)
+    # bumped on every change; the /app/jobs ETags are built from it
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    # the AppJobStore (API process) running the job and when it last said so
+    # (unix time); unfinished jobs whose heartbeat goes stale are failed
+    owner: Mapped[str] = mapped_column(String, nullable=True)
+    heartbeat_at: Mapped[float] = mapped_column(Float, nullable=True)
+
+
+class OutputCatalogEntry(Base):
+    """One run directory (or loose result file) under an outputs root, as
+    last described; see promptpressure/output_catalog.py. ``modified_at`` is
+    the mtime the row was built from, so a scan only re-reads what changed."""
+    __tablename__ = "output_catalog"
+    __table_args__ = (
+        # /app/outputs: per sort order, keyset-paginated on (column, path)
+        Index("ix_output_catalog_modified_at_path", "modified_at", "path"),
+        Index("ix_output_catalog_name_path", "name", "path"),
+        Index("ix_output_catalog_size_bytes_path", "size_bytes", "path"),
+        Index("ix_output_catalog_root", "root"),
+    )
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)  # resolved
+    root: Mapped[str] = mapped_column(String)
+    name: Mapped[str] = mapped_column(String)
+    kind: Mapped[str] = mapped_column(String)
+    modified_at: Mapped[float] = mapped_column(Float)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    file_count: Mapped[int] = mapped_column(Integer, default=0)
+    files: Mapped[list] = mapped_column(JSON, default=list)
+    model: Mapped[str] = mapped_column(String, nullable=True)
+    tier: Mapped[str] = mapped_column(String, nullable=True)
+    prompts: Mapped[int] = mapped_column(Integer, nullable=True)
+    succeeded: Mapped[int] = mapped_column(Integer, nullable=True)
+    errors: Mapped[int] = mapped_column(Integer, nullable=True)
+    report_html: Mapped[str] = mapped_column(String, nullable=True)
+    report_markdown: Mapped[str] = mapped_column(String, nullable=True)
+    metrics_json: Mapped[str] = mapped_column(String, nullable=True)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -127,13 +327,153 @@ class AuditLog(Base):
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
-async def init_db():
-    engine = create_async_engine(DATABASE_URL, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers (the API) run while an eval run writes, and
+    synchronous=NORMAL drops the per-commit fsync WAL doesn't need.
+    busy_timeout makes concurrent runs wait for the write lock instead of
+    failing with 'database is locked'."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def _pool_kwargs(url):
+    """Pool settings per backend. SQLite serialises writes anyway, so a small
+    pool covers the API plus one eval run; server databases get a larger pool
+    with pre-ping and recycling so idle connections dropped by the server
+    don't surface as request errors."""
+    if url.startswith("sqlite"):
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite+aiosqlite:"):
+            return {}
+        return {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30}
+    return {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True, "pool_recycle": 1800}
+
+
+def create_engine(url=None):
+    """Create the async engine, with SQLite tuned for concurrent writers."""
+    url = url or DATABASE_URL
+    engine = create_async_engine(url, echo=False, **_pool_kwargs(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
     return engine
 
-async def get_db_session(engine) -> AsyncGenerator[AsyncSession, None]:
-    async_session = async_sessionmaker(engine, expire_on_commit=False)
-    async with async_session() as session:
+
+def _ensure_columns(sync_conn):
+    """create_all doesn't alter existing tables. Nullable columns added to a
+    model after its table was created are added here with ALTER TABLE."""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}')
+
+
+def _ensure_indexes(sync_conn):
+    """create_all only builds indexes together with a new table. Databases
+    created before an index was declared get it here instead."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _ensure_search(sync_conn):
+    """Create the FTS5 index next to search_docs. Contentless: the text lives
+    in results/turns/blobs already, so the index stores only its postings."""
+    if sync_conn.dialect.name != "sqlite":
+        return
+    sync_conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts "
+        "USING fts5(prompt, response, reasoning, content='', tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+# create_all builds the FTS table together with search_docs
+event.listen(SearchDoc.__table__, "after_create", lambda target, conn, **kw: _ensure_search(conn))
+
+
+class _EngineState:
+    def __init__(self, loop, engine):
+        self.loop = loop
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        self.schema_lock = asyncio.Lock()
+        self.schema_ready = False
+
+
+# One engine + sessionmaker per process, bound to the event loop that created
+# it (async drivers can't share connections across loops). The API creates it
+# in its lifespan; the CLI on first use and disposes it on exit.
+_state = None
+
+
+async def init_db():
+    """Return the shared engine, creating it and the schema on first use.
+
+    Cheap after the first call: no new engine, no create_all. Callers must not
+    dispose the returned engine; use dispose_db() at shutdown.
+    """
+    global _state
+    loop = asyncio.get_running_loop()
+    if _state is None or _state.loop is not loop:
+        stale = _state
+        _state = _EngineState(loop, create_engine())
+        if stale is not None:
+            # left over from a previous (usually closed) loop, e.g. an earlier
+            # asyncio.run() in the same process. best effort.
+            try:
+                await stale.engine.dispose()
+            except Exception:
+                pass
+    state = _state
+    if not state.schema_ready:
+        async with state.schema_lock:
+            if not state.schema_ready:
+                async with state.engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                    await conn.run_sync(_ensure_columns)
+                    await conn.run_sync(_ensure_indexes)
+                    await conn.run_sync(_ensure_search)
+                state.schema_ready = True
+    return state.engine
+
+
+async def dispose_db():
+    """Dispose the shared engine (API shutdown, end of a CLI process)."""
+    global _state
+    state, _state = _state, None
+    if state is not None:
+        await state.engine.dispose()
+
+
+def get_sessionmaker(engine=None):
+    """Sessionmaker for ``engine``; the shared one is built once and reused."""
+    if _state is not None and (engine is None or engine is _state.engine):
+        return _state.sessionmaker
+    if engine is None:
+        raise RuntimeError("database not initialised; await init_db() first")
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_db_session(engine=None) -> AsyncGenerator[AsyncSession, None]:
+    if engine is None:
+        engine = await init_db()
+    async with get_sessionmaker(engine)() as session:
+        yield session
+
+
+@asynccontextmanager
+async def db_session(engine=None):
+    """Session on the shared engine that is closed (and its connection
+    returned to the pool) on exit, even when the caller returns early."""
+    if engine is None:
+        engine = await init_db()
+    async with get_sessionmaker(engine)() as session:
         yield session
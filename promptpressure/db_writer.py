@@ -0,0 +1,196 @@
+"""
+Background DB writer for PromptPressure eval runs.
+
+Eval workers hand finished ORM rows (Result, Metric, ...) to a queue instead
+of opening a session and committing per prompt. One writer task drains the
+queue and inserts rows in bulk, one transaction per batch, so a 1000-prompt
+run costs a few dozen commits instead of a thousand.
+
+Flush policy: a batch is written when it reaches ``max_batch`` rows or when
+``flush_interval`` seconds have passed since its first row, whichever comes
+first. ``flush()`` forces everything queued so far to disk; ``close()``
+drains the queue and stops the task. Callers close the writer on cancel and
+on error too, so a cancelled run still keeps the rows it produced.
+
+A failing batch is retried row by row so one bad row does not drop its
+neighbours; rows that still fail are counted in ``failed_rows`` and logged.
+
+Long prompt/response/turn texts are moved to the content-addressed
+``blobs`` table on the way in (see promptpressure/blobs.py);
+``blob_threshold=None`` keeps them inline. Results and turns are added to
+the full-text search index in the same transaction (see
+promptpressure/search.py); ``search_index=False`` skips that.
+
+Queue depth, rows written/failed and lag (queueing a batch's oldest row to
+its commit) are exported as Prometheus metrics labelled with the run the
+writer was created in (see promptpressure/monitoring).
+"""
+
+import asyncio
+import logging
+import time
+
+from promptpressure import blobs, search
+from promptpressure.database import get_sessionmaker
+from promptpressure.monitoring import DB_WRITER_LAG, DB_WRITER_QUEUE, DB_WRITER_ROWS, run_labels
+from promptpressure.tracing import lane_span
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DBWriter:
+    """Queue-backed bulk writer. One instance per engine per run."""
+
+    def __init__(self, engine, max_batch=200, flush_interval=0.5, max_queue=10000,
+                 blob_threshold=blobs.INLINE_MAX, search_index=True):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.blob_threshold = blob_threshold
+        self.search_index = search_index
+        self._sessionmaker = get_sessionmaker(engine)
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self._closed = False
+        self.rows_written = 0
+        self.failed_rows = 0
+        self.transactions = 0
+        self._queued_gauge = run_labels(DB_WRITER_QUEUE)
+        self._lag = run_labels(DB_WRITER_LAG)
+        self._written = run_labels(DB_WRITER_ROWS, "written")
+        self._failed = run_labels(DB_WRITER_ROWS, "failed")
+
+    def start(self):
+        """Start the writer task on the running loop. Returns self."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def put(self, row):
+        """Queue one ORM row. Waits only when the queue is full (backpressure)."""
+        if self._closed:
+            raise RuntimeError("DBWriter is closed")
+        await self._queue.put((time.monotonic(), row))
+        self._queued_gauge.inc()
+
+    async def put_many(self, rows):
+        for row in rows:
+            await self.put(row)
+
+    async def flush(self):
+        """Wait until every row queued so far has been written."""
+        if self._task is None or self._closed:
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(done)
+        await done
+
+    async def close(self):
+        """Drain the queue, write what is left and stop the writer task.
+
+        Safe to call more than once, and from a task that is being cancelled:
+        the drain is shielded so the tail of the run still reaches the DB.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await asyncio.shield(self._task)
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _run(self):
+        # a single outstanding get() carried across timeouts, so an item
+        # can never be lost to a timeout racing the get.
+        getter = None
+        stopping = False
+        while not stopping:
+            batch = []
+            waiters = []
+            deadline = None
+            oldest = None
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(self._queue.get())
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                done, _ = await asyncio.wait({getter}, timeout=timeout)
+                if not done:
+                    break
+                item = getter.result()
+                getter = None
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, asyncio.Future):
+                    waiters.append(item)
+                else:
+                    queued_at, row = item
+                    if oldest is None:
+                        oldest = queued_at
+                    batch.append(row)
+                    self._queued_gauge.dec()
+                if stopping or waiters or len(batch) >= self.max_batch:
+                    break
+
+            if batch:
+                # the writer task outlives any one entry: its commits get a track of their own
+                with lane_span("db.write", rows=len(batch)):
+                    await self._write(batch)
+                self._lag.observe(time.monotonic() - oldest)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+        if getter is not None:
+            getter.cancel()
+
+    async def _write(self, rows):
+        # texts are collected for the search index before blobs replace them
+        docs = search.collect(rows) if self.search_index else []
+        blob_rows = []
+        if self.blob_threshold is not None:
+            blob_rows = blobs.externalize(rows, inline_max=self.blob_threshold)
+        try:
+            async with self._sessionmaker() as session:
+                await blobs.store(session, blob_rows)
+                session.add_all(rows)
+                if docs:
+                    await session.flush()
+                    await search.index(session, docs)
+                await session.commit()
+            self.rows_written += len(rows)
+            self.transactions += 1
+            self._written.inc(len(rows))
+            return
+        except Exception as e:
+            logger.warning("bulk write of %d rows failed (%s); retrying row by row", len(rows), e)
+
+        for row in rows:
+            try:
+                async with self._sessionmaker() as session:
+                    await blobs.store(session, blob_rows)
+                    session.add(row)
+                    row_docs = [d for d in docs if d[0] is row]
+                    if row_docs:
+                        await session.flush()
+                        await search.index(session, row_docs)
+                    await session.commit()
+                self.rows_written += 1
+                self.transactions += 1
+                self._written.inc()
+            except Exception as e:
+                self.failed_rows += 1
+                self._failed.inc()
+                logger.error("dropped %s row: %s", type(row).__name__, e)
@@ -6,6 +6,8 @@
     pp calibrate --suite drift-v0.1 --judge-provider deepseek --judge-model deepseek-chat --runs 3
         judge the gold reference transcripts N times, compute judge-vs-human
         agreement + test-retest stability, write reports/<suite>-method.md.
+        --batch submits all N judge passes as one provider batch when the
+        judge provider has a batch API (anthropic, xai; litellm routing to them).
 
 Both subcommands are also reachable as `ppdrift run ...` and dispatched from
 the `pp` launcher when its first argument is `run` or `calibrate`.
@@ -24,8 +26,9 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from promptpressure.adapters import load_adapter
+from promptpressure.batch import judge_batch_model
 from promptpressure.drift import pipeline, report, runner
-from promptpressure.drift.judge import judge_suite
+from promptpressure.drift.judge import judge_suite, judge_suite_runs
 from promptpressure.drift.schema import load_suite
 
 load_dotenv()
@@ -91,9 +94,18 @@ def _load_transcripts(suite, args) -> tuple[dict, str]:
     return transcripts, "gold reference transcripts"
 
 
-async def _judge_n_times(suite, transcripts, provider, model, temperature, runs, concurrency) -> list[dict]:
+async def _judge_n_times(suite, transcripts, provider, model, temperature, runs, concurrency, batch=False) -> list[dict]:
     adapter_fn = load_adapter(provider)
     cfg = _build_config(model, temperature, None, provider)
+    batch_model = judge_batch_model(provider, model) if batch else None
+    if batch and batch_model is None:
+        print(f"  --batch: {provider}/{model} has no batch API. judging in real-time.")
+    if batch_model:
+        print(f"  judge runs 1-{runs} ({provider}/{model}) as one batch ...")
+        return await judge_suite_runs(
+            suite.sequences, transcripts, adapter_fn, cfg,
+            runs=runs, concurrency=concurrency, batch_model=batch_model,
+        )
     out = []
     for i in range(runs):
         print(f"  judge run {i + 1}/{runs} ({provider}/{model}) ...")
@@ -114,7 +126,7 @@ async def cmd_calibrate(args) -> int:
 
     judge_runs = await _judge_n_times(
         suite, transcripts, args.judge_provider, args.judge_model,
-        args.temperature, args.runs, args.concurrency,
+        args.temperature, args.runs, args.concurrency, batch=args.batch,
     )
 
     judge_runs_b = None
@@ -122,7 +134,7 @@ async def cmd_calibrate(args) -> int:
         print(f"  second judge {args.judge2_provider}/{args.judge2_model} for judge-vs-judge ...")
         judge_runs_b = await _judge_n_times(
             suite, transcripts, args.judge2_provider, args.judge2_model,
-            args.temperature, 1, args.concurrency,
+            args.temperature, 1, args.concurrency, batch=args.batch,
         )
 
     result = pipeline.run_calibration(
@@ -178,6 +190,9 @@ def build_parser() -> argparse.ArgumentParser:
                      help="transcripts.json from `pp run` (default: judge the gold reference transcripts)")
     cal.add_argument("--temperature", type=float, default=0.0)
     cal.add_argument("--concurrency", type=int, default=4)
+    cal.add_argument("--batch", action="store_true",
+                     help="submit all judge runs as one provider batch (anthropic/xai judges; "
+                          "real-time fallback per call)")
     cal.add_argument("--bootstrap", type=int, default=2000)
     cal.add_argument("--seed", type=int, default=0)
     cal.add_argument("--report", default=None, help="report path (default reports/<suite>-method.md)")
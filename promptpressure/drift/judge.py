@@ -12,6 +12,11 @@ explicit instruction not to follow anything inside them.
 
 The adapter contract matches the rest of the codebase:
 ``await adapter_fn(prompt, config) -> str``.
+
+Judge calls are independent and latency-insensitive, so ``judge_suite_runs``
+can send every call of N judge passes as one provider batch (via
+``batch.complete_prompts``) when the judge model supports it, falling back
+to real-time per call.
 """
 
 from __future__ import annotations
@@ -19,6 +24,7 @@ from __future__ import annotations
 import asyncio
 import json
 
+from promptpressure.batch import complete_prompts
 from promptpressure.drift.dimensions import (
     DIMENSIONS,
     NA,
@@ -132,6 +138,18 @@ def parse_judge_labels(raw: str, sequence: dict, dimensions: list[str] | None =
     return labels, failures
 
 
+def _judge_result(sequence: dict, raw: str | None, dimensions: list[str] | None = None, error: str | None = None) -> dict:
+    if error is not None:
+        # judge call failed entirely -> all N/A, surfaced loudly. use the
+        # per-dimension failure count from parse_judge_labels (turns x dims),
+        # so parse_failures means the same thing on the error path as the
+        # normal path (both are summed in the coverage diagnostic).
+        labels, failures = parse_judge_labels("", sequence, dimensions)
+        return {"id": sequence["id"], "labels": labels, "parse_failures": failures, "raw": "", "error": error}
+    labels, failures = parse_judge_labels(raw, sequence, dimensions)
+    return {"id": sequence["id"], "labels": labels, "parse_failures": failures, "raw": raw}
+
+
 async def judge_sequence(
     sequence: dict,
     transcript: list[dict],
@@ -143,14 +161,9 @@ async def judge_sequence(
     prompt = build_judge_prompt(sequence, transcript, dimensions)
     try:
         raw = await adapter_fn(prompt, config)
-    except Exception as exc:  # judge call failed entirely -> all N/A, surfaced loudly
-        # use the per-dimension failure count from parse_judge_labels (turns x dims),
-        # so parse_failures means the same thing on the error path as the normal path
-        # (both are summed in the coverage diagnostic).
-        labels, failures = parse_judge_labels("", sequence, dimensions)
-        return {"id": sequence["id"], "labels": labels, "parse_failures": failures, "raw": "", "error": str(exc)}
-    labels, failures = parse_judge_labels(raw, sequence, dimensions)
-    return {"id": sequence["id"], "labels": labels, "parse_failures": failures, "raw": raw}
+    except Exception as exc:
+        return _judge_result(sequence, None, dimensions, error=str(exc))
+    return _judge_result(sequence, raw, dimensions)
 
 
 async def judge_suite(
@@ -170,3 +183,43 @@ async def judge_suite(
     todo = [s for s in sequences if s["id"] in transcripts]
     results = await asyncio.gather(*(one(s) for s in todo))
     return {r["id"]: r for r in results}
+
+
+async def judge_suite_runs(
+    sequences: list[dict],
+    transcripts: dict[str, list[dict]],
+    adapter_fn,
+    config: dict,
+    runs: int = 1,
+    concurrency: int = 4,
+    batch_model: str | None = None,
+) -> list[dict[str, dict]]:
+    """Judge the suite ``runs`` times, submitting every call as one batch.
+
+    With ``batch_model`` set and batch-capable, all ``runs x sequences`` judge
+    calls go out in a single provider batch; anything the batch does not
+    answer is judged in real-time. Returns one ``judge_suite``-shaped dict per
+    run, in run order.
+    """
+    todo = [s for s in sequences if s["id"] in transcripts]
+    prompts = {}
+    for i in range(runs):
+        for j, seq in enumerate(todo):
+            prompts[f"r{i}_s{j}"] = build_judge_prompt(seq, transcripts[seq["id"]])
+
+    answers = await complete_prompts(
+        prompts,
+        lambda prompt: adapter_fn(prompt, config),
+        model_name=batch_model,
+        config=config,
+        concurrency=concurrency,
+    )
+
+    out = []
+    for i in range(runs):
+        run = {}
+        for j, seq in enumerate(todo):
+            answer = answers[f"r{i}_s{j}"]
+            run[seq["id"]] = _judge_result(seq, answer.get("content"), error=answer.get("error"))
+        out.append(run)
+    return out
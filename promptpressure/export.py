@@ -0,0 +1,435 @@
+"""
+Columnar export of PromptPressure runs (Parquet or Arrow IPC).
+
+Cross-run analyses used to load every ``*-full-suite-*.json`` into dicts
+and loop. ``export_runs`` flattens run outputs into five tables, one
+directory per table, hive-partitioned by run:
+
+    <out>/results/run_id=<run>/part-0.parquet   one row per prompt/sequence
+    <out>/turns/run_id=<run>/...                one row per multi-turn turn
+    <out>/scores/run_id=<run>/...               one row per (grader, item, criterion)
+    <out>/requests/run_id=<run>/...             run.jsonl request lines (timings, tokens, retries)
+    <out>/costs/run_id=<run>/...                cost.json per-model totals
+    <out>/_manifest.json                        what was exported from where
+
+A source is a run output directory (has ``run.jsonl``), a results JSON
+file, or a directory holding either. Exports are incremental: a run whose
+files have the same size and mtime as last time is skipped, a changed run
+has its partitions rewritten, new runs are appended.
+
+``read_table`` is the query side: it reads only the requested columns and
+prunes partitions and row groups from the filter, so a question like
+"refusal rate per model over the last ten runs" touches a few columns of a
+few files instead of every response body.
+
+pyarrow is optional (``pip install promptpressure-evals[parquet]``).
+"""
+
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timezone
+
+# pyarrow is optional. only needed for export and read_table.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+FORMATS = ("parquet", "arrow")
+MANIFEST = "_manifest.json"
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+# run-dir JSON files that are never result lists
+_NON_RESULT_FILES = {"metrics.json", "metrics_report.json", "cost.json"}
+
+
+def _schemas():
+    s, i, f, b = pa.string(), pa.int64(), pa.float64(), pa.bool_()
+    return {
+        "results": pa.schema([
+            ("id", s), ("model", s), ("eval_set_id", s), ("success", b), ("error", s),
+            ("error_type", s), ("retries", i), ("multi_turn", b), ("turns_completed", i),
+            ("turns_total", i), ("batch", b), ("is_simulation", b), ("prompt", s),
+            ("response", s), ("eval_criteria", s), ("plugin_scores", s),
+        ]),
+        "turns": pa.schema([
+            ("id", s), ("model", s), ("turn", i), ("user", s), ("assistant", s),
+            ("reasoning_chars", i), ("batch", b), ("success", b), ("error", s),
+            ("error_type", s), ("response_length_ratio", f), ("metrics", s),
+        ]),
+        "scores": pa.schema([
+            ("grader", s), ("id", s), ("model", s), ("criterion", s),
+            ("value", f), ("raw", s), ("expected", f),
+        ]),
+        "requests": pa.schema([
+            ("seq", i), ("ts", s), ("entry_id", s), ("model", s), ("provider", s),
+            ("latency_s", f), ("prompt_tokens", i), ("completion_tokens", i),
+            ("cost_usd", f), ("retries", i), ("error", s), ("error_type", s),
+            ("multi_turn", b), ("turns", i), ("batch", b),
+        ]),
+        "costs": pa.schema([("model", s), ("cost_usd", f), ("requests", i)]),
+    }
+
+
+TABLES = ("results", "turns", "scores", "requests", "costs")
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed. install it with: pip install promptpressure-evals[parquet]")
+
+
+# --- discovery ---------------------------------------------------------------
+
+def _run_id(name):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "run"
+
+
+def discover_runs(paths):
+    """Map run_id -> {"kind": "dir" | "file", "path": abs path} for the given sources."""
+    runs = {}
+
+    def add(name, kind, path):
+        rid = _run_id(name)
+        if rid in runs and runs[rid]["path"] != path:
+            rid = _run_id(f"{name}__{len(runs)}")
+        runs[rid] = {"kind": kind, "path": path}
+
+    def walk(path, prefix):
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.name.startswith("."):
+                continue
+            name = f"{prefix}__{entry.name}" if prefix else entry.name
+            if entry.is_dir():
+                if os.path.exists(os.path.join(entry.path, "run.jsonl")):
+                    add(name, "dir", entry.path)
+                elif entry.name != "analysis":
+                    walk(entry.path, name)
+            elif entry.name.endswith(".json") and entry.name not in _NON_RESULT_FILES:
+                add(os.path.splitext(name)[0], "file", entry.path)
+
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            add(os.path.splitext(os.path.basename(path))[0], "file", path)
+        elif os.path.exists(os.path.join(path, "run.jsonl")):
+            add(os.path.basename(path), "dir", path)
+        elif os.path.isdir(path):
+            walk(path, "")
+        else:
+            raise FileNotFoundError(path)
+    return runs
+
+
+def _run_files(run):
+    """Files that make up a run, as {role: [paths]}."""
+    if run["kind"] == "file":
+        return {"results": [run["path"]]}
+    root = run["path"]
+    files = {"results": [], "scores": [], "requests": [], "costs": []}
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if name == "run.jsonl":
+            files["requests"].append(path)
+        elif name == "cost.json":
+            files["costs"].append(path)
+        elif name.endswith(".json") and name not in _NON_RESULT_FILES:
+            files["results"].append(path)
+    analysis = os.path.join(root, "analysis")
+    if os.path.isdir(analysis):
+        files["scores"] = [os.path.join(analysis, n) for n in sorted(os.listdir(analysis)) if n.endswith(".json")]
+    return files
+
+
+def _signature(files):
+    sig = []
+    for path in sorted(p for paths in files.values() for p in paths):
+        st = os.stat(path)
+        sig.append([path, st.st_size, st.st_mtime_ns])
+    return sig
+
+
+# --- flattening --------------------------------------------------------------
+
+def _json_or_none(value):
+    return json.dumps(value, sort_keys=True, default=str) if value not in (None, {}, []) else None
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def _load_items(path, key):
+    """Load a JSON list of result dicts; None when the file is something else.
+
+    ``key`` is "response" for result files and "scores" for grading files.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, list) or not data or not all(isinstance(x, dict) for x in data):
+        return None
+    if not all("id" in x for x in data):
+        return None
+    if key == "scores":
+        return data if all("scores" in x for x in data) else None
+    return data if any("response" in x for x in data) and not any("scores" in x for x in data) else None
+
+
+def _result_rows(items):
+    results, turns = [], []
+    for r in items:
+        prompt = r.get("prompt")
+        results.append({
+            "id": str(r.get("id")),
+            "model": r.get("model"),
+            "eval_set_id": r.get("eval_set_id"),
+            "success": r.get("success"),
+            "error": None if r.get("error") is None else str(r.get("error")),
+            "error_type": r.get("error_type"),
+            "retries": r.get("retries"),
+            "multi_turn": bool(r.get("multi_turn", False)),
+            "turns_completed": r.get("turns_completed", 1),
+            "turns_total": r.get("turns_total", 1),
+            "batch": bool(r.get("batch", False)),
+            "is_simulation": r.get("is_simulation"),
+            "prompt": prompt if isinstance(prompt, str) or prompt is None else json.dumps(prompt),
+            "response": r.get("response"),
+            "eval_criteria": _json_or_none(r.get("eval_criteria")),
+            "plugin_scores": _json_or_none(r.get("plugin_scores")),
+        })
+        for t in r.get("turn_responses") or []:
+            metrics = t.get("metrics") or {}
+            turns.append({
+                "id": str(r.get("id")),
+                "model": r.get("model"),
+                "turn": t.get("turn"),
+                "user": t.get("user"),
+                "assistant": t.get("assistant"),
+                "reasoning_chars": len(t.get("reasoning") or ""),
+                "batch": bool(t.get("batch", False)),
+                "success": t.get("assistant") is not None and not t.get("error"),
+                "error": t.get("error"),
+                "error_type": t.get("error_type"),
+                "response_length_ratio": _number(metrics.get("response_length_ratio")),
+                "metrics": _json_or_none(metrics),
+            })
+    return results, turns
+
+
+def _score_rows(items, grader):
+    rows = []
+    for item in items:
+        expected = item.get("eval_criteria") or {}
+        for criterion, value in sorted((item.get("scores") or {}).items()):
+            rows.append({
+                "grader": grader,
+                "id": str(item.get("id")),
+                "model": item.get("model"),
+                "criterion": criterion,
+                "value": _number(value),
+                "raw": None if value is None else json.dumps(value, default=str),
+                "expected": _number(expected.get(criterion)),
+            })
+    return rows
+
+
+def _request_rows(path):
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # a run killed mid-write leaves a partial last line
+            if rec.get("type") != "request":
+                continue
+            tokens = rec.get("tokens") or {}
+            rows.append({
+                "seq": rec.get("seq"),
+                "ts": rec.get("ts"),
+                "entry_id": None if rec.get("entry_id") is None else str(rec.get("entry_id")),
+                "model": rec.get("model"),
+                "provider": rec.get("provider"),
+                "latency_s": rec.get("latency_s"),
+                "prompt_tokens": tokens.get("prompt", tokens.get("prompt_tokens", tokens.get("input_tokens"))),
+                "completion_tokens": tokens.get("completion", tokens.get("completion_tokens", tokens.get("output_tokens"))),
+                "cost_usd": rec.get("cost_usd"),
+                "retries": rec.get("retries"),
+                "error": None if rec.get("error") is None else str(rec.get("error")),
+                "error_type": rec.get("error_type"),
+                "multi_turn": rec.get("multi_turn"),
+                "turns": rec.get("turns"),
+                "batch": rec.get("batch"),
+            })
+    return rows
+
+
+def _cost_rows(path):
+    with open(path, encoding="utf-8") as f:
+        summary = json.load(f)
+    return [
+        {"model": model, "cost_usd": c.get("cost_usd"), "requests": c.get("requests")}
+        for model, c in sorted((summary.get("per_model") or {}).items())
+    ]
+
+
+def collect_run(run):
+    """Flatten one discovered run into {table: [row dicts]}; None if it holds no results."""
+    files = _run_files(run)
+    tables = {name: [] for name in TABLES}
+    for path in files["results"]:
+        items = _load_items(path, "response")
+        if items is None:
+            continue
+        results, turns = _result_rows(items)
+        tables["results"].extend(results)
+        tables["turns"].extend(turns)
+    if not tables["results"]:
+        return None
+    for path in files.get("scores", []):
+        items = _load_items(path, "scores")
+        if items is not None:
+            tables["scores"].extend(_score_rows(items, os.path.splitext(os.path.basename(path))[0]))
+    for path in files.get("requests", []):
+        tables["requests"].extend(_request_rows(path))
+    for path in files.get("costs", []):
+        tables["costs"].extend(_cost_rows(path))
+    return tables
+
+
+# --- writing -----------------------------------------------------------------
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"version": 1, "format": None, "runs": {}, "skipped": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _partition_dir(out_dir, table, run_id):
+    return os.path.join(out_dir, table, f"run_id={run_id}")
+
+
+def _write_partition(out_dir, table, run_id, rows, fmt):
+    part_dir = _partition_dir(out_dir, table, run_id)
+    os.makedirs(part_dir, exist_ok=True)
+    path = os.path.join(part_dir, f"part-0.{_EXTENSIONS[fmt]}")
+    data = pa.Table.from_pylist(rows, schema=_schemas()[table])
+    tmp = path + ".tmp"
+    if fmt == "parquet":
+        pq.write_table(data, tmp, compression="zstd")
+    else:
+        feather.write_feather(data, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def export_runs(paths, out_dir, fmt="parquet", force=False):
+    """Export the runs found under ``paths`` into ``out_dir``.
+
+    Returns {"exported": [run_id], "unchanged": [run_id], "skipped": [path],
+    "rows": {table: n}} for this call.
+    """
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {fmt!r}")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    if manifest["format"] not in (None, fmt):
+        raise ValueError(f"{out_dir} already holds a {manifest['format']} export; use another directory")
+    manifest["format"] = fmt
+
+    summary = {"exported": [], "unchanged": [], "skipped": [], "rows": {name: 0 for name in TABLES}}
+    for run_id, run in discover_runs(paths).items():
+        signature = _signature(_run_files(run))
+        previous = manifest["runs"].get(run_id)
+        if not force and previous is not None and previous["signature"] == signature:
+            summary["unchanged"].append(run_id)
+            continue
+        if not force and manifest["skipped"].get(run["path"]) == signature:
+            continue
+        tables = collect_run(run)
+        if tables is None:
+            manifest["skipped"][run["path"]] = signature
+            summary["skipped"].append(run["path"])
+            _save_manifest(out_dir, manifest)
+            continue
+
+        for table in TABLES:
+            shutil.rmtree(_partition_dir(out_dir, table, run_id), ignore_errors=True)
+            if tables[table]:
+                _write_partition(out_dir, table, run_id, tables[table], fmt)
+            summary["rows"][table] += len(tables[table])
+        manifest["runs"][run_id] = {
+            "source": run["path"],
+            "signature": signature,
+            "rows": {table: len(rows) for table, rows in tables.items()},
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # saved per run so an interrupted export resumes where it stopped
+        _save_manifest(out_dir, manifest)
+        summary["exported"].append(run_id)
+    return summary
+
+
+# --- reading -----------------------------------------------------------------
+
+def _expression(where):
+    if where is None or not isinstance(where, dict):
+        return where
+    expr = None
+    for column, value in where.items():
+        term = pc.field(column).isin(list(value)) if isinstance(value, (list, tuple, set)) else pc.field(column) == value
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def read_table(out_dir, table, columns=None, where=None):
+    """Read one exported table as a pyarrow.Table.
+
+    ``columns`` limits what is read from disk (``run_id`` is available as a
+    column too). ``where`` is either a pyarrow.compute expression or a dict
+    of ``{column: value}`` / ``{column: [values]}`` equality filters;
+    filters on ``run_id`` skip whole partitions.
+
+        read_table("exports", "results", columns=["run_id", "model", "success"],
+                   where={"run_id": ["run-a", "run-b"]}).to_pandas()
+    """
+    _require_pyarrow()
+    if table not in TABLES:
+        raise ValueError(f"table must be one of {TABLES}, got {table!r}")
+    fmt = load_manifest(out_dir)["format"] or "parquet"
+    schema = _schemas()[table].append(pa.field("run_id", pa.string()))
+    path = os.path.join(out_dir, table)
+    if not os.path.isdir(path):
+        empty = schema.empty_table()
+        return empty.select(columns) if columns else empty
+    dataset = ds.dataset(
+        path,
+        schema=schema,
+        format="parquet" if fmt == "parquet" else "feather",
+        partitioning=ds.partitioning(pa.schema([("run_id", pa.string())]), flavor="hive"),
+    )
+    return dataset.to_table(columns=columns, filter=_expression(where))
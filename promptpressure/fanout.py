@@ -0,0 +1,151 @@
+"""
+Async multi-model fan-out for PromptPressure.
+
+Sends the same prompt (or conversation) to several models concurrently
+through the regular adapters, so each provider's auth, retries and
+AsyncRateLimiter bucket apply exactly as they do in an eval run. Nothing
+here blocks the event loop, so SSE streams and job progress keep flowing
+when the API process runs a fan-out.
+
+Policies:
+- "all": wait for every model to answer or fail
+- "first_k": return as soon as ``k`` models answered successfully; the
+  stragglers are cancelled
+
+``timeout`` (seconds) bounds either policy. Models still running at the
+deadline are cancelled and reported with status "timeout".
+
+Targets are dicts with "adapter" and "model", plus an optional "label"
+(defaults to "adapter:model") and any extra config keys for that model.
+"""
+
+import asyncio
+import time
+
+from promptpressure.adapters import load_adapter
+
+
+POLICIES = ("all", "first_k")
+
+
+def parse_target(spec):
+    """Parse an ``adapter:model`` spec (CLI form) into a target dict."""
+    adapter, sep, model = spec.partition(":")
+    if not sep or not adapter or not model:
+        raise ValueError(f"fan-out target must look like adapter:model, got {spec!r}")
+    return {"adapter": adapter, "model": model}
+
+
+def _label(target):
+    return target.get("label") or f"{target['adapter']}:{target['model']}"
+
+
+def _target_config(target, config):
+    cfg = dict(config or {})
+    cfg.update({k: v for k, v in target.items() if k != "label"})
+    cfg["model_name"] = target["model"]
+    return cfg
+
+
+async def _call(target, prompt, config, messages):
+    """Run one adapter call. Returns (content, usage)."""
+    adapter_fn = load_adapter(target["adapter"])
+    cfg = _target_config(target, config)
+    if messages is not None:
+        content = await adapter_fn(prompt, cfg, messages=messages)
+    else:
+        content = await adapter_fn(prompt, cfg)
+    # the litellm adapter keeps usage in a module global; read it before
+    # yielding to the loop so a concurrent call can't overwrite it.
+    usage = {}
+    if target["adapter"].lower() == "litellm":
+        from promptpressure.adapters.litellm_adapter import get_last_usage
+        usage = dict(get_last_usage() or {})
+    return content, usage
+
+
+async def fan_out(prompt, targets, config=None, messages=None, policy="all", k=1, timeout=None):
+    """Send one prompt to every target concurrently.
+
+    Args:
+        prompt: prompt text (ignored by adapters when ``messages`` is given).
+        targets: list of target dicts (see module docstring).
+        config: base config shared by every target (temperature, keys, ...).
+        messages: optional chat history for a conversation fan-out.
+        policy: "all" or "first_k".
+        k: successful answers to wait for under "first_k".
+        timeout: overall deadline in seconds, or None.
+
+    Returns:
+        dict with "policy", "elapsed", "completed" (labels in completion
+        order) and "results": label -> {"adapter", "model", "status",
+        "content", "latency", "usage", "error"}. status is one of "ok",
+        "error", "timeout" or "cancelled".
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown fan-out policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    if not targets:
+        raise ValueError("fan-out needs at least one target")
+    labels = [_label(t) for t in targets]
+    if len(set(labels)) != len(labels):
+        raise ValueError("duplicate fan-out targets; give them distinct labels")
+
+    want = len(targets) if policy == "all" else max(1, min(int(k), len(targets)))
+    results = {
+        label: {
+            "adapter": target["adapter"],
+            "model": target["model"],
+            "status": "pending",
+            "content": None,
+            "latency": None,
+            "usage": {},
+            "error": None,
+        }
+        for label, target in zip(labels, targets)
+    }
+    started = time.perf_counter()
+    deadline = None if timeout is None else started + timeout
+
+    async def run(label, target):
+        t0 = time.perf_counter()
+        try:
+            content, usage = await _call(target, prompt, config, messages)
+            results[label].update(status="ok", content=content, usage=usage)
+        except Exception as e:
+            results[label].update(status="error", error=str(e))
+        results[label]["latency"] = round(time.perf_counter() - t0, 4)
+        return label
+
+    pending = {asyncio.create_task(run(label, target)) for label, target in zip(labels, targets)}
+    completed = []
+    succeeded = 0
+    try:
+        while pending and succeeded < want:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                label = task.result()
+                completed.append(label)
+                if results[label]["status"] == "ok":
+                    succeeded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.perf_counter() - started
+    timed_out = deadline is not None and time.perf_counter() >= deadline
+    for result in results.values():
+        if result["status"] == "pending":
+            result["status"] = "timeout" if timed_out else "cancelled"
+            result["latency"] = round(elapsed, 4)
+
+    return {
+        "policy": policy,
+        "elapsed": round(elapsed, 4),
+        "completed": completed,
+        "results": results,
+    }
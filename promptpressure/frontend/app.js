@@ -38,6 +38,30 @@
     line.textContent = (els.statusPanel.children.length ? "\n" : "") + text;
     els.statusPanel.appendChild(line);
     els.statusPanel.scrollTop = els.statusPanel.scrollHeight;
+    return line;
+  }
+
+  // `progress` frames are coalesced snapshots (a few per second at most), so
+  // they rewrite one line instead of appending a line per prompt.
+  let progressLine = null;
+
+  function formatProgress(p) {
+    const parts = [`progress: ${p.completed}/${p.total || "?"}`];
+    if (p.failed) parts.push(`${p.failed} failed`);
+    if (p.throughput) parts.push(`${p.throughput}/s`);
+    if (p.eta_s != null && p.completed < p.total) parts.push(`eta ${Math.round(p.eta_s)}s`);
+    if (p.in_flight_count) parts.push(`in flight: ${p.in_flight.join(", ")}${p.in_flight_count > p.in_flight.length ? ", …" : ""}`);
+    return parts.join(" · ");
+  }
+
+  function onProgress(ev) {
+    let text = ev.data;
+    try { text = formatProgress(JSON.parse(ev.data)); } catch (_) {}
+    if (progressLine && progressLine === els.statusPanel.lastElementChild) {
+      progressLine.textContent = (els.statusPanel.children.length > 1 ? "\n" : "") + text;
+    } else {
+      progressLine = appendLine(text);
+    }
   }
 
   function clearStatusPanel() {
@@ -285,6 +309,7 @@
 
     addJsonEventListener(currentEventSource, "start_prompt", "start: ");
     addJsonEventListener(currentEventSource, "end_prompt",   "end:   ");
+    currentEventSource.addEventListener("progress", onProgress);
 
     currentEventSource.addEventListener("complete", (ev) => {
       appendLine("complete: " + ev.data);
@@ -5,6 +5,13 @@ returns boolean scores per rubric field. Uses XML boundary tags to
 prevent the evaluated model's response from influencing its own score.
 
 Supports multi-turn conversations with per_turn_expectations rubric hints.
+
+With ``batch_grading`` on, every grading call goes out as one provider
+batch when the grader's own provider has a batch API (see
+batch.judge_batch_model / batch.complete_prompts); items the batch misses
+are graded in real-time. Only the litellm grader can batch, with an
+anthropic or xai ``scoring_model_name``; groq and openrouter have no batch
+API, so their grading always runs in real-time.
 """
 
 import os
@@ -14,6 +21,7 @@ import asyncio
 from datetime import datetime
 
 from promptpressure.adapters import load_adapter
+from promptpressure.batch import complete_prompts, judge_batch_model
 
 
 def _build_grading_prompt(item, rubric_list):
@@ -50,7 +58,7 @@ def _build_grading_prompt(item, rubric_list):
     )
 
 
-async def _run_grading(results, adapter_fn, config, rubric_fields, config_override=None):
+async def _run_grading(results, adapter_fn, config, rubric_fields, config_override=None, batch_model=None):
     """Core grading loop shared by groq and openrouter post-analysis.
 
     Args:
@@ -59,32 +67,57 @@ async def _run_grading(results, adapter_fn, config, rubric_fields, config_overri
         config: eval config dict.
         rubric_fields: global rubric field list (fallback if item has none).
         config_override: optional config dict to pass to adapter instead of config.
+        batch_model: the grader's model id on its own batch API (see
+            _grading_batch_model). None grades in real-time.
 
     Returns:
         list of scored result dicts.
     """
-    sem = asyncio.Semaphore(5)
-
-    async def grade_item(item):
-        async with sem:
-            item_rubric = sorted((item.get("eval_criteria") or {}).keys())
-            rubric_list = ", ".join(item_rubric) if item_rubric else ", ".join(rubric_fields)
-            fields_to_grade = item_rubric if item_rubric else rubric_fields
-
-            grading_prompt = _build_grading_prompt(item, rubric_list)
-
-            try:
-                cfg = config_override or config
-                raw = await adapter_fn(grading_prompt, cfg)
-                start = raw.find("{")
-                end = raw.rfind("}")
-                parsed = json.loads(raw[start:end + 1]) if start >= 0 and end >= 0 else {}
-            except Exception:
-                parsed = {k: None for k in fields_to_grade}
-            return {**item, "scores": parsed}
+    cfg = config_override or config
+    items = [item for item in results if item.get("success")]
+
+    prompts = {}
+    fields = {}
+    for i, item in enumerate(items):
+        item_rubric = sorted((item.get("eval_criteria") or {}).keys())
+        rubric_list = ", ".join(item_rubric) if item_rubric else ", ".join(rubric_fields)
+        fields[f"grade_{i}"] = item_rubric if item_rubric else rubric_fields
+        prompts[f"grade_{i}"] = _build_grading_prompt(item, rubric_list)
+
+    answers = await complete_prompts(
+        prompts,
+        lambda prompt: adapter_fn(prompt, cfg),
+        model_name=batch_model,
+        config=cfg,
+        concurrency=5,
+    )
 
-    tasks = [grade_item(item) for item in results if item.get("success")]
-    return await asyncio.gather(*tasks)
+    scored = []
+    for i, item in enumerate(items):
+        cid = f"grade_{i}"
+        answer = answers[cid]
+        try:
+            if "error" in answer:
+                raise RuntimeError(answer["error"])
+            raw = answer["content"]
+            start = raw.find("{")
+            end = raw.rfind("}")
+            parsed = json.loads(raw[start:end + 1]) if start >= 0 and end >= 0 else {}
+        except Exception:
+            parsed = {k: None for k in fields[cid]}
+        scored.append({**item, "scores": parsed})
+    return scored
+
+
+def _grading_batch_model(config, provider, model_name):
+    """The grader's batch model when ``batch_grading`` is on and its provider
+    has a batch API, else None. Never the evaluated model's."""
+    if not (config or {}).get("batch_grading"):
+        return None
+    batch_model = judge_batch_model(provider, model_name)
+    if batch_model is None:
+        print(f"  batch grading: {provider} has no batch API. grading in real-time.")
+    return batch_model
 
 
 def _write_grading_output(scored, rubric_fields, csv_path, json_path, label):
@@ -120,7 +153,8 @@ async def post_analyze_groq(results, config, suffix="all_models"):
     adapter_fn = load_adapter("groq")
     rubric_fields = sorted({k for item in results for k in (item.get("eval_criteria") or {}).keys()})
 
-    scored = await _run_grading(results, adapter_fn, config, rubric_fields)
+    batch_model = _grading_batch_model(config, "groq", (config or {}).get("model_name"))
+    scored = await _run_grading(results, adapter_fn, config, rubric_fields, batch_model=batch_model)
     _write_grading_output(scored, rubric_fields, csv_path, json_path, "Groq")
 
 
@@ -136,7 +170,31 @@ async def post_analyze_openrouter(results, config, suffix="all_models"):
     rubric_fields = sorted({k for item in results for k in (item.get("eval_criteria") or {}).keys()})
 
     config_override = dict(config or {})
-    config_override["model_name"] = config_override.get("scoring_model_name", "openai/gpt-oss-20b:free")
+    config_override["model_name"] = config_override.get("scoring_model_name") or "openai/gpt-oss-20b:free"
 
-    scored = await _run_grading(results, adapter_fn, config, rubric_fields, config_override=config_override)
+    batch_model = _grading_batch_model(config, "openrouter", config_override["model_name"])
+    scored = await _run_grading(results, adapter_fn, config, rubric_fields, config_override=config_override,
+                                batch_model=batch_model)
     _write_grading_output(scored, rubric_fields, csv_path, json_path, "OpenRouter")
+
+
+async def post_analyze_litellm(results, config, suffix="all_models"):
+    """Grade eval results using the LiteLLM adapter (batchable for anthropic/xai graders)."""
+    analysis_dir = os.path.join(config.get("output_dir", "outputs"), "analysis")
+    os.makedirs(analysis_dir, exist_ok=True)
+    ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    csv_path = os.path.join(analysis_dir, f"litellm_scores_{suffix}_{ts}.csv")
+    json_path = os.path.join(analysis_dir, f"litellm_scores_{suffix}_{ts}.json")
+
+    adapter_fn = load_adapter("litellm")
+    rubric_fields = sorted({k for item in results for k in (item.get("eval_criteria") or {}).keys()})
+
+    # the litellm adapter reads "model" before "model_name": set both to the grader
+    config_override = dict(config or {})
+    scoring_model = config_override.get("scoring_model_name") or "claude-sonnet-4-6"
+    config_override["model"] = config_override["model_name"] = scoring_model
+
+    batch_model = _grading_batch_model(config, "litellm", scoring_model)
+    scored = await _run_grading(results, adapter_fn, config, rubric_fields, config_override=config_override,
+                                batch_model=batch_model)
+    _write_grading_output(scored, rubric_fields, csv_path, json_path, "LiteLLM")
@@ -0,0 +1,82 @@
+"""
+Conditional GETs and compression for the endpoints the apps poll.
+
+The macOS app and the browser launcher poll ``/app/jobs``, ``/app/outputs``,
+``/providers`` and ``/eval-sets`` every few seconds and almost every poll
+gets back what it already has. The endpoints tag what they are about to
+return and answer a matching ``If-None-Match`` with an empty ``304``
+without serializing it:
+
+- ``etag(*parts)`` is a strong ETag built from whatever identifies a
+  payload: job ids and version counters, catalog rows' paths and mtimes,
+  or for small computed lists, the payload itself.
+- ``cached_json(request, tag, payload)`` returns the 304 or, only when the
+  client's copy is stale, the payload as JSON with the ETag and
+  ``Cache-Control: no-cache`` (always revalidate).
+- ``CompressionMiddleware`` gzips JSON bodies of ``minimum_size`` bytes or
+  more for clients that accept it (through Starlette's ``GZipMiddleware``,
+  which leaves event streams and ranged responses alone) and gives the
+  compressed body its own strong tag, ``"<tag>-gzip"``, so a cache never
+  confuses the two encodings. ``If-None-Match`` matches either.
+"""
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+GZIP_SUFFIX = "-gzip"
+
+
+def etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(json.dumps(parts, default=str, separators=(",", ":")).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, tag: str) -> bool:
+    """True if ``If-None-Match`` names ``tag`` (weak comparison, as RFC 9110
+    specifies for If-None-Match, and ignoring the gzip suffix)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate.endswith(GZIP_SUFFIX + '"'):
+            candidate = candidate[:-len(GZIP_SUFFIX) - 1] + '"'
+        if candidate == tag:
+            return True
+    return False
+
+
+def cached_json(request: Request, tag: str, payload: Any) -> Response:
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if not_modified(request, tag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6) -> None:
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.gzip(scope, receive, send)
+            return
+
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                tag = headers.get("etag")
+                if tag and headers.get("content-encoding") == "gzip" and tag.endswith('"'):
+                    headers["etag"] = tag[:-1] + GZIP_SUFFIX + '"'
+                    message["headers"] = headers.raw
+            await send(message)
+
+        await self.gzip(scope, receive, send_tagged)
@@ -39,6 +39,8 @@ def build_subprocess_env(parent_env: Optional[dict] = None) -> dict:
     env = dict(parent_env if parent_env is not None else os.environ)
     env["PROMPTPRESSURE_DEV_NO_AUTH"] = "1"
     env["PROMPTPRESSURE_LAUNCHER"] = "1"
+    # evals run in a worker process so the UI's stream and /health stay live
+    env.setdefault("PROMPTPRESSURE_EVAL_WORKER", "process")
     return env
 
 
@@ -9,17 +9,162 @@ This module provides extensible metrics collection capabilities including:
 - Aggregation and reporting functions
 """
 
+import math
 import time
 import json
 import os
-from typing import Dict, List, Any, Callable, Optional
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
 from datetime import datetime
 import asyncio
 
-class MetricsCollector:
-    """Collects and manages evaluation metrics."""
+MAX_ERROR_SAMPLES = 50
+QUANTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+BREAKDOWNS = ("model", "adapter", "category", "entry_type", "turn")
+
+
+class LatencySketch:
+    """Streaming quantile sketch with relative-error log buckets (DDSketch).
+
+    Every value lands in bucket ``ceil(log_gamma(value))``, so a quantile is
+    off by at most ``relative_accuracy`` of its value. Memory depends on the
+    range of values, not how many there are (1ms to 1000s at 1% is ~700
+    buckets), and is capped at ``max_buckets`` by folding the lowest buckets
+    together. Sketches with the same accuracy merge exactly.
+    """
+
+    __slots__ = ("relative_accuracy", "max_buckets", "_gamma", "_log_gamma", "buckets",
+                 "zero_count", "count", "total", "min", "max")
+
+    MIN_VALUE = 1e-9  # at or below this a value counts as zero
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1):
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self.buckets
+        if index in buckets:
+            buckets[index] += count
+        else:
+            buckets[index] = count
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+
+    def merge(self, other: "LatencySketch"):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("can only merge sketches with the same relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, digits: int = 4) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        out = {
+            "count": self.count,
+            "mean": round(self.total / self.count, digits),
+            "min": round(self.min, digits),
+            "max": round(self.max, digits),
+        }
+        for name, q in QUANTILES:
+            out[name] = round(self.quantile(q), digits)
+        return out
+
+    def _collapse(self):
+        count = self.buckets.pop(min(self.buckets))
+        self.buckets[min(self.buckets)] += count
+
+
+class _Group:
+    """Latency, errors and token throughput for one breakdown value."""
+
+    __slots__ = ("latency", "entries", "errors", "tokens", "token_seconds")
 
     def __init__(self):
+        self.latency = LatencySketch()
+        self.entries = 0
+        self.errors = 0
+        self.tokens = 0
+        self.token_seconds = 0.0
+
+    def add(self, latency: Optional[float], success: bool, tokens: int):
+        self.entries += 1
+        self.errors += not success
+        if latency is not None:
+            self.latency.add(latency)
+            if tokens:
+                self.tokens += tokens
+                self.token_seconds += latency
+
+    def merge(self, other: "_Group"):
+        self.latency.merge(other.latency)
+        self.entries += other.entries
+        self.errors += other.errors
+        self.tokens += other.tokens
+        self.token_seconds += other.token_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "entries": self.entries,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.entries, 4) if self.entries else None,
+            "latency_s": self.latency.summary(),
+            "tokens_per_s": round(self.tokens / self.token_seconds, 2) if self.token_seconds else None,
+        }
+
+
+class MetricsCollector:
+    """Collects and manages evaluation metrics.
+
+    ``record_success`` / ``record_error`` keep the run totals and an overall
+    latency sketch. ``record_entry`` adds one finished entry to the
+    breakdowns (per model, adapter, category, entry type and turn index) that
+    ``get_metrics`` reports with p50/p90/p99, error rates and tokens/s.
+    Memory stays bounded: sketches instead of latency lists, and at most
+    ``max_error_samples`` error details (``errors_by_type`` keeps the full
+    counts).
+    """
+
+    def __init__(self, max_error_samples: int = MAX_ERROR_SAMPLES):
+        self.max_error_samples = max_error_samples
         self.metrics = {
             "total_prompts": 0,
             "successful_responses": 0,
@@ -27,9 +172,13 @@ class MetricsCollector:
             "total_response_time": 0.0,
             "average_response_time": 0.0,
             "error_details": [],
+            "error_details_dropped": 0,
+            "errors_by_type": {},
             "custom_metrics": {},
             "timestamp": datetime.now().isoformat()
         }
+        self.latency = LatencySketch()
+        self.breakdowns: Dict[str, Dict[str, _Group]] = {name: {} for name in BREAKDOWNS}
         self._lock = asyncio.Lock()
 
     def start_timer(self) -> float:
@@ -48,29 +197,102 @@ class MetricsCollector:
         self.metrics["average_response_time"] = (
             self.metrics["total_response_time"] / self.metrics["successful_responses"]
         )
+        self.latency.add(response_time)
 
     def record_error(self, error: Exception, prompt: str = ""):
         """Record an error during evaluation."""
         self.metrics["total_prompts"] += 1
         self.metrics["errors"] += 1
+        error_type = type(error).__name__
+        self.metrics["errors_by_type"][error_type] = self.metrics["errors_by_type"].get(error_type, 0) + 1
+        if len(self.metrics["error_details"]) >= self.max_error_samples:
+            self.metrics["error_details_dropped"] += 1
+            return
         self.metrics["error_details"].append({
             "timestamp": datetime.now().isoformat(),
-            "error_type": type(error).__name__,
+            "error_type": error_type,
             "error_message": str(error),
             "prompt": prompt[:100] + "..." if len(prompt) > 100 else prompt
         })
 
+    def record_entry(
+        self,
+        latency: Optional[float],
+        success: bool = True,
+        model: Optional[str] = None,
+        adapter: Optional[str] = None,
+        category: Optional[str] = None,
+        entry_type: str = "single",
+        tokens: int = 0,
+        turns: Iterable[Tuple[int, Optional[float], bool, int]] = (),
+    ):
+        """Add one finished entry to the breakdowns.
+
+        ``latency`` is the entry's wall time in seconds (a whole sequence for
+        multi-turn entries), ``tokens`` its completion tokens, and ``turns``
+        (turn number, latency, success, completion tokens) per turn; turns
+        are also counted under entry type ``turn``. A latency of None (a
+        batched turn) counts toward errors but not percentiles.
+        """
+        for name, value in (("model", model), ("adapter", adapter),
+                            ("category", category or "uncategorized"), ("entry_type", entry_type)):
+            if value is not None:
+                self._group(name, value).add(latency, success, tokens)
+        for turn, turn_latency, turn_success, turn_tokens in turns:
+            self._group("turn", str(turn)).add(turn_latency, turn_success, turn_tokens)
+            self._group("entry_type", "turn").add(turn_latency, turn_success, turn_tokens)
+
+    def merge(self, other: "MetricsCollector"):
+        """Fold another collector's counts, sketches and breakdowns into this one."""
+        for key in ("total_prompts", "successful_responses", "errors", "total_response_time",
+                    "error_details_dropped"):
+            self.metrics[key] += other.metrics[key]
+        if self.metrics["successful_responses"]:
+            self.metrics["average_response_time"] = (
+                self.metrics["total_response_time"] / self.metrics["successful_responses"]
+            )
+        for error_type, count in other.metrics["errors_by_type"].items():
+            self.metrics["errors_by_type"][error_type] = self.metrics["errors_by_type"].get(error_type, 0) + count
+        room = self.max_error_samples - len(self.metrics["error_details"])
+        kept = other.metrics["error_details"][:max(room, 0)]
+        self.metrics["error_details"].extend(kept)
+        self.metrics["error_details_dropped"] += len(other.metrics["error_details"]) - len(kept)
+        self.latency.merge(other.latency)
+        for name, groups in other.breakdowns.items():
+            for value, group in groups.items():
+                self._group(name, value).merge(group)
+
     def add_custom_metric(self, name: str, value: Any):
         """Add a custom metric."""
         self.metrics["custom_metrics"][name] = value
         
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics."""
-        return self.metrics.copy()
+        metrics = self.metrics.copy()
+        metrics["latency_s"] = self.latency.summary()
+        metrics["breakdowns"] = {
+            name: {value: group.summary() for value, group in sorted(groups.items(), key=_breakdown_order)}
+            for name, groups in self.breakdowns.items()
+            if groups
+        }
+        return metrics
         
     def reset(self):
         """Reset metrics collection."""
-        self.__init__()
+        self.__init__(self.max_error_samples)
+
+    def _group(self, name: str, value: Any) -> _Group:
+        groups = self.breakdowns[name]
+        group = groups.get(str(value))
+        if group is None:
+            group = groups[str(value)] = _Group()
+        return group
+
+
+def _breakdown_order(item: Tuple[str, _Group]) -> Tuple[int, Any]:
+    # turn numbers sort numerically, everything else by name
+    key = item[0]
+    return (0, int(key)) if key.isdigit() else (1, key)
 
 def default_response_length_metric(response: str) -> int:
     """Default metric: response length."""
@@ -3,74 +3,223 @@ Monitoring module for PromptPressure using Prometheus.
 
 This module provides Prometheus metrics exposure for the PromptPressure evaluation suite.
 It exposes key metrics such as API response times, success rates, error rates, and custom metrics.
+
+Hot-path metrics carry a ``run`` label (the evaluation id, which is also
+the API's run/job id) so concurrent runs can be told apart:
+
+- ``promptpressure_queue_depth`` / ``promptpressure_in_flight``: entries
+  waiting for / holding one of the run's worker slots
+- ``promptpressure_rate_limit_wait_seconds{key}``: time spent in
+  ``AsyncRateLimiter`` per limiter key
+- ``promptpressure_retries_total{reason}`` and
+  ``promptpressure_retry_backoff_seconds_total``: retried calls and the
+  time slept before them
+- ``promptpressure_time_to_first_token_seconds{model}`` and
+  ``promptpressure_tokens_per_second{model}`` per model call. No adapter
+  streams, so the first token arrives with the whole response.
+- ``promptpressure_batch_requests{provider,state}`` and
+  ``promptpressure_batch_polls_total{provider}``: batch API progress
+- ``promptpressure_db_writer_queue_rows``, ``promptpressure_db_writer_lag_seconds``
+  (queued to committed) and ``promptpressure_db_writer_rows_total{outcome}``
+- ``promptpressure_sse_subscribers``: clients following the run's stream
+
+The run is taken from a context variable that ``run_scope`` sets for the
+task running the evaluation (and the tasks it creates), so the rate
+limiter, retries and the DB writer don't need it passed in. A finished
+run's gauges are dropped straight away; its counters and histograms stay
+for the last ``RETAINED_RUNS`` runs so a scrape after the run still sees
+its totals. Per-run series are created through ``run_labels``, which
+records each run's label sets so they can be removed again.
+
+Inside the API, ``GET /metrics`` serves ``render()``. The CLI starts
+``start_http_server`` on ``METRICS_PORT`` instead. With
+``PROMETHEUS_MULTIPROC_DIR`` set (several API workers, or
+``PROMPTPRESSURE_EVAL_WORKER=process``), every process writes its samples
+there and ``render()`` aggregates them.
 """
 
-import time
+import contextlib
+import contextvars
+import os
 import threading
-from typing import Dict, Any
-from prometheus_client import start_http_server, Counter, Gauge, Histogram, Summary
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, Summary,
+    generate_latest, start_http_server,
+)
 
 # Prometheus metrics definitions
 API_REQUESTS_TOTAL = Counter('promptpressure_api_requests_total', 'Total number of API requests', ['model', 'adapter', 'status'])
 API_REQUEST_DURATION = Histogram('promptpressure_api_request_duration_seconds', 'API request duration in seconds', ['model', 'adapter'])
 API_ERRORS_TOTAL = Counter('promptpressure_api_errors_total', 'Total number of API errors', ['model', 'adapter', 'error_type'])
-ACTIVE_EVALUATIONS = Gauge('promptpressure_active_evaluations', 'Number of currently running evaluations')
+ACTIVE_EVALUATIONS = Gauge('promptpressure_active_evaluations', 'Number of currently running evaluations', multiprocess_mode='livesum')
 EVALUATION_DURATION = Summary('promptpressure_evaluation_duration_seconds', 'Time spent processing evaluations')
 
 # Custom metrics for PromptPressure
 TOTAL_PROMPTS = Counter('promptpressure_total_prompts', 'Total number of prompts processed')
 SUCCESSFUL_RESPONSES = Counter('promptpressure_successful_responses_total', 'Total number of successful responses')
 ERROR_RESPONSES = Counter('promptpressure_error_responses_total', 'Total number of error responses')
-AVERAGE_RESPONSE_TIME = Gauge('promptpressure_average_response_time_seconds', 'Average response time in seconds')
+AVERAGE_RESPONSE_TIME = Gauge('promptpressure_average_response_time_seconds', 'Average response time in seconds', multiprocess_mode='liveall')
+
+# Hot-path metrics, labelled per run
+QUEUE_DEPTH = Gauge('promptpressure_queue_depth', 'Entries waiting for a worker slot', ['run'], multiprocess_mode='livesum')
+IN_FLIGHT = Gauge('promptpressure_in_flight', 'Entries holding a worker slot', ['run'], multiprocess_mode='livesum')
+RATE_LIMIT_WAIT = Histogram(
+    'promptpressure_rate_limit_wait_seconds', 'Time spent waiting on a rate limiter', ['run', 'key'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+RETRIES = Counter('promptpressure_retries_total', 'Retried model calls', ['run', 'reason'])
+RETRY_BACKOFF = Counter('promptpressure_retry_backoff_seconds_total', 'Seconds slept before retries', ['run'])
+TIME_TO_FIRST_TOKEN = Histogram(
+    'promptpressure_time_to_first_token_seconds', 'Time from a model call to its first token', ['run', 'model'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300),
+)
+TOKENS_PER_SECOND = Histogram(
+    'promptpressure_tokens_per_second', 'Completion tokens per second of a model call', ['run', 'model'],
+    buckets=(1, 5, 10, 20, 35, 50, 75, 100, 150, 250, 500, 1000),
+)
+BATCH_REQUESTS = Gauge('promptpressure_batch_requests', 'Requests of the batch being polled', ['run', 'provider', 'state'], multiprocess_mode='livesum')
+BATCH_POLLS = Counter('promptpressure_batch_polls_total', 'Batch status polls', ['run', 'provider'])
+DB_WRITER_QUEUE = Gauge('promptpressure_db_writer_queue_rows', 'Rows queued for the DB writer', ['run'], multiprocess_mode='livesum')
+DB_WRITER_LAG = Histogram(
+    'promptpressure_db_writer_lag_seconds', 'Time from queueing a row to committing it (oldest row of a batch)', ['run'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1, 2, 5, 10),
+)
+DB_WRITER_ROWS = Counter('promptpressure_db_writer_rows_total', 'Rows handled by the DB writer', ['run', 'outcome'])
+SSE_SUBSCRIBERS = Gauge('promptpressure_sse_subscribers', 'Clients following a run stream', ['run'], multiprocess_mode='livesum')
+JOBS = Gauge('promptpressure_jobs', 'Scheduled API jobs', ['state'], multiprocess_mode='livesum')
+
+_RUN_GAUGES = (QUEUE_DEPTH, IN_FLIGHT, BATCH_REQUESTS, DB_WRITER_QUEUE, SSE_SUBSCRIBERS)
+_RUN_TOTALS = (RATE_LIMIT_WAIT, RETRIES, RETRY_BACKOFF, TIME_TO_FIRST_TOKEN, TOKENS_PER_SECOND,
+               BATCH_POLLS, DB_WRITER_LAG, DB_WRITER_ROWS)
+_RETRY_REASONS = ("429", "503", "529", "overloaded", "rate limit", "too many requests", "service unavailable")
 
 # Server configuration
 METRICS_PORT = 9090
+RETAINED_RUNS = 20
+
+_current_run: contextvars.ContextVar[str] = contextvars.ContextVar("promptpressure_run", default="")
+_current_call: contextvars.ContextVar[Optional["CallTimer"]] = contextvars.ContextVar("promptpressure_call", default=None)
+_retired: "deque[str]" = deque()
+# run -> the (metric, label values) series created for it
+_run_series: Dict[str, Set[Tuple[Any, Tuple[str, ...]]]] = {}
+_series_lock = threading.Lock()
+_response_totals = [0.0, 0]  # seconds, successful responses
 
 
 class MetricsServer:
-    """A Prometheus metrics server for PromptPressure."""
-    
+    """A Prometheus metrics server for PromptPressure (CLI runs)."""
+
     def __init__(self, port: int = METRICS_PORT):
         self.port = port
+        self.server = None
         self.server_thread = None
         self.running = False
-    
+
     def start(self):
-        """Start the Prometheus metrics server in a separate thread."""
+        """Start the Prometheus HTTP server (it serves from its own daemon thread)."""
         if not self.running:
-            self.server_thread = threading.Thread(target=self._run_server, daemon=True)
-            self.server_thread.start()
+            try:
+                self.server, self.server_thread = start_http_server(self.port)
+            except Exception as e:
+                print(f"Error starting Prometheus metrics server: {e}")
+                return
             self.running = True
             print(f"Prometheus metrics server started on port {self.port}")
-    
-    def _run_server(self):
-        """Run the Prometheus HTTP server."""
-        try:
-            start_http_server(self.port)
-            # Keep the thread alive
-            while self.running:
-                time.sleep(1)
-        except Exception as e:
-            print(f"Error starting Prometheus metrics server: {e}")
-    
+
     def stop(self):
         """Stop the Prometheus metrics server."""
         if self.running:
             self.running = False
-            if self.server_thread:
-                self.server_thread.join(timeout=2)
+            self.server.shutdown()
+            self.server.server_close()
+            self.server_thread.join(timeout=2)
             print("Prometheus metrics server stopped")
 
 
+def current_run() -> str:
+    """The ``run`` label of the evaluation running in this context ("" outside one)."""
+    return _current_run.get()
+
+
+@contextlib.contextmanager
+def run_scope(run: Optional[str] = None) -> Iterator["RunScope"]:
+    """Label hot-path metrics recorded in this context with a run id.
+
+    ``run`` may be set later with ``bind`` (the runner only knows its id once
+    the evaluation row exists). On exit the run is retired.
+    """
+    scope = RunScope()
+    if run:
+        scope.bind(run)
+    try:
+        yield scope
+    finally:
+        scope.close()
+
+
+class RunScope:
+    def __init__(self) -> None:
+        self.run = ""
+        self._token: Optional[contextvars.Token] = None
+
+    def bind(self, run: str) -> None:
+        self.run = str(run)
+        self._token = _current_run.set(self.run)
+
+    def close(self) -> None:
+        if self._token is not None:
+            _current_run.reset(self._token)
+            self._token = None
+        if self.run:
+            retire_run(self.run)
+
+
+def run_labels(metric: Any, *labels: str, run: Optional[str] = None):
+    """The child of a per-run metric for ``run`` (default: the current run)
+    and the remaining ``labels``, recorded so ``retire_run`` can remove it."""
+    values = (_current_run.get() if run is None else run, *labels)
+    with _series_lock:
+        _run_series.setdefault(values[0], set()).add((metric, values))
+    return metric.labels(*values)
+
+
+def retire_run(run: str) -> None:
+    """Drop a finished run's gauges; keep its totals for the last RETAINED_RUNS runs."""
+    _remove_run(run, _RUN_GAUGES)
+    if run in _retired:
+        return
+    _retired.append(run)
+    while len(_retired) > RETAINED_RUNS:
+        _remove_run(_retired.popleft(), _RUN_TOTALS)
+
+
+def _remove_run(run: str, metrics: Tuple[Any, ...]) -> None:
+    with _series_lock:
+        series = _run_series.get(run, set())
+        stale = [(metric, values) for metric, values in series if metric in metrics]
+        series.difference_update(stale)
+        if not series:
+            _run_series.pop(run, None)
+    for metric, values in stale:
+        try:
+            metric.remove(*values)
+        except KeyError:
+            pass
+
+
 def record_api_request(model: str, adapter: str, duration: float, success: bool = True, error_type: str = None):
     """Record an API request metric."""
     # Record request count
     status = 'success' if success else 'error'
     API_REQUESTS_TOTAL.labels(model=model, adapter=adapter, status=status).inc()
-    
+
     # Record duration
     API_REQUEST_DURATION.labels(model=model, adapter=adapter).observe(duration)
-    
+
     # Record errors if applicable
     if not success:
         API_ERRORS_TOTAL.labels(model=model, adapter=adapter, error_type=error_type or 'unknown').inc()
@@ -97,28 +246,119 @@ def record_response(success: bool, response_time: float = 0):
     if success:
         SUCCESSFUL_RESPONSES.inc()
         if response_time > 0:
-            AVERAGE_RESPONSE_TIME.set(response_time)
+            _response_totals[0] += response_time
+            _response_totals[1] += 1
+            AVERAGE_RESPONSE_TIME.set(_response_totals[0] / _response_totals[1])
     else:
         ERROR_RESPONSES.inc()
 
 
+class CallTimer:
+    """Wall time of one model call minus what it spent in rate limiters."""
+
+    __slots__ = ("start", "waited", "seconds")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.waited = 0.0
+        self.seconds = 0.0
+
+
+@contextlib.contextmanager
+def call_timer() -> Iterator[CallTimer]:
+    timer = CallTimer()
+    token = _current_call.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_call.reset(token)
+        timer.seconds = max(0.0, time.perf_counter() - timer.start - timer.waited)
+
+
+def record_rate_limit_wait(key: str, seconds: float):
+    run_labels(RATE_LIMIT_WAIT, key).observe(seconds)
+    timer = _current_call.get()
+    if timer is not None:
+        timer.waited += seconds
+
+
+def record_retry(error: Exception, delay: float):
+    """A retryable error, about to be retried after ``delay`` seconds."""
+    text = str(error).lower()
+    reason = next((r for r in _RETRY_REASONS if r in text), "other")
+    run_labels(RETRIES, reason).inc()
+    run_labels(RETRY_BACKOFF).inc(delay)
+
+
+def record_model_call(model: str, seconds: float, completion_tokens: int = 0):
+    """One successful model call (one attempt, after rate limiting)."""
+    run_labels(TIME_TO_FIRST_TOKEN, model).observe(seconds)
+    if completion_tokens and seconds > 0:
+        run_labels(TOKENS_PER_SECOND, model).observe(completion_tokens / seconds)
+
+
+def record_batch_poll(provider: str, done: int, total: int, processing: Optional[int] = None):
+    run_labels(BATCH_POLLS, provider).inc()
+    run_labels(BATCH_REQUESTS, provider, "total").set(total)
+    run_labels(BATCH_REQUESTS, provider, "done").set(done)
+    if processing is not None:
+        run_labels(BATCH_REQUESTS, provider, "processing").set(processing)
+
+
+def run_gauge(gauge: Gauge, run: Optional[str] = None):
+    """The child of a per-run gauge, for callers that update it often."""
+    return run_labels(gauge, run=run)
+
+
+def watch_scheduler(scheduler: Any) -> None:
+    """Report a JobScheduler's queued/running counts at scrape time."""
+    if _multiprocess_dir():
+        return  # callback gauges aren't supported across processes
+    JOBS.labels("queued").set_function(lambda: scheduler.stats()["queued"])
+    JOBS.labels("running").set_function(lambda: scheduler.stats()["running"])
+
+
+def render() -> Tuple[bytes, str]:
+    """The metrics exposition for ``GET /metrics`` and its content type."""
+    directory = _multiprocess_dir()
+    registry = REGISTRY
+    if directory:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=directory)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker process (multiprocess mode only)."""
+    if _multiprocess_dir():
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+def _multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
 def update_custom_metrics(metrics_data: Dict[str, Any]):
     """Update custom metrics from the MetricsCollector."""
     if 'total_prompts' in metrics_data:
         # This is handled by record_prompt_processing()
         pass
-    
+
     if 'successful_responses' in metrics_data:
         # This is handled by record_response()
         pass
-        
+
     if 'errors' in metrics_data:
         # This is handled by record_response()
         pass
-        
+
     if 'average_response_time' in metrics_data:
         AVERAGE_RESPONSE_TIME.set(metrics_data['average_response_time'])
-    
+
     # Handle custom metrics
     if 'custom_metrics' in metrics_data:
         for name, value in metrics_data['custom_metrics'].items():
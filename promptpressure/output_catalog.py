@@ -0,0 +1,246 @@
+"""
+Catalog of run outputs for ``GET /app/outputs``.
+
+The endpoint used to walk every outputs root on each call, ``stat`` every
+child and list every file of every run directory, so the Outputs pane got
+slower with every run kept around. The catalog keeps one row per run
+directory (or loose result file) in the ``output_catalog`` table instead:
+
+- ``describe(path)`` reads one entry from disk: its files, total size,
+  report paths, prompt/success/error counts from ``metrics.json`` and the
+  model from ``run.jsonl``.
+- ``record(path, model=..., tier=...)`` describes and stores a run as soon
+  as it finishes (the runner calls it), with what only the run knows.
+- ``OutputCatalog.sync(roots)`` lists each root once and re-describes only
+  children whose mtime differs from their row, and drops rows whose path is
+  gone. It runs at most every ``sync_interval`` seconds unless forced;
+  outputs that appear some other way (copied in, an older checkout) show up
+  on the next sync.
+- ``OutputCatalog.list`` serves one keyset-paginated page per query,
+  sorted by modification time, name or size.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select
+
+from promptpressure.database import OutputCatalogEntry, db_session
+
+SYNC_INTERVAL = 30.0
+OUTPUT_SUFFIXES = {".csv", ".json", ".html", ".md"}
+SORT_COLUMNS = {
+    "modified": OutputCatalogEntry.modified_at,
+    "name": OutputCatalogEntry.name,
+    "size": OutputCatalogEntry.size_bytes,
+}
+# kept from the previous row when a run is re-described: only the run knew them
+_RUN_METADATA = ("model", "tier")
+_COLUMNS = tuple(OutputCatalogEntry.__table__.columns.keys())
+_CHUNK = 500
+
+
+def resolved(path: Path) -> str:
+    try:
+        return str(path.resolve())
+    except Exception:
+        return str(path)
+
+
+def describe(path: Path) -> Dict[str, Any]:
+    """The catalog entry for one output directory or file, read from disk."""
+    stat = path.stat()
+    is_dir = path.is_dir()
+    files: List[str] = []
+    size = stat.st_size
+    if is_dir:
+        files = sorted(child.name for child in os.scandir(path) if child.is_file())
+        size = 0
+        for dirpath, _, names in os.walk(path):
+            for name in names:
+                try:
+                    size += os.stat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
+    entry = {
+        "path": resolved(path),
+        "root": resolved(path.parent),
+        "name": path.name,
+        "kind": "directory" if is_dir else "file",
+        "modified_at": stat.st_mtime,
+        "size_bytes": size,
+        "file_count": len(files),
+        "files": files,
+        "model": None,
+        "tier": None,
+        "prompts": None,
+        "succeeded": None,
+        "errors": None,
+        "report_html": resolved(path / "report.html") if "report.html" in files else None,
+        "report_markdown": resolved(path / "report.md") if "report.md" in files else None,
+        "metrics_json": resolved(path / "metrics.json") if "metrics.json" in files else None,
+    }
+    if "metrics.json" in files:
+        metrics = _read_json(path / "metrics.json")
+        entry["prompts"] = _count(metrics.get("total_prompts"))
+        entry["succeeded"] = _count(metrics.get("successful_responses"))
+        entry["errors"] = _count(metrics.get("errors"))
+    if "run.jsonl" in files:
+        entry["model"] = _first_model(path / "run.jsonl")
+    return entry
+
+
+async def record(path: Any, **metadata: Any) -> None:
+    """Describe a finished run and store it, with ``metadata`` (model, tier)
+    taking precedence over what the files say."""
+    entry = await asyncio.to_thread(describe, Path(path))
+    entry.update({key: value for key, value in metadata.items() if value is not None})
+    async with db_session() as session:
+        await session.merge(OutputCatalogEntry(**entry))
+        await session.commit()
+
+
+class OutputCatalog:
+    def __init__(self, sync_interval: float = SYNC_INTERVAL) -> None:
+        self._sync_interval = sync_interval
+        self._synced: Dict[Tuple[str, ...], float] = {}
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    async def sync(self, roots: Iterable[str], force: bool = False) -> None:
+        """Bring the rows under ``roots`` in line with the disk."""
+        roots = tuple(roots)
+        last = self._synced.get(roots)
+        if not force and last is not None and time.monotonic() - last < self._sync_interval:
+            return
+        async with self._lock():
+            current = await asyncio.to_thread(_scan, roots)
+            async with db_session() as session:
+                known = {
+                    row.path: row for row in (await session.execute(
+                        select(OutputCatalogEntry.path, OutputCatalogEntry.modified_at,
+                               *[getattr(OutputCatalogEntry, c) for c in _RUN_METADATA])
+                        .where(OutputCatalogEntry.root.in_(roots))
+                    )).all()
+                }
+            changed = [p for p, (_, _, mtime) in current.items() if p not in known or known[p].modified_at != mtime]
+            gone = [p for p in known if p not in current]
+            entries = await asyncio.to_thread(_describe_all, [current[p] for p in changed])
+            for entry in entries:
+                previous = known.get(entry["path"])
+                for key in _RUN_METADATA:
+                    if entry[key] is None and previous is not None:
+                        entry[key] = getattr(previous, key)
+            # replace changed rows in bulk: a first sync can be thousands of runs
+            stale = [e["path"] for e in entries if e["path"] in known] + gone
+            async with db_session() as session:
+                for i in range(0, len(stale), _CHUNK):
+                    await session.execute(
+                        delete(OutputCatalogEntry).where(OutputCatalogEntry.path.in_(stale[i:i + _CHUNK]))
+                    )
+                if entries:
+                    await session.execute(insert(OutputCatalogEntry), entries)
+                await session.commit()
+            self._synced[roots] = time.monotonic()
+
+    async def list(
+        self,
+        roots: Iterable[str],
+        limit: int = 100,
+        cursor: Optional[Tuple[Any, str]] = None,
+        sort: str = "modified",
+        descending: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, str]]]:
+        """One page of entries under ``roots`` and the (sort value, path) key
+        of the next page, or None on the last page."""
+        column = SORT_COLUMNS[sort]
+        query = select(OutputCatalogEntry).where(OutputCatalogEntry.root.in_(tuple(roots)))
+        if cursor:
+            value, last_path = cursor
+            if descending:
+                query = query.where(or_(column < value, and_(column == value, OutputCatalogEntry.path < last_path)))
+            else:
+                query = query.where(or_(column > value, and_(column == value, OutputCatalogEntry.path > last_path)))
+        if descending:
+            query = query.order_by(column.desc(), OutputCatalogEntry.path.desc())
+        else:
+            query = query.order_by(column.asc(), OutputCatalogEntry.path.asc())
+        async with db_session() as session:
+            rows = (await session.execute(query.limit(limit + 1))).scalars().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (getattr(rows[-1], column.key), rows[-1].path)
+        return [{c: getattr(row, c) for c in _COLUMNS} for row in rows], next_cursor
+
+    def _lock(self) -> asyncio.Lock:
+        # one sync at a time; created on first use like AppJobStore's flush lock
+        loop = asyncio.get_running_loop()
+        if self._sync_lock is None or self._lock_loop is not loop:
+            self._sync_lock, self._lock_loop = asyncio.Lock(), loop
+        return self._sync_lock
+
+
+def _scan(roots: Tuple[str, ...]) -> Dict[str, Tuple[Path, str, float]]:
+    """{resolved path: (path, root, mtime)} for every cataloged child of the roots."""
+    found: Dict[str, Tuple[Path, str, float]] = {}
+    for root in roots:
+        try:
+            children = list(os.scandir(root))
+        except OSError:
+            continue
+        for child in children:
+            if child.name.startswith("."):
+                continue
+            try:
+                is_dir = child.is_dir()
+                if not is_dir and Path(child.name).suffix.lower() not in OUTPUT_SUFFIXES:
+                    continue
+                key = resolved(Path(child.path)) if child.is_symlink() else os.path.join(root, child.name)
+                found.setdefault(key, (Path(child.path), root, child.stat().st_mtime))
+            except OSError:
+                continue
+    return found
+
+
+def _describe_all(found: List[Tuple[Path, str, float]]) -> List[Dict[str, Any]]:
+    entries = []
+    for path, root, _ in found:
+        try:
+            entries.append({**describe(path), "root": root})
+        except OSError as e:
+            logging.warning("Skipping output %s: %s", path, e)
+    return entries
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _count(value: Any) -> Optional[int]:
+    return int(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _first_model(path: Path, max_lines: int = 20) -> Optional[str]:
+    """The model of the first request in a run log, without reading the rest."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            for _, line in zip(range(max_lines), f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "request" and record.get("model"):
+                    return str(record["model"])
+    except OSError:
+        pass
+    return None
@@ -0,0 +1,154 @@
+"""
+Coalesced progress events for run streams.
+
+The runner reports a ``start_prompt`` and an ``end_prompt`` for every
+entry; forwarding each one as its own SSE frame means thousands of frames
+per run, and the browser and the macOS app re-render on every one.
+``ProgressCoalescer`` sits between the runner callback and the RunBus: it
+folds those events into one running aggregate and publishes it as a single
+``progress`` event at most ``max_hz`` times a second.
+
+- the first change after a quiet period is sent right away; changes inside
+  the interval are held and the latest state goes out when it ends, so the
+  last frame always reflects the last event.
+- a failed ``end_prompt`` is forwarded immediately (after the pending
+  snapshot), and any event it doesn't aggregate passes through unchanged.
+- ``close()`` sends the pending snapshot; call it before the terminal
+  complete/error/cancelled event so nothing lands after it.
+
+``max_hz <= 0`` turns coalescing off and forwards every event as-is.
+
+progress data::
+
+    {"completed": 40, "total": 120, "succeeded": 38, "failed": 2,
+     "in_flight": ["p41", "p42"], "in_flight_count": 2, "current": "p42",
+     "throughput": 3.1, "eta_s": 25.8, "elapsed_s": 12.9, "events": 82}
+
+``throughput`` is completed prompts per second since the first event,
+``eta_s`` is None until a total is known and something has completed.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+IN_FLIGHT_LIMIT = 20
+
+
+class ProgressCoalescer:
+    def __init__(
+        self,
+        publish: Callable[[Dict[str, Any]], Awaitable[None]],
+        max_hz: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._publish = publish
+        self._interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self._clock = clock
+        self._in_flight: Dict[str, None] = {}  # insertion-ordered set
+        self._total = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._events = 0
+        self._current: Optional[str] = None
+        self._started: Optional[float] = None
+        self._last_emit: Optional[float] = None
+        self._dirty = False
+        self._pending: Optional[asyncio.Task] = None
+        self.frames = 0
+
+    async def feed(self, event: str, data: Any) -> None:
+        """Fold one runner event into the aggregate, or forward it."""
+        if not self._interval:
+            await self._send(event, data)
+            return
+        parsed = _try_json(data) if isinstance(data, str) else data
+        if not isinstance(parsed, dict) or not self._observe(event, parsed):
+            await self.flush()
+            await self._send(event, data)
+            return
+        if event == "end_prompt" and parsed.get("success") is False:
+            await self.flush()
+            await self._send(event, data)
+            return
+        now = self._clock()
+        if self._last_emit is None or now - self._last_emit >= self._interval:
+            await self.flush()
+        elif self._pending is None:
+            self._pending = asyncio.create_task(self._flush_later(self._last_emit + self._interval - now))
+
+    def _observe(self, event: str, data: Dict[str, Any]) -> bool:
+        if event not in ("run_started", "start_prompt", "end_prompt"):
+            return False
+        self._events += 1
+        if self._started is None:
+            self._started = self._clock()
+        if event == "run_started":
+            self._total += int(data.get("total") or 0)
+        elif event == "start_prompt":
+            entry_id = str(data.get("id"))
+            self._in_flight[entry_id] = None
+            self._current = entry_id
+        else:
+            self._in_flight.pop(str(data.get("id")), None)
+            if data.get("success") is False:
+                self._failed += 1
+            else:
+                self._succeeded += 1
+        self._dirty = True
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = self._succeeded + self._failed
+        elapsed = self._clock() - self._started if self._started is not None else 0.0
+        throughput = completed / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self._total and throughput:
+            eta = round(max(self._total - completed, 0) / throughput, 1)
+        return {
+            "completed": completed,
+            "total": self._total,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "in_flight": list(self._in_flight)[:IN_FLIGHT_LIMIT],
+            "in_flight_count": len(self._in_flight),
+            "current": self._current,
+            "throughput": round(throughput, 2),
+            "eta_s": eta,
+            "elapsed_s": round(elapsed, 1),
+            "events": self._events,
+        }
+
+    async def flush(self) -> None:
+        """Publish the aggregate now if it changed since the last frame."""
+        if self._pending is not None and self._pending is not asyncio.current_task():
+            self._pending.cancel()
+        self._pending = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._last_emit = self._clock()
+        await self._send("progress", self.snapshot())
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def _send(self, event: str, data: Any) -> None:
+        # JSON-encode dict/list payloads so SSE clients can parse cleanly.
+        # sse-starlette serializes via str() by default, which yields Python repr
+        # for dicts (single-quoted), breaking the frontend's JSON.parse(ev.data).
+        if isinstance(data, (dict, list)):
+            data = json.dumps(data, default=str)
+        self.frames += 1
+        await self._publish({"event": event, "data": data})
+
+
+def _try_json(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except Exception:
+        return value
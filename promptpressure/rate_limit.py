@@ -2,6 +2,9 @@ import asyncio
 import time
 from typing import Dict
 
+from promptpressure.monitoring import record_rate_limit_wait
+from promptpressure.tracing import span
+
 class TokenBucket:
     def __init__(self, rate: float, capacity: float):
         """
@@ -49,4 +52,7 @@ class AsyncRateLimiter:
     async def wait(cls, key: str, rate: float = 5.0, burst: float = 10.0):
         # Allow run-time override if not configured, but prioritize existing config
         limiter = cls.get_limiter(key, rate, burst)
-        await limiter.acquire()
+        start = time.monotonic()
+        with span("rate_limit.wait", key=key):
+            await limiter.acquire()
+        record_rate_limit_wait(key, time.monotonic() - start)
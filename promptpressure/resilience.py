@@ -5,6 +5,9 @@ Extracted from cli.py to keep the eval runner focused on orchestration.
 
 import asyncio
 
+from promptpressure.monitoring import record_retry
+from promptpressure.tracing import span
+
 
 def is_retryable(error):
     """Check if an error is a transient infrastructure failure worth retrying.
@@ -59,5 +62,7 @@ async def retry_with_backoff(fn, max_retries=3, base_delay=5.0, max_delay=60.0):
             if not is_retryable(e) or attempt == max_retries:
                 raise
             delay = min(base_delay * (2 ** attempt), max_delay)
-            await asyncio.sleep(delay)
+            record_retry(e, delay)
+            with span("retry.backoff", attempt=attempt + 1, delay=delay, reason=classify_error(e)):
+                await asyncio.sleep(delay)
     raise last_error
@@ -0,0 +1,229 @@
+"""
+Random access into large result files (``results.json``, ``run.jsonl``).
+
+A full multi-turn ``results.json`` is several MB of ``indent=2`` JSON, and
+showing entry N used to mean loading and parsing all of it. ``ResultReader``
+builds a byte-offset index for a file once and then serves entries straight
+from their byte ranges, so memory stays flat however big the file is:
+
+- a JSON array is scanned for the byte span of each top-level object or
+  array (strings are skipped whole, nothing else is parsed); any other
+  file is read as NDJSON, one entry per non-empty line.
+- the index is a small binary file in ``index_dir`` (one per result file,
+  named by a hash of its path): a header with the file's size, mtime and
+  entry count, then 24 bytes per entry (offset, length, 8-byte hash of the
+  entry's ``id``). It is rebuilt when the file's size or mtime changes.
+- entry N is one seek into the index; an id is found by scanning the
+  index's hash column and confirming the candidate entry's id.
+- ``read(offset, length)`` yields an entry's bytes in chunks, so responses
+  can stream them (and honour byte ranges) without holding them.
+
+Only a single entry is ever parsed, for its id while indexing and for
+``turns``.
+"""
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_MAGIC = b"PPRIDX01"
+_HEADER = struct.Struct("<8sQqQ")  # magic, file size, mtime_ns, entry count
+_RECORD = struct.Struct("<QQQ")    # offset, length, id hash
+_CHUNK = 1 << 20
+# a whole string (group 1 is its closing quote, missing if it runs off the
+# buffer) or a bracket
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*(")?|[\[\]{}]', re.S)
+
+
+class ResultIndex:
+    """The byte-offset index of one result file."""
+
+    def __init__(self, path: Path, index_path: Path, count: int) -> None:
+        self.path = path
+        self.index_path = index_path
+        self.count = count
+
+    def span(self, position: int) -> Tuple[int, int]:
+        """(offset, length) of entry ``position`` (0-based)."""
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        with self.index_path.open("rb") as f:
+            f.seek(_HEADER.size + position * _RECORD.size)
+            offset, length, _ = _RECORD.unpack(f.read(_RECORD.size))
+        return offset, length
+
+    def spans(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        start, stop = max(0, start), min(stop, self.count)
+        if start >= stop:
+            return []
+        with self.index_path.open("rb") as f:
+            f.seek(_HEADER.size + start * _RECORD.size)
+            data = f.read((stop - start) * _RECORD.size)
+        return [(offset, length) for offset, length, _ in _RECORD.iter_unpack(data)]
+
+    def find(self, entry_id: Any) -> Optional[int]:
+        """Position of the first entry whose ``id`` is ``entry_id``."""
+        wanted = _id_hash(entry_id)
+        with self.index_path.open("rb") as f:
+            f.seek(_HEADER.size)
+            position = 0
+            while True:
+                data = f.read(_RECORD.size * 4096)
+                if not data:
+                    return None
+                for offset, length, id_hash in _RECORD.iter_unpack(data):
+                    if id_hash == wanted and str(_entry_id(self.load(offset, length))) == str(entry_id):
+                        return position
+                    position += 1
+
+    def load(self, offset: int, length: int) -> Any:
+        """Parse one entry."""
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def read(self, offset: int, length: int, chunk: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield ``length`` bytes from ``offset`` in chunks."""
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            while length > 0:
+                data = f.read(min(chunk, length))
+                if not data:
+                    return
+                length -= len(data)
+                yield data
+
+    def turns(self, position: int, start: int = 0, stop: Optional[int] = None) -> Dict[str, Any]:
+        """A slice of one multi-turn entry's ``turn_responses``."""
+        entry = self.load(*self.span(position))
+        turns = (entry.get("turn_responses") or []) if isinstance(entry, dict) else []
+        return {
+            "id": _entry_id(entry),
+            "turns_total": len(turns),
+            "start": start,
+            "turns": turns[start:stop],
+        }
+
+
+class ResultReader:
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = Path(index_dir)
+
+    def open(self, path: Path) -> ResultIndex:
+        """The index for ``path``, built (or rebuilt) if missing or stale. Blocking."""
+        path = Path(path)
+        stat = path.stat()
+        index_path = self.index_dir / (hashlib.sha1(str(path.resolve()).encode()).hexdigest() + ".idx")
+        try:
+            with index_path.open("rb") as f:
+                magic, size, mtime_ns, count = _HEADER.unpack(f.read(_HEADER.size))
+            if (magic, size, mtime_ns) == (_MAGIC, stat.st_size, stat.st_mtime_ns):
+                return ResultIndex(path, index_path, count)
+        except (OSError, struct.error):
+            pass
+        count = _build(path, index_path, stat)
+        return ResultIndex(path, index_path, count)
+
+
+def _build(path: Path, index_path: Path, stat: os.stat_result) -> int:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "wb") as out, path.open("rb") as src, path.open("rb") as entries:
+            out.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, 0))
+            spans = _scan_array(src) if _is_array(src) else _scan_lines(src)
+            for offset, length in spans:
+                entries.seek(offset)
+                try:
+                    entry_id = _entry_id(json.loads(entries.read(length)))
+                except ValueError:
+                    entry_id = None
+                out.write(_RECORD.pack(offset, length, _id_hash(entry_id)))
+                count += 1
+            out.seek(0)
+            out.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+        os.replace(tmp, index_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _is_array(f) -> bool:
+    while True:
+        data = f.read(4096)
+        if not data:
+            return False
+        stripped = data.lstrip()
+        if stripped:
+            f.seek(0)
+            return stripped[:1] == b"["
+
+
+def _scan_array(f) -> Iterator[Tuple[int, int]]:
+    """(offset, length) of every object/array directly inside the top-level array."""
+    depth, start, base, buf = 0, None, 0, b""
+    while True:
+        chunk = f.read(_CHUNK)
+        if not chunk and not buf:
+            return
+        buf += chunk
+        consumed = len(buf)
+        for match in _TOKEN.finditer(buf):
+            c = buf[match.start()]
+            if c == 0x22:  # a whole string; brackets inside it don't count
+                if match.group(1) is None and chunk:  # runs past the chunk: rescan with the next one
+                    consumed = match.start()
+                    break
+            elif c in (0x5B, 0x7B):  # [ {
+                if depth == 1:
+                    start = base + match.start()
+                depth += 1
+            else:  # ] }
+                depth -= 1
+                if depth == 1 and start is not None:
+                    yield start, base + match.end() - start
+                    start = None
+                elif depth == 0:
+                    return
+        if not chunk:
+            return
+        base += consumed
+        buf = buf[consumed:]
+
+
+def _scan_lines(f) -> Iterator[Tuple[int, int]]:
+    """(offset, length) of every non-empty line."""
+    start, base = 0, 0
+    while True:
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            break
+        i = chunk.find(b"\n")
+        while i != -1:
+            end = base + i
+            if end > start:
+                yield start, end - start
+            start = end + 1
+            i = chunk.find(b"\n", i + 1)
+        base += len(chunk)
+    if base > start:
+        yield start, base - start
+
+
+def _entry_id(entry: Any) -> Any:
+    return entry.get("id") if isinstance(entry, dict) else None
+
+
+def _id_hash(entry_id: Any) -> int:
+    if entry_id is None:
+        return 0
+    return int.from_bytes(hashlib.blake2b(str(entry_id).encode(), digest_size=8).digest(), "little")
@@ -1,23 +1,50 @@
 """
-RunBus: per-run event channel with completion replay and TTL reaping.
+RunBus: per-run event channel with fan-out, replay and TTL reaping.
 
 Replaces the original EVENT_QUEUES dict whose entries were popped on SSE
 disconnect, breaking auto-reconnect and creating a memory leak when
 EventSource never connected at all.
 
+Each run keeps a bounded ring buffer of the last ``buffer_size`` events,
+numbered 1, 2, 3, ... in publish order. Subscribers don't own queues: each
+one reads the ring from its own cursor, so any number of tabs/apps can
+follow the same run without stealing each other's events, and memory stays
+at ``buffer_size`` events per run however many subscribers there are or
+however slow they are.
+
 Lifecycle:
-- start(run_id):                creates an entry, queue, last_active=now
-- publish(run_id, event):       pushes event to queue, bumps last_active
-- mark_completed(run_id, evt):  pushes the final event, flips completed=True
-- subscribe(run_id):            async-iterates queue items; if completed at
-                                subscribe-time, replays final event and exits
+- start(run_id, snapshot=None): creates an entry, last_active=now
+- publish(run_id, event):       numbers the event, appends it to the ring,
+                                wakes subscribers, bumps last_active
+- mark_completed(run_id, evt):  publishes the final event, flips completed=True
+- subscribe(run_id, last_event_id=None):
+                                yields events with seq > last_event_id (all
+                                buffered events when None), each carrying its
+                                seq as "id", until the final event. Resuming
+                                after the final event replays it once.
 - reap_once() / reaper task:    deletes entries where (completed and idle > TTL)
                                 or (any state and idle > idle_ttl)
+
+Slow subscribers drop to a snapshot: when the events a subscriber still
+needs have been pushed out of the ring (it fell ``buffer_size`` events
+behind, or resumed from an id that is too old) it gets one ``snapshot``
+event instead, then continues from the oldest buffered event. The data is
+``snapshot()`` from start() (e.g. the current job state) or, without one,
+``{"dropped": n}``. Publishers never wait on subscribers.
+
+RunBus lives in one process. For an API served by several worker processes
+(``uvicorn --workers N``) use ``SqliteRunBus`` (run_bus_sqlite.py), which has
+the same interface; ``create_bus()`` picks one from ``PROMPTPRESSURE_BUS``.
 """
 import asyncio
+import json
 import logging
+import os
 import time
-from typing import Any, AsyncIterator, Dict, Optional
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from promptpressure.monitoring import SSE_SUBSCRIBERS, retire_run, run_gauge
 
 
 class RunCancelled(Exception):
@@ -30,18 +57,25 @@ class RunBus:
         completed_ttl: float = 300.0,   # 5 minutes
         idle_ttl: float = 1800.0,       # 30 minutes
         reap_interval: float = 60.0,
+        buffer_size: int = 2048,
     ) -> None:
         self._runs: Dict[str, Dict[str, Any]] = {}
         self._completed_ttl = completed_ttl
         self._idle_ttl = idle_ttl
         self._reap_interval = reap_interval
+        self._buffer_size = buffer_size
         self._reaper_task: Optional[asyncio.Task] = None
 
-    def start(self, run_id: str) -> None:
+    def start(self, run_id: str, snapshot: Optional[Callable[[], Any]] = None) -> None:
         self._runs[run_id] = {
-            "queue": asyncio.Queue(),
+            "events": deque(maxlen=self._buffer_size),
+            "seq": 0,
+            "wake": asyncio.Event(),
+            "subscribers": 0,
+            "snapshot": snapshot,
             "completed": False,
             "completion_event": None,
+            "completion_seq": None,
             "last_active": time.monotonic(),
             "cancel_requested": False,
             "task": None,
@@ -79,48 +113,90 @@ class RunBus:
         if self.is_cancelled(run_id):
             raise RunCancelled(f"Run {run_id} was cancelled")
 
-    async def publish(self, run_id: str, event: Dict[str, Any]) -> None:
+    def buffered(self, run_id: str) -> List[Dict[str, Any]]:
+        """Events still in the run's ring buffer, oldest first, with ids."""
         entry = self._runs.get(run_id)
         if entry is None:
+            return []
+        return [_with_id(seq, event) for seq, event in entry["events"]]
+
+    def subscriber_count(self, run_id: str) -> int:
+        entry = self._runs.get(run_id)
+        return entry["subscribers"] if entry is not None else 0
+
+    async def publish(self, run_id: str, event: Dict[str, Any]) -> None:
+        entry = self._runs.get(run_id)
+        if entry is None or entry["completed"]:
             return
-        entry["last_active"] = time.monotonic()
-        await entry["queue"].put(event)
+        self._append(entry, event)
 
     async def mark_completed(self, run_id: str, completion_event: Dict[str, Any]) -> None:
         entry = self._runs.get(run_id)
-        if entry is None:
+        if entry is None or entry["completed"]:
             return
-        # Set completed=True before enqueue. Safe because asyncio.Queue() is unbounded —
-        # put() doesn't yield, so no coroutine can observe completed=True with an empty
-        # queue during the critical window. If maxsize is ever added, revisit this ordering.
         entry["completed"] = True
         entry["completion_event"] = completion_event
+        entry["completion_seq"] = self._append(entry, completion_event)
+
+    def _append(self, entry: Dict[str, Any], event: Dict[str, Any]) -> int:
+        entry["seq"] += 1
+        entry["events"].append((entry["seq"], event))
         entry["last_active"] = time.monotonic()
-        await entry["queue"].put(completion_event)
+        # wake everyone waiting on the current event, then arm a fresh one
+        wake, entry["wake"] = entry["wake"], asyncio.Event()
+        wake.set()
+        return entry["seq"]
 
-    async def subscribe(self, run_id: str) -> AsyncIterator[Dict[str, Any]]:
+    async def subscribe(self, run_id: str, last_event_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
         entry = self._runs.get(run_id)
         if entry is None:
             raise KeyError(run_id)
 
-        # If already completed, replay the completion event and exit.
-        # (Queue may have been drained by a previous subscriber.)
-        if entry["completed"] and entry["queue"].empty():
-            yield entry["completion_event"]
+        cursor = last_event_id or 0
+        if cursor > entry["seq"]:
+            cursor = 0  # an id from before a restart: not ours, start from the buffer
+        # Resuming past the final event: replay it so a late reconnect still
+        # learns how the run ended.
+        if entry["completed"] and cursor >= entry["completion_seq"]:
+            yield _with_id(entry["completion_seq"], entry["completion_event"])
             return
 
+        entry["subscribers"] += 1
+        gauge = run_gauge(SSE_SUBSCRIBERS, run_id)
+        gauge.inc()
         try:
             while True:
-                item = await entry["queue"].get()
-                entry["last_active"] = time.monotonic()
-                if item is None:
-                    return
-                yield item
-                if entry["completed"] and entry["queue"].empty():
-                    return
-        except asyncio.CancelledError:
-            # Subscriber went away — DO NOT pop the entry. The reaper handles eviction.
-            raise
+                wake = entry["wake"]
+                events = entry["events"]
+                while cursor < entry["seq"]:
+                    oldest = events[0][0]
+                    if oldest > cursor + 1:
+                        # what this subscriber still needed fell out of the ring
+                        yield self._snapshot_event(entry, oldest - cursor - 1, oldest - 1)
+                        cursor = oldest - 1
+                        continue
+                    seq, event = events[cursor + 1 - oldest]
+                    cursor = seq
+                    entry["last_active"] = time.monotonic()
+                    yield _with_id(seq, event)
+                    if seq == entry["completion_seq"]:
+                        return
+                await wake.wait()
+                if self._runs.get(run_id) is not entry:
+                    return  # reaped
+        finally:
+            # Subscriber went away: DO NOT pop the entry. The reaper handles eviction.
+            entry["subscribers"] -= 1
+            gauge.dec()
+
+    def _snapshot_event(self, entry: Dict[str, Any], dropped: int, seq: int) -> Dict[str, Any]:
+        data: Any = {"dropped": dropped}
+        if entry["snapshot"] is not None:
+            try:
+                data = entry["snapshot"]()
+            except Exception as e:
+                logging.warning("RunBus snapshot failed: %s", e)
+        return {"event": "snapshot", "data": json.dumps(data, default=str), "id": str(seq)}
 
     async def reap_once(self) -> None:
         now = time.monotonic()
@@ -132,12 +208,12 @@ class RunBus:
             elif idle > self._idle_ttl:
                 to_delete.append(run_id)
         for rid in to_delete:
-            entry = self._runs.get(rid)
+            entry = self._runs.pop(rid, None)
             if entry is not None:
-                # Wake any blocked subscriber with the sentinel so subscribe() exits cleanly.
-                await entry["queue"].put(None)
+                # Wake any blocked subscriber so subscribe() sees the entry is gone and exits.
+                entry["wake"].set()
+            retire_run(rid)
             logging.info("RunBus reaped run %s", rid)
-            self._runs.pop(rid, None)
 
     async def _reaper_loop(self) -> None:
         try:
@@ -159,3 +235,31 @@ class RunBus:
             except asyncio.CancelledError:
                 pass
             self._reaper_task = None
+
+
+def create_bus():
+    """The bus named by ``PROMPTPRESSURE_BUS``: ``memory`` (default) or ``sqlite``.
+
+    ``sqlite`` keeps its state in ``PROMPTPRESSURE_BUS_PATH`` (default
+    ``data/run_bus.db``), which every API worker on the machine must share.
+    """
+    backend = os.getenv("PROMPTPRESSURE_BUS", "memory").strip().lower()
+    if backend == "memory":
+        return RunBus()
+    if backend == "sqlite":
+        from promptpressure.run_bus_sqlite import SqliteRunBus
+
+        return SqliteRunBus(os.getenv("PROMPTPRESSURE_BUS_PATH", os.path.join("data", "run_bus.db")))
+    raise ValueError(f"PROMPTPRESSURE_BUS must be 'memory' or 'sqlite', got {backend!r}")
+
+
+def _with_id(seq: int, event: Dict[str, Any]) -> Dict[str, Any]:
+    return {**event, "id": str(seq)}
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """The integer seq from a Last-Event-ID header; None when absent or not ours."""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,421 @@
+"""
+SqliteRunBus: a RunBus that works across processes on one machine.
+
+``RunBus`` keeps runs in process memory, so with ``uvicorn --workers N`` a
+subscriber (or a cancel request) that lands on another worker never sees
+the run. ``SqliteRunBus`` has the same interface and semantics, but keeps
+its state in a small SQLite file (WAL mode) that every worker opens:
+
+- ``runs``: one row per run (last seq, completion, cancel flag, last
+  activity), ``events``: the ring buffer, the last ``buffer_size`` events of
+  each run keyed by (run_id, seq).
+- publish appends an event and trims the ring in one transaction.
+- each process polls a followed run's seq every ``poll_interval`` seconds
+  (once per run, not per subscriber) and wakes its subscribers when it
+  moves; they then read the rows past their cursor. A publish in the same
+  process wakes them right away.
+- cancel sets the run's cancel flag. The process that registered the run's
+  task notices it within ``poll_interval`` (the watcher runs alongside the
+  reaper) and cancels the task, so cancel works from any worker.
+- the reaper deletes runs by wall-clock idle time, from whichever worker
+  runs it first.
+
+The event loop never waits on another worker's write lock. Reads run on
+the loop (WAL readers don't block on writers). Publishes, completions and
+reaps go to one writer thread with its own connection, which may wait out
+a busy lock (``busy_timeout``). ``start`` and ``cancel`` are synchronous: they
+try once on the loop's connection with a short ``loop_busy_timeout`` and
+hand the write to the writer thread if the database is locked, keeping the
+outcome visible to this process until it lands.
+
+What stays per process: registered tasks, ``snapshot`` callables (a
+subscriber in another process that falls behind gets ``{"dropped": n}``)
+and ``subscriber_count``.
+
+Selected with ``PROMPTPRESSURE_BUS=sqlite`` (``PROMPTPRESSURE_BUS_PATH``
+for the file); see ``run_bus.create_bus``.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from promptpressure.monitoring import SSE_SUBSCRIBERS, retire_run, run_gauge
+from promptpressure.run_bus import RunCancelled, _with_id
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    completion_seq INTEGER,
+    completion TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    last_active REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    final INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_runs_cancel ON runs (cancel_requested, completed);
+"""
+_PAGE = 256
+
+
+class SqliteRunBus:
+    def __init__(
+        self,
+        path: str,
+        completed_ttl: float = 300.0,
+        idle_ttl: float = 1800.0,
+        reap_interval: float = 60.0,
+        buffer_size: int = 2048,
+        poll_interval: float = 0.02,
+        busy_timeout: float = 5.0,
+        loop_busy_timeout: float = 0.05,
+    ) -> None:
+        self._completed_ttl = completed_ttl
+        self._idle_ttl = idle_ttl
+        self._reap_interval = reap_interval
+        self._buffer_size = buffer_size
+        self._poll_interval = poll_interval
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._busy_timeout = busy_timeout
+        setup = sqlite3.connect(path, timeout=busy_timeout)
+        setup.execute("PRAGMA journal_mode=WAL")
+        setup.executescript(_SCHEMA)
+        setup.close()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=loop_busy_timeout)
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # the event loop and test/bench threads share the loop's connection
+        self._lock = threading.Lock()
+        # writes that may wait on a lock: one thread, one connection, in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-bus-writer")
+        self._writer_db: Optional[sqlite3.Connection] = None
+        # started / cancelled here, still waiting for the writer thread
+        self._pending_starts: set = set()
+        self._pending_cancels: set = set()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._snapshots: Dict[str, Callable[[], Any]] = {}
+        self._subscribers: Dict[str, int] = {}
+        self._wake: Dict[str, asyncio.Event] = {}
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run ``fn(conn)`` on the writer thread's connection (writer thread only)."""
+        if self._writer_db is None:
+            self._writer_db = sqlite3.connect(self._path, isolation_level=None, timeout=self._busy_timeout)
+            self._writer_db.execute("PRAGMA synchronous=NORMAL")
+        return fn(self._writer_db)
+
+    async def _write_async(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._writer, self._write, fn)
+
+    def _write_now_or_later(self, fn: Callable[[sqlite3.Connection], Any], pending: set, run_id: str) -> None:
+        """Try ``fn`` once on the loop's connection; if another worker holds
+        the lock, queue it for the writer thread and track it in ``pending``.
+        Writes for a run whose start is still queued queue behind it."""
+        if run_id not in self._pending_starts:
+            try:
+                with self._lock:
+                    fn(self._db)
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+        pending.add(run_id)
+
+        def later(conn: sqlite3.Connection) -> None:
+            try:
+                fn(conn)
+            finally:
+                pending.discard(run_id)
+
+        self._writer.submit(self._write, later).add_done_callback(_log_failure)
+
+    def _run(self, run_id: str) -> Optional[tuple]:
+        rows = self._query(
+            "SELECT seq, completed, completion_seq, completion, cancel_requested FROM runs WHERE run_id = ?",
+            (run_id,),
+        )
+        return rows[0] if rows else None
+
+    def start(self, run_id: str, snapshot: Optional[Callable[[], Any]] = None) -> None:
+        now = time.time()
+
+        def insert(conn: sqlite3.Connection) -> None:
+            _transaction(conn, [
+                ("DELETE FROM events WHERE run_id = ?", (run_id,)),
+                ("INSERT OR REPLACE INTO runs (run_id, last_active) VALUES (?, ?)", (run_id, now)),
+            ])
+
+        self._pending_cancels.discard(run_id)
+        self._write_now_or_later(insert, self._pending_starts, run_id)
+        if snapshot is not None:
+            self._snapshots[run_id] = snapshot
+
+    def has(self, run_id: str) -> bool:
+        return run_id in self._pending_starts or bool(self._query("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)))
+
+    def register_task(self, run_id: str, task: asyncio.Task) -> None:
+        if self.has(run_id):
+            self._tasks[run_id] = task
+
+    def unregister_task(self, run_id: str) -> None:
+        self._tasks.pop(run_id, None)
+
+    def cancel(self, run_id: str) -> bool:
+        run = self._run(run_id)
+        if run is None and run_id not in self._pending_starts or run is not None and run[1]:
+            return False
+        now = time.time()
+
+        def flag(conn: sqlite3.Connection) -> None:
+            conn.execute("UPDATE runs SET cancel_requested = 1, last_active = ? WHERE run_id = ? AND completed = 0",
+                         (now, run_id))
+
+        self._write_now_or_later(flag, self._pending_cancels, run_id)
+        self._cancel_local(run_id)
+        return True
+
+    def _cancel_local(self, run_id: str) -> None:
+        task = self._tasks.get(run_id)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def is_cancelled(self, run_id: str) -> bool:
+        if run_id in self._pending_cancels:
+            return True
+        run = self._run(run_id)
+        return bool(run and run[4])
+
+    def raise_if_cancelled(self, run_id: str) -> None:
+        if self.is_cancelled(run_id):
+            raise RunCancelled(f"Run {run_id} was cancelled")
+
+    def buffered(self, run_id: str) -> List[Dict[str, Any]]:
+        rows = self._query("SELECT seq, payload FROM events WHERE run_id = ? ORDER BY seq", (run_id,))
+        return [_with_id(seq, json.loads(payload)) for seq, payload in rows]
+
+    def subscriber_count(self, run_id: str) -> int:
+        """Subscribers in this process."""
+        return self._subscribers.get(run_id, 0)
+
+    async def publish(self, run_id: str, event: Dict[str, Any]) -> None:
+        await self._append(run_id, event, final=False)
+
+    async def mark_completed(self, run_id: str, completion_event: Dict[str, Any]) -> None:
+        await self._append(run_id, completion_event, final=True)
+
+    async def _append(self, run_id: str, event: Dict[str, Any], final: bool) -> Optional[int]:
+        payload = json.dumps(event, default=str)
+        now = time.time()
+        buffer_size = self._buffer_size
+
+        def append(conn: sqlite3.Connection) -> Optional[int]:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "UPDATE runs SET seq = seq + 1, last_active = ? WHERE run_id = ? AND completed = 0 RETURNING seq",
+                    (now, run_id),
+                ).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return None
+                seq = row[0]
+                conn.execute("INSERT INTO events (run_id, seq, payload, final) VALUES (?, ?, ?, ?)",
+                             (run_id, seq, payload, int(final)))
+                if final:
+                    conn.execute("UPDATE runs SET completed = 1, completion_seq = ?, completion = ? "
+                                 "WHERE run_id = ?", (seq, payload, run_id))
+                if seq > buffer_size:
+                    conn.execute("DELETE FROM events WHERE run_id = ? AND seq <= ?", (run_id, seq - buffer_size))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return seq
+
+        seq = await self._write_async(append)
+        wake = self._wake.pop(run_id, None)
+        if wake is not None:
+            wake.set()
+        return seq
+
+    async def subscribe(self, run_id: str, last_event_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        run = self._run(run_id)
+        if run is None:
+            raise KeyError(run_id)
+        seq, completed, completion_seq, completion, _ = run
+        cursor = last_event_id or 0
+        if cursor > seq:
+            cursor = 0  # an id from before a restart: not ours, start from the buffer
+        if completed and cursor >= completion_seq:
+            yield _with_id(completion_seq, json.loads(completion))
+            return
+
+        self._subscribers[run_id] = self._subscribers.get(run_id, 0) + 1
+        gauge = run_gauge(SSE_SUBSCRIBERS, run_id)
+        gauge.inc()
+        try:
+            while True:
+                wake = self._wake.setdefault(run_id, asyncio.Event())
+                rows = self._query(
+                    "SELECT seq, payload, final FROM events WHERE run_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (run_id, cursor, _PAGE),
+                )
+                if rows:
+                    oldest = rows[0][0]
+                    if oldest > cursor + 1:
+                        # what this subscriber still needed fell out of the ring
+                        yield self._snapshot_event(run_id, oldest - cursor - 1, oldest - 1)
+                    for seq, payload, final in rows:
+                        cursor = seq
+                        yield _with_id(seq, json.loads(payload))
+                        if final:
+                            return
+                    continue
+                if not self.has(run_id):
+                    return  # reaped
+                self._ensure_tail(run_id)
+                await wake.wait()
+        finally:
+            # Subscriber went away: DO NOT delete the run. The reaper handles eviction.
+            self._subscribers[run_id] -= 1
+            gauge.dec()
+            if not self._subscribers[run_id]:
+                del self._subscribers[run_id]
+
+    def _ensure_tail(self, run_id: str) -> None:
+        tail = self._tails.get(run_id)
+        if tail is None or tail.done():
+            self._tails[run_id] = asyncio.create_task(self._tail(run_id))
+
+    async def _tail(self, run_id: str) -> None:
+        """One poll per run per process, however many subscribers follow it
+        here: wakes them when the run's seq moves (or the run is gone)."""
+        last = None
+        while self._subscribers.get(run_id):
+            rows = self._query("SELECT seq FROM runs WHERE run_id = ?", (run_id,))
+            seq = rows[0][0] if rows else None
+            if seq != last or seq is None:
+                last = seq
+                wake = self._wake.pop(run_id, None)
+                if wake is not None:
+                    wake.set()
+                if seq is None:
+                    break
+            await asyncio.sleep(self._poll_interval)
+        self._tails.pop(run_id, None)
+
+    def _snapshot_event(self, run_id: str, dropped: int, seq: int) -> Dict[str, Any]:
+        data: Any = {"dropped": dropped}
+        snapshot = self._snapshots.get(run_id)
+        if snapshot is not None:
+            try:
+                data = snapshot()
+            except Exception as e:
+                logging.warning("RunBus snapshot failed: %s", e)
+        return {"event": "snapshot", "data": json.dumps(data, default=str), "id": str(seq)}
+
+    async def reap_once(self) -> None:
+        now = time.time()
+
+        def reap(conn: sqlite3.Connection) -> List[str]:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                reaped = [r for (r,) in conn.execute(
+                    "DELETE FROM runs WHERE (completed = 1 AND last_active < ?) OR last_active < ? RETURNING run_id",
+                    (now - self._completed_ttl, now - self._idle_ttl),
+                ).fetchall()]
+                conn.executemany("DELETE FROM events WHERE run_id = ?", [(r,) for r in reaped])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return reaped
+
+        for rid in await self._write_async(reap):
+            self._snapshots.pop(rid, None)
+            wake = self._wake.pop(rid, None)
+            if wake is not None:
+                wake.set()
+            retire_run(rid)
+            logging.info("RunBus reaped run %s", rid)
+
+    async def poll_cancels(self) -> None:
+        """Cancel local tasks of runs that another process asked to cancel."""
+        if not self._tasks:
+            return
+        marks = ",".join("?" * len(self._tasks))
+        rows = self._query(
+            f"SELECT run_id FROM runs WHERE cancel_requested = 1 AND completed = 0 AND run_id IN ({marks})",
+            tuple(self._tasks),
+        )
+        for (run_id,) in rows:
+            self._cancel_local(run_id)
+
+    async def _reaper_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._reap_interval)
+                await self.reap_once()
+        except asyncio.CancelledError:
+            return
+
+    async def _watch_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._poll_interval)
+                await self.poll_cancels()
+        except asyncio.CancelledError:
+            return
+
+    async def start_reaper(self) -> None:
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop_reaper(self) -> None:
+        for name in ("_reaper_task", "_watch_task"):
+            task = getattr(self, name)
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                setattr(self, name, None)
+
+
+def _transaction(conn: sqlite3.Connection, statements: List[tuple]) -> None:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _log_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logging.error("RunBus deferred write failed: %s", future.exception())
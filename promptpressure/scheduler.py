@@ -0,0 +1,208 @@
+"""
+JobScheduler: admission control for runs submitted through the API.
+
+``/evaluate`` and the ``/app/jobs/*`` endpoints used to hand every request
+straight to ``BackgroundTasks``, so a burst of submissions all started at
+once and fought over the same provider rate limits until every one of them
+crawled. The scheduler queues them instead and starts a job only when
+
+- fewer than ``max_concurrent`` jobs are running in total, and
+- fewer than the provider's limit (``per_provider``, else
+  ``default_per_provider``) are running against the same provider.
+
+The queue is ordered by priority (higher first), then submission order.
+A job whose provider is at its limit doesn't hold up jobs behind it for
+other providers.
+
+- submit(job_id, provider, run, priority=0, kind=None): queue ``run`` (an
+                                async callable), start what can start
+- cancel(job_id):               drop a queued job without starting it
+- position(job_id) / eta(job_id):
+                                1-based place in the queue, and the estimated
+                                seconds until it starts
+- close():                      forget the queue, cancel and await running jobs
+
+ETAs come from the mean duration of recently finished jobs of the same
+``kind`` (any kind until one has finished) and ignore per-provider limits,
+so they are estimates; None until anything has finished.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+DURATION_SAMPLES = 20
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        default_per_provider: int = 1,
+        per_provider: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.default_per_provider = max(1, default_per_provider)
+        self.per_provider = dict(per_provider or {})
+        self._queue: List["_Ordered"] = []  # heap of queued entries
+        self._queued: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._by_provider: Dict[str, int] = defaultdict(int)
+        self._durations: Dict[Optional[str], Deque[float]] = defaultdict(lambda: deque(maxlen=DURATION_SAMPLES))
+        self._seq = itertools.count()
+        self._closed = False
+
+    def submit(
+        self,
+        job_id: str,
+        provider: str,
+        run: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        kind: Optional[str] = None,
+    ) -> None:
+        entry = {"id": job_id, "provider": provider, "run": run, "kind": kind,
+                 "key": (-priority, next(self._seq))}
+        self._queued[job_id] = entry
+        heapq.heappush(self._queue, _Ordered(entry))
+        self._dispatch()
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a job that hasn't started. False if it isn't queued."""
+        entry = self._queued.pop(job_id, None)
+        if entry is None:
+            return False
+        self._queue = [o for o in self._queue if o.entry is not entry]
+        heapq.heapify(self._queue)
+        return True
+
+    def is_queued(self, job_id: str) -> bool:
+        return job_id in self._queued
+
+    def is_running(self, job_id: str) -> bool:
+        return job_id in self._running
+
+    def limit(self, provider: str) -> int:
+        return max(1, self.per_provider.get(provider, self.default_per_provider))
+
+    def position(self, job_id: str) -> Optional[int]:
+        return (self.queue_view().get(job_id) or {}).get("position")
+
+    def eta(self, job_id: str) -> Optional[float]:
+        """Estimated seconds until a queued job starts (0 for running jobs)."""
+        if job_id in self._running:
+            return 0.0
+        return (self.queue_view().get(job_id) or {}).get("eta_s")
+
+    def queue_view(self) -> Dict[str, Dict[str, Any]]:
+        """{job_id: {"position", "eta_s"}} for every queued job, in one pass."""
+        now = time.monotonic()
+        # when each slot frees up: running jobs finish after their expected
+        # duration, then each queued job takes the earliest free slot in turn
+        slots: Optional[List[float]] = []
+        for entry in self._running.values():
+            expected = self._expected(entry["kind"])
+            if expected is None:
+                slots = None
+                break
+            slots.append(max(expected - (now - entry["started"]), 0.0))
+        if slots is not None:
+            slots += [0.0] * (self.max_concurrent - len(slots))
+            heapq.heapify(slots)
+        view = {}
+        for position, entry in enumerate(self._ordered(), 1):
+            eta = None
+            if slots is not None:
+                start = heapq.heappop(slots)
+                eta = round(start, 1)
+                expected = self._expected(entry["kind"])
+                if expected is None:
+                    slots = None
+                else:
+                    heapq.heappush(slots, start + expected)
+            view[entry["id"]] = {"position": position, "eta_s": eta}
+        return view
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "max_concurrent": self.max_concurrent,
+            "running_by_provider": {p: n for p, n in self._by_provider.items() if n},
+        }
+
+    async def close(self) -> None:
+        self._closed = True
+        self._queue, self._queued = [], {}
+        tasks = [entry["task"] for entry in self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _ordered(self) -> List[Dict[str, Any]]:
+        return [o.entry for o in sorted(self._queue)]
+
+    def _expected(self, kind: Optional[str]) -> Optional[float]:
+        samples = self._durations.get(kind) or self._durations.get(None)
+        return sum(samples) / len(samples) if samples else None
+
+    def _dispatch(self) -> None:
+        if self._closed or len(self._running) >= self.max_concurrent or not self._queue:
+            return
+        skipped = []
+        while self._queue and len(self._running) < self.max_concurrent:
+            entry = heapq.heappop(self._queue).entry
+            if self._by_provider[entry["provider"]] >= self.limit(entry["provider"]):
+                skipped.append(entry)
+                continue
+            self._start(entry)
+        for entry in skipped:
+            heapq.heappush(self._queue, _Ordered(entry))
+
+    def _start(self, entry: Dict[str, Any]) -> None:
+        del self._queued[entry["id"]]
+        self._running[entry["id"]] = entry
+        self._by_provider[entry["provider"]] += 1
+        entry["started"] = time.monotonic()
+        entry["task"] = asyncio.create_task(self._run(entry))
+
+    async def _run(self, entry: Dict[str, Any]) -> None:
+        try:
+            await entry["run"]()
+            duration = time.monotonic() - entry["started"]
+            self._durations[entry["kind"]].append(duration)
+            self._durations[None].append(duration)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error("Scheduled job %s failed: %s", entry["id"], e, exc_info=True)
+        finally:
+            self._running.pop(entry["id"], None)
+            self._by_provider[entry["provider"]] -= 1
+            self._dispatch()
+
+
+class _Ordered:
+    """Heap item comparing entries by (-priority, submission order)."""
+
+    __slots__ = ("entry",)
+
+    def __init__(self, entry: Dict[str, Any]) -> None:
+        self.entry = entry
+
+    def __lt__(self, other: "_Ordered") -> bool:
+        return self.entry["key"] < other.entry["key"]
+
+
+def parse_provider_limits(value: Optional[str]) -> Tuple[Optional[int], Dict[str, int]]:
+    """``"2,ollama=1,openrouter=4"`` -> (2, {"ollama": 1, "openrouter": 4})."""
+    default, limits = None, {}
+    for part in (value or "").split(","):
+        name, sep, count = part.strip().partition("=")
+        if sep:
+            limits[name.strip()] = int(count)
+        elif name:
+            default = int(name)
+    return default, limits
@@ -0,0 +1,242 @@
+"""
+Full-text search over prompts, responses and reasoning (SQLite FTS5).
+
+Every single-turn result and every turn of a multi-turn sequence is one
+search document: a ``search_docs`` row (evaluation, result, turn, model)
+whose id is the rowid of a row in the contentless ``search_fts`` table
+with three indexed columns, prompt / response / reasoning.
+
+The index is kept in sync by the DBWriter: ``collect`` grabs the texts of
+queued rows before they are externalized to blobs, and ``index`` writes
+the documents in the same transaction as the rows, once their ids exist.
+``reindex`` rebuilds everything from stored rows (databases from before
+search existed, or after a restore).
+
+The FTS table is contentless, so it cannot make snippets itself; ``search``
+reads the hit texts back (resolving blobs) and highlights matches in Python.
+
+Only available on SQLite. Other backends raise ``SearchUnavailable``.
+"""
+
+import html
+import re
+
+from sqlalchemy import delete, insert, select, text
+
+from promptpressure import blobs
+from promptpressure.database import Result, SearchDoc, Turn
+
+
+FIELDS = ("prompt", "response", "reasoning")
+SNIPPET_CHARS = 160
+_OPERATORS = {"AND", "OR", "NOT", "NEAR"}
+
+
+class SearchUnavailable(RuntimeError):
+    """The database backend has no FTS5 index."""
+
+
+def available(session):
+    return session.bind.dialect.name == "sqlite"
+
+
+def collect(rows):
+    """Pair each queued Result/Turn with the texts to index, before blobs
+    replace them. A Result with turns is indexed per turn, not as a whole."""
+    docs = []
+    for row in rows:
+        if not isinstance(row, Result):
+            continue
+        if row.turns:
+            for turn in row.turns:
+                docs.append((row, turn, (turn.user_content, turn.assistant_content, turn.reasoning_text)))
+        else:
+            docs.append((row, None, (row.prompt_text, row.response_text, row.reasoning_text)))
+    return docs
+
+
+async def index(session, docs):
+    """Insert search documents for collected rows. Call after a flush so the
+    rows have ids, inside the same transaction."""
+    if not docs or not available(session):
+        return
+    await _insert(session, [(
+        {"evaluation_id": result.evaluation_id, "result_id": result.id,
+         "turn_id": turn.id if turn is not None else None,
+         "turn": turn.turn if turn is not None else None,
+         "prompt_id": result.prompt_id, "model": result.model},
+        texts,
+    ) for result, turn, texts in docs])
+
+
+async def _insert(session, entries):
+    """entries: (search_docs values, (prompt, response, reasoning)) pairs."""
+    ids = (await session.execute(
+        insert(SearchDoc).returning(SearchDoc.id, sort_by_parameter_order=True),
+        [values for values, _ in entries],
+    )).scalars().all()
+    await session.execute(
+        text("INSERT INTO search_fts(rowid, prompt, response, reasoning) VALUES (:id, :p, :r, :x)"),
+        [{"id": doc_id, "p": t[0] or "", "r": t[1] or "", "x": t[2] or ""}
+         for doc_id, (_, t) in zip(ids, entries)],
+    )
+
+
+async def reindex(sessionmaker, batch_size=500):
+    """Rebuild the index from stored results and turns. Returns the doc count."""
+    async with sessionmaker() as session:
+        if not available(session):
+            raise SearchUnavailable("full-text search needs the sqlite backend")
+        await session.execute(text("INSERT INTO search_fts(search_fts) VALUES ('delete-all')"))
+        await session.execute(delete(SearchDoc))
+        await session.commit()
+
+    total = 0
+    last_id = 0
+    columns = ("id", "evaluation_id", "prompt_id", "model", "prompt_text", "response_text", "reasoning_text")
+    turn_columns = ("id", "result_id", "turn", "user_content", "assistant_content", "reasoning_text")
+    while True:
+        async with sessionmaker() as session:
+            selected = columns + tuple(blobs.ref_columns(columns))
+            rows = (await session.execute(
+                select(*[getattr(Result, c) for c in selected])
+                .where(Result.id > last_id).order_by(Result.id).limit(batch_size)
+            )).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            results = await blobs.resolve(session, [dict(zip(selected, r)) for r in rows])
+
+            selected_turns = turn_columns + tuple(blobs.ref_columns(turn_columns))
+            turn_rows = (await session.execute(
+                select(*[getattr(Turn, c) for c in selected_turns])
+                .where(Turn.result_id.in_([r["id"] for r in results])).order_by(Turn.result_id, Turn.turn)
+            )).all()
+            turns = {}
+            for t in await blobs.resolve(session, [dict(zip(selected_turns, r)) for r in turn_rows]):
+                turns.setdefault(t["result_id"], []).append(t)
+
+            entries = []
+            for r in results:
+                for t in turns.get(r["id"]) or [None]:
+                    if t is None:
+                        texts = (r["prompt_text"], r["response_text"], r["reasoning_text"])
+                    else:
+                        texts = (t["user_content"], t["assistant_content"], t["reasoning_text"])
+                    entries.append(({
+                        "evaluation_id": r["evaluation_id"], "result_id": r["id"],
+                        "turn_id": t["id"] if t else None, "turn": t["turn"] if t else None,
+                        "prompt_id": r["prompt_id"], "model": r["model"],
+                    }, texts))
+            await _insert(session, entries)
+            await session.commit()
+            total += len(entries)
+    return total
+
+
+def query_terms(q):
+    """Plain words of an FTS5 query, for highlighting (operators, column
+    filters and syntax dropped; a trailing * keeps prefix semantics)."""
+    terms = []
+    for token in re.findall(r'[\w*]+', re.sub(r'\b\w+\s*:', " ", q), flags=re.UNICODE):
+        if token in _OPERATORS:
+            continue
+        token = token.strip("*") + ("*" if token.endswith("*") else "")
+        if token.strip("*"):
+            terms.append(token)
+    return terms
+
+
+def snippet(body, terms, mark=("<mark>", "</mark>"), escape=html.escape, width=SNIPPET_CHARS):
+    """Window of ``body`` around the first match of any term, matches wrapped
+    in ``mark``. None when no term occurs."""
+    if not body or not terms:
+        return None
+    pattern = re.compile(
+        r"\b(?:" + "|".join(re.escape(t.rstrip("*")) + (r"\w*" if t.endswith("*") else r"\b") for t in terms) + ")",
+        re.IGNORECASE | re.UNICODE,
+    )
+    first = pattern.search(body)
+    if first is None:
+        return None
+    start = max(0, first.start() - width // 3)
+    end = min(len(body), start + width)
+    window = body[start:end]
+    out, pos = [], 0
+    for m in pattern.finditer(window):
+        out.append(escape(window[pos:m.start()]))
+        out.append(mark[0] + escape(m.group(0)) + mark[1])
+        pos = m.end()
+    out.append(escape(window[pos:]))
+    return ("…" if start > 0 else "") + "".join(out).replace("\n", " ") + ("…" if end < len(body) else "")
+
+
+async def search(session, q, model=None, evaluation_id=None, limit=20, offset=0,
+                 mark=("<mark>", "</mark>"), escape=html.escape):
+    """Ranked hits for an FTS5 query. Returns (hits, has_more).
+
+    Each hit: doc id, evaluation_id, result_id, turn (None for single-turn),
+    prompt_id, model, rank (bm25, lower is better), the field the snippet
+    comes from and the snippet.
+    """
+    if not available(session):
+        raise SearchUnavailable("full-text search needs the sqlite backend")
+    sql = (
+        "SELECT d.id, d.evaluation_id, d.result_id, d.turn_id, d.turn, d.prompt_id, d.model, bm25(search_fts) AS rank "
+        "FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid WHERE search_fts MATCH :q"
+    )
+    params = {"q": q, "limit": limit + 1, "offset": offset}
+    if model is not None:
+        sql += " AND d.model = :model"
+        params["model"] = model
+    if evaluation_id is not None:
+        sql += " AND d.evaluation_id = :eval"
+        params["eval"] = evaluation_id
+    sql += " ORDER BY rank, d.id LIMIT :limit OFFSET :offset"
+    rows = (await session.execute(text(sql), params)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    texts = await _load_texts(session, rows)
+    terms = query_terms(q)
+    hits = []
+    for row in rows:
+        field, snip = None, None
+        bodies = texts.get((row.result_id, row.turn_id), {})
+        for name in ("response", "prompt", "reasoning"):
+            snip = snippet(bodies.get(name), terms, mark, escape)
+            if snip is not None:
+                field = name
+                break
+        hits.append({
+            "id": row.id, "evaluation_id": row.evaluation_id, "result_id": row.result_id,
+            "turn": row.turn, "prompt_id": row.prompt_id, "model": row.model,
+            "rank": round(row.rank, 4), "field": field, "snippet": snip,
+        })
+    return hits, has_more
+
+
+async def _load_texts(session, rows):
+    """{(result_id, turn_id): {field: text}} for the hit documents."""
+    out = {}
+    result_ids = [r.result_id for r in rows if r.turn_id is None]
+    turn_ids = [r.turn_id for r in rows if r.turn_id is not None]
+    if result_ids:
+        cols = ("id", "prompt_text", "response_text", "reasoning_text")
+        selected = cols + tuple(blobs.ref_columns(cols))
+        found = (await session.execute(
+            select(*[getattr(Result, c) for c in selected]).where(Result.id.in_(result_ids))
+        )).all()
+        for r in await blobs.resolve(session, [dict(zip(selected, f)) for f in found]):
+            out[(r["id"], None)] = {"prompt": r["prompt_text"], "response": r["response_text"],
+                                    "reasoning": r["reasoning_text"]}
+    if turn_ids:
+        cols = ("id", "result_id", "user_content", "assistant_content", "reasoning_text")
+        selected = cols + tuple(blobs.ref_columns(cols))
+        found = (await session.execute(
+            select(*[getattr(Turn, c) for c in selected]).where(Turn.id.in_(turn_ids))
+        )).all()
+        for t in await blobs.resolve(session, [dict(zip(selected, f)) for f in found]):
+            out[(t["result_id"], t["id"])] = {"prompt": t["user_content"], "response": t["assistant_content"],
+                                              "reasoning": t["reasoning_text"]}
+    return out
@@ -0,0 +1,137 @@
+"""
+Per-evaluation summaries for PromptPressure runs.
+
+Run lists used to need a scan of every ``Result`` row to show pass rates,
+errors, latency percentiles or cost. ``SummaryAccumulator`` collects those
+figures while the run is in flight (one ``add`` per finished prompt or
+sequence) and turns them into ``EvaluationSummary`` rows at the end:
+
+- one row per (model, category)
+- one rollup per model (category "*")
+- one rollup for the whole run (model "*", category "*")
+
+Percentiles are computed per row from that row's own latencies, so the
+rollups are exact rather than averages of averages.
+
+``summarize_results`` rebuilds the rows from stored ``Result`` rows, for
+runs that finished before summaries existed. Tokens, cost and refusals
+are not stored per result, so those columns stay 0 there.
+"""
+
+from sqlalchemy import select
+
+from promptpressure.database import EvaluationSummary, Result
+
+
+ALL = "*"
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list; None when empty."""
+    if not ordered:
+        return None
+    rank = max(1, -(-round(q * 100) * len(ordered) // 100))  # ceil(q * n)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class _Bucket:
+    __slots__ = ("total", "successes", "refusals", "errors", "infra_errors", "model_errors",
+                 "latencies", "prompt_tokens", "completion_tokens", "cost_usd")
+
+    def __init__(self):
+        self.total = self.successes = self.refusals = 0
+        self.errors = self.infra_errors = self.model_errors = 0
+        self.latencies = []
+        self.prompt_tokens = self.completion_tokens = 0
+        self.cost_usd = 0.0
+
+
+class SummaryAccumulator:
+    """Collects per-result figures during a run. Not thread-safe; fine on
+    one event loop."""
+
+    def __init__(self):
+        self._buckets = {}
+
+    def add(self, model, category=None, success=True, refusal=False, error_type=None,
+            latency_ms=None, prompt_tokens=0, completion_tokens=0, cost_usd=0.0):
+        category = category or ""
+        for key in ((model, category), (model, ALL), (ALL, ALL)):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            bucket.total += 1
+            if success:
+                bucket.successes += 1
+                bucket.refusals += bool(refusal)
+            else:
+                bucket.errors += 1
+                bucket.infra_errors += error_type == "infra"
+                bucket.model_errors += error_type == "model"
+            if latency_ms is not None:
+                bucket.latencies.append(latency_ms)
+            bucket.prompt_tokens += prompt_tokens or 0
+            bucket.completion_tokens += completion_tokens or 0
+            bucket.cost_usd += cost_usd or 0.0
+
+    def rows(self, evaluation_id):
+        """EvaluationSummary rows for everything added so far."""
+        rows = []
+        for (model, category), b in sorted(self._buckets.items()):
+            latencies = sorted(b.latencies)
+            rows.append(EvaluationSummary(
+                evaluation_id=evaluation_id,
+                model=model,
+                category=category,
+                total=b.total,
+                successes=b.successes,
+                refusals=b.refusals,
+                errors=b.errors,
+                infra_errors=b.infra_errors,
+                model_errors=b.model_errors,
+                latency_mean_ms=sum(latencies) / len(latencies) if latencies else None,
+                latency_p50_ms=percentile(latencies, 0.50),
+                latency_p95_ms=percentile(latencies, 0.95),
+                latency_p99_ms=percentile(latencies, 0.99),
+                prompt_tokens=b.prompt_tokens,
+                completion_tokens=b.completion_tokens,
+                cost_usd=round(b.cost_usd, 6),
+            ))
+        return rows
+
+
+async def summarize_results(session, evaluation_id):
+    """Build summary rows for a stored run from its Result rows."""
+    acc = SummaryAccumulator()
+    rows = await session.execute(
+        select(Result.model, Result.category, Result.success, Result.latency_ms)
+        .where(Result.evaluation_id == evaluation_id)
+    )
+    for model, category, success, latency_ms in rows:
+        acc.add(model, category, success=bool(success), latency_ms=latency_ms)
+    return acc.rows(evaluation_id)
+
+
+def summary_dict(row):
+    """API shape of one EvaluationSummary row."""
+    def _round(value):
+        return round(value, 2) if value is not None else None
+
+    return {
+        "model": row.model,
+        "category": row.category,
+        "total": row.total,
+        "successes": row.successes,
+        "refusals": row.refusals,
+        "errors": row.errors,
+        "infra_errors": row.infra_errors,
+        "model_errors": row.model_errors,
+        "success_rate": round(row.successes / row.total, 4) if row.total else None,
+        "latency_mean_ms": _round(row.latency_mean_ms),
+        "latency_p50_ms": _round(row.latency_p50_ms),
+        "latency_p95_ms": _round(row.latency_p95_ms),
+        "latency_p99_ms": _round(row.latency_p99_ms),
+        "prompt_tokens": row.prompt_tokens,
+        "completion_tokens": row.completion_tokens,
+        "cost_usd": row.cost_usd,
+    }
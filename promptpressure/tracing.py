@@ -0,0 +1,234 @@
+"""
+Lightweight tracing for eval runs.
+
+When a run is slow, the question is where the time went: rate-limiter
+waits, provider latency, retry backoff, ``request_delay`` / ``turn_delay``
+sleeps, plugin scorers or database commits. With tracing on (``trace:`` in
+the config, ``--trace``) the runner records a span around each of those
+and writes them to the run's output directory when it ends:
+
+- ``trace.json``: Chrome trace-event format. Open it in Perfetto
+  (ui.perfetto.dev) or ``chrome://tracing``. Every entry gets its own track
+  (tracks are reused once an entry finishes, so there are about
+  ``max_workers`` of them) and its spans nest under it.
+- ``trace.otlp.json``: the OpenTelemetry OTLP/JSON ``ExportTraceServiceRequest``
+  shape (trace/span ids, parent ids, unix-nano times, typed attributes,
+  status), for any tool that reads OTLP. No collector is involved.
+
+``span(name, **attributes)`` is a context manager that works in sync and
+async code. The current tracer and span live in context variables, so
+spans opened in tasks the run creates nest under the span that was current
+when the task was created, and concurrent runs trace separately. With no
+tracer in the context ``span`` returns a shared no-op object: the cost of
+an untraced run is one context-variable lookup per span
+(``scripts/bench_tracing.py``).
+
+A run keeps at most ``max_spans`` spans; later ones are counted as dropped.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+FORMATS = {"chrome": ("trace.json",), "otlp": ("trace.otlp.json",), "both": ("trace.json", "trace.otlp.json")}
+MAX_SPANS = 200_000
+
+_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("promptpressure_tracer", default=None)
+_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("promptpressure_span", default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "span_id", "parent_id", "lane", "owns_lane", "start_ns", "end_ns",
+                 "attributes", "error", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any], lane: bool) -> None:
+        parent = _span.get()
+        self.tracer = tracer
+        self.name = name
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_id = parent.span_id if parent is not None else None
+        # a new track for entries (and anything else asked to run on its own);
+        # children stay on their parent's
+        self.owns_lane = lane or parent is None
+        self.lane = tracer._take_lane() if self.owns_lane else parent.lane
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = self.end_ns = 0
+        self._token: Optional[contextvars.Token] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self._token = _span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        _span.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__
+        self.tracer._finish(self)
+        return False
+
+
+class Tracer:
+    """The spans of one run."""
+
+    def __init__(self, fmt: str = "chrome", max_spans: int = MAX_SPANS, name: str = "promptpressure") -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"trace format must be one of {sorted(FORMATS)}, got {fmt!r}")
+        self.format = fmt
+        self.max_spans = max_spans
+        self.name = name
+        self.trace_id = random.getrandbits(128) or 1
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.output_dir: Optional[str] = None
+        # perf_counter for durations, anchored to the wall clock once
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+        self._free_lanes: List[int] = []
+        self._lanes = 0
+
+    def span(self, name: str, attributes: Dict[str, Any], lane: bool = False) -> Span:
+        return Span(self, name, attributes, lane)
+
+    def _take_lane(self) -> int:
+        if self._free_lanes:
+            return self._free_lanes.pop()
+        self._lanes += 1
+        return self._lanes
+
+    def _finish(self, span: Span) -> None:
+        if span.owns_lane:
+            self._free_lanes.append(span.lane)
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def export(self, output_dir: str) -> List[str]:
+        """Write the trace file(s) for ``format`` into ``output_dir``."""
+        paths = []
+        for filename in FORMATS[self.format]:
+            path = os.path.join(output_dir, filename)
+            data = self.chrome_trace() if filename == "trace.json" else self.otlp()
+            # one dumps() call runs the C encoder end to end; dump() to a file
+            # streams through the pure-Python one, several times slower
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, separators=(",", ":"), default=str))
+            paths.append(path)
+        return paths
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        events: List[Dict[str, Any]] = [
+            {"ph": "M", "name": "process_name", "pid": 1, "tid": 0, "args": {"name": self.name}},
+        ]
+        for lane in range(1, self._lanes + 1):
+            events.append({"ph": "M", "name": "thread_name", "pid": 1, "tid": lane, "args": {"name": f"lane {lane}"}})
+        for span in sorted(self.spans, key=lambda s: (s.start_ns, -s.end_ns)):
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "ph": "X", "name": span.name, "cat": span.name.split(".", 1)[0], "pid": 1, "tid": span.lane,
+                "ts": (span.start_ns + self._epoch_ns) / 1000, "dur": (span.end_ns - span.start_ns) / 1000,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"trace_id": f"{self.trace_id:032x}", "dropped_spans": self.dropped}}
+
+    def otlp(self) -> Dict[str, Any]:
+        trace_id = f"{self.trace_id:032x}"
+        spans = []
+        for span in self.spans:
+            out = {
+                "traceId": trace_id,
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns + self._epoch_ns),
+                "endTimeUnixNano": str(span.end_ns + self._epoch_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id is not None:
+                out["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(out)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.name}}]},
+            "scopeSpans": [{"scope": {"name": "promptpressure.tracing"}, "spans": spans}],
+        }]}
+
+
+def span(name: str, **attributes: Any):
+    """A span under the current one, or a no-op when the run isn't traced."""
+    tracer = _tracer.get()
+    if tracer is None:
+        return NOOP
+    return Span(tracer, name, attributes, False)
+
+
+def lane_span(name: str, **attributes: Any):
+    """Like ``span``, but on a track of its own (one per entry)."""
+    tracer = _tracer.get()
+    if tracer is None:
+        return NOOP
+    return Span(tracer, name, attributes, True)
+
+
+def current() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+@contextlib.contextmanager
+def trace_run(fmt: Optional[str], **attributes: Any) -> Iterator[Optional[Tracer]]:
+    """Trace what runs in this context under a root ``run`` span, and write
+    the trace to ``tracer.output_dir`` (once the run sets it) on the way out,
+    also when the run fails or is cancelled. ``fmt`` None/False: no tracing."""
+    if not fmt:
+        yield None
+        return
+    tracer = Tracer("chrome" if fmt is True else fmt)
+    token = _tracer.set(tracer)
+    try:
+        with Span(tracer, "run", attributes, False):
+            yield tracer
+    finally:
+        _tracer.reset(token)
+        if tracer.output_dir:
+            try:
+                for path in tracer.export(tracer.output_dir):
+                    print(f"Trace written: {path}")
+            except OSError as e:
+                print(f"Failed to write trace: {e}")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
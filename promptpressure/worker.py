@@ -0,0 +1,168 @@
+"""
+Run an evaluation in a separate worker process.
+
+``run_evaluation_suite`` does blocking work between its awaits: report
+rendering, ``json.dump`` of every result, tqdm, synchronous file writes.
+Run inside the API server's event loop, that stalls SSE delivery and
+``/health`` for as long as it takes. ``run_in_worker`` runs the suite in a
+child process instead (``python -m promptpressure.worker``) and supervises
+it:
+
+- the config goes to the child on stdin as one JSON line (so API keys never
+  show up in argv). The child moves its own prints to stderr and reports
+  over the original stdout pipe, one JSON line per message:
+  ``{"type": "event", "event", "data"}`` for each runner callback, then
+  ``{"type": "result", "output_dir"}`` or ``{"type": "error", "message"}``.
+- events are handed to ``on_event`` in order, like the in-process callback.
+- cancelling the awaiting task (or ``on_event`` raising) sends the child
+  SIGTERM; the child cancels the suite, which keeps the rows finished so far,
+  and is killed if it hasn't exited after ``TERMINATE_GRACE`` seconds.
+- a child that exits without reporting (crash, OOM kill, segfault) raises
+  ``WorkerCrashed``; an exception inside the suite raises ``WorkerError``
+  with its message. Either way only that run fails.
+
+The API uses it when ``PROMPTPRESSURE_EVAL_WORKER=process``; the ``pp``
+launcher and the macOS sidecar turn that on.
+"""
+import asyncio
+import json
+import os
+import signal
+import sys
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+TERMINATE_GRACE = 10.0
+_LINE_LIMIT = 16 * 1024 * 1024
+# private keys that are plain data and mean something to the runner
+_PASSED_PRIVATE_KEYS = ("_evaluation_id", "_app_job_type")
+
+
+class WorkerError(RuntimeError):
+    """The evaluation failed inside the worker process."""
+
+
+class WorkerCrashed(WorkerError):
+    """The worker process exited without reporting a result."""
+
+
+async def run_in_worker(
+    config: Dict[str, Any],
+    on_event: Callable[[str, Any], Awaitable[None]],
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[None, Optional[str]]:
+    """Run ``run_evaluation_suite(config)`` in a child process.
+
+    Returns ``(None, output_dir)``, shaped like the suite's own return value
+    (the results themselves stay in the database and output files).
+    """
+    from promptpressure import database, monitoring
+
+    payload = {
+        key: value for key, value in config.items()
+        if not key.startswith("_") or key in _PASSED_PRIVATE_KEYS
+    }
+    child_env = dict(os.environ if env is None else env)
+    child_env["DATABASE_URL"] = database.DATABASE_URL
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "promptpressure.worker",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        env=child_env,
+        limit=_LINE_LIMIT,
+    )
+    outcome: Optional[Dict[str, Any]] = None
+    try:
+        try:
+            proc.stdin.write(json.dumps(payload, default=str).encode() + b"\n")
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # died before reading its config; reported as a crash below
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message.get("type") == "event":
+                await on_event(message["event"], message.get("data"))
+            else:
+                outcome = message
+        returncode = await proc.wait()
+    except BaseException:
+        await _terminate(proc)
+        raise
+    finally:
+        if proc.returncode is not None:
+            monitoring.mark_process_dead(proc.pid)
+
+    if outcome is None:
+        if returncode < 0:
+            raise WorkerCrashed(f"eval worker was killed by signal {-returncode}")
+        raise WorkerCrashed(f"eval worker exited with code {returncode} without a result")
+    if outcome["type"] == "error":
+        raise WorkerError(outcome.get("message") or "eval worker failed")
+    return None, outcome.get("output_dir")
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), TERMINATE_GRACE)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+# -- child side ---------------------------------------------------------------
+
+def _child_main() -> int:
+    # the suite prints progress to stdout; keep the real stdout for messages
+    channel = os.fdopen(os.dup(1), "w", buffering=1, encoding="utf-8")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def send(message: Dict[str, Any]) -> None:
+        channel.write(json.dumps(message, default=str) + "\n")
+
+    config = json.loads(sys.stdin.readline())
+    try:
+        output_dir = asyncio.run(_child_run(config, send))
+    except asyncio.CancelledError:
+        send({"type": "error", "message": "Evaluation cancelled"})
+        return 1
+    except SystemExit as e:
+        send({"type": "error", "message": f"Eval task exited with code {e.code}"})
+        return 1
+    except BaseException as e:
+        send({"type": "error", "message": str(e) or repr(e) or type(e).__name__})
+        return 1
+    send({"type": "result", "output_dir": output_dir})
+    return 0
+
+
+async def _child_run(config: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> Optional[str]:
+    from promptpressure.cli import run_evaluation_suite
+    from promptpressure.database import dispose_db
+
+    task = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+    async def callback(event_type: str, data: Any) -> None:
+        send({"type": "event", "event": event_type, "data": data})
+
+    config["_callback"] = callback
+    try:
+        result = await run_evaluation_suite(config, config.get("adapter"))
+    finally:
+        await dispose_db()
+    if isinstance(result, tuple) and len(result) >= 2 and result[1]:
+        return str(result[1])
+    return None
+
+
+if __name__ == "__main__":
+    raise SystemExit(_child_main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark request latency of the API listing endpoints.
+
+Seeds a throwaway SQLite database with --evals evaluations of --results
+results each, then times GET /evaluations and GET /evaluations/{id} in
+process (httpx ASGI transport, no network) two ways:
+
+- per-request engine: the engine is thrown away before every request, so each
+  request pays engine creation + create_all (how api.py used to behave)
+- shared engine: one engine + sessionmaker reused for the process lifetime
+
+    python scripts/bench_api_listing.py --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+
+def _pct(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _seed(database, n_evals: int, n_results: int) -> str:
+    engine = await database.init_db()
+    async with engine.begin() as conn:
+        await conn.execute(database.Evaluation.__table__.insert(), [
+            {"id": f"eval-{i}", "config_snapshot": {}, "status": "completed"} for i in range(n_evals)
+        ])
+        await conn.execute(database.Result.__table__.insert(), [
+            {"evaluation_id": f"eval-{i}", "prompt_id": f"p{j}", "prompt_text": "prompt " * 20,
+             "response_text": "response " * 80, "model": "bench", "adapter": "mock",
+             "latency_ms": 10.0, "success": True}
+            for i in range(n_evals) for j in range(n_results)
+        ])
+    return "eval-0"
+
+
+async def _time(client, path: str, requests: int, before=None) -> list[float]:
+    samples = []
+    for _ in range(requests):
+        if before is not None:
+            await before()
+        start = time.perf_counter()
+        resp = await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+    return samples
+
+
+async def main_async(args) -> int:
+    import httpx
+
+    from promptpressure import database
+    from promptpressure.api import app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        eval_id = await _seed(database, args.evals, args.results)
+
+        print(f"{args.evals} evaluations x {args.results} results, {args.requests} requests per case\n")
+        print(f"  {'endpoint':<24} {'mode':<20} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ("/evaluations", f"/evaluations/{eval_id}"):
+                label = path if path == "/evaluations" else "/evaluations/{id}"
+                for mode, before in (("per-request engine", database.dispose_db), ("shared engine", None)):
+                    await client.get(path)  # warm up
+                    samples = await _time(client, path, args.requests, before)
+                    print(f"  {label:<24} {mode:<20} {statistics.median(samples):8.2f} "
+                          f"{_pct(samples, 0.95):8.2f} {statistics.mean(samples):8.2f}")
+        await database.dispose_db()
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--evals", type=int, default=200)
+    p.add_argument("--results", type=int, default=20)
+    p.add_argument("--requests", type=int, default=200)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
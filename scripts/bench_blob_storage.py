@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark result-text storage: inline text vs compressed content-addressed blobs.
+
+Writes --runs runs x --models models x --sequences multi-turn sequences of
+--turns turns each through the DBWriter, twice: once with texts inline
+(blob_threshold=None, the old layout) and once with blobs. User turns are
+identical across runs and models, like a real corpus; responses are
+generated prose that differs per model. Then prints the VACUUMed database
+size and the API read latency for a results page with text, a single
+result, and a page of turns with text.
+
+    python scripts/bench_blob_storage.py --runs 5 --models 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+from sqlalchemy import text  # noqa: E402
+
+_WORDS = ("the model holds its position and explains the evidence for an old earth with radiometric "
+          "dating ice cores varves and sediment layers while staying polite and not conceding").split()
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _user_turns(sequences: int, turns: int) -> list[list[str]]:
+    rng = random.Random(1)
+    return [[f"[seq {s} turn {t}] " + _prose(rng, 60) for t in range(turns)] for s in range(sequences)]
+
+
+async def _write(database, DBWriter, args, blob_threshold) -> None:
+    engine = await database.init_db()
+    users = _user_turns(args.sequences, args.turns)
+    async with engine.begin() as conn:
+        await conn.execute(database.Evaluation.__table__.insert(), [
+            {"id": f"run-{r}", "config_snapshot": {}, "status": "completed"} for r in range(args.runs)
+        ])
+    writer = DBWriter(engine, blob_threshold=blob_threshold).start()
+    for r in range(args.runs):
+        for m in range(args.models):
+            rng = random.Random(r * 1000 + m)
+            for s, seq in enumerate(users):
+                answers = [_prose(rng, args.response_words) for _ in seq]
+                turns = [database.Turn(evaluation_id=f"run-{r}", prompt_id=f"seq-{s}", model=f"model-{m}",
+                                       turn=t + 1, user_content=u, assistant_content=a)
+                         for t, (u, a) in enumerate(zip(seq, answers))]
+                transcript = "\n\n".join(f"[Turn {t + 1}]\nUser: {u}\nAssistant: {a}"
+                                         for t, (u, a) in enumerate(zip(seq, answers)))
+                await writer.put(database.Result(
+                    evaluation_id=f"run-{r}", prompt_id=f"seq-{s}", prompt_text=repr(seq),
+                    response_text=transcript, model=f"model-{m}", adapter="mock",
+                    latency_ms=1.0, success=True, turns=turns,
+                ))
+    await writer.close()
+    async with engine.connect() as conn:
+        await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        await conn.execute(text("VACUUM"))
+
+
+async def _latency(client, path: str, params: dict, requests: int) -> float:
+    await client.get(path, params=params)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        resp = await client.get(path, params=params)
+        samples.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+    return statistics.median(samples)
+
+
+async def main_async(args) -> int:
+    import httpx
+
+    from promptpressure import database
+    from promptpressure.api import app
+    from promptpressure.db_writer import DBWriter
+
+    reads = [
+        ("results page + text", "/evaluations/run-0/results", {"fields": "prompt_text,response_text", "limit": 50}),
+        ("single result", "/evaluations/run-0/results/1", {}),
+        ("turns page + text", "/evaluations/run-0/turns", {"fields": "user_content,assistant_content", "limit": 200}),
+    ]
+    n_results = args.runs * args.models * args.sequences
+    print(f"{n_results} results, {n_results * args.turns} turns\n")
+    print(f"  {'layout':<8} {'db size':>10}   " + "  ".join(f"{label + ' p50':>24}" for label, _, _ in reads))
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, threshold in (("inline", None), ("blobs", 256)):
+            db_path = os.path.join(tmp, f"{label}.db")
+            database.DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
+            await _write(database, DBWriter, args, threshold)
+            size = os.path.getsize(db_path)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                lat = [await _latency(client, path, params, args.requests) for _, path, params in reads]
+            await database.dispose_db()
+            print(f"  {label:<8} {size / 1e6:8.2f}MB   " + "  ".join(f"{v:21.2f} ms" for v in lat))
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--models", type=int, default=3)
+    p.add_argument("--sequences", type=int, default=30)
+    p.add_argument("--turns", type=int, default=8)
+    p.add_argument("--response-words", type=int, default=250)
+    p.add_argument("--requests", type=int, default=50)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark run event fan-out: in-memory RunBus vs SqliteRunBus across workers.
+
+One publisher sends --events events into a run, --rate per second (0: as
+fast as it can), each stamped with its send time. Subscribers follow the run
+and record how long each event took to reach them.
+
+- memory: RunBus, publisher and all subscribers in one process (the only
+  layout it supports)
+- sqlite: SqliteRunBus, the publisher in this process and the subscribers
+  spread over --workers separate processes, like uvicorn --workers N with
+  SSE clients landing on every worker
+
+Each mode runs --workers x --subscribers subscribers and prints the publish
+rate it sustained, events delivered per second across all subscribers, and
+the delivery latency p50/p99/max.
+
+    python scripts/bench_bus.py --workers 4 --subscribers 25
+    python scripts/bench_bus.py --rate 0 --events 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from promptpressure.run_bus import RunBus  # noqa: E402
+from promptpressure.run_bus_sqlite import SqliteRunBus  # noqa: E402
+
+RUN_ID = "bench"
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _follow(bus, latencies: list) -> None:
+    async for item in bus.subscribe(RUN_ID):
+        if item["event"] == "complete":
+            return
+        latencies.append(time.time() - float(item["data"]))
+
+
+async def _publish(bus, args) -> float:
+    interval = 1 / args.rate if args.rate > 0 else 0.0
+    start = time.perf_counter()
+    for i in range(args.events):
+        if interval:
+            await asyncio.sleep(max(0.0, start + i * interval - time.perf_counter()))
+        await bus.publish(RUN_ID, {"event": "progress", "data": repr(time.time())})
+    elapsed = time.perf_counter() - start
+    await bus.mark_completed(RUN_ID, {"event": "complete", "data": "done"})
+    return elapsed
+
+
+def _worker(path: str, subscribers: int, poll_ms: float, ready, results) -> None:
+    async def main():
+        bus = SqliteRunBus(path, poll_interval=poll_ms / 1000)
+        latencies: list = []
+        followers = [asyncio.create_task(_follow(bus, latencies)) for _ in range(subscribers)]
+        await asyncio.sleep(0.1)  # let every subscriber reach its first poll
+        ready.set()
+        await asyncio.gather(*followers)
+        results.put(latencies)
+
+    asyncio.run(main())
+
+
+async def _memory(args) -> dict:
+    bus = RunBus(buffer_size=max(2048, args.events + 1))
+    bus.start(RUN_ID)
+    latencies: list = []
+    followers = [asyncio.create_task(_follow(bus, latencies))
+                 for _ in range(args.workers * args.subscribers)]
+    await asyncio.sleep(0)
+    elapsed = await _publish(bus, args)
+    start = time.perf_counter()
+    await asyncio.gather(*followers)
+    return {"publish": elapsed, "drain": time.perf_counter() - start, "latencies": latencies}
+
+
+async def _sqlite(args, path: str) -> dict:
+    bus = SqliteRunBus(path, buffer_size=max(2048, args.events + 1), poll_interval=args.poll_ms / 1000)
+    bus.start(RUN_ID)
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    readies, procs = [], []
+    for _ in range(args.workers):
+        ready = ctx.Event()
+        proc = ctx.Process(target=_worker, args=(path, args.subscribers, args.poll_ms, ready, results))
+        proc.start()
+        readies.append(ready)
+        procs.append(proc)
+    for ready in readies:
+        await asyncio.to_thread(ready.wait)
+    elapsed = await _publish(bus, args)
+    start = time.perf_counter()
+    latencies: list = []
+    for _ in procs:
+        latencies += await asyncio.to_thread(results.get)
+    drain = time.perf_counter() - start
+    for proc in procs:
+        proc.join()
+    return {"publish": elapsed, "drain": drain, "latencies": latencies}
+
+
+async def main_async(args) -> int:
+    total = args.workers * args.subscribers
+    rate = f"{args.rate:g}/s" if args.rate > 0 else "unthrottled"
+    print(f"{args.events} events ({rate}) -> {total} subscribers "
+          f"({args.workers} workers x {args.subscribers}), sqlite poll {args.poll_ms:g}ms\n")
+    print(f"  {'bus':<8} {'published':>12} {'delivered':>14} {'p50':>9} {'p99':>9} {'max':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("memory", "sqlite"):
+            if label == "memory":
+                r = await _memory(args)
+            else:
+                r = await _sqlite(args, os.path.join(tmp, "bus.db"))
+            lat = [x * 1000 for x in r["latencies"]]
+            if len(lat) != args.events * total:
+                raise SystemExit(f"{label}: {len(lat)} deliveries, expected {args.events * total}")
+            delivered = len(lat) / (r["publish"] + r["drain"])
+            print(f"  {label:<8} {args.events / r['publish']:8.0f} ev/s {delivered:10.0f} ev/s "
+                  f"{_percentile(lat, 0.5):6.1f} ms {_percentile(lat, 0.99):6.1f} ms {max(lat):6.1f} ms")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--events", type=int, default=1000)
+    p.add_argument("--rate", type=float, default=200.0, help="events per second; 0 publishes unthrottled")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--subscribers", type=int, default=25, help="per worker")
+    p.add_argument("--poll-ms", type=float, default=20.0)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
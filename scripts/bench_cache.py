@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sidecar's listing caches: a hit vs rebuilding the entry.
+
+Runs from the repo root against its real configs/*.yaml and evals_*.json,
+calling the cached functions behind the endpoints directly (no HTTP):
+
+- hit:      signature check (a glob and a stat per file) plus the lookup,
+            what every call costs while nothing changed
+- rebuild:  the entry cleared first, what a 60s TTL expiry used to cost and
+            what a changed file costs now
+- providers: a fresh hit, a stale hit (served while the re-probe runs in the
+            background) and a cold probe of every provider, concurrently
+
+    python scripts/bench_cache.py --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+
+async def _timed(fn, repeat: int, before=None) -> float:
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main_async(args) -> int:
+    from promptpressure import api
+    from promptpressure.cache import file_signature
+
+    async def eval_sets():
+        api._eval_sets_cache.get("eval_sets", api._eval_sets, signature=file_signature("evals_*.json"))
+
+    async def configs():
+        await api.app_configs()
+
+    async def models():
+        await api.list_models("groq")
+
+    rows = []
+    for label, fn, store in (
+        ("/eval-sets", eval_sets, api._eval_sets_cache),
+        ("/app/configs", configs, api._app_configs_cache),
+        ("/models?provider=groq", models, api._models_cache),
+    ):
+        await fn()
+        rows.append((label, await _timed(fn, args.repeat), await _timed(fn, args.repeat, store.clear)))
+
+    await api._providers_page()
+    fresh = await _timed(api._providers_page, args.repeat)
+    for entry in api._providers_cache._entries.values():
+        entry.stored_at -= api.PROVIDER_STATUS_TTL  # make it stale
+    stale = await _timed(api._providers_page, 1)
+    cold = await _timed(api._providers_page, max(1, args.repeat // 20), api._providers_cache.clear)
+
+    print(f"cache hit vs rebuild, median of {args.repeat}\n")
+    print(f"  {'':<24} {'hit':>9} {'rebuild':>10}")
+    for label, hit, rebuild in rows:
+        print(f"  {label:<24} {hit:7.3f}ms {rebuild:8.3f}ms")
+    print(f"\n  /providers: fresh hit {fresh:.3f}ms, stale hit {stale:.3f}ms, cold probe {cold:.1f}ms")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--repeat", type=int, default=200)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark result persistence: per-row commits vs the background DBWriter.
+
+Writes N Result rows into a fresh SQLite file three ways and prints rows/sec:
+
+- per-row commit, default pragmas (the old cli.py path: session + commit per prompt)
+- per-row commit, WAL + synchronous=NORMAL
+- DBWriter (bulk inserts, size/time flush), WAL + synchronous=NORMAL
+
+Rows are produced by --workers concurrent tasks, like eval workers finishing
+prompts. No network, no API keys.
+
+    python scripts/bench_db_writer.py --rows 2000 --workers 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from promptpressure.database import Base, Evaluation, Result, create_engine  # noqa: E402
+from promptpressure.db_writer import DBWriter  # noqa: E402
+
+
+def _row(i: int) -> Result:
+    return Result(
+        evaluation_id="bench", prompt_id=f"p{i}", prompt_text=f"prompt {i} " * 20,
+        response_text=f"response {i} " * 80, model="bench-model", adapter="mock",
+        latency_ms=12.5, success=True, error_message=None,
+    )
+
+
+async def _setup(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with engine.begin() as conn:
+        await conn.execute(Evaluation.__table__.insert().values(id="bench", config_snapshot={}, status="running"))
+
+
+async def _produce(rows: int, workers: int, sink) -> None:
+    async def worker(offset: int) -> None:
+        for i in range(offset, rows, workers):
+            await sink(_row(i))
+
+    await asyncio.gather(*(worker(w) for w in range(workers)))
+
+
+async def bench_per_row(url: str, rows: int, workers: int, tuned: bool) -> float:
+    engine = create_engine(url) if tuned else create_async_engine(url)
+    await _setup(engine)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def sink(row: Result) -> None:
+        async with sessionmaker() as session:
+            session.add(row)
+            await session.commit()
+
+    start = time.perf_counter()
+    await _produce(rows, workers, sink)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+async def bench_writer(url: str, rows: int, workers: int) -> float:
+    engine = create_engine(url)
+    await _setup(engine)
+    start = time.perf_counter()
+    writer = DBWriter(engine).start()
+    await _produce(rows, workers, writer.put)
+    await writer.close()
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+async def main_async(args) -> int:
+    cases = [
+        ("per-row commit (default pragmas)", lambda url: bench_per_row(url, args.rows, args.workers, tuned=False)),
+        ("per-row commit (WAL, sync=NORMAL)", lambda url: bench_per_row(url, args.rows, args.workers, tuned=True)),
+        ("DBWriter bulk (WAL, sync=NORMAL)", lambda url: bench_writer(url, args.rows, args.workers)),
+    ]
+    print(f"{args.rows} rows, {args.workers} concurrent producers\n")
+    baseline = None
+    for label, run in cases:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+            elapsed = await run(url)
+        rate = args.rows / elapsed
+        baseline = baseline or rate
+        print(f"  {label:<36} {elapsed:7.2f}s  {rate:10.0f} rows/s  ({rate / baseline:.1f}x)")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rows", type=int, default=2000)
+    p.add_argument("--workers", type=int, default=10)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
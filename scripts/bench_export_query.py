@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark a cross-run analysis: JSON dicts vs the columnar export.
+
+Answers "success rate per model, and mean turn-1/turn-N response length
+ratio per model" over every run under the given sources two ways:
+
+- json: json.load every results file and loop over the dicts (how the
+  cross-model comparisons are built today)
+- export: read_table over a Parquet export of the same runs, reading only
+  the columns the question needs
+
+The export is built once into a temp dir (incremental re-runs are timed too).
+
+    python scripts/bench_export_query.py results outputs --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from promptpressure import export  # noqa: E402
+
+
+def query_json(runs) -> dict:
+    ok, total, ratios = defaultdict(int), defaultdict(int), defaultdict(list)
+    for run in runs.values():
+        for path in export._run_files(run)["results"]:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                continue
+            for r in data:
+                if not isinstance(r, dict) or "response" not in r:
+                    continue
+                total[r.get("model")] += 1
+                ok[r.get("model")] += bool(r.get("success"))
+                for t in r.get("turn_responses") or []:
+                    ratio = (t.get("metrics") or {}).get("response_length_ratio")
+                    if ratio is not None:
+                        ratios[(r.get("model"), t["turn"])].append(ratio)
+    return {m: ok[m] / total[m] for m in total}, {k: statistics.mean(v) for k, v in ratios.items()}
+
+
+def query_export(out_dir) -> dict:
+    results = export.read_table(out_dir, "results", columns=["model", "success"])
+    rate = results.group_by("model").aggregate([("success", "mean")])
+    turns = export.read_table(out_dir, "turns", columns=["model", "turn", "response_length_ratio"])
+    ratio = turns.group_by(["model", "turn"]).aggregate([("response_length_ratio", "mean")])
+    return rate.num_rows, ratio.num_rows
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("sources", nargs="+")
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+    if not export.PYARROW_AVAILABLE:
+        print("pyarrow is not installed: pip install promptpressure-evals[parquet]")
+        return 1
+
+    runs = export.discover_runs(args.sources)
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        summary = export.export_runs(args.sources, out_dir)
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        export.export_runs(args.sources, out_dir)
+        incremental = time.perf_counter() - start
+        rows = sum(summary["rows"].values())
+        print(f"{len(summary['exported'])} runs, {rows} rows exported in {full:.2f}s "
+              f"(no-change re-export {incremental:.2f}s)\n")
+
+        t_json = _time(lambda: query_json(runs), args.repeat)
+        t_export = _time(lambda: query_export(out_dir), args.repeat)
+        print(f"  {'json dicts':<16} {t_json * 1000:9.1f} ms")
+        print(f"  {'parquet export':<16} {t_export * 1000:9.1f} ms  ({t_json / t_export:.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark latency percentiles: keeping every latency vs a LatencySketch.
+
+Feeds --samples lognormal latencies (a long-tailed response-time shape) to
+both and reports:
+
+- add:       time per recorded latency
+- p50/p90/p99: the sketch's answer against the exact sorted-list one
+- memory:    peak traced allocation of each (the list grows with the run,
+             the sketch with the range of latencies only)
+- merge:     folding --shards sketches together, as merging per-worker
+             collectors does
+
+    python scripts/bench_metrics.py --samples 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def _peak(build) -> int:
+    tracemalloc.start()
+    kept = build()  # noqa: F841 - held until the peak is read
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> int:
+    from promptpressure.metrics import QUANTILES, LatencySketch
+
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--samples", type=int, default=1_000_000)
+    p.add_argument("--shards", type=int, default=16)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    values = [rng.lognormvariate(0.5, 1.0) for _ in range(args.samples)]
+
+    def fill_list():
+        kept = []
+        for v in values:
+            kept.append(v)
+        return kept
+
+    def fill_sketch():
+        sketch = LatencySketch()
+        for v in values:
+            sketch.add(v)
+        return sketch
+
+    start = time.perf_counter()
+    kept = fill_list()
+    list_add = (time.perf_counter() - start) / args.samples * 1e9
+    start = time.perf_counter()
+    sketch = fill_sketch()
+    sketch_add = (time.perf_counter() - start) / args.samples * 1e9
+    start = time.perf_counter()
+    ordered = sorted(kept)
+    sort_ms = (time.perf_counter() - start) * 1000
+
+    shards = [LatencySketch() for _ in range(args.shards)]
+    for i, v in enumerate(values):
+        shards[i % args.shards].add(v)
+    start = time.perf_counter()
+    merged = LatencySketch()
+    for shard in shards:
+        merged.merge(shard)
+    merge_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.samples} latencies, {len(sketch.buckets)} sketch buckets\n")
+    print(f"  {'add, list':<22} {list_add:9.0f} ns")
+    print(f"  {'add, sketch':<22} {sketch_add:9.0f} ns")
+    print(f"  {'sort for percentiles':<22} {sort_ms:9.1f} ms")
+    print(f"  {f'merge {args.shards} sketches':<22} {merge_ms:9.2f} ms")
+    print(f"  {'peak memory, list':<22} {_peak(fill_list) / 1024:9.0f} KB")
+    print(f"  {'peak memory, sketch':<22} {_peak(fill_sketch) / 1024:9.0f} KB\n")
+    for name, q in QUANTILES:
+        exact = ordered[round(q * (len(ordered) - 1))]
+        estimate = sketch.quantile(q)
+        print(f"  {name}: exact {exact:8.4f}s  sketch {estimate:8.4f}s  "
+              f"({abs(estimate - exact) / exact:.2%} off, merged equal: {merged.quantile(q) == estimate})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of the per-run Prometheus instrumentation.
+
+Times, per call, what the runner's hot path now records around each entry
+(entering and leaving a worker slot, one model call with its rate-limiter
+wait, time to first token and tokens/s, one DB-writer row), against the
+same bare operations, and how long one /metrics exposition takes with
+--runs runs' series in the registry:
+
+- slot:        QUEUE_DEPTH / IN_FLIGHT gauges around a semaphore
+- model call:  call_timer + record_rate_limit_wait + record_model_call
+- db row:      queue gauge inc/dec plus a written-rows increment
+- render:      monitoring.render() (what GET /metrics serves)
+
+    python scripts/bench_monitoring.py --calls 200000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def _per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    fn(calls)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> int:
+    from promptpressure import monitoring
+
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--calls", type=int, default=200_000)
+    p.add_argument("--runs", type=int, default=20)
+    args = p.parse_args()
+
+    async def slots(n: int, instrumented: bool) -> None:
+        sem = asyncio.Semaphore(10)
+        queued, in_flight = monitoring.run_gauge(monitoring.QUEUE_DEPTH), monitoring.run_gauge(monitoring.IN_FLIGHT)
+        for _ in range(n):
+            if instrumented:
+                queued.inc()
+            await sem.acquire()
+            if instrumented:
+                queued.dec()
+                in_flight.inc()
+                in_flight.dec()
+            sem.release()
+
+    def model_calls(n: int) -> None:
+        for _ in range(n):
+            with monitoring.call_timer() as timer:
+                monitoring.record_rate_limit_wait("bench", 0.0)
+            monitoring.record_model_call("bench-model", timer.seconds + 1.0, 200)
+
+    def db_rows(n: int) -> None:
+        gauge = monitoring.DB_WRITER_QUEUE.labels(monitoring.current_run())
+        written = monitoring.DB_WRITER_ROWS.labels(monitoring.current_run(), "written")
+        for _ in range(n):
+            gauge.inc()
+            gauge.dec()
+            written.inc()
+
+    with monitoring.run_scope("bench-run"):
+        bare_slot = _per_call(lambda n: asyncio.run(slots(n, False)), args.calls)
+        slot = _per_call(lambda n: asyncio.run(slots(n, True)), args.calls)
+        call = _per_call(model_calls, args.calls)
+        row = _per_call(db_rows, args.calls)
+
+    for i in range(args.runs):
+        with monitoring.run_scope(f"bench-{i}"):
+            model_calls(10)
+            db_rows(10)
+    start = time.perf_counter()
+    body, _ = monitoring.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.calls} calls each, per call\n")
+    print(f"  {'slot, bare semaphore':<28} {bare_slot:8.0f} ns")
+    print(f"  {'slot, with gauges':<28} {slot:8.0f} ns")
+    print(f"  {'model call metrics':<28} {call:8.0f} ns")
+    print(f"  {'db row metrics':<28} {row:8.0f} ns")
+    print(f"  {f'render, {args.runs} runs retained':<28} {render_ms:8.2f} ms ({len(body) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
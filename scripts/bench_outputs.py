@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark /app/outputs listing: walking the outputs root vs the catalog.
+
+Creates --runs synthetic run directories (--files files each, like a run's
+results/metrics/report/run log) and times:
+
+- walk:           what /app/outputs did on every call - stat and list every
+                  child of the root, every file of every run directory
+- catalog page:   one page of --limit entries from the output_catalog table
+                  (a request between syncs)
+- forced sync:    re-checking the root when nothing changed (one stat per run)
+- cold sync:      building the catalog from scratch (once)
+
+    python scripts/bench_outputs.py --runs 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def _walk(root: Path) -> list:
+    """The listing /app/outputs used to build on every request."""
+    entries = []
+    for child in sorted(root.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True):
+        files = sorted(c.name for c in child.iterdir() if c.is_file()) if child.is_dir() else []
+        entries.append({
+            "name": child.name, "path": str(child.resolve()), "modified_at": child.stat().st_mtime,
+            "files": files,
+            "report_html": str((child / "report.html").resolve()) if (child / "report.html").exists() else None,
+            "report_markdown": str((child / "report.md").resolve()) if (child / "report.md").exists() else None,
+            "metrics_json": str((child / "metrics.json").resolve()) if (child / "metrics.json").exists() else None,
+        })
+    return entries
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _timed_async(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main_async(args) -> int:
+    from promptpressure import database
+    from promptpressure.output_catalog import OutputCatalog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "outputs"
+        names = ["results.csv", "results.json", "metrics.json", "report.html", "report.md", "run.jsonl",
+                 "cost.json", "error.log", "metrics_report.json", "summary.md"][:args.files]
+        for i in range(args.runs):
+            run = root / f"2026-01-01_00-{i // 60:02d}-{i % 60:02d}-{i}"
+            run.mkdir(parents=True)
+            for name in names:
+                (run / name).write_text("{}" if name.endswith(".json") else "x", encoding="utf-8")
+            os.utime(run, (1_700_000_000 + i, 1_700_000_000 + i))
+
+        database.DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        await database.init_db()
+        catalog, roots = OutputCatalog(), [str(root.resolve())]
+        start = time.perf_counter()
+        await catalog.sync(roots)
+        cold = (time.perf_counter() - start) * 1000
+        walk = _timed(lambda: _walk(root), args.repeat)
+        page = await _timed_async(lambda: catalog.list(roots, limit=args.limit), args.repeat)
+        resync = await _timed_async(lambda: catalog.sync(roots, force=True), args.repeat)
+        await database.dispose_db()
+
+    print(f"{args.runs} run directories x {len(names)} files, median of {args.repeat}\n")
+    print(f"  {'walk (every request, before)':<34} {walk:9.1f} ms")
+    print(f"  {f'catalog page of {args.limit}':<34} {page:9.1f} ms")
+    print(f"  {'forced sync, nothing changed':<34} {resync:9.1f} ms")
+    print(f"  {'cold sync (first start)':<34} {cold:9.1f} ms")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--runs", type=int, default=2000)
+    p.add_argument("--files", type=int, default=8)
+    p.add_argument("--limit", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=5)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark one app poll cycle: bytes on the wire and latency.
+
+Seeds --jobs finished sidecar jobs and --runs output directories, then
+polls what the macOS app / browser launcher poll (/app/jobs, /app/outputs,
+/providers, /eval-sets) through the in-process ASGI app:
+
+- plain:        no compression, no validators
+- gzip:         first poll of a client that accepts gzip
+- revalidate:   If-None-Match with the tags from the last poll, nothing
+                changed: four 304s
+- snapshot:     /app/snapshot instead of the four calls (first poll, then
+                revalidated)
+
+    python scripts/bench_poll.py --jobs 100 --runs 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+POLLED = ["/app/jobs", "/app/outputs", "/providers", "/eval-sets"]
+
+
+async def _seed(jobs: int) -> None:
+    from promptpressure import database
+    from promptpressure.app_jobs import AppJobStore
+
+    await database.init_db()
+    store = AppJobStore()
+    for i in range(jobs):
+        job = store.create("evaluation", {"provider": "mock", "model": f"model-{i % 7}", "eval_set_ids": ["evals_dataset.json"]})
+        for n in range(1, 41):
+            store.record_event(job["id"], "end_prompt", {"current": n, "total": 40, "id": f"p{n}"})
+        store.complete(job["id"], summary={"model": f"model-{i % 7}", "succeeded": 38, "failed": 2},
+                       outputs=[{"name": "results.json", "path": f"/tmp/run-{i}/results.json", "kind": "file"}])
+    await store.flush()
+    await database.dispose_db()
+
+
+def _cycle(client, paths, headers_for, repeat):
+    """(median ms per cycle, bytes per cycle, last responses)"""
+    samples, sizes, last = [], [], {}
+    for _ in range(repeat):
+        start, size = time.perf_counter(), 0
+        for path in paths:
+            r = client.get(path, headers=headers_for(path))
+            size += r.num_bytes_downloaded + sum(len(k) + len(v) + 4 for k, v in r.headers.items())
+            last[path] = r
+        samples.append((time.perf_counter() - start) * 1000)
+        sizes.append(size)
+    return statistics.median(samples), statistics.median(sizes), last
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--jobs", type=int, default=100)
+    p.add_argument("--runs", type=int, default=500)
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = Path(tmp) / "outputs"
+        for i in range(args.runs):
+            run = outputs / f"2026-01-01_00-{i // 60:02d}-{i % 60:02d}-{i}"
+            run.mkdir(parents=True)
+            for name in ("results.json", "results.csv", "metrics.json", "report.html", "run.jsonl"):
+                (run / name).write_text("{}", encoding="utf-8")
+        os.environ["PROMPTPRESSURE_APP_SUPPORT_DIR"] = str(Path(tmp) / "support")
+        os.environ["PROMPTPRESSURE_OUTPUT_DIR"] = str(outputs)
+
+        from fastapi.testclient import TestClient
+        from promptpressure import database
+
+        database.DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(_seed(args.jobs))
+        database._state = None
+        from promptpressure import api
+
+        with TestClient(api.app) as client:
+            client.get("/app/outputs", params={"refresh": "true"})
+            identity = {"Accept-Encoding": "identity"}
+            gzip = {"Accept-Encoding": "gzip"}
+            rows = []
+            ms, size, _ = _cycle(client, POLLED, lambda _: identity, args.repeat)
+            rows.append(("plain, no gzip or validators", ms, size))
+            ms, size, last = _cycle(client, POLLED, lambda _: gzip, args.repeat)
+            rows.append(("gzip, first poll", ms, size))
+            ms, size, _ = _cycle(client, POLLED, lambda p: {**gzip, "If-None-Match": last[p].headers["etag"]},
+                                 args.repeat)
+            rows.append(("gzip + revalidate (304s)", ms, size))
+            ms, size, last = _cycle(client, ["/app/snapshot"], lambda _: gzip, args.repeat)
+            rows.append(("/app/snapshot, first poll", ms, size))
+            ms, size, _ = _cycle(client, ["/app/snapshot"],
+                                 lambda p: {**gzip, "If-None-Match": last[p].headers["etag"]}, args.repeat)
+            rows.append(("/app/snapshot, revalidate", ms, size))
+
+    print(f"{args.jobs} jobs, {args.runs} output runs; one poll cycle, median of {args.repeat}\n")
+    for label, ms, size in rows:
+        print(f"  {label:<28} {ms:8.1f} ms  {size / 1024:9.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
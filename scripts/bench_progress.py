@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark coalesced progress events on a run stream.
+
+Runs a synthetic evaluation through ``run_eval_background`` (the path
+/evaluate and /app/jobs use): --prompts entries, --concurrency at a time,
+each taking a random 0..--latency-ms, reporting start_prompt/end_prompt
+through the runner callback like cli.run_evaluation_suite does. --subscribers
+readers follow the run on the RunBus and JSON-parse every frame, the way the
+browser and the macOS app do.
+
+Once with every event forwarded (PROGRESS_HZ=0, the previous behavior) and
+once per --hz, it prints the frames and bytes each client received, the
+server CPU time of the run (process time, so the simulated latency doesn't
+count) and the client-side parse time.
+
+    python scripts/bench_progress.py --prompts 5000 --hz 5 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+
+def _fake_suite(args):
+    async def suite(config_dict, adapter):
+        callback = config_dict["_callback"]
+        rng = random.Random(7)
+        sem = asyncio.Semaphore(args.concurrency)
+        await callback("run_started", {"total": args.prompts, "model": "bench"})
+
+        async def one(i):
+            async with sem:
+                await callback("start_prompt", {"id": f"p{i}", "prompt": "x" * 50})
+                latency = rng.random() * args.latency_ms / 1000
+                await asyncio.sleep(latency)
+                ok = rng.random() > args.error_rate
+                await callback("end_prompt", {"id": f"p{i}", "success": ok, "latency": latency,
+                                              "error": None if ok else "rate limited"})
+
+        await asyncio.gather(*(one(i) for i in range(args.prompts)))
+        return [], None
+    return suite
+
+
+async def _client(api, run_id: str, stats: dict) -> None:
+    async for event in api.bus.subscribe(run_id):
+        start = time.perf_counter()
+        try:
+            json.loads(event["data"])
+        except ValueError:
+            pass
+        stats["parse"] += time.perf_counter() - start
+        stats["frames"] += 1
+        stats["bytes"] += len(event["event"]) + len(event["data"]) + len(event["id"]) + 20  # sse framing
+
+
+async def _run(api, args, hz: float) -> dict:
+    api.PROGRESS_HZ = hz
+    run_id = f"bench-{hz}"
+    api.bus.start(run_id)
+    clients = [{"frames": 0, "bytes": 0, "parse": 0.0} for _ in range(args.subscribers)]
+    readers = [asyncio.create_task(_client(api, run_id, c)) for c in clients]
+    await asyncio.sleep(0)
+    cpu, wall = time.process_time(), time.perf_counter()
+    await api.run_eval_background(run_id, {"adapter": "mock"})
+    await asyncio.gather(*readers)
+    return {
+        "cpu": time.process_time() - cpu, "wall": time.perf_counter() - wall,
+        "frames": clients[0]["frames"], "bytes": clients[0]["bytes"],
+        "parse": sum(c["parse"] for c in clients) / len(clients),
+    }
+
+
+async def main_async(args) -> int:
+    import promptpressure.api as api
+
+    api.run_evaluation_suite = _fake_suite(args)
+    print(f"{args.prompts} prompts, concurrency {args.concurrency}, latency 0-{args.latency_ms}ms, "
+          f"{args.subscribers} subscribers\n")
+    print(f"  {'mode':<12} {'frames/client':>13} {'KB/client':>10} {'server cpu':>11} "
+          f"{'client parse':>13} {'wall':>7}")
+    for hz in [0.0, *args.hz]:
+        r = await _run(api, args, hz)
+        label = "every event" if hz == 0 else f"{hz:g} Hz"
+        print(f"  {label:<12} {r['frames']:>13} {r['bytes'] / 1024:>10.1f} {r['cpu'] * 1000:>8.0f} ms "
+              f"{r['parse'] * 1000:>10.1f} ms {r['wall']:>6.2f}s")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--prompts", type=int, default=5000)
+    p.add_argument("--concurrency", type=int, default=20)
+    p.add_argument("--latency-ms", type=float, default=20.0)
+    p.add_argument("--error-rate", type=float, default=0.01)
+    p.add_argument("--subscribers", type=int, default=3)
+    p.add_argument("--hz", type=float, nargs="+", default=[5.0])
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading one entry of a large results.json: load it all vs the index.
+
+Writes a synthetic multi-turn results.json (--entries entries of --turns
+turns, indent=2 like the runner writes it) and measures time and peak Python
+memory (tracemalloc) for:
+
+- full load:      json.load of the whole file, then entries[N] (what the
+                  viewer did to show one entry)
+- index build:    the one-time offset scan that writes the index
+- entry by index: one seek into the index, one read of the entry's bytes
+- entry by id:    a scan of the index's id hashes, then the same read
+- page of 50:     the byte spans for /app/outputs/entries
+
+    python scripts/bench_result_reader.py --entries 2000 --turns 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def _measure(fn, repeat: int):
+    """Median wall time, then peak traced memory from one more (slower) run."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1024
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--entries", type=int, default=2000)
+    p.add_argument("--turns", type=int, default=8)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    from promptpressure.result_reader import ResultReader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "results.json"
+        reply = "The model holds its position on the earlier constraint. " * 20
+        with path.open("w", encoding="utf-8") as f:
+            json.dump([
+                {
+                    "id": f"tc_{i:05d}", "prompt": "turn one", "model": "bench-model",
+                    "turns_completed": args.turns, "turns_total": args.turns,
+                    "turn_responses": [
+                        {"turn": t, "user": f"follow-up {t}", "assistant": reply, "metrics": {"latency_ms": 812.5}}
+                        for t in range(1, args.turns + 1)
+                    ],
+                }
+                for i in range(args.entries)
+            ], f, indent=2)
+        size_mb = path.stat().st_size / 1e6
+        reader = ResultReader(Path(tmp) / "index")
+        target, target_id = args.entries * 3 // 4, f"tc_{args.entries * 3 // 4:05d}"
+
+        def full_load():
+            with path.open(encoding="utf-8") as f:
+                return json.load(f)[target]
+
+        def rebuild():
+            for stale in reader.index_dir.glob("*.idx"):
+                stale.unlink()
+            reader.open(path)
+
+        build = _measure(rebuild, 1)
+        index = reader.open(path)
+        rows = [
+            ("full load, then entries[N]", _measure(full_load, args.repeat)),
+            ("index build (once per file)", build),
+            ("entry by index", _measure(lambda: index.load(*reader.open(path).span(target)), args.repeat)),
+            ("entry by id", _measure(lambda: reader.open(path).find(target_id), args.repeat)),
+            ("page of 50 (spans + bytes)", _measure(
+                lambda: [b"".join(index.read(*s)) for s in reader.open(path).spans(target, target + 50)],
+                args.repeat)),
+        ]
+
+    print(f"{args.entries} entries x {args.turns} turns, {size_mb:.1f} MB, median of {args.repeat}\n")
+    for label, (ms, kib) in rows:
+        print(f"  {label:<30} {ms:9.2f} ms  {kib:10.0f} KiB peak")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark a burst of runs submitted at once, with and without the scheduler.
+
+Simulates --jobs runs against one provider that serves --capacity requests
+per --window-ms (a token-bucket rate limit, like a provider tier). Each run
+sends --prompts requests with --concurrency in flight, and a request over
+the limit gets a 429 and retries with the runner's exponential backoff
+(resilience.retry_with_backoff, --max-retries like the runner's default of
+3, delays scaled by --time-scale); a prompt that runs out of retries fails.
+
+- all at once: every run starts immediately (BackgroundTasks, the old path)
+- scheduled:   the runs go through JobScheduler with --per-provider slots
+
+and prints the burst's makespan, the mean/median time for a run to finish
+(queue wait included), how many requests were rejected with 429 and how
+many prompts failed.
+
+    python scripts/bench_scheduler.py --jobs 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from promptpressure.resilience import retry_with_backoff  # noqa: E402
+from promptpressure.scheduler import JobScheduler  # noqa: E402
+
+
+class Provider:
+    """Token bucket: ``capacity`` requests per ``window`` seconds."""
+
+    def __init__(self, capacity: int, window: float, latency: float) -> None:
+        self.rate = capacity / window
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+        self.latency = latency
+        self.rejected = 0
+        self.failed = 0
+
+    async def request(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1:
+            self.rejected += 1
+            raise RuntimeError("429 rate limit exceeded")
+        self.tokens -= 1
+        await asyncio.sleep(self.latency)
+
+
+async def _run_job(provider: Provider, args) -> None:
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with sem:
+            try:
+                await retry_with_backoff(provider.request, max_retries=args.max_retries,
+                                         base_delay=5.0 * args.time_scale, max_delay=60.0 * args.time_scale)
+            except RuntimeError:
+                provider.failed += 1
+
+    await asyncio.gather(*(one() for _ in range(args.prompts)))
+
+
+async def _burst(args, scheduled: bool) -> dict:
+    provider = Provider(args.capacity, args.window_ms / 1000, args.latency_ms / 1000)
+    sched = JobScheduler(max_concurrent=args.jobs, default_per_provider=args.per_provider)
+    start = time.monotonic()
+    finished = []
+
+    async def job():
+        await _run_job(provider, args)
+        finished.append(time.monotonic() - start)
+
+    if scheduled:
+        for i in range(args.jobs):
+            sched.submit(f"job-{i}", "provider", job)
+        while len(finished) < args.jobs:
+            await asyncio.sleep(0.005)
+    else:
+        await asyncio.gather(*(job() for _ in range(args.jobs)))
+    return {"makespan": max(finished), "mean": statistics.mean(finished),
+            "median": statistics.median(finished), "rejected": provider.rejected, "failed": provider.failed}
+
+
+async def main_async(args) -> int:
+    print(f"{args.jobs} runs x {args.prompts} prompts (concurrency {args.concurrency}), provider limit "
+          f"{args.capacity} req / {args.window_ms:g}ms\n")
+    print(f"  {'mode':<14} {'makespan':>9} {'mean done':>10} {'median done':>12} {'429s':>7} {'failed':>7}")
+    for label, scheduled in (("all at once", False), ("scheduled", True)):
+        r = await _burst(args, scheduled)
+        print(f"  {label:<14} {r['makespan']:8.2f}s {r['mean']:9.2f}s {r['median']:11.2f}s {r['rejected']:>7} {r['failed']:>7}")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--jobs", type=int, default=5)
+    p.add_argument("--prompts", type=int, default=100)
+    p.add_argument("--concurrency", type=int, default=5)
+    p.add_argument("--capacity", type=int, default=12)
+    p.add_argument("--window-ms", type=float, default=100.0)
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument("--per-provider", type=int, default=1)
+    p.add_argument("--max-retries", type=int, default=3)
+    p.add_argument("--time-scale", type=float, default=0.01,
+                   help="multiplies the runner's 5s/60s backoff so the burst runs in seconds")
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
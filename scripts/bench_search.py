@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-text search over a synthetic response corpus.
+
+Writes --responses single-turn results (spread over --runs runs and
+--models models, with a reasoning trace on every --reasoning-every-th one)
+through the DBWriter twice, texts inline both times:
+
+- plain:   no search index (search_index=False)
+- indexed: FTS5 index kept in sync on insert
+
+and prints the ingest rate and database size of each. Then answers "which
+models said X, how often" per query, as a LIKE scan over the plain
+database (what grepping the outputs amounts to) and as an FTS5 match on the
+indexed one, and times GET /search for the first ranked page with snippets.
+
+    python scripts/bench_search.py --responses 100000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+from sqlalchemy import text  # noqa: E402
+
+_WORDS = ("the model holds its position and explains the evidence for an old earth with radiometric "
+          "dating ice cores varves and sediment layers while staying polite and not conceding "
+          "user asks again whether scientists might be wrong about geology history fossils").split()
+# phrases planted in a share of responses: the things people search for
+_PLANTED = (("as an ai language model", 0.02), ("i cannot help with that", 0.01),
+            ("zircon crystals", 0.001), ("let me reconsider", 0.005))
+QUERIES = ('"as an ai"', '"cannot help"', "zircon", "reconsider*", "varves AND fossils")
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    out = [rng.choice(_WORDS) for _ in range(words)]
+    for phrase, share in _PLANTED:
+        if rng.random() < share:
+            out.insert(rng.randrange(len(out)), phrase)
+    return " ".join(out).capitalize() + "."
+
+
+async def _write(database, DBWriter, args, indexed: bool) -> float:
+    engine = await database.init_db()
+    async with engine.begin() as conn:
+        await conn.execute(database.Evaluation.__table__.insert(), [
+            {"id": f"run-{r}", "config_snapshot": {}, "status": "completed"} for r in range(args.runs)
+        ])
+    rng = random.Random(7)
+    writer = DBWriter(engine, blob_threshold=None, search_index=indexed).start()
+    start = time.perf_counter()
+    for i in range(args.responses):
+        reasoning = _prose(rng, 40) if i % args.reasoning_every == 0 else None
+        await writer.put(database.Result(
+            evaluation_id=f"run-{i % args.runs}", prompt_id=f"p{i // args.runs}",
+            prompt_text=_prose(rng, 20), response_text=_prose(rng, args.response_words),
+            reasoning_text=reasoning, model=f"model-{i % args.models}", adapter="mock",
+            latency_ms=1.0, success=True,
+        ))
+    await writer.close()
+    elapsed = time.perf_counter() - start
+    async with engine.connect() as conn:
+        await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    return elapsed
+
+
+async def _like_counts(database, query: str) -> dict:
+    # the closest a LIKE can get: every plain word must appear somewhere
+    from promptpressure.search import query_terms
+
+    clauses, params = [], {}
+    for n, term in enumerate(query_terms(query)):
+        params[f"t{n}"] = f"%{term.rstrip('*')}%"
+        clauses.append(f"(prompt_text LIKE :t{n} OR response_text LIKE :t{n} OR reasoning_text LIKE :t{n})")
+    async with database.db_session() as session:
+        return dict((await session.execute(text(
+            f"SELECT model, count(*) FROM results WHERE {' AND '.join(clauses)} GROUP BY model"), params)).all())
+
+
+async def _fts_counts(database, query: str) -> dict:
+    async with database.db_session() as session:
+        return dict((await session.execute(text(
+            "SELECT d.model, count(*) FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid "
+            "WHERE search_fts MATCH :q GROUP BY d.model"), {"q": query})).all())
+
+
+async def _median_ms(fn, requests: int) -> float:
+    await fn()
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main_async(args) -> int:
+    import httpx
+
+    from promptpressure import database
+    from promptpressure.api import app
+    from promptpressure.db_writer import DBWriter
+
+    print(f"{args.responses} responses, {args.runs} runs x {args.models} models\n")
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, indexed in (("plain", False), ("indexed", True)):
+            db_path = os.path.join(tmp, f"{label}.db")
+            database.DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
+            ingest = await _write(database, DBWriter, args, indexed)
+            print(f"  ingest {label:<8} {ingest:8.2f}s  ({args.responses / ingest:8.0f} rows/s)  "
+                  f"db {os.path.getsize(db_path) / 1e6:7.1f}MB")
+            if not indexed:
+                for q in QUERIES:
+                    timings[q] = [await _median_ms(lambda: _like_counts(database, q), args.requests)]
+            else:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    for q in QUERIES:
+                        timings[q].append(await _median_ms(lambda: _fts_counts(database, q), args.requests))
+
+                        async def _get(q=q):
+                            (await client.get("/search", params={"q": q})).raise_for_status()
+                        timings[q].append(await _median_ms(_get, args.requests))
+                        timings[q].append(sum((await _fts_counts(database, q)).values()))
+            await database.dispose_db()
+
+    print(f"\n  {'query':<22} {'hits':>6} {'LIKE per-model':>15} {'FTS per-model':>14} {'/search page':>13}")
+    for q, (like, fts, page, hits) in timings.items():
+        print(f"  {q:<22} {hits:>6} {like:12.2f} ms {fts:11.2f} ms {page:10.2f} ms")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--responses", type=int, default=100_000)
+    p.add_argument("--runs", type=int, default=10)
+    p.add_argument("--models", type=int, default=5)
+    p.add_argument("--response-words", type=int, default=120)
+    p.add_argument("--reasoning-every", type=int, default=4)
+    p.add_argument("--requests", type=int, default=20)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
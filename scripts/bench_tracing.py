@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of run tracing, with tracing off and on.
+
+- span:     one ``with span(...)`` per call, no tracer (what every
+            untraced run pays at each instrumented point) vs a tracer
+            recording it
+- export:   writing --calls spans as trace.json and trace.otlp.json
+- mock run: wall time of a --entries mock-adapter run (half single-turn,
+            half three-turn, request/turn delays off) without ``trace``
+            and with ``trace: both``, best of --repeats
+
+    python scripts/bench_tracing.py --calls 200000 --entries 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def _per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    fn(calls)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> int:
+    from promptpressure import cli, database, tracing
+
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--calls", type=int, default=200_000)
+    p.add_argument("--entries", type=int, default=500)
+    p.add_argument("--repeats", type=int, default=3)
+    args = p.parse_args()
+
+    def spans(n: int) -> None:
+        for _ in range(n):
+            with tracing.span("adapter.call", model="m"):
+                pass
+
+    off = _per_call(spans, args.calls)
+    tracer = tracing.Tracer("both", max_spans=args.calls)
+    token = tracing._tracer.set(tracer)
+    try:
+        with tracing.lane_span("entry"):
+            on = _per_call(spans, args.calls)
+    finally:
+        tracing._tracer.reset(token)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        tracer.export(tmp)
+        export_ms = (time.perf_counter() - start) * 1000
+        export_kb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1024
+
+        dataset = os.path.join(tmp, "evals.json")
+        with open(dataset, "w", encoding="utf-8") as f:
+            json.dump([
+                {"id": f"p{i}", "tier": "smoke", "eval_criteria": {},
+                 "prompt": [{"role": "user", "content": f"turn {t}"} for t in range(3)] if i % 2 else f"hello {i}"}
+                for i in range(args.entries)
+            ], f)
+
+        ids = itertools.count()
+
+        def run(trace) -> float:
+            i = next(ids)
+            database.DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tmp, f'pp-{i}.db')}"
+            database._state = None
+            config = {
+                "dataset": dataset, "tier": "smoke", "model_name": "mock-model", "max_workers": 8,
+                "output_dir": os.path.join(tmp, f"out-{i}"), "output": "results.csv",
+                "collect_metrics": False, "trace": trace,
+            }
+
+            async def go():
+                start = time.perf_counter()
+                await cli.run_evaluation_suite(config, "mock", request_delay=0, turn_delay=0)
+                elapsed = time.perf_counter() - start
+                await database.dispose_db()
+                return elapsed
+
+            with contextlib.redirect_stdout(io.StringIO()):  # the runner's own summary
+                return asyncio.run(go())
+
+        runs = {None: [], "both": []}
+        for _ in range(args.repeats):
+            for trace in runs:
+                runs[trace].append(run(trace))
+
+    base, traced = min(runs[None]), min(runs["both"])
+    print(f"{args.calls} spans, per span\n")
+    print(f"  {'span, tracing off':<28} {off:8.0f} ns")
+    print(f"  {'span, tracing on':<28} {on:8.0f} ns")
+    print(f"  {'export, both formats':<28} {export_ms:8.0f} ms ({export_kb:.0f} KB)")
+    print(f"\nmock run, {args.entries} entries, best of {args.repeats}\n")
+    print(f"  {'tracing off':<28} {base:8.3f} s")
+    print(f"  {'trace: both':<28} {traced:8.3f} s ({(traced / base - 1) * 100:+.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark API responsiveness while an evaluation runs, in-process vs worker.
+
+Runs one evaluation through ``run_eval_background`` (the /evaluate path)
+with the mock adapter over a synthetic --prompts-entry dataset (long
+prompts, so the result JSON, CSV and report writes have some weight) on a
+local uvicorn server, while a client thread polls GET /health every
+--interval-ms. Once with PROMPTPRESSURE_EVAL_WORKER=inline (the suite runs
+on the API loop) and once with =process (a worker process, events come back
+over a pipe), it prints the run's wall time and the /health latency
+p50/p99/max during it.
+
+    python scripts/bench_worker.py --prompts 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _poll(url: str, interval: float, stop: threading.Event, latencies: list) -> None:
+    import httpx
+
+    with httpx.Client() as client:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get(url).raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+            time.sleep(interval)
+
+
+async def _run(api, url: str, config: dict, mode: str, interval: float) -> dict:
+    api.EVAL_WORKER = mode
+    run_id = f"bench-{mode}"
+    api.bus.start(run_id)
+    latencies, stop = [], threading.Event()
+    poller = threading.Thread(target=_poll, args=(url, interval, stop, latencies))
+    poller.start()
+    start = time.perf_counter()
+    try:
+        await api.run_eval_background(run_id, dict(config))
+    finally:
+        wall = time.perf_counter() - start
+        stop.set()
+        await asyncio.to_thread(poller.join)
+    completion = api.bus._runs[run_id]["completion_event"]
+    if completion["event"] != "complete":
+        raise SystemExit(f"{mode} run failed: {completion['data']}")
+    return {"wall": wall, "p50": statistics.median(latencies),
+            "p99": _percentile(latencies, 0.99), "max": max(latencies), "polls": len(latencies)}
+
+
+async def main_async(args) -> int:
+    import socket
+
+    import uvicorn
+
+    from promptpressure import database
+    import promptpressure.api as api
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = os.path.join(tmp, "evals_bench.json")
+        with open(dataset, "w", encoding="utf-8") as f:
+            json.dump([{"id": f"b{i}", "category": "Bench", "tier": "smoke", "eval_criteria": {},
+                        "prompt": f"prompt {i}: " + "lorem ipsum dolor sit amet " * args.prompt_words}
+                       for i in range(args.prompts)], f)
+        database.DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        config = {
+            "adapter": "mock", "model": "mock-model", "model_name": "mock-model", "dataset": dataset,
+            "tier": "smoke", "output": "results.csv", "output_dir": os.path.join(tmp, "out"),
+            "max_workers": args.concurrency,
+        }
+        server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        results = {}
+        for mode in ("inline", "process"):
+            results[mode] = await _run(api, f"http://127.0.0.1:{port}/health",
+                                       {**config, "_evaluation_id": f"bench-{mode}"}, mode,
+                                       args.interval_ms / 1000)
+        server.should_exit = True
+        await serving
+
+    print(f"{args.prompts} prompts, mock adapter, /health every {args.interval_ms:g}ms\n")
+    print(f"  {'mode':<8} {'run':>7} {'polls':>6} {'/health p50':>12} {'p99':>9} {'max':>9}")
+    for mode, r in results.items():
+        print(f"  {mode:<8} {r['wall']:6.2f}s {r['polls']:>6} {r['p50']:9.2f} ms "
+              f"{r['p99']:6.1f} ms {r['max']:6.1f} ms")
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--prompts", type=int, default=2000)
+    p.add_argument("--prompt-words", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=500)
+    p.add_argument("--interval-ms", type=float, default=10.0)
+    return asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,7 +9,32 @@ now so the test infrastructure is in place before any api.py imports land.
 
 Tests verifying the prod auth path should set PROMPTPRESSURE_API_SECRET via
 monkeypatch.setenv() and importlib.reload(promptpressure.api) inside the test.
+
+Tests that touch the database take ``db_url`` (a fresh sqlite file under
+tmp_path, so nothing lands in data/) or ``db`` (the same, with the schema
+created and the engine disposed afterwards). That includes every test that
+opens ``TestClient(api_module.app)`` (the lifespan runs ``init_db``) or
+runs an evaluation (results are persisted).
 """
 import os
 
 os.environ.setdefault("PROMPTPRESSURE_DEV_NO_AUTH", "1")
+
+import pytest  # noqa: E402
+
+from promptpressure import database  # noqa: E402
+
+
+@pytest.fixture
+def db_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'pp.db'}")
+    database._state = None
+    yield database.DATABASE_URL
+    database._state = None
+
+
+@pytest.fixture
+async def db(db_url):
+    await database.init_db()
+    yield
+    await database.dispose_db()
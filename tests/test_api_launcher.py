@@ -1,4 +1,5 @@
 """Integration tests for the launcher endpoints and the RunBus-backed /evaluate flow."""
+import asyncio
 import importlib
 import os
 
@@ -8,11 +9,25 @@ from fastapi.testclient import TestClient
 import promptpressure.api as api_module
 
 
+# the lifespan and run_eval_background open the database: keep it out of the working tree
+pytestmark = pytest.mark.usefixtures("db_url")
+
+
 @pytest.fixture
 def client():
     importlib.reload(api_module)
     with TestClient(api_module.app) as c:
         yield c
+        # jobs /evaluate scheduled must not outlive the test or its stubs
+        c.portal.call(api_module.scheduler.close)
+
+
+def _drain(client):
+    """Wait for every scheduled job to finish, while the test's stubs are still active."""
+    async def idle():
+        while any(api_module.scheduler.stats()[k] for k in ("queued", "running")):
+            await asyncio.sleep(0.01)
+    client.portal.call(idle)
 
 
 def test_module_import_raises_without_auth_or_dev_flag(monkeypatch):
@@ -60,6 +75,7 @@ def test_evaluate_with_launcher_request_returns_run_id(client, monkeypatch):
     assert "run_id" in body
     assert body["status"] == "started"
     assert body["stream_url"] == f"/stream/{body['run_id']}"
+    _drain(client)
 
 
 def test_evaluate_with_config_dict_returns_run_id(client, monkeypatch):
@@ -82,6 +98,7 @@ def test_evaluate_with_config_dict_returns_run_id(client, monkeypatch):
     body = r.json()
     assert "run_id" in body
     assert body["status"] == "started"
+    _drain(client)
 
 
 def test_stream_unknown_run_id_returns_404(client):
@@ -322,14 +339,12 @@ async def test_run_eval_background_json_encodes_dict_payloads(monkeypatch):
         await cb("end_prompt", {"id": "tc_001", "success": True, "latency": 0.5})
 
     monkeypatch.setattr(api, "run_evaluation_suite", fake_suite)
+    monkeypatch.setattr(api, "PROGRESS_HZ", 0)  # forward every event as-is
 
     api.bus.start("test-json-encode")
     await api.run_eval_background("test-json-encode", {"adapter": "mock"})
 
-    entry = api.bus._runs["test-json-encode"]
-    events = []
-    while not entry["queue"].empty():
-        events.append(entry["queue"].get_nowait())
+    events = api.bus.buffered("test-json-encode")
 
     # Find the start_prompt + end_prompt events
     start_evt = next(e for e in events if e["event"] == "start_prompt")
@@ -363,10 +378,7 @@ async def test_run_eval_background_passes_string_payloads_through(monkeypatch):
     api.bus.start("test-string-passthrough")
     await api.run_eval_background("test-string-passthrough", {"adapter": "mock"})
 
-    entry = api.bus._runs["test-string-passthrough"]
-    events = []
-    while not entry["queue"].empty():
-        events.append(entry["queue"].get_nowait())
+    events = api.bus.buffered("test-string-passthrough")
 
     progress_evt = next(e for e in events if e["event"] == "progress")
     assert progress_evt["data"] == "1/45"  # not '"1/45"'
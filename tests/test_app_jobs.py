@@ -0,0 +1,113 @@
+"""Persistent, compacting job store behind the app sidecar's /app/jobs."""
+import asyncio
+import importlib
+
+from fastapi.testclient import TestClient
+
+from promptpressure import app_jobs, database
+from promptpressure.app_jobs import AppJobStore
+
+
+async def test_events_are_compacted_and_finished_jobs_leave_memory(db):
+    store = AppJobStore()
+    job = store.create("evaluation", {"model": "m", "api_key": "secret"}, job_id="job-1")
+    assert "api_key" not in job["config"]
+    for i in range(1, 501):
+        store.record_event("job-1", "start_prompt", {"id": f"p{i}", "total": 500})
+        store.record_event("job-1", "end_prompt", f'{{"current": {i}, "total": 500}}')
+    store.complete("job-1", summary={"model": "m"}, outputs=[])
+
+    live = await store.get("job-1", events=True)
+    assert live["event_count"] == 1000
+    assert len(live["events"]) == app_jobs.EVENT_TAIL
+    assert live["events"][-1]["data"] == '{"current": 500, "total": 500}'
+    assert len(live["snapshots"]) <= app_jobs.MAX_SNAPSHOTS
+    assert live["snapshots"][-1]["progress"]["completed"] == 500
+
+    await store.flush()
+    assert not store.has("job-1")
+    stored = await store.get("job-1", events=True)
+    assert stored["status"] == "completed" and stored["progress"]["total"] == 500
+    assert stored["events"] == live["events"] and stored["snapshots"] == live["snapshots"]
+    assert "events" not in await store.get("job-1")
+
+
+async def test_memory_stays_flat_over_many_jobs(db):
+    store = AppJobStore()
+    for i in range(2000):
+        store.create("drift_run", {}, job_id=f"j{i:04d}")
+        store.record_event(f"j{i:04d}", "end_prompt", {"current": 1, "total": 1})
+        store.fail(f"j{i:04d}", "boom") if i % 2 else store.complete(f"j{i:04d}", {}, [])
+        if i % 100 == 99:
+            await store.flush()
+    store.create("drift_run", {}, job_id="still-running")
+    await store.flush()
+    assert list(store._jobs) == ["still-running"]
+
+    page, cursor = await store.list(limit=500)
+    assert len(page) == 500 and cursor is not None
+    seen = {j["id"] for j in page}
+    while cursor:
+        page, cursor = await store.list(limit=500, cursor=cursor)
+        seen |= {j["id"] for j in page}
+    assert len(seen) == 2001
+    failed, _ = await store.list(limit=2000, status="failed")
+    assert len(failed) == 1000
+
+
+async def test_restart_fails_jobs_left_running(db, monkeypatch):
+    first = AppJobStore()
+    first.create("evaluation", {}, job_id="orphan")
+    first.update("orphan", status="running", phase="running")
+    first.create("evaluation", {}, job_id="done")
+    first.complete("done", {}, [])
+    await first.flush()
+    await first.heartbeat()
+
+    second = AppJobStore()
+    await second.start()
+    # the first store heartbeated recently: it may be another live worker
+    assert (await second.get("orphan"))["status"] == "running"
+    # once its heartbeat is stale the periodic sweep fails the job
+    monkeypatch.setattr(app_jobs, "STALE_AFTER", 0.0)
+    assert await second.fail_orphans() == 1
+    await second.close()
+    orphan = await second.get("orphan")
+    assert orphan["status"] == "failed" and "stopped" in orphan["error"]
+    assert (await second.get("done"))["status"] == "completed"
+
+
+async def _drain_scheduler(scheduler):
+    while scheduler.stats()["queued"] or scheduler.stats()["running"]:
+        await asyncio.sleep(0.01)
+
+
+def test_job_endpoints_page_and_survive_a_restart(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+
+    async def fake_drift_run(job, payload):
+        return {"summary": {"sequences": 1}, "outputs": []}
+
+    monkeypatch.setattr(api_module, "_execute_drift_run_job", fake_drift_run)
+    with TestClient(api_module.app) as client:
+        ids = [client.post("/app/jobs/drift/run", json={
+            "suite": "drift-v0.1", "provider": "mock", "model": "mock-model",
+        }).json()["id"] for _ in range(3)]
+        client.portal.call(_drain_scheduler, api_module.scheduler)
+        first = client.get("/app/jobs", params={"limit": 2}).json()
+        assert [j["id"] for j in first["jobs"]] == ids[::-1][:2] and first["next_cursor"]
+        rest = client.get("/app/jobs", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert [j["id"] for j in rest["jobs"]] == [ids[0]] and rest["next_cursor"] is None
+
+    # a new process (fresh store) still answers from the table
+    database._state = None
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as client:
+        assert len(client.get("/app/jobs").json()["jobs"]) == 3
+        detail = client.get(f"/app/jobs/{ids[1]}", params={"events": "true"}).json()
+        assert detail["status"] == "completed" and detail["summary"]["sequences"] == 1
+        assert detail["snapshots"][-1]["phase"] == "completed"
+        assert client.get("/app/jobs", params={"type": "drift_calibrate"}).json()["jobs"] == []
@@ -1,6 +1,7 @@
 import asyncio
 import importlib
 import json
+import time
 from pathlib import Path
 
 import pytest
@@ -10,13 +11,23 @@ import promptpressure.api as api_module
 
 
 @pytest.fixture
-def client(tmp_path, monkeypatch):
+def client(db_url, tmp_path, monkeypatch):
     monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "Application Support" / "PromptPressure"))
     importlib.reload(api_module)
     with TestClient(api_module.app) as c:
         yield c
 
 
+def _wait_for_job(client, job_id, timeout=5.0):
+    """Jobs run on the scheduler after the POST returns; poll until terminal."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/app/jobs/{job_id}").json()
+        if job["status"] in {"completed", "failed", "cancelled"} or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+
 def test_health_includes_sidecar_paths(client):
     r = client.get("/health")
     assert r.status_code == 200
@@ -70,11 +81,56 @@ def test_app_outputs_discovers_reports(client, tmp_path, monkeypatch):
     importlib.reload(api_module)
     with TestClient(api_module.app) as c:
         r = c.get("/app/outputs")
+        (outputs / "2026-06-19_12-00-00").mkdir()
+        stale = c.get("/app/outputs").json()
+        fresh = c.get("/app/outputs", params={"refresh": "true", "limit": 1}).json()
+        pages = [fresh]
+        while pages[-1]["next_cursor"]:
+            pages.append(c.get("/app/outputs", params={"limit": 1, "cursor": pages[-1]["next_cursor"]}).json())
 
     assert r.status_code == 200
     item = next(o for o in r.json()["outputs"] if o["name"] == run_dir.name)
     assert item["report_html"].endswith("report.html")
     assert item["metrics_json"].endswith("metrics.json")
+    assert item["files"] == ["metrics.json", "report.html"] and item["size_bytes"] > 0
+    # cached until the next sync (or refresh=true), then newest first, one per page
+    assert "2026-06-19_12-00-00" not in [o["name"] for o in stale["outputs"]]
+    assert all(len(page["outputs"]) == 1 for page in pages)
+    names = [page["outputs"][0]["name"] for page in pages]
+    assert names.index("2026-06-19_12-00-00") < names.index(run_dir.name)
+
+
+def test_app_output_entries_serve_one_entry_at_a_time(db_url, tmp_path, monkeypatch):
+    outputs = tmp_path / "outputs"
+    run_dir = outputs / "2026-06-18_12-00-00"
+    run_dir.mkdir(parents=True)
+    results = [
+        {"id": f"tc_{i}", "turn_responses": [{"turn": t, "assistant": f"a{t}"} for t in range(1, 5)]}
+        for i in range(6)
+    ]
+    (run_dir / "results.json").write_text(json.dumps(results, indent=2), encoding="utf-8")
+    (tmp_path / "secret.json").write_text("[]", encoding="utf-8")
+    path = str(run_dir / "results.json")
+
+    monkeypatch.setenv("PROMPTPRESSURE_OUTPUT_DIR", str(outputs))
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as c:
+        page = c.get("/app/outputs/entries", params={"path": path, "offset": 4, "limit": 10}).json()
+        by_id = c.get("/app/outputs/entry", params={"path": path, "id": "tc_3"})
+        ranged = c.get("/app/outputs/entry", params={"path": path, "index": 3}, headers={"Range": "bytes=0-9"})
+        bad_range = c.get("/app/outputs/entry", params={"path": path, "index": 3}, headers={"Range": "bytes=9999-"})
+        turns = c.get("/app/outputs/turns", params={"path": path, "id": "tc_1", "start": 1, "end": 3}).json()
+        missing = c.get("/app/outputs/entry", params={"path": path, "id": "nope"})
+        outside = c.get("/app/outputs/entries", params={"path": str(tmp_path / "secret.json")})
+
+    assert (page["total"], page["offset"], page["entries"]) == (6, 4, results[4:])
+    assert by_id.status_code == 200 and by_id.json() == results[3]
+    assert by_id.headers["x-entry-index"] == "3" and by_id.headers["accept-ranges"] == "bytes"
+    assert ranged.status_code == 206 and ranged.content == by_id.content[:10]
+    assert ranged.headers["content-range"] == f"bytes 0-9/{len(by_id.content)}"
+    assert bad_range.status_code == 416
+    assert turns == {"id": "tc_1", "turns_total": 4, "start": 1, "turns": results[1]["turn_responses"][1:3]}
+    assert missing.status_code == 404 and outside.status_code == 404
 
 
 def test_app_themes_loads_valid_and_reports_invalid(client):
@@ -173,7 +229,7 @@ def test_app_evaluation_job_completes_with_authoritative_status(client, monkeypa
     job = r.json()
     assert job["status"] in {"queued", "running", "completed"}
 
-    detail = client.get(f"/app/jobs/{job['id']}").json()
+    detail = _wait_for_job(client, job["id"])
     assert detail["status"] == "completed"
     assert detail["phase"] == "completed"
     assert detail["progress"]["completed"] == 1
@@ -199,6 +255,71 @@ def test_app_job_terminal_event_replays_after_completion(client, monkeypatch):
         body = "".join(response.iter_text())
     assert "event: completed" in body
     assert "Evaluation finished" in body
+    assert body.count("event: progress") == 1 and "event: end_prompt" not in body
+
+
+def test_app_job_events_resume_from_last_event_id(client, monkeypatch):
+    async def fake_suite(config_dict, adapter):
+        for i in range(1, 4):
+            await config_dict["_callback"]("end_prompt", {"current": i, "total": 3, "id": f"p{i}"})
+
+    monkeypatch.setattr(api_module, "run_evaluation_suite", fake_suite)
+    monkeypatch.setattr(api_module, "PROGRESS_HZ", 0)  # one frame per prompt event
+    job = client.post("/app/jobs/evaluations", json={
+        "provider": "mock",
+        "model": "mock-model",
+        "eval_set_ids": ["evals_dataset.json"],
+    }).json()
+
+    # two readers of the same job both see every event, with ids
+    for _ in range(2):
+        with client.stream("GET", f"/app/jobs/{job['id']}/events") as response:
+            body = "".join(response.iter_text())
+        assert body.count("event: end_prompt") == 3 and "id: 4" in body
+
+    headers = {"Last-Event-ID": "2"}
+    with client.stream("GET", f"/app/jobs/{job['id']}/events", headers=headers) as response:
+        body = "".join(response.iter_text())
+    assert "id: 3" in body and "p3" in body and "p1" not in body and "p2" not in body
+    assert "event: completed" in body
+
+
+def test_polled_endpoints_answer_304_until_something_changes(client, monkeypatch):
+    async def fake_suite(config_dict, adapter):
+        await config_dict["_callback"]("end_prompt", {"current": 1, "total": 1, "id": "a"})
+
+    monkeypatch.setattr(api_module, "run_evaluation_suite", fake_suite)
+    for path in ("/app/jobs", "/app/outputs", "/providers", "/eval-sets", "/app/snapshot"):
+        first = client.get(path)
+        tag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        again = client.get(path, headers={"If-None-Match": tag})
+        assert again.status_code == 304 and again.content == b"", path
+        assert client.get(path, headers={"If-None-Match": f'W/{tag}, "other"'}).status_code == 304
+
+    jobs_tag = client.get("/app/jobs").headers["etag"]
+    snapshot = client.get("/app/snapshot")
+    job = client.post("/app/jobs/evaluations", json={
+        "provider": "mock", "model": "mock-model", "eval_set_ids": ["evals_dataset.json"],
+    }).json()
+    _wait_for_job(client, job["id"])
+    assert client.get("/app/jobs", headers={"If-None-Match": jobs_tag}).status_code == 200
+    changed = client.get("/app/snapshot", headers={"If-None-Match": snapshot.headers["etag"]})
+    assert changed.status_code == 200 and changed.json()["jobs"]["jobs"][0]["id"] == job["id"]
+    assert changed.json()["etags"]["providers"] == snapshot.json()["etags"]["providers"]
+
+    detail = client.get(f"/app/jobs/{job['id']}")
+    assert detail.json()["version"] > 1
+    assert client.get(f"/app/jobs/{job['id']}", headers={"If-None-Match": detail.headers["etag"]}).status_code == 304
+
+
+def test_large_json_is_gzipped_with_its_own_tag(client):
+    plain = client.get("/providers", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/providers", headers={"Accept-Encoding": "gzip"})
+    assert len(plain.content) > 1024 and "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip" and gzipped.json() == plain.json()
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert client.get("/providers", headers={"If-None-Match": gzipped.headers["etag"]}).status_code == 304
 
 
 def test_app_drift_jobs_are_typed_and_complete_without_shelling(client, monkeypatch):
@@ -221,7 +342,7 @@ def test_app_drift_jobs_are_typed_and_complete_without_shelling(client, monkeypa
     body = r.json()
     assert body["type"] == "drift_run"
     assert body["status"] in {"queued", "running", "completed"}
-    detail = client.get(f"/app/jobs/{body['id']}").json()
+    detail = _wait_for_job(client, body["id"])
     assert detail["status"] == "completed"
     assert detail["summary"]["sequences"] == 3
 
@@ -237,7 +358,7 @@ def test_risky_operations_require_confirmation(client):
 
 
 @pytest.mark.asyncio
-async def test_cancelled_background_run_publishes_cancelled(monkeypatch):
+async def test_cancelled_background_run_publishes_cancelled(db_url, monkeypatch):
     import promptpressure.api as api
 
     async def slow_suite(config_dict, adapter):
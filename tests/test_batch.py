@@ -13,6 +13,9 @@ from promptpressure.batch import (
     get_batch_support,
     should_use_realtime,
     run_batch,
+    run_multi_turn_batch,
+    complete_prompts,
+    judge_batch_model,
     BATCH_PROVIDERS,
     _MODEL_PROVIDER_MAP,
 )
@@ -101,6 +104,12 @@ class TestShouldUseRealtime:
         entry = {"id": "t1", "prompt": [{"role": "user", "content": "hi"}]}
         assert should_use_realtime(entry, "claude-sonnet-4-6") is True
 
+    def test_multi_turn_batch_opt_in(self):
+        entry = {"id": "t1", "prompt": [{"role": "user", "content": "hi"}]}
+        assert should_use_realtime(entry, "claude-sonnet-4-6", multi_turn_batch=True) is False
+        assert should_use_realtime(entry, "gpt-4o", multi_turn_batch=True) is True
+        assert should_use_realtime(entry, "deepseek-r1", multi_turn_batch=True) is True
+
     def test_deepseek_r1_always_realtime(self):
         entry = {"id": "t1", "prompt": "hello"}
         assert should_use_realtime(entry, "deepseek-r1") is True
@@ -198,6 +207,198 @@ class TestRunBatch:
             assert "t1" in result
 
 
+# ---------------------------------------------------------------------------
+# run_multi_turn_batch (turn-synchronous)
+# ---------------------------------------------------------------------------
+
+def _seq(entry_id, *contents):
+    return {"id": entry_id, "prompt": [{"role": "user", "content": c} for c in contents]}
+
+
+class TestRunMultiTurnBatch:
+    @pytest.mark.asyncio
+    async def test_one_batch_per_turn_with_growing_history(self):
+        submitted = []
+
+        async def fake_message_batch(requests, model_name, config):
+            submitted.append({k: [dict(m) for m in v] for k, v in requests.items()})
+            return {
+                cid: {"content": f"{cid} r{sum(1 for m in msgs if m['role'] == 'user')}",
+                      "usage": {"input_tokens": 1, "output_tokens": 2}}
+                for cid, msgs in requests.items()
+            }
+
+        entries = [_seq("a", "a1", "a2", "a3"), _seq("b", "b1")]
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch):
+            out = await run_multi_turn_batch(entries, "claude-sonnet-4-6", {})
+
+        assert [sorted(r) for r in submitted] == [["a", "b"], ["a"], ["a"]]
+        assert submitted[2]["a"] == [
+            {"role": "user", "content": "a1"},
+            {"role": "assistant", "content": "a r1"},
+            {"role": "user", "content": "a2"},
+            {"role": "assistant", "content": "a r2"},
+            {"role": "user", "content": "a3"},
+        ]
+        assert [r["content"] for r in out["a"]["responses"]] == ["a r1", "a r2", "a r3"]
+        assert out["a"]["error"] is None
+        assert [r["content"] for r in out["b"]["responses"]] == ["b r1"]
+
+    @pytest.mark.asyncio
+    async def test_errored_sequence_drops_out(self):
+        rounds = []
+
+        async def fake_message_batch(requests, model_name, config):
+            rounds.append(sorted(requests))
+            results = {cid: {"content": "ok", "usage": {}} for cid in requests}
+            if len(rounds) == 1:
+                results["bad"] = {"content": "", "error": "overloaded", "usage": {}}
+            return results
+
+        entries = [_seq("good", "g1", "g2"), _seq("bad", "x1", "x2")]
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch):
+            out = await run_multi_turn_batch(entries, "claude-sonnet-4-6", {})
+
+        assert rounds == [["bad", "good"], ["good"]]
+        assert out["bad"] == {"responses": [], "error": "overloaded"}
+        assert len(out["good"]["responses"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_submission_stops_the_lane(self):
+        calls = 0
+
+        async def fake_message_batch(requests, model_name, config):
+            nonlocal calls
+            calls += 1
+            return {cid: {"content": "ok", "usage": {}} for cid in requests} if calls == 1 else {}
+
+        entries = [_seq("a", "a1", "a2", "a3")]
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch):
+            out = await run_multi_turn_batch(entries, "claude-sonnet-4-6", {})
+
+        assert calls == 2
+        assert len(out["a"]["responses"]) == 1
+        assert out["a"]["error"] is None
+
+
+# ---------------------------------------------------------------------------
+# complete_prompts (judge traffic: grading, drift judging)
+# ---------------------------------------------------------------------------
+
+class TestCompletePrompts:
+    @pytest.mark.asyncio
+    async def test_batch_answers_with_per_item_realtime_fallback(self):
+        realtime = []
+
+        async def fake_message_batch(requests, model_name, config):
+            return {
+                "a": {"content": "batched a", "usage": {}},
+                "b": {"content": "", "error": "overloaded", "usage": {}},
+            }
+
+        async def fake_realtime(prompt):
+            realtime.append(prompt)
+            return f"live {prompt}"
+
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch):
+            out = await complete_prompts({"a": "pa", "b": "pb", "c": "pc"}, fake_realtime,
+                                         model_name="claude-sonnet-4-6", config={})
+
+        assert out["a"] == {"content": "batched a", "batch": True}
+        assert out["b"] == {"content": "live pb", "batch": False}
+        assert out["c"] == {"content": "live pc", "batch": False}
+        assert sorted(realtime) == ["pb", "pc"]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_model_skips_batch(self):
+        async def fake_realtime(prompt):
+            if prompt == "boom":
+                raise RuntimeError("api down")
+            return "ok"
+
+        with patch("promptpressure.batch.run_message_batch", new_callable=AsyncMock) as mock_batch:
+            out = await complete_prompts({"x": "fine", "y": "boom"}, fake_realtime,
+                                         model_name="gpt-4o", config={})
+
+        mock_batch.assert_not_called()
+        assert out["x"] == {"content": "ok", "batch": False}
+        assert out["y"] == {"error": "api down", "batch": False}
+
+    @pytest.mark.asyncio
+    async def test_grading_routes_through_batch_when_enabled(self):
+        from promptpressure.grading import _run_grading
+
+        async def fake_message_batch(requests, model_name, config):
+            assert model_name == "claude-sonnet-4-6"
+            return {cid: {"content": '{"refused": true}', "usage": {}} for cid in requests}
+
+        adapter = AsyncMock(return_value='{"refused": false}')
+        results = [
+            {"id": "r1", "prompt": "p1", "response": "x", "success": True, "eval_criteria": {"refused": True}},
+            {"id": "r2", "prompt": "p2", "response": "y", "success": False},
+            {"id": "r3", "prompt": "p3", "response": "z", "success": True, "eval_criteria": {"refused": True}},
+        ]
+        config = {"model_name": "gpt-4o", "batch_grading": True}
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch):
+            scored = await _run_grading(results, adapter, config, ["refused"], batch_model="claude-sonnet-4-6")
+
+        adapter.assert_not_called()
+        assert [s["id"] for s in scored] == ["r1", "r3"]
+        assert all(s["scores"] == {"refused": True} for s in scored)
+
+    @pytest.mark.asyncio
+    async def test_groq_grader_never_batches_the_evaluated_model(self, tmp_path):
+        from promptpressure import grading
+
+        adapter = AsyncMock(return_value='{"refused": false}')
+        results = [{"id": "r1", "prompt": "p1", "response": "x", "model": "claude-sonnet-4-6",
+                    "success": True, "eval_criteria": {"refused": True}}]
+        config = {"model_name": "claude-sonnet-4-6", "batch_grading": True, "output_dir": str(tmp_path)}
+        with patch("promptpressure.batch.run_message_batch", new_callable=AsyncMock) as mock_batch, \
+                patch.object(grading, "load_adapter", return_value=adapter):
+            await grading.post_analyze_groq(results, config)
+            await grading.post_analyze_openrouter(results, {**config, "scoring_model_name": "anthropic/claude-sonnet-4-6"})
+
+        mock_batch.assert_not_called()
+        assert adapter.call_count == 2
+        assert adapter.call_args_list[0].args[1]["model_name"] == "claude-sonnet-4-6"  # groq's own call
+
+    @pytest.mark.asyncio
+    async def test_litellm_grader_batches_on_its_scoring_model(self, tmp_path):
+        from promptpressure import grading
+
+        submitted = []
+
+        async def fake_message_batch(requests, model_name, config):
+            submitted.append(model_name)
+            return {cid: {"content": '{"refused": true}', "usage": {}} for cid in requests}
+
+        adapter = AsyncMock(return_value='{"refused": false}')
+        results = [{"id": "r1", "prompt": "p1", "response": "x", "model": "gpt-4o",
+                    "success": True, "eval_criteria": {"refused": True}}]
+        config = {"model": "gpt-4o", "model_name": "gpt-4o", "batch_grading": True, "output_dir": str(tmp_path)}
+        with patch("promptpressure.batch.run_message_batch", side_effect=fake_message_batch), \
+                patch.object(grading, "load_adapter", return_value=adapter):
+            await grading.post_analyze_litellm(results, {**config, "scoring_model_name": "xai/grok-4"})
+            await grading.post_analyze_litellm(results, config)  # default grader: claude-sonnet-4-6
+            await grading.post_analyze_litellm(results, {**config, "batch_grading": False})
+
+        assert submitted == ["grok-4", "claude-sonnet-4-6"]
+        adapter.assert_called_once()  # batch_grading off: real-time, on the grader
+        assert adapter.call_args.args[1]["model"] == "claude-sonnet-4-6"
+        assert list((tmp_path / "analysis").glob("litellm_scores_*.json"))
+
+    def test_judge_batch_model_follows_the_judge_provider(self):
+        assert judge_batch_model("groq", "claude-sonnet-4-6") is None
+        assert judge_batch_model("openrouter", "anthropic/claude-sonnet-4-6") is None
+        assert judge_batch_model("anthropic", "claude-sonnet-4-6") == "claude-sonnet-4-6"
+        assert judge_batch_model("xai", "grok-4") == "grok-4"
+        assert judge_batch_model("anthropic", "grok-4") is None
+        assert judge_batch_model("litellm", "claude-sonnet-4-6") == "claude-sonnet-4-6"
+        assert judge_batch_model("litellm", "xai/grok-4") == "grok-4"
+        assert judge_batch_model("litellm", "openrouter/anthropic/claude-sonnet-4-6") is None
+
+
 # ---------------------------------------------------------------------------
 # Provider registry integrity
 # ---------------------------------------------------------------------------
@@ -220,3 +421,127 @@ class TestProviderRegistry:
         for prefix, provider in _MODEL_PROVIDER_MAP.items():
             assert provider in BATCH_PROVIDERS or provider == "openrouter", \
                 f"model prefix '{prefix}' maps to unknown provider '{provider}'"
+
+
+# ---------------------------------------------------------------------------
+# Batch lane overlaps the real-time lane in run_evaluation_suite
+# ---------------------------------------------------------------------------
+
+class TestBatchOverlap:
+    @pytest.fixture
+    def suite_config(self, db_url, tmp_path):
+        dataset = tmp_path / "evals.json"
+        dataset.write_text(json.dumps([
+            {"id": "single_1", "prompt": "hello", "tier": "smoke", "eval_criteria": {}},
+            {"id": "single_2", "prompt": "world", "tier": "smoke", "eval_criteria": {}},
+            {"id": "multi_1", "tier": "smoke", "eval_criteria": {}, "prompt": [
+                {"role": "user", "content": "turn one"},
+                {"role": "user", "content": "turn two"},
+            ]},
+        ]), encoding="utf-8")
+        return {
+            "dataset": str(dataset),
+            "tier": "smoke",
+            "model_name": "claude-sonnet-4-6",
+            "output_dir": str(tmp_path / "out"),
+            "output": "results.csv",
+            "collect_metrics": False,
+        }
+
+    @pytest.mark.asyncio
+    async def test_realtime_entries_finish_before_batch_returns(self, suite_config, monkeypatch):
+        import promptpressure.cli as cli
+
+        timeline = []
+        batch_release = asyncio.Event()
+
+        async def fake_adapter(text, config, messages=None):
+            timeline.append(("realtime", text))
+            return f"echo {text}"
+
+        async def fake_run_batch(entries, model_name, config, litellm_endpoint=None):
+            timeline.append(("batch_submitted", len(entries)))
+            await batch_release.wait()
+            timeline.append(("batch_done", len(entries)))
+            return {e["id"]: {"content": f"batched {e['id']}", "usage": {}} for e in entries}
+
+        async def release_when_realtime_done():
+            while sum(1 for kind, _ in timeline if kind == "realtime") < 2:
+                await asyncio.sleep(0.01)
+            batch_release.set()
+
+        monkeypatch.setattr(cli, "load_adapter", lambda name: fake_adapter)
+        monkeypatch.setattr(cli, "run_batch", fake_run_batch)
+
+        releaser = asyncio.create_task(release_when_realtime_done())
+        results, _, _ = await asyncio.wait_for(
+            cli.run_evaluation_suite(suite_config, "litellm", batch_mode=True,
+                                     request_delay=0, turn_delay=0),
+            timeout=10,
+        )
+        await releaser
+
+        kinds = [kind for kind, _ in timeline]
+        # both multi-turn turns ran while the batch was still outstanding
+        assert kinds.index("batch_submitted") < kinds.index("realtime")
+        assert kinds.index("batch_done") > max(i for i, k in enumerate(kinds) if k == "realtime")
+        by_id = {r["id"]: r for r in results}
+        assert [r["id"] for r in results] == ["single_1", "single_2", "multi_1"]
+        assert by_id["single_1"]["batch"] is True
+        assert by_id["single_1"]["response"] == "batched single_1"
+        assert by_id["multi_1"]["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_realtime(self, suite_config, monkeypatch):
+        import promptpressure.cli as cli
+
+        async def fake_adapter(text, config, messages=None):
+            return f"echo {text}"
+
+        async def failing_run_batch(entries, model_name, config, litellm_endpoint=None):
+            raise RuntimeError("upload rejected")
+
+        monkeypatch.setattr(cli, "load_adapter", lambda name: fake_adapter)
+        monkeypatch.setattr(cli, "run_batch", failing_run_batch)
+
+        results, _, _ = await cli.run_evaluation_suite(
+            suite_config, "litellm", batch_mode=True, request_delay=0, turn_delay=0,
+        )
+        by_id = {r["id"]: r for r in results}
+        assert by_id["single_1"]["success"] is True
+        assert by_id["single_1"]["response"] == "echo hello"
+        assert "batch" not in by_id["single_1"]
+
+    @pytest.mark.asyncio
+    async def test_multi_turn_batch_prefix_then_realtime(self, suite_config, monkeypatch):
+        import promptpressure.cli as cli
+
+        realtime_calls = []
+
+        async def fake_adapter(text, config, messages=None):
+            realtime_calls.append((text, [m["content"] for m in messages or []]))
+            return f"live {text}"
+
+        async def fake_run_batch(entries, model_name, config, litellm_endpoint=None):
+            return {e["id"]: {"content": f"batched {e['id']}", "usage": {}} for e in entries}
+
+        async def fake_multi_turn_batch(entries, model_name, config):
+            # batch answered turn 1, then the lane stopped
+            return {e["id"]: {"responses": [{"content": "batched turn 1", "usage": {}}], "error": None}
+                    for e in entries}
+
+        monkeypatch.setattr(cli, "load_adapter", lambda name: fake_adapter)
+        monkeypatch.setattr(cli, "run_batch", fake_run_batch)
+        monkeypatch.setattr(cli, "run_multi_turn_batch", fake_multi_turn_batch)
+
+        suite_config["batch_multi_turn"] = True
+        results, _, _ = await cli.run_evaluation_suite(
+            suite_config, "litellm", batch_mode=True, request_delay=0, turn_delay=0,
+        )
+        multi = next(r for r in results if r["id"] == "multi_1")
+        assert multi["success"] is True
+        assert multi["batch_turns"] == 1
+        assert [t["assistant"] for t in multi["turn_responses"]] == ["batched turn 1", "live turn two"]
+        assert [t["metrics"]["turn"] for t in multi["turn_responses"]] == [1, 2]
+        # the real-time continuation saw the batched turn in its history
+        assert realtime_calls == [("turn two", ["turn one", "batched turn 1", "turn two"])]
@@ -0,0 +1,147 @@
+"""Content-addressed blob storage for long result texts."""
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text
+
+from promptpressure import blobs, database
+from promptpressure.database import Base, Blob, Evaluation, Result, Turn, create_engine, get_sessionmaker
+from promptpressure.db_writer import DBWriter
+
+LONG_PROMPT = "tell me about the young earth model. " * 40
+LONG_RESPONSE = "the earth is about 4.54 billion years old. " * 200
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pp.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Evaluation.__table__.insert().values(id="ev1", config_snapshot={}, status="running"))
+    yield engine
+    await engine.dispose()
+
+
+def _result(i, prompt=LONG_PROMPT, response=LONG_RESPONSE, turns=()):
+    return Result(evaluation_id="ev1", prompt_id=f"p{i}", prompt_text=prompt, response_text=response,
+                  model="m", adapter="mock", latency_ms=1.0, success=True, turns=list(turns))
+
+
+def _turn(n, user, assistant):
+    return Turn(evaluation_id="ev1", prompt_id="seq", model="m", turn=n,
+                user_content=user, assistant_content=assistant)
+
+
+async def _count(engine, model):
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.parametrize("zstd", [True, False])
+def test_pack_round_trip(monkeypatch, zstd):
+    if zstd and not blobs.ZSTD_AVAILABLE:
+        pytest.skip("zstandard not installed")
+    monkeypatch.setattr(blobs, "ZSTD_AVAILABLE", zstd)
+    small, large = blobs.pack("hello"), blobs.pack(LONG_RESPONSE)
+    assert small["codec"] == "raw"
+    assert large["codec"] == ("zstd" if zstd else "zlib")
+    assert large["size"] == len(LONG_RESPONSE) and len(large["data"]) < large["size"] // 10
+    assert blobs.unpack(large["codec"], large["data"]) == LONG_RESPONSE
+    assert blobs.pack(LONG_RESPONSE)["hash"] == large["hash"]
+
+
+async def test_writer_externalizes_and_dedupes(engine):
+    user_turn = "My geology professor said the rock record points to a young earth. " * 5
+    writer = DBWriter(engine).start()
+    for i in range(3):
+        await writer.put(_result(i, turns=[_turn(1, user_turn, LONG_RESPONSE + str(i)), _turn(2, "ok?", "short")]))
+    await writer.put(_result(9, prompt="short prompt", response="short"))
+    await writer.close()
+
+    # prompt, response, shared user turn, 3 distinct assistant turns
+    assert await _count(engine, Blob) == 6
+    async with get_sessionmaker(engine)() as session:
+        rows = (await session.execute(
+            select(Result.prompt_text, Result.prompt_blob, Result.response_blob).order_by(Result.id)
+        )).all()
+        assert rows[0].prompt_text == "" and rows[0].prompt_blob == rows[1].prompt_blob
+        assert rows[3] == ("short prompt", None, None)
+
+        items = [dict(zip(("user_content", "assistant_content", "user_blob", "assistant_blob"), row))
+                 for row in await session.execute(
+                     select(Turn.user_content, Turn.assistant_content, Turn.user_blob, Turn.assistant_blob)
+                     .order_by(Turn.id))]
+        await blobs.resolve(session, items)
+    assert items[0] == {"user_content": user_turn, "assistant_content": LONG_RESPONSE + "0"}
+    assert items[1] == {"user_content": "ok?", "assistant_content": "short"}
+
+
+async def test_migrate_moves_inline_text_and_prunes(engine):
+    writer = DBWriter(engine, blob_threshold=None).start()
+    await writer.put_many([_result(i) for i in range(4)])
+    await writer.close()
+    assert await _count(engine, Blob) == 0
+
+    sessionmaker = get_sessionmaker(engine)
+    stats = await blobs.migrate(sessionmaker, batch_size=3)
+    assert stats["rows"] == 4
+    assert stats["blobs"] == 2
+    assert stats["blob_bytes"] < stats["text_bytes"] // 10
+    assert (await blobs.migrate(sessionmaker))["rows"] == 0
+
+    async with sessionmaker() as session:
+        await session.execute(Blob.__table__.insert().values(hash="x" * 64, codec="raw", size=1, data=b"x"))
+        assert await blobs.prune(session) == 1
+        await session.commit()
+        items = [{"response_text": r[0], "response_blob": r[1]}
+                 for r in await session.execute(select(Result.response_text, Result.response_blob))]
+        await blobs.resolve(session, items)
+    assert {i["response_text"] for i in items} == {LONG_RESPONSE}
+
+
+async def test_init_db_adds_ref_columns_to_old_tables(db_url):
+    old = create_engine(db_url)
+    async with old.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE results (id INTEGER PRIMARY KEY, evaluation_id VARCHAR, prompt_id VARCHAR, "
+            "prompt_text TEXT NOT NULL, response_text TEXT, model VARCHAR, adapter VARCHAR, "
+            "latency_ms FLOAT, success BOOLEAN, error_message TEXT)"
+        ))
+    await old.dispose()
+
+    try:
+        engine = await database.init_db()
+        async with engine.connect() as conn:
+            columns = {r[1] for r in await conn.execute(text("PRAGMA table_info(results)"))}
+        assert {"prompt_blob", "response_blob"} <= columns
+    finally:
+        await database.dispose_db()
+
+
+def test_api_returns_blob_text(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+
+    async def seed():
+        engine = await database.init_db()
+        async with engine.begin() as conn:
+            await conn.execute(Evaluation.__table__.insert().values(id="ev1", config_snapshot={}, status="completed"))
+        writer = DBWriter(engine).start()
+        await writer.put(_result(1, turns=[_turn(1, "hi", LONG_RESPONSE)]))
+        await writer.close()
+
+    with TestClient(api_module.app) as client:
+        client.portal.call(seed)
+        detail = client.get("/evaluations/ev1").json()
+        assert detail["results"][0]["prompt_text"] == LONG_PROMPT
+        assert "prompt_blob" not in detail["results"][0]
+
+        page = client.get("/evaluations/ev1/results", params={"fields": "response_text"}).json()
+        assert page["items"][0] == {"id": 1, "response_text": LONG_RESPONSE}
+        one = client.get("/evaluations/ev1/results/1").json()
+        assert one["response_text"] == LONG_RESPONSE and "response_blob" not in one
+        turns = client.get("/evaluations/ev1/turns", params={"fields": "turn,assistant_content"}).json()
+        assert turns["items"][0]["assistant_content"] == LONG_RESPONSE
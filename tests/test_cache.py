@@ -0,0 +1,95 @@
+"""Signature-validated caches behind the sidecar's listing endpoints."""
+import asyncio
+import importlib
+import os
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import promptpressure.api as api_module
+from promptpressure import cache
+from promptpressure.cache import SignatureCache, file_signature
+
+
+def test_entries_follow_file_signatures_and_ttls(tmp_path, monkeypatch):
+    (tmp_path / "a.yaml").write_text("a", encoding="utf-8")
+    pattern = str(tmp_path / "*.yaml")
+    store, builds = SignatureCache("test-files"), []
+
+    def read():
+        builds.append(1)
+        return sorted(os.listdir(tmp_path))
+
+    assert store.get("k", read, signature=file_signature(pattern)) == ["a.yaml"]
+    assert store.get("k", read, signature=file_signature(pattern)) == ["a.yaml"] and len(builds) == 1
+    (tmp_path / "b.yaml").write_text("b", encoding="utf-8")
+    assert store.get("k", read, signature=file_signature(pattern)) == ["a.yaml", "b.yaml"]
+    os.utime(tmp_path / "a.yaml", ns=(1, 1))
+    store.get("k", read, signature=file_signature(pattern))
+    assert len(builds) == 3
+
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    store.get("short", read, ttl=5)
+    now[0] += 4
+    store.get("short", read, ttl=5)
+    now[0] += 2
+    store.get("short", read, ttl=5)
+    assert len(builds) == 5
+    assert store.stats() | {"hit_ratio": None} == {
+        "hits": 2, "misses": 5, "stale": 0, "builds": 5, "build_errors": 0, "size": 2, "hit_ratio": None,
+    }
+    assert cache.all_stats()["test-files"]["hits"] == 2
+
+
+async def test_stale_entries_are_served_while_one_rebuild_runs(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    store, builds, release = SignatureCache("test-swr", ttl=10), [], asyncio.Event()
+
+    async def probe():
+        builds.append(1)
+        await release.wait()
+        return len(builds)
+
+    release.set()
+    results = await asyncio.gather(*(store.get_async("status", probe, stale_ttl=60) for _ in range(5)))
+    assert results == [1] * 5 and len(builds) == 1  # concurrent misses share one build
+
+    release.clear()
+    now[0] += 15
+    assert [await store.get_async("status", probe, stale_ttl=60) for _ in range(3)] == [1, 1, 1]
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(builds) == 2 and await store.get_async("status", probe, stale_ttl=60) == 2
+    assert store.stats()["stale"] == 3
+
+    now[0] += 100  # past ttl + stale_ttl: wait for a fresh value
+    assert await store.get_async("status", probe, stale_ttl=60) == 3
+    assert await store.get_async("status", probe, signature="changed", stale_ttl=60) == 4
+
+
+def test_listing_endpoints_see_new_files_without_a_restart(db_url, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "evals_first.json").write_text("[{}]", encoding="utf-8")
+    (tmp_path / "configs" / "config_a.yaml").write_text("adapter: groq\nmodel: model-a\n", encoding="utf-8")
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as c:
+        assert [e["id"] for e in c.get("/eval-sets").json()] == ["evals_first.json"]
+        assert "model-a" in c.get("/models", params={"provider": "groq"}).json()["models"]
+        assert len(c.get("/app/configs").json()["configs"]) == 1
+
+        (tmp_path / "evals_second.json").write_text("[{}, {}]", encoding="utf-8")
+        (tmp_path / "configs" / "config_b.yaml").write_text("adapter: groq\nmodel: model-b\n", encoding="utf-8")
+        assert [e["id"] for e in c.get("/eval-sets").json()] == ["evals_first.json", "evals_second.json"]
+        assert "model-b" in c.get("/models", params={"provider": "groq"}).json()["models"]
+        assert len(c.get("/app/configs").json()["configs"]) == 2
+
+        monkeypatch.setenv("GROQ_API_KEY", "k")
+        c.get("/providers")
+        assert next(p for p in c.get("/providers").json() if p["id"] == "groq")["available"] is True
+        caches = c.get("/diagnostics").json()["caches"]
+    assert caches["eval_sets"]["misses"] == 2 and caches["providers"]["hits"] >= 1
@@ -0,0 +1,45 @@
+"""Tests for the shared engine / session factory in promptpressure.database."""
+import asyncio
+import importlib
+
+from fastapi.testclient import TestClient
+
+from promptpressure import database
+
+
+async def test_init_db_reuses_engine_and_creates_schema_once(db_url, monkeypatch):
+    calls = []
+    real_create_all = database.Base.metadata.create_all
+    monkeypatch.setattr(database.Base.metadata, "create_all",
+                        lambda *a, **kw: (calls.append(1), real_create_all(*a, **kw))[1])
+
+    first = await database.init_db()
+    second = await database.init_db()
+    assert first is second
+    assert len(calls) == 1
+    assert database.get_sessionmaker() is database.get_sessionmaker(first)
+
+    async for session in database.get_db_session():
+        assert session.bind is first
+    await database.dispose_db()
+    assert database._state is None
+
+
+def test_new_event_loop_gets_its_own_engine(db_url):
+    first = asyncio.run(database.init_db())
+    second = asyncio.run(database.init_db())
+    assert first is not second
+    asyncio.run(database.dispose_db())
+
+
+def test_api_lifespan_owns_the_engine(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as client:
+        engine = database._state.engine
+        assert client.get("/evaluations").json() == []
+        assert client.get("/evaluations").status_code == 200
+        assert database._state.engine is engine
+    assert database._state is None  # disposed on shutdown
@@ -0,0 +1,100 @@
+"""Tests for the background DB writer and SQLite tuning."""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+
+from promptpressure.database import Base, Evaluation, Metric, Result, create_engine
+from promptpressure.db_writer import DBWriter
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pp.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with engine.begin() as conn:
+        await conn.execute(Evaluation.__table__.insert().values(id="ev1", config_snapshot={}, status="running"))
+    yield engine
+    await engine.dispose()
+
+
+def _result(i, **overrides):
+    fields = dict(
+        evaluation_id="ev1", prompt_id=f"p{i}", prompt_text=f"prompt {i}", response_text="ok",
+        model="m", adapter="mock", latency_ms=1.0, success=True, error_message=None,
+    )
+    fields.update(overrides)
+    return Result(**fields)
+
+
+async def _count(engine, model=Result):
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def test_sqlite_runs_in_wal_mode(engine):
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar_one() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar_one() == 1  # NORMAL
+
+
+async def test_size_flush_batches_rows_into_few_transactions(engine):
+    writer = DBWriter(engine, max_batch=200, flush_interval=60).start()
+    for i in range(450):
+        await writer.put(_result(i))
+    await writer.close()
+
+    assert await _count(engine) == 450
+    assert writer.rows_written == 450
+    assert writer.transactions == 3
+
+
+async def test_time_flush_writes_without_close(engine):
+    writer = DBWriter(engine, max_batch=1000, flush_interval=0.05).start()
+    await writer.put(_result(1))
+    await asyncio.sleep(0.3)
+    assert await _count(engine) == 1
+    await writer.close()
+
+
+async def test_flush_makes_queued_rows_visible(engine):
+    writer = DBWriter(engine, max_batch=1000, flush_interval=60).start()
+    await writer.put_many([_result(i) for i in range(5)])
+    await writer.put(Metric(evaluation_id="ev1", name="total_requests", value=5.0))
+    await writer.flush()
+    assert await _count(engine) == 5
+    assert await _count(engine, Metric) == 1
+    await writer.close()
+
+
+async def test_close_after_cancel_keeps_finished_rows(engine):
+    writer = DBWriter(engine, max_batch=1000, flush_interval=60).start()
+
+    async def producer():
+        for i in range(10):
+            await writer.put(_result(i))
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(producer())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await writer.close()
+    await writer.close()  # idempotent
+
+    assert await _count(engine) == 10
+    with pytest.raises(RuntimeError):
+        await writer.put(_result(99))
+
+
+async def test_bad_row_does_not_drop_its_batch(engine):
+    writer = DBWriter(engine, max_batch=10, flush_interval=60).start()
+    await writer.put(_result(1))
+    await writer.put(_result(2, prompt_text=None))  # NOT NULL violation
+    await writer.put(_result(3))
+    await writer.close()
+
+    assert await _count(engine) == 2
+    assert writer.failed_rows == 1
@@ -110,3 +110,50 @@ def test_launcher_no_args_does_not_dispatch(monkeypatch):
     monkeypatch.setattr("webbrowser.open", lambda url: True)
     rc = launcher.main()
     assert rc == 0  # took the launcher path, not the drift path
+
+
+def test_calibrate_batch_submits_all_runs_at_once(monkeypatch, tmp_path):
+    suite = load_suite("drift-v0.1", strict=True)
+    calls = []
+
+    async def fake_judge_suite_runs(sequences, transcripts, adapter_fn, cfg,
+                                    runs=1, concurrency=4, batch_model=None):
+        calls.append((runs, batch_model))
+        run = {s["id"]: {"labels": [dict(r) for r in suite.gold[s["id"]]["labels"]],
+                         "parse_failures": 0}
+               for s in sequences if s["id"] in suite.gold}
+        return [run for _ in range(runs)]
+
+    monkeypatch.setattr(cli, "judge_suite_runs", fake_judge_suite_runs)
+    monkeypatch.setattr(cli, "load_adapter", lambda name: _flexible_fake_adapter())
+
+    report_path = tmp_path / "b.md"
+    rc = cli.main(["calibrate", "--judge-provider", "litellm", "--judge-model", "claude-sonnet-4-6",
+                   "--runs", "3", "--batch", "--bootstrap", "50", "--report", str(report_path)])
+    assert rc == 0
+    assert calls == [(3, "claude-sonnet-4-6")]
+    data = json.loads(report_path.with_suffix(".json").read_text())
+    assert data["test_retest"]["n_runs"] == 3
+
+
+def test_calibrate_batch_needs_a_batch_provider(monkeypatch, tmp_path):
+    suite = load_suite("drift-v0.1", strict=True)
+    calls = []
+
+    async def fake_judge_suite_runs(*args, **kwargs):
+        calls.append(kwargs.get("batch_model"))
+        return []
+
+    async def fake_judge_suite(sequences, transcripts, adapter_fn, cfg, concurrency=4):
+        return {s["id"]: {"labels": [dict(r) for r in suite.gold[s["id"]]["labels"]], "parse_failures": 0}
+                for s in sequences if s["id"] in suite.gold}
+
+    monkeypatch.setattr(cli, "judge_suite_runs", fake_judge_suite_runs)
+    monkeypatch.setattr(cli, "judge_suite", fake_judge_suite)
+    monkeypatch.setattr(cli, "load_adapter", lambda name: _flexible_fake_adapter())
+
+    # an anthropic model id behind openrouter is judged through openrouter, in real-time
+    rc = cli.main(["calibrate", "--judge-provider", "openrouter", "--judge-model", "anthropic/claude-sonnet-4-6",
+                   "--runs", "2", "--batch", "--bootstrap", "50", "--report", str(tmp_path / "r.md")])
+    assert rc == 0
+    assert calls == []
@@ -134,6 +134,45 @@ async def test_judge_suite_skips_missing_transcripts():
     assert set(out) == {"syc-01"}
 
 
+async def test_judge_suite_runs_batches_all_passes(monkeypatch):
+    labels = json.dumps({"labels": [{"turn": i + 1, "sycophancy": "hold",
+                                     "contradiction": "hold", "escalation": "hold"}
+                                    for i in range(3)]})
+    submitted = []
+
+    async def fake_batch(requests, model_name, config):
+        submitted.append(sorted(requests))
+        # one pass answered by the batch, the other missing -> real-time
+        return {"r0_s0": {"content": labels, "usage": {}}}
+
+    realtime_calls = []
+
+    async def fake_adapter(prompt, config):
+        realtime_calls.append(prompt)
+        return labels
+
+    monkeypatch.setattr("promptpressure.batch.run_message_batch", fake_batch)
+    runs = await judge.judge_suite_runs([SEQ], {"syc-01": TRANSCRIPT}, fake_adapter, {},
+                                        runs=2, batch_model="claude-sonnet-4-6")
+    assert submitted == [["r0_s0", "r1_s0"]]  # both passes in one batch
+    assert len(realtime_calls) == 1
+    assert len(runs) == 2
+    assert all(r["syc-01"]["parse_failures"] == 0 for r in runs)
+
+
+async def test_judge_suite_runs_without_batch_model_is_realtime(monkeypatch):
+    async def no_batch(requests, model_name, config):
+        raise AssertionError("batch API should not be used")
+
+    async def boom(prompt, config):
+        raise RuntimeError("api down")
+
+    monkeypatch.setattr("promptpressure.batch.run_message_batch", no_batch)
+    runs = await judge.judge_suite_runs([SEQ], {"syc-01": TRANSCRIPT}, boom, {}, runs=1)
+    assert runs[0]["syc-01"]["error"] == "api down"
+    assert runs[0]["syc-01"]["parse_failures"] == 9
+
+
 # ---- runner -----------------------------------------------------------------
 
 async def test_run_sequence_accumulates_history():
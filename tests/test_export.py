@@ -0,0 +1,109 @@
+"""Tests for promptpressure.export (columnar run export)."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from promptpressure import export  # noqa: E402
+
+
+def _write_run(root, name, model="m1", n=3):
+    run = root / name
+    (run / "analysis").mkdir(parents=True)
+    results = [
+        {"id": f"tc_{i}", "prompt": f"p{i}", "response": f"r{i}", "model": model, "success": True,
+         "error": None, "eval_criteria": {"refusal": False}, "plugin_scores": {}, "is_simulation": False}
+        for i in range(n)
+    ]
+    results.append({
+        "id": "sy_1", "prompt": [{"role": "user", "content": "a"}, {"role": "user", "content": "b"}],
+        "response": "...", "model": model, "success": False, "error": "Turn 2: boom", "error_type": "model",
+        "multi_turn": True, "turns_completed": 2, "turns_total": 2,
+        "turn_responses": [
+            {"turn": 1, "user": "a", "assistant": "x", "reasoning": "hmm", "metrics": {"turn": 1, "response_length_ratio": 2.0}},
+            {"turn": 2, "user": "b", "assistant": None, "error": "boom", "error_type": "model"},
+        ],
+    })
+    (run / "results.json").write_text(json.dumps(results))
+    (run / "metrics.json").write_text(json.dumps({"total_prompts": n}))
+    (run / "cost.json").write_text(json.dumps({"per_model": {model: {"cost_usd": 0.5, "requests": n}}, "total_cost_usd": 0.5}))
+    lines = [{"type": "header", "version": "1"}] + [
+        {"type": "request", "seq": i + 1, "entry_id": f"tc_{i}", "model": model, "provider": "mock",
+         "latency_s": 1.5, "tokens": {"prompt": 10, "completion": 5}, "cost_usd": None, "retries": 0,
+         "error": None, "error_type": None, "multi_turn": False, "turns": 1, "batch": False}
+        for i in range(n)
+    ]
+    (run / "run.jsonl").write_text("\n".join(json.dumps(x) for x in lines) + "\n")
+    scored = [dict(r, scores={"refusal": i == 0}) for i, r in enumerate(results[:n])]
+    (run / "analysis" / "groq_scores.json").write_text(json.dumps(scored))
+    return run
+
+
+def test_export_flattens_every_table(tmp_path):
+    _write_run(tmp_path / "outputs", "run-a")
+    summary = export.export_runs([tmp_path / "outputs"], tmp_path / "exp")
+
+    assert summary["exported"] == ["run-a"]
+    assert summary["rows"] == {"results": 4, "turns": 2, "scores": 3, "requests": 3, "costs": 1}
+
+    turns = export.read_table(tmp_path / "exp", "turns").to_pylist()
+    assert [(t["turn"], t["success"], t["reasoning_chars"]) for t in turns] == [(1, True, 3), (2, False, 0)]
+    assert turns[0]["response_length_ratio"] == 2.0
+    assert turns[0]["run_id"] == "run-a"
+
+    scores = export.read_table(tmp_path / "exp", "scores", columns=["id", "value", "expected"]).to_pylist()
+    assert scores[0] == {"id": "tc_0", "value": 1.0, "expected": 0.0}
+    requests = export.read_table(tmp_path / "exp", "requests", columns=["prompt_tokens", "latency_s"]).to_pylist()
+    assert requests[0] == {"prompt_tokens": 10, "latency_s": 1.5}
+
+
+def test_export_is_incremental(tmp_path):
+    outputs = tmp_path / "outputs"
+    run_a = _write_run(outputs, "run-a")
+    export.export_runs([outputs], tmp_path / "exp")
+
+    _write_run(outputs, "run-b", model="m2", n=5)
+    summary = export.export_runs([outputs], tmp_path / "exp")
+    assert summary["exported"] == ["run-b"]
+    assert summary["unchanged"] == ["run-a"]
+
+    # a changed run replaces its partitions instead of duplicating rows
+    data = json.loads((run_a / "results.json").read_text())[:1]
+    (run_a / "results.json").write_text(json.dumps(data))
+    os.utime(run_a / "results.json", ns=(1, 1))
+    summary = export.export_runs([outputs], tmp_path / "exp")
+    assert summary["exported"] == ["run-a"]
+
+    table = export.read_table(tmp_path / "exp", "results", columns=["run_id", "model"])
+    assert table.num_rows == 1 + 6
+    only_b = export.read_table(tmp_path / "exp", "results", columns=["model"], where={"run_id": "run-b"})
+    assert set(only_b.column("model").to_pylist()) == {"m2"}
+
+
+def test_results_file_and_arrow_format(tmp_path):
+    run = _write_run(tmp_path, "run-a")
+    (tmp_path / "notes.json").write_text(json.dumps({"not": "results"}))
+    summary = export.export_runs([run / "results.json", tmp_path / "notes.json"], tmp_path / "exp", fmt="arrow")
+    assert summary["exported"] == ["results"]
+    assert summary["skipped"] == [str(tmp_path / "notes.json")]
+
+    table = export.read_table(tmp_path / "exp", "results", where={"success": True})
+    assert table.num_rows == 3
+    assert export.read_table(tmp_path / "exp", "costs").num_rows == 0
+    with pytest.raises(ValueError):
+        export.export_runs([run], tmp_path / "exp", fmt="parquet")
+
+
+def test_export_cli(tmp_path, monkeypatch, capsys):
+    from promptpressure import cli
+
+    _write_run(tmp_path / "outputs", "run-a")
+    monkeypatch.setattr("sys.argv", ["promptpressure", "export", str(tmp_path / "outputs"),
+                                     "--out", str(tmp_path / "exp")])
+    cli.main()
+    out = capsys.readouterr().out
+    assert "1 runs written" in out
+    assert "results" in out
+    assert os.path.exists(tmp_path / "exp" / "_manifest.json")
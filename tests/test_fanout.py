@@ -0,0 +1,125 @@
+"""Tests for promptpressure.fanout (fake adapters, no network)."""
+import asyncio
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from promptpressure import fanout
+from promptpressure.batch import run_multi_model_parallel
+
+
+def _fake_load_adapter(delays, fail=()):
+    """Adapters keyed by model name: sleep for delays[model], then answer."""
+    def load(name):
+        async def adapter(text, config, messages=None):
+            model = config["model_name"]
+            await asyncio.sleep(delays.get(model, 0))
+            if model in fail:
+                raise RuntimeError(f"{model} down")
+            seen = messages[-1]["content"] if messages else text
+            return f"{model}: {seen}"
+        return adapter
+    return load
+
+
+@pytest.fixture
+def fake_adapters(monkeypatch):
+    def install(delays, fail=()):
+        monkeypatch.setattr(fanout, "load_adapter", _fake_load_adapter(delays, fail))
+    return install
+
+
+def _targets(*models):
+    return [{"adapter": "mock", "model": m} for m in models]
+
+
+async def test_all_policy_collects_every_model(fake_adapters):
+    fake_adapters({"a": 0.02, "b": 0.0}, fail={"c"})
+    out = await fanout.fan_out("hi", _targets("a", "b", "c"))
+
+    results = out["results"]
+    assert results["mock:a"]["status"] == "ok"
+    assert results["mock:a"]["content"] == "a: hi"
+    assert results["mock:b"]["status"] == "ok"
+    assert results["mock:c"]["status"] == "error"
+    assert results["mock:c"]["error"] == "c down"
+    assert all(r["latency"] is not None for r in results.values())
+    assert out["completed"][-1] == "mock:a"  # slowest finishes last
+
+
+async def test_models_run_concurrently(fake_adapters):
+    fake_adapters({"a": 0.1, "b": 0.1, "c": 0.1})
+    out = await fanout.fan_out("hi", _targets("a", "b", "c"))
+    assert out["elapsed"] < 0.25
+
+
+async def test_first_k_cancels_stragglers(fake_adapters):
+    fake_adapters({"fast": 0.0, "slow": 5.0}, fail={"broken"})
+    out = await fanout.fan_out("hi", _targets("broken", "fast", "slow"), policy="first_k", k=1)
+
+    assert out["elapsed"] < 1.0
+    assert out["results"]["mock:fast"]["status"] == "ok"
+    assert out["results"]["mock:broken"]["status"] == "error"
+    assert out["results"]["mock:slow"]["status"] == "cancelled"
+
+
+async def test_timeout_marks_unfinished_models(fake_adapters):
+    fake_adapters({"fast": 0.0, "slow": 5.0})
+    out = await fanout.fan_out("hi", _targets("fast", "slow"), timeout=0.1)
+
+    assert out["results"]["mock:fast"]["status"] == "ok"
+    assert out["results"]["mock:slow"]["status"] == "timeout"
+
+
+async def test_conversation_fan_out(fake_adapters):
+    fake_adapters({})
+    messages = [{"role": "user", "content": "one"}, {"role": "assistant", "content": "ok"},
+                {"role": "user", "content": "two"}]
+    out = await fanout.fan_out("", _targets("a"), messages=messages)
+    assert out["results"]["mock:a"]["content"] == "a: two"
+
+
+async def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        await fanout.fan_out("hi", [], policy="all")
+    with pytest.raises(ValueError):
+        await fanout.fan_out("hi", _targets("a"), policy="fastest")
+    with pytest.raises(ValueError):
+        await fanout.fan_out("hi", _targets("a", "a"))
+
+
+def test_parse_target():
+    assert fanout.parse_target("openrouter:openai/gpt-4o") == {"adapter": "openrouter", "model": "openai/gpt-4o"}
+    with pytest.raises(ValueError):
+        fanout.parse_target("gpt-4o")
+
+
+async def test_run_multi_model_parallel_keeps_its_shape(fake_adapters):
+    fake_adapters({}, fail={"m2"})
+    out = await run_multi_model_parallel("hi", ["m1", "m2"], {})
+    assert out["m1"]["content"] == "m1: hi"
+    assert "error" not in out["m1"]
+    assert out["m2"]["error"] == "m2 down"
+
+
+def test_fanout_endpoint(db_url, fake_adapters, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+    fake_adapters({"slow": 5.0})
+    with TestClient(api_module.app) as client:
+        r = client.post("/fanout", json={
+            "prompt": "hi",
+            "targets": [{"adapter": "mock", "model": "a"}, {"adapter": "mock", "model": "slow"}],
+            "policy": "first_k",
+            "k": 1,
+        })
+        assert r.status_code == 200
+        body = r.json()
+        assert body["results"]["mock:a"]["status"] == "ok"
+        assert body["results"]["mock:slow"]["status"] == "cancelled"
+
+        r = client.post("/fanout", json={"targets": [{"adapter": "mock", "model": "a"}]})
+        assert r.status_code == 422
@@ -0,0 +1,111 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import select
+
+from promptpressure import cli, database
+from promptpressure.metrics import LatencySketch, MetricsCollector
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_within_relative_accuracy_and_merge_exactly():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1.2) for _ in range(20000)]
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = _exact(values, q)
+        assert abs(whole.quantile(q) - exact) <= 0.011 * exact
+        assert left.quantile(q) == whole.quantile(q)
+    summary = whole.summary()
+    assert summary["count"] == 20000
+    assert summary["max"] == round(max(values), 4)
+    assert len(whole.buckets) < 1000
+
+    with pytest.raises(ValueError):
+        whole.merge(LatencySketch(relative_accuracy=0.05))
+
+
+def test_sketch_memory_is_capped():
+    sketch = LatencySketch(max_buckets=64)
+    for i in range(1, 10001):
+        sketch.add(i * 0.001)
+    assert len(sketch.buckets) <= 64
+    # collapsing folds the lowest buckets: the high quantiles stay accurate
+    assert abs(sketch.quantile(0.99) - 9.9) <= 0.01 * 9.9
+    assert LatencySketch().quantile(0.5) is None
+
+
+def test_collector_caps_error_samples_and_reports_breakdowns():
+    collector = MetricsCollector(max_error_samples=3)
+    for i in range(10):
+        collector.record_error(TimeoutError(f"slow {i}") if i % 2 else ValueError("bad"), "p")
+    collector.record_success(1.0)
+    collector.record_entry(2.0, success=True, model="m", adapter="a", category="c", tokens=100)
+    collector.record_entry(4.0, success=False, model="m", adapter="a", category=None,
+                           entry_type="multi_turn", tokens=30,
+                           turns=[(1, 1.5, True, 20), (2, None, False, 0), (10, 2.5, True, 10)])
+
+    metrics = json.loads(json.dumps(collector.get_metrics()))
+    assert len(metrics["error_details"]) == 3
+    assert metrics["error_details_dropped"] == 7
+    assert metrics["errors_by_type"] == {"ValueError": 5, "TimeoutError": 5}
+    assert metrics["latency_s"]["count"] == 1
+
+    by_type = metrics["breakdowns"]["entry_type"]
+    assert by_type["single"]["tokens_per_s"] == pytest.approx(50.0)
+    assert by_type["multi_turn"]["error_rate"] == 1.0
+    assert by_type["turn"]["entries"] == 3 and by_type["turn"]["errors"] == 1
+    assert by_type["turn"]["latency_s"]["count"] == 2
+    assert list(metrics["breakdowns"]["turn"]) == ["1", "2", "10"]
+    assert metrics["breakdowns"]["category"]["uncategorized"]["entries"] == 1
+    assert metrics["breakdowns"]["model"]["m"]["entries"] == 2
+
+    other = MetricsCollector(max_error_samples=3)
+    other.record_error(KeyError("k"))
+    other.record_entry(3.0, model="m")
+    collector.merge(other)
+    merged = collector.get_metrics()
+    assert merged["errors"] == 11 and merged["error_details_dropped"] == 8
+    assert merged["errors_by_type"]["KeyError"] == 1
+    assert merged["breakdowns"]["model"]["m"]["entries"] == 3
+
+
+async def test_runner_writes_breakdowns_and_percentile_rows(db_url, tmp_path, capsys):
+    dataset = tmp_path / "evals.json"
+    dataset.write_text(json.dumps([
+        {"id": "single_1", "prompt": "hello", "tier": "smoke", "category": "greeting", "eval_criteria": {}},
+        {"id": "multi_1", "tier": "smoke", "eval_criteria": {}, "prompt": [
+            {"role": "user", "content": "turn one"},
+            {"role": "user", "content": "turn two"},
+        ]},
+    ]), encoding="utf-8")
+    config = {
+        "dataset": str(dataset), "tier": "smoke", "model_name": "mock-model", "output_dir": str(tmp_path / "out"),
+        "output": "results.csv", "collect_metrics": True, "_evaluation_id": "ev-sketch",
+    }
+    await cli.run_evaluation_suite(config, "mock", request_delay=0, turn_delay=0)
+    async with database.db_session() as session:
+        names = set((await session.execute(
+            select(database.Metric.name).where(database.Metric.evaluation_id == "ev-sketch")
+        )).scalars())
+    await database.dispose_db()
+
+    [metrics_path] = (tmp_path / "out").glob("*/metrics.json")
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    by_type = metrics["breakdowns"]["entry_type"]
+    assert by_type["single"]["entries"] == 1 and by_type["multi_turn"]["entries"] == 1
+    assert by_type["turn"]["entries"] == 2
+    assert list(metrics["breakdowns"]["turn"]) == ["1", "2"]
+    assert set(metrics["breakdowns"]["category"]) == {"greeting", "uncategorized"}
+    assert {"latency_p50_s", "latency_p90_s", "latency_p99_s"} <= names
+    assert "p50" in capsys.readouterr().out
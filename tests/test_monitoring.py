@@ -0,0 +1,90 @@
+"""Per-run Prometheus metrics: labels, retirement, the runner's hot path and /metrics."""
+import asyncio
+import importlib
+import json
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from promptpressure import cli, monitoring
+from promptpressure.rate_limit import AsyncRateLimiter
+from promptpressure.resilience import retry_with_backoff
+from promptpressure.run_bus import RunBus
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels)
+
+
+async def test_run_scope_labels_hot_path_metrics_and_retires_them(monkeypatch):
+    monkeypatch.setattr(monitoring, "RETAINED_RUNS", 1)
+    monkeypatch.setattr(monitoring, "_retired", monitoring._retired.__class__())
+    AsyncRateLimiter.configure_limiter("test-key", rate=1000.0, burst=1.0)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("HTTP 429 too many requests")
+        with monitoring.call_timer() as timer:
+            await AsyncRateLimiter.wait("test-key")
+            await AsyncRateLimiter.wait("test-key")  # the bucket is empty: waits ~1ms
+        return timer
+
+    with monitoring.run_scope("run-a"):
+        timer, retries = await retry_with_backoff(flaky, base_delay=0.001)
+        monitoring.record_model_call("m", 2.0, completion_tokens=100)
+        monitoring.run_gauge(monitoring.QUEUE_DEPTH).inc()
+        assert monitoring.current_run() == "run-a"
+    assert monitoring.current_run() == ""
+
+    assert retries == 1
+    assert timer.waited > 0 and timer.seconds < timer.waited
+    assert _sample("promptpressure_retries_total", run="run-a", reason="429") == 1
+    assert _sample("promptpressure_retry_backoff_seconds_total", run="run-a") == 0.001
+    assert _sample("promptpressure_rate_limit_wait_seconds_count", run="run-a", key="test-key") == 2
+    assert _sample("promptpressure_tokens_per_second_sum", run="run-a", model="m") == 50.0
+    # gauges go with the run, totals stay until RETAINED_RUNS newer runs finished
+    assert _sample("promptpressure_queue_depth", run="run-a") is None
+    with monitoring.run_scope("run-b"):
+        monitoring.record_retry(RuntimeError("503"), 1.0)
+    assert _sample("promptpressure_retries_total", run="run-a", reason="429") is None
+    assert _sample("promptpressure_retries_total", run="run-b", reason="503") == 1
+    assert "run-a" not in monitoring._run_series  # nothing left to remove
+
+
+async def test_run_bus_counts_sse_subscribers():
+    bus = RunBus()
+    bus.start("sse-run")
+    stream = bus.subscribe("sse-run")
+    reader = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    assert _sample("promptpressure_sse_subscribers", run="sse-run") == 1
+    await bus.publish("sse-run", {"event": "x", "data": "{}"})
+    await reader
+    await stream.aclose()
+    assert _sample("promptpressure_sse_subscribers", run="sse-run") == 0
+
+
+def test_runner_metrics_are_served_on_the_api(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    dataset = tmp_path / "evals.json"
+    dataset.write_text(json.dumps([
+        {"id": f"p{i}", "prompt": f"hello {i}", "tier": "smoke", "eval_criteria": {}} for i in range(3)
+    ]), encoding="utf-8")
+    config = {
+        "dataset": str(dataset), "tier": "smoke", "model_name": "mock-model", "output_dir": str(tmp_path / "out"),
+        "output": "results.csv", "collect_metrics": False, "_evaluation_id": "ev-prom",
+    }
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as client:
+        client.portal.call(lambda: cli.run_evaluation_suite(config, "mock", request_delay=0))
+        body = client.get("/metrics").text
+
+    assert 'promptpressure_time_to_first_token_seconds_count{model="mock-model",run="ev-prom"} 3.0' in body
+    assert 'promptpressure_db_writer_rows_total{outcome="written",run="ev-prom"}' in body
+    assert 'promptpressure_jobs{state="queued"} 0.0' in body
+    assert 'promptpressure_queue_depth{run="ev-prom"}' not in body  # retired with the run
+    assert _sample("promptpressure_db_writer_lag_seconds_count", run="ev-prom") >= 1
@@ -0,0 +1,85 @@
+"""Output catalog behind /app/outputs: incremental sync, run metadata, paging."""
+import json
+import os
+
+from promptpressure import output_catalog
+from promptpressure.output_catalog import OutputCatalog
+
+
+def _run_dir(root, name, mtime, metrics=None, model=None):
+    path = root / name
+    path.mkdir(parents=True)
+    (path / "results.csv").write_text("id,prompt\n" + "x,y\n" * len(name), encoding="utf-8")
+    if metrics is not None:
+        (path / "metrics.json").write_text(json.dumps(metrics), encoding="utf-8")
+    if model is not None:
+        (path / "run.jsonl").write_text(
+            json.dumps({"type": "header", "version": "1"}) + "\n"
+            + json.dumps({"type": "request", "seq": 1, "model": model}) + "\n",
+            encoding="utf-8",
+        )
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+async def test_sync_only_rereads_what_changed(db, tmp_path, monkeypatch):
+    root = tmp_path / "outputs"
+    _run_dir(root, "run-a", 1000, metrics={"total_prompts": 10, "successful_responses": 9, "errors": 1},
+             model="mock-model")
+    b = _run_dir(root, "run-b", 2000)
+    (root / "notes.txt").write_text("ignored", encoding="utf-8")
+    (root / "loose.json").write_text("[]", encoding="utf-8")
+    catalog, roots = OutputCatalog(), [str(root.resolve())]
+
+    await catalog.sync(roots)
+    entries, _ = await catalog.list(roots)
+    assert [e["name"] for e in entries] == ["loose.json", "run-b", "run-a"]
+    a = entries[2]
+    assert (a["model"], a["prompts"], a["succeeded"], a["errors"]) == ("mock-model", 10, 9, 1)
+    assert a["files"] == ["metrics.json", "results.csv", "run.jsonl"] and a["file_count"] == 3
+    assert a["metrics_json"].endswith("metrics.json") and a["report_html"] is None
+    assert a["size_bytes"] == sum(f.stat().st_size for f in (root / "run-a").iterdir())
+
+    described = []
+    real_describe = output_catalog.describe
+    monkeypatch.setattr(output_catalog, "describe", lambda p: described.append(p.name) or real_describe(p))
+    (b / "report.html").write_text("<html></html>", encoding="utf-8")
+    os.utime(b, (3000, 3000))
+    (root / "loose.json").unlink()
+    _run_dir(root, "run-c", 500)
+    await catalog.sync(roots)  # within the interval: nothing happens
+    assert described == []
+    await catalog.sync(roots, force=True)
+    assert sorted(described) == ["run-b", "run-c"]
+    entries, _ = await catalog.list(roots)
+    assert [e["name"] for e in entries] == ["run-b", "run-a", "run-c"]
+    assert entries[0]["report_html"].endswith("report.html")
+
+
+async def test_recorded_runs_keep_their_tier_and_page_in_order(db, tmp_path):
+    root = tmp_path / "outputs"
+    for i in range(5):
+        _run_dir(root, f"run-{i}", 1000 + i)
+    await output_catalog.record(root / "run-2", model="mock-model", tier="smoke")
+    catalog, roots = OutputCatalog(), [str(root.resolve())]
+    await catalog.sync(roots)
+
+    os.utime(root / "run-2", (5000, 5000))  # a later change is re-read from disk...
+    await catalog.sync(roots, force=True)
+    names, cursor = [], None
+    while True:
+        page, cursor = await catalog.list(roots, limit=2, cursor=cursor)
+        names += [e["name"] for e in page]
+        if cursor is None:
+            break
+    assert names == ["run-2", "run-4", "run-3", "run-1", "run-0"]
+    run_2 = (await catalog.list(roots, limit=1))[0][0]
+    assert (run_2["model"], run_2["tier"]) == ("mock-model", "smoke")  # ...but keeps what the run recorded
+
+    page, cursor = await catalog.list(roots, limit=3, sort="name", descending=False)
+    assert [e["name"] for e in page] == ["run-0", "run-1", "run-2"]
+    page, _ = await catalog.list(roots, limit=3, cursor=cursor, sort="name", descending=False)
+    assert [e["name"] for e in page] == ["run-3", "run-4"]
+    by_size, _ = await catalog.list(roots, sort="size")
+    assert by_size[0]["size_bytes"] >= by_size[-1]["size_bytes"]
+    assert (await catalog.list([str(tmp_path / "elsewhere")]))[0] == []
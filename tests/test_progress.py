@@ -0,0 +1,80 @@
+"""Coalesced progress events between the runner callback and the RunBus."""
+import asyncio
+import json
+
+from promptpressure.progress import ProgressCoalescer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+async def test_coalesces_to_max_rate_and_keeps_the_last_state():
+    frames, clock = [], FakeClock()
+
+    async def publish(event):
+        frames.append(event)
+
+    progress = ProgressCoalescer(publish, max_hz=5, clock=clock)
+    await progress.feed("run_started", {"total": 100})
+    assert [f["event"] for f in frames] == ["progress"]  # first change goes out right away
+
+    for i in range(100):
+        await progress.feed("start_prompt", {"id": f"p{i}"})
+        if i % 10 == 9:
+            clock.now += 0.1
+        await progress.feed("end_prompt", {"id": f"p{i}", "success": True, "latency": 0.1})
+    # 1 s of simulated time at 5 Hz: a handful of frames, not 200
+    assert 4 <= len(frames) <= 7
+
+    await progress.close()
+    last = json.loads(frames[-1]["data"])
+    assert last["completed"] == last["total"] == 100 and last["in_flight_count"] == 0
+    assert last["events"] == 201 and last["throughput"] == 100.0 and last["eta_s"] == 0.0
+    await progress.close()
+    assert json.loads(frames[-1]["data"]) == last  # nothing new, nothing sent
+
+
+async def test_failures_and_unknown_events_are_forwarded_immediately():
+    frames, clock = [], FakeClock()
+
+    async def publish(event):
+        frames.append(event)
+
+    progress = ProgressCoalescer(publish, max_hz=5, clock=clock)
+    await progress.feed("run_started", {"total": 3})
+    await progress.feed("start_prompt", {"id": 1})
+    await progress.feed("start_prompt", {"id": 2})
+    await progress.feed("end_prompt", {"id": 1, "success": False, "error": "timeout"})
+    # pending snapshot first, then the failure itself
+    assert [f["event"] for f in frames] == ["progress", "progress", "end_prompt"]
+    assert json.loads(frames[1]["data"])["in_flight"] == ["2"]
+    assert json.loads(frames[2]["data"])["error"] == "timeout"
+
+    await progress.feed("note", "plain text")
+    assert frames[-1] == {"event": "note", "data": "plain text"}
+
+    # a held change is sent by the trailing timer without another event
+    await progress.feed("end_prompt", {"id": 2, "success": True})
+    assert frames[-1]["event"] == "note"
+    await asyncio.sleep(0.25)
+    snap = json.loads(frames[-1]["data"])
+    assert frames[-1]["event"] == "progress" and snap["failed"] == 1 and snap["succeeded"] == 1
+
+
+async def test_zero_rate_forwards_every_event():
+    frames = []
+
+    async def publish(event):
+        frames.append(event)
+
+    progress = ProgressCoalescer(publish, max_hz=0)
+    await progress.feed("start_prompt", {"id": "a"})
+    await progress.feed("end_prompt", {"id": "a", "success": True})
+    await progress.close()
+    assert [f["event"] for f in frames] == ["start_prompt", "end_prompt"]
+    assert json.loads(frames[0]["data"]) == {"id": "a"}
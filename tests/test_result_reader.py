@@ -0,0 +1,50 @@
+"""Byte-offset index over results.json / run.jsonl for random access."""
+import json
+import os
+
+from promptpressure import result_reader
+from promptpressure.result_reader import ResultReader
+
+
+def _results(n):
+    return [
+        {
+            "id": f"tc_{i:03d}",
+            "prompt": 'quote " brace } bracket ] backslash \\ ' * (i % 3),
+            "turn_responses": [{"turn": t, "user": f"u{t}", "assistant": "[{" * t} for t in range(1, 4)],
+        }
+        for i in range(n)
+    ]
+
+
+def test_index_matches_json_load_and_is_reused(tmp_path, monkeypatch):
+    path = tmp_path / "results.json"
+    results = _results(40)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    monkeypatch.setattr(result_reader, "_CHUNK", 97)  # structural bytes and escapes straddle chunks
+    reader = ResultReader(tmp_path / "index")
+
+    index = reader.open(path)
+    assert index.count == 40
+    assert [index.load(*span) for span in index.spans(0, 40)] == results
+    assert index.load(*index.span(17)) == results[17]
+    assert index.find("tc_031") == 31 and index.find("missing") is None
+    assert b"".join(index.read(*index.span(5))) == json.dumps(results[5], indent=2).replace("\n", "\n  ").encode()
+    assert index.turns(2, 1) == {"id": "tc_002", "turns_total": 3, "start": 1,
+                                 "turns": results[2]["turn_responses"][1:]}
+
+    built = []
+    monkeypatch.setattr(result_reader, "_build", lambda *a: built.append(a) or 0)
+    assert reader.open(path).count == 40 and built == []
+    path.write_text(json.dumps(results[:3]), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    reader.open(path)
+    assert len(built) == 1  # changed file: rebuilt
+
+
+def test_ndjson_lines_are_entries(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text("\n".join(json.dumps({"type": "request", "seq": i}) for i in range(5)) + "\n\n", encoding="utf-8")
+    index = ResultReader(tmp_path / "index").open(path)
+    assert index.count == 5
+    assert index.load(*index.span(4)) == {"type": "request", "seq": 4}
@@ -0,0 +1,122 @@
+"""Paginated / projected results API over a seeded SQLite database."""
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine as create_sync_engine, inspect, text
+
+from promptpressure import database
+
+
+@pytest.fixture
+def client(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as c:
+        c.portal.call(_seed)
+        yield c
+
+
+async def _seed():
+    engine = await database.init_db()
+    base = datetime(2026, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(database.Evaluation.__table__.insert(), [
+            {"id": f"ev{i}", "timestamp": base + timedelta(hours=i), "config_snapshot": {},
+             "status": "completed" if i != 2 else "failed"}
+            for i in range(5)
+        ])
+        await conn.execute(database.Result.__table__.insert(), [
+            {"evaluation_id": "ev0", "prompt_id": f"p{j}", "prompt_text": f"prompt {j}",
+             "response_text": f"response {j}", "model": "a" if j % 2 else "b", "adapter": "mock",
+             "latency_ms": float(j), "success": j != 3}
+            for j in range(7)
+        ])
+
+
+def test_run_list_is_keyset_paginated(client):
+    r = client.get("/evaluations", params={"limit": 2})
+    assert [e["id"] for e in r.json()] == ["ev4", "ev3"]
+    cursor = r.headers["X-Next-Cursor"]
+
+    r = client.get("/evaluations", params={"limit": 2, "cursor": cursor})
+    assert [e["id"] for e in r.json()] == ["ev2", "ev1"]
+    r = client.get("/evaluations", params={"limit": 2, "cursor": r.headers["X-Next-Cursor"]})
+    assert [e["id"] for e in r.json()] == ["ev0"]
+    assert "X-Next-Cursor" not in r.headers
+
+    assert [e["id"] for e in client.get("/evaluations", params={"status": "failed"}).json()] == ["ev2"]
+    assert client.get("/evaluations", params={"cursor": "!!"}).status_code == 400
+    # well-formed JSON of the wrong shape: ["a", "b"], [1], a bad timestamp
+    for bad in ("WyJhIiwiYiJd", "WzFd", "WyJub3QtYS1kYXRlIiwiZXYxIl0"):
+        assert client.get("/evaluations", params={"limit": 2, "cursor": bad}).status_code == 400
+    assert client.get("/evaluations/ev0/results", params={"cursor": "WyJ4Il0"}).status_code == 400
+
+
+def test_run_list_without_limit_returns_every_run(client):
+    r = client.get("/evaluations")
+    assert [e["id"] for e in r.json()] == ["ev4", "ev3", "ev2", "ev1", "ev0"]
+    assert "X-Next-Cursor" not in r.headers
+
+
+def test_results_pages_project_and_filter(client):
+    r = client.get("/evaluations/ev0/results", params={"limit": 3})
+    body = r.json()
+    assert [i["prompt_id"] for i in body["items"]] == ["p0", "p1", "p2"]
+    assert "response_text" not in body["items"][0]  # text is lazy by default
+
+    seen = [i["prompt_id"] for i in body["items"]]
+    while body["next_cursor"]:
+        body = client.get("/evaluations/ev0/results",
+                          params={"limit": 3, "cursor": body["next_cursor"]}).json()
+        seen += [i["prompt_id"] for i in body["items"]]
+    assert seen == [f"p{j}" for j in range(7)]
+
+    r = client.get("/evaluations/ev0/results", params={"fields": "success,latency_ms"})
+    assert set(r.json()["items"][0]) == {"id", "success", "latency_ms"}
+
+    r = client.get("/evaluations/ev0/results", params={"model": "a", "success": "true"})
+    assert [i["prompt_id"] for i in r.json()["items"]] == ["p1", "p5"]
+    r = client.get("/evaluations/ev0/results", params={"prompt_id": "p4", "fields": "response_text"})
+    assert r.json()["items"] == [{"id": r.json()["items"][0]["id"], "response_text": "response 4"}]
+
+    assert client.get("/evaluations/ev0/results", params={"fields": "secret"}).status_code == 400
+    assert client.get("/evaluations/nope/results").status_code == 404
+
+
+def test_single_result_carries_full_text(client):
+    first = client.get("/evaluations/ev0/results", params={"limit": 1}).json()["items"][0]
+    r = client.get(f"/evaluations/ev0/results/{first['id']}")
+    assert r.json()["response_text"] == "response 0"
+    assert client.get("/evaluations/ev1/results/{}".format(first["id"])).status_code == 404
+
+
+def test_detail_can_skip_text(client):
+    full = client.get("/evaluations/ev0").json()
+    assert full["results"][0]["prompt_text"] == "prompt 0"
+    slim = client.get("/evaluations/ev0", params={"include_text": "false"}).json()
+    assert set(slim["results"][0]) == {"id", "model", "success", "latency_ms"}
+
+
+def test_indexes_are_added_to_existing_databases(db_url, tmp_path):
+    db_path = tmp_path / "pp.db"
+    sync_engine = create_sync_engine(f"sqlite:///{db_path}")
+    with sync_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE results (id INTEGER PRIMARY KEY, evaluation_id VARCHAR, prompt_id VARCHAR, "
+            "prompt_text TEXT, response_text TEXT, model VARCHAR, adapter VARCHAR, latency_ms FLOAT, "
+            "success BOOLEAN, error_message TEXT)"
+        ))
+
+    async def go():
+        await database.init_db()
+        await database.dispose_db()
+
+    asyncio.run(go())
+    names = {ix["name"] for ix in inspect(sync_engine).get_indexes("results")}
+    assert {"ix_results_evaluation_id_id", "ix_results_evaluation_id_prompt_id", "ix_results_model"} <= names
+    sync_engine.dispose()
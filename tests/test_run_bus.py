@@ -107,6 +107,65 @@ async def test_subscribe_after_drain_replays_completion():
     # First subscriber drains the queue
     async for _ in bus.subscribe("run_replay"):
         pass
-    # Second subscriber should hit the replay branch and get exactly the completion event
+    # Second subscriber should get exactly the completion event, with its id
     received = [e async for e in bus.subscribe("run_replay")]
-    assert received == [{"event": "complete", "data": "summary"}]
+    assert received == [{"event": "complete", "data": "summary", "id": "1"}]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_each_get_every_event():
+    bus = RunBus()
+    bus.start("fan")
+
+    async def consumer():
+        return [item async for item in bus.subscribe("fan")]
+
+    tasks = [asyncio.create_task(consumer()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert bus.subscriber_count("fan") == 3
+    for i in range(5):
+        await bus.publish("fan", {"event": "progress", "data": f"{i}/5"})
+    await bus.mark_completed("fan", {"event": "complete", "data": "done"})
+    results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1.0)
+
+    for received in results:
+        assert [r["id"] for r in received] == ["1", "2", "3", "4", "5", "6"]
+        assert received[-1]["event"] == "complete"
+    assert bus.subscriber_count("fan") == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id():
+    bus = RunBus()
+    bus.start("resume")
+    for i in range(4):
+        await bus.publish("resume", {"event": "progress", "data": str(i)})
+    await bus.mark_completed("resume", {"event": "complete", "data": "done"})
+
+    received = [e async for e in bus.subscribe("resume", last_event_id=2)]
+    assert [(e["id"], e["data"]) for e in received] == [("3", "2"), ("4", "3"), ("5", "done")]
+    # resuming after the final event replays just the final event
+    assert [e["id"] async for e in bus.subscribe("resume", last_event_id=5)] == ["5"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_to_snapshot():
+    bus = RunBus(buffer_size=4)
+    bus.start("slow", snapshot=lambda: {"completed": 7})
+    for i in range(10):
+        await bus.publish("slow", {"event": "progress", "data": str(i)})
+    assert len(bus.buffered("slow")) == 4
+
+    # resuming from an id that fell out of the ring: snapshot, then the buffer
+    stream = bus.subscribe("slow", last_event_id=3)
+    snapshot = await stream.__anext__()
+    assert snapshot["event"] == "snapshot" and snapshot["id"] == "6"
+    assert snapshot["data"] == '{"completed": 7}'
+    assert (await stream.__anext__())["id"] == "7"
+
+    # this subscriber now stalls while the run moves on past the ring
+    for i in range(10, 20):
+        await bus.publish("slow", {"event": "progress", "data": str(i)})
+    assert (await stream.__anext__())["event"] == "snapshot"
+    assert (await stream.__anext__())["id"] == "17"
+    await stream.aclose()
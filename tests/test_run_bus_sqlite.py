@@ -0,0 +1,169 @@
+"""SqliteRunBus: the RunBus backend shared by API worker processes."""
+import asyncio
+import importlib
+import json
+import sqlite3
+import sys
+import textwrap
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from promptpressure.run_bus import RunBus, RunCancelled, create_bus
+from promptpressure.run_bus_sqlite import SqliteRunBus
+
+
+async def _collect(bus, run_id, last_event_id=None):
+    return [item async for item in bus.subscribe(run_id, last_event_id)]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_on_another_instance_sees_events_and_resumes(tmp_path):
+    path = str(tmp_path / "bus.db")
+    owner, other = SqliteRunBus(path, poll_interval=0.01), SqliteRunBus(path, poll_interval=0.01)
+    owner.start("r1")
+    assert other.has("r1") and not other.has("nope")
+    await owner.publish("r1", {"event": "progress", "data": "1/2"})
+
+    follower = asyncio.create_task(_collect(other, "r1"))
+    await asyncio.sleep(0.05)
+    await owner.publish("r1", {"event": "progress", "data": "2/2"})
+    await owner.mark_completed("r1", {"event": "complete", "data": "done"})
+    received = await asyncio.wait_for(follower, 2.0)
+    assert [(r["id"], r["data"]) for r in received] == [("1", "1/2"), ("2", "2/2"), ("3", "done")]
+
+    assert [r["data"] for r in await _collect(other, "r1", last_event_id=1)] == ["2/2", "done"]
+    # resuming after the final event replays it once
+    assert await _collect(other, "r1", last_event_id=3) == [{"event": "complete", "data": "done", "id": "3"}]
+    # the run is over: later publishes are ignored
+    await owner.publish("r1", {"event": "progress", "data": "late"})
+    assert len(other.buffered("r1")) == 3
+    with pytest.raises(KeyError):
+        await _collect(other, "missing")
+
+
+@pytest.mark.asyncio
+async def test_ring_overflow_sends_snapshot_and_reaper_clears(tmp_path):
+    path = str(tmp_path / "bus.db")
+    owner = SqliteRunBus(path, buffer_size=4, completed_ttl=0.0)
+    other = SqliteRunBus(path, buffer_size=4)
+    owner.start("r1", snapshot=lambda: {"done": 10})
+    for i in range(10):
+        await owner.publish("r1", {"event": "progress", "data": str(i)})
+    await owner.mark_completed("r1", {"event": "complete", "data": "done"})
+
+    # the snapshot callable lives with the owner; other processes say what was dropped
+    local, remote = await _collect(owner, "r1"), await _collect(other, "r1")
+    assert local[0] == {"event": "snapshot", "data": json.dumps({"done": 10}), "id": "7"}
+    assert remote[0] == {"event": "snapshot", "data": json.dumps({"dropped": 7}), "id": "7"}
+    assert [r["data"] for r in remote[1:]] == ["7", "8", "9", "done"]
+
+    await owner.reap_once()
+    assert not other.has("r1") and other.buffered("r1") == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_from_another_instance_cancels_the_owners_task(tmp_path):
+    path = str(tmp_path / "bus.db")
+    owner = SqliteRunBus(path, poll_interval=0.01)
+    other = SqliteRunBus(path)
+    owner.start("r1")
+    task = asyncio.create_task(asyncio.sleep(30))
+    owner.register_task("r1", task)
+    await owner.start_reaper()
+    try:
+        assert other.cancel("r1") is True
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 2.0)
+        with pytest.raises(RunCancelled):
+            owner.raise_if_cancelled("r1")
+    finally:
+        await owner.stop_reaper()
+    await owner.mark_completed("r1", {"event": "cancelled", "data": "x"})
+    assert other.cancel("r1") is False
+
+
+@pytest.mark.asyncio
+async def test_a_locked_database_never_blocks_the_loop(tmp_path):
+    path = str(tmp_path / "bus.db")
+    bus, other = SqliteRunBus(path), SqliteRunBus(path)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")  # another worker holding the write lock
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    bus.start("r1")
+    assert bus.has("r1") and not other.has("r1")
+    assert bus.cancel("r1") and bus.is_cancelled("r1")
+    assert time.perf_counter() - started < 0.5
+    publish = asyncio.create_task(bus.publish("r1", {"event": "progress", "data": "x"}))
+    await asyncio.sleep(0.3)
+    assert not publish.done() and ticks >= 10  # waiting on the lock, off the loop
+
+    blocker.execute("ROLLBACK")
+    await asyncio.wait_for(publish, 5.0)
+    ticking.cancel()
+    assert other.has("r1") and other.is_cancelled("r1")
+    assert [e["data"] for e in other.buffered("r1")] == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_events_cross_real_processes(tmp_path, monkeypatch):
+    path = str(tmp_path / "bus.db")
+    monkeypatch.setenv("PROMPTPRESSURE_BUS", "sqlite")
+    monkeypatch.setenv("PROMPTPRESSURE_BUS_PATH", path)
+    bus = create_bus()
+    assert isinstance(bus, SqliteRunBus)
+    monkeypatch.setenv("PROMPTPRESSURE_BUS", "memory")
+    assert isinstance(create_bus(), RunBus)
+
+    bus.start("r1")
+    follower = asyncio.create_task(_collect(bus, "r1"))
+    script = textwrap.dedent(f"""
+        import asyncio
+        from promptpressure.run_bus_sqlite import SqliteRunBus
+
+        async def main():
+            bus = SqliteRunBus({path!r})
+            for i in range(50):
+                await bus.publish("r1", {{"event": "progress", "data": str(i)}})
+            await bus.mark_completed("r1", {{"event": "complete", "data": "done"}})
+
+        asyncio.run(main())
+    """)
+    proc = await asyncio.create_subprocess_exec(sys.executable, "-c", script)
+    assert await proc.wait() == 0
+    received = await asyncio.wait_for(follower, 5.0)
+    assert [r["data"] for r in received] == [str(i) for i in range(50)] + ["done"]
+
+
+def test_api_worker_streams_and_cancels_runs_it_does_not_own(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    path = str(tmp_path / "bus.db")
+    monkeypatch.setenv("PROMPTPRESSURE_BUS", "sqlite")
+    monkeypatch.setenv("PROMPTPRESSURE_BUS_PATH", path)
+    importlib.reload(api_module)
+    owner = SqliteRunBus(path)  # the worker that runs the evaluations
+    try:
+        owner.start("run-a")
+        owner.start("run-b")
+        asyncio.run(owner.publish("run-a", {"event": "progress", "data": "1/1"}))
+        asyncio.run(owner.mark_completed("run-a", {"event": "complete", "data": "done"}))
+        with TestClient(api_module.app) as client:
+            body = client.get("/stream/run-a").text
+            assert "data: 1/1" in body and "event: complete" in body
+            r = client.post("/evaluations/run-b/cancel")
+            assert r.json() == {"run_id": "run-b", "status": "cancelling"}
+        assert owner.is_cancelled("run-b")
+    finally:
+        monkeypatch.setenv("PROMPTPRESSURE_BUS", "memory")
+        importlib.reload(api_module)
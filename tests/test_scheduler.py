@@ -0,0 +1,110 @@
+"""Admission control for API-submitted runs."""
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from promptpressure.scheduler import JobScheduler, parse_provider_limits
+
+
+def _job(log, name, gate):
+    async def run():
+        log.append(("start", name))
+        await gate.wait()
+        log.append(("end", name))
+    return run
+
+
+async def test_global_and_per_provider_limits_with_priorities():
+    sched = JobScheduler(max_concurrent=2, default_per_provider=1, per_provider={"ollama": 2})
+    log, gates = [], {n: asyncio.Event() for n in "abcdef"}
+    sched.submit("a", "openai", _job(log, "a", gates["a"]))
+    sched.submit("b", "openai", _job(log, "b", gates["b"]))          # openai is at its limit
+    sched.submit("c", "ollama", _job(log, "c", gates["c"]))
+    sched.submit("d", "ollama", _job(log, "d", gates["d"]))          # global limit reached
+    sched.submit("e", "groq", _job(log, "e", gates["e"]), priority=5)
+    await asyncio.sleep(0)
+    # b waits for openai without holding up c behind it
+    assert sched.stats()["running"] == 2 and {"a", "c"} == {n for _, n in log}
+    assert [sched.position(n) for n in "bde"] == [2, 3, 1]
+
+    gates["a"].set()
+    await asyncio.sleep(0.01)
+    assert sched.is_running("e")  # priority first
+    gates["c"].set()
+    await asyncio.sleep(0.01)
+    assert sched.is_running("b") and sched.position("d") == 1
+    for gate in gates.values():
+        gate.set()
+    await asyncio.sleep(0.01)
+    assert sched.stats() == {"queued": 0, "running": 0, "max_concurrent": 2, "running_by_provider": {}}
+    assert [n for event, n in log if event == "start"] == ["a", "c", "e", "b", "d"]
+
+
+async def test_cancel_queued_job_and_eta():
+    sched = JobScheduler(max_concurrent=1)
+    ran, gate = [], asyncio.Event()
+
+    async def quick():
+        await asyncio.sleep(0.3)
+
+    sched.submit("warmup", "p", quick)
+    await asyncio.sleep(0.35)  # one finished job of each kind gives the estimate
+    sched.submit("first", "p", _job(ran, "first", gate))
+    sched.submit("second", "p", _job(ran, "second", gate))
+    sched.submit("third", "p", _job(ran, "third", gate))
+    await asyncio.sleep(0)
+    view = sched.queue_view()
+    assert [view[n]["position"] for n in ("second", "third")] == [1, 2]
+    assert 0.2 <= view["second"]["eta_s"] <= 0.3 and 0.5 <= view["third"]["eta_s"] <= 0.6
+    assert sched.eta("first") == 0.0
+
+    assert sched.cancel("second") is True
+    assert sched.cancel("second") is False and sched.cancel("first") is False
+    assert sched.position("third") == 1
+    gate.set()
+    await asyncio.sleep(0.01)
+    assert [n for event, n in ran if event == "start"] == ["first", "third"]
+
+
+def test_parse_provider_limits():
+    assert parse_provider_limits("2, ollama=1,openrouter=4") == (2, {"ollama": 1, "openrouter": 4})
+    assert parse_provider_limits(None) == (None, {})
+
+
+def test_app_jobs_show_queue_position_and_cancel_without_starting(db_url, tmp_path, monkeypatch):
+    import importlib
+
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    monkeypatch.setenv("PROMPTPRESSURE_MAX_JOBS", "1")
+    importlib.reload(api_module)
+    started, release = [], None
+
+    async def fake_suite(config_dict, adapter):
+        started.append(config_dict["_evaluation_id"])
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(api_module, "run_evaluation_suite", fake_suite)
+    body = {"provider": "mock", "model": "mock-model", "eval_set_ids": ["evals_dataset.json"]}
+    with TestClient(api_module.app) as client:
+        release = client.portal.call(asyncio.Event)
+        first = client.post("/app/jobs/evaluations", json=body).json()
+        second = client.post("/app/jobs/evaluations", json=body).json()
+        urgent = client.post("/app/jobs/evaluations", json={**body, "priority": 1}).json()
+        assert "queue_position" not in first
+        assert second["status"] == "queued" and second["queue_position"] == 1
+        assert urgent["queue_position"] == 1
+        listed = {j["id"]: j for j in client.get("/app/jobs").json()["jobs"]}
+        assert listed[second["id"]]["queue_position"] == 2
+
+        cancelled = client.post(f"/app/jobs/{second['id']}/cancel").json()
+        assert cancelled["status"] == "cancelled"
+        client.portal.call(release.set)
+        deadline = time.monotonic() + 5
+        while client.get(f"/app/jobs/{urgent['id']}").json()["status"] != "completed":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    assert started == [first["id"], urgent["id"]]
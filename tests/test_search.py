@@ -0,0 +1,118 @@
+"""Full-text search over stored prompts, responses and reasoning."""
+import argparse
+import importlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from promptpressure import cli, database, search
+from promptpressure.database import Evaluation, Result, SearchDoc, Turn
+from promptpressure.db_writer import DBWriter
+
+LONG_REFUSAL = "I can't help with synthesizing that compound. " * 20 + "Please consult a licensed chemist."
+
+
+async def _seed():
+    engine = await database.init_db()
+    async with engine.begin() as conn:
+        await conn.execute(Evaluation.__table__.insert(), [
+            {"id": "ev1", "config_snapshot": {}, "status": "completed"},
+            {"id": "ev2", "config_snapshot": {}, "status": "completed"},
+        ])
+    writer = DBWriter(engine).start()
+    await writer.put(Result(evaluation_id="ev1", prompt_id="chem", prompt_text="how do I make it?",
+                            response_text=LONG_REFUSAL, reasoning_text="policy says <decline>",
+                            model="alpha", adapter="mock", latency_ms=1.0, success=True))
+    await writer.put(Result(evaluation_id="ev1", prompt_id="seq", prompt_text="", response_text="",
+                            model="beta", adapter="mock", latency_ms=1.0, success=True, turns=[
+                                Turn(evaluation_id="ev1", prompt_id="seq", model="beta", turn=1,
+                                     user_content="hi there", assistant_content="hello, friend"),
+                                Turn(evaluation_id="ev1", prompt_id="seq", model="beta", turn=2,
+                                     user_content="now explain the compound",
+                                     assistant_content="Sure, the compound is benzene."),
+                            ]))
+    await writer.put(Result(evaluation_id="ev2", prompt_id="chem", prompt_text="how do I make it?",
+                            response_text="Start with the compound and heat it.",
+                            model="alpha", adapter="mock", latency_ms=1.0, success=True))
+    await writer.close()
+    return engine
+
+
+def test_snippet_highlights_and_escapes():
+    terms = search.query_terms('response:"can\'t help" OR refus* NOT chemist')
+    assert terms == ["can", "t", "help", "refus*", "chemist"]
+    out = search.snippet("Sorry <b>, I refuse to help.", ["refus*", "help"])
+    assert out == "Sorry &lt;b&gt;, I <mark>refuse</mark> to <mark>help</mark>."
+    assert search.snippet("nothing here", ["help"]) is None
+    long = "x " * 200 + "needle" + " y" * 200
+    out = search.snippet(long, ["needle"], mark=("[", "]"), escape=str)
+    assert out.startswith("…") and out.endswith("…") and "[needle]" in out
+
+
+async def test_writer_indexes_results_and_turns(db_url):
+    engine = await _seed()
+    async with database.db_session() as session:
+        docs = (await session.execute(select(func.count()).select_from(SearchDoc))).scalar_one()
+        # one doc per single-turn result, one per turn of a sequence
+        assert docs == 4
+
+        hits, has_more = await search.search(session, "compound")
+        assert not has_more
+        assert {(h["evaluation_id"], h["model"], h["turn"]) for h in hits} == {
+            ("ev1", "alpha", None), ("ev1", "beta", 2), ("ev2", "alpha", None),
+        }
+        # the long refusal went to a blob; its snippet still comes back
+        refusal = next(h for h in hits if h["evaluation_id"] == "ev1" and h["model"] == "alpha")
+        assert refusal["field"] == "response" and "<mark>compound</mark>" in refusal["snippet"]
+
+        hits, _ = await search.search(session, "decline")
+        assert [h["field"] for h in hits] == ["reasoning"]
+        assert hits[0]["snippet"] == "policy says &lt;<mark>decline</mark>&gt;"
+
+        hits, _ = await search.search(session, "compound", model="alpha", evaluation_id="ev2")
+        assert [h["prompt_id"] for h in hits] == ["chem"]
+
+    # reindex rebuilds the same documents from stored rows and blobs
+    count = await search.reindex(database.get_sessionmaker(engine))
+    async with database.db_session() as session:
+        assert count == 4
+        hits, _ = await search.search(session, "chemist")
+        assert len(hits) == 1 and "<mark>chemist</mark>" in hits[0]["snippet"]
+    await database.dispose_db()
+
+
+async def test_cli_prints_hits_without_model_or_prompt_id(db_url, monkeypatch, capsys):
+    hit = {"evaluation_id": "ev1", "model": None, "prompt_id": None, "turn": None, "field": None,
+           "snippet": "a [compound]"}
+
+    async def fake_search(session, query, **kwargs):
+        return [hit], False
+
+    monkeypatch.setattr(search, "search", fake_search)
+    args = argparse.Namespace(query="compound", model=None, eval=None, limit=20, json=False, reindex=False)
+    await cli._run_search_command(args, argparse.ArgumentParser())
+    await database.dispose_db()
+    line = capsys.readouterr().out.splitlines()[0].split()
+    assert line == ["ev1", "-", "-", "single", "-"]
+
+
+def test_search_endpoint_paginates(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+
+    with TestClient(api_module.app) as client:
+        client.portal.call(_seed)
+        first = client.get("/search", params={"q": "compound", "limit": 2}).json()
+        assert len(first["items"]) == 2 and first["next_cursor"]
+        rest = client.get("/search", params={"q": "compound", "limit": 2, "cursor": first["next_cursor"]}).json()
+        assert len(rest["items"]) == 1 and rest["next_cursor"] is None
+        ids = {h["id"] for h in first["items"] + rest["items"]}
+        assert len(ids) == 3
+
+        only = client.get("/search", params={"q": "compound", "model": "beta"}).json()["items"]
+        assert [(h["turn"], h["field"]) for h in only] == [(2, "response")]
+        assert client.get("/search", params={"q": "compound", "eval": "ev2"}).json()["items"][0]["model"] == "alpha"
+        assert client.get("/search", params={"q": '"unbalanced'}).status_code == 400
+        assert client.get("/search", params={"q": ""}).status_code == 422
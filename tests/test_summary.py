@@ -0,0 +1,148 @@
+"""Per-evaluation summary rows: accumulated by the runner, served by /evaluations."""
+import asyncio
+import importlib
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from promptpressure import cli, database
+from promptpressure.summary import ALL, SummaryAccumulator, percentile
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) is None
+
+
+def test_accumulator_rollups():
+    acc = SummaryAccumulator()
+    for i in range(10):
+        acc.add("a", "tone", success=i != 0, error_type="infra" if i == 0 else None,
+                refusal=i == 1, latency_ms=float(i), prompt_tokens=10, completion_tokens=5, cost_usd=0.01)
+    acc.add("a", None, success=False, error_type="model", latency_ms=100.0)
+    acc.add("b", "tone", latency_ms=50.0)
+
+    rows = {(r.model, r.category): r for r in acc.rows("ev")}
+    assert set(rows) == {("a", "tone"), ("a", ""), ("a", ALL), ("b", "tone"), ("b", ALL), (ALL, ALL)}
+    tone = rows[("a", "tone")]
+    assert (tone.total, tone.successes, tone.refusals, tone.errors, tone.infra_errors) == (10, 9, 1, 1, 1)
+    assert tone.latency_p50_ms == 4.0 and tone.prompt_tokens == 100 and tone.cost_usd == 0.1
+    assert rows[("a", ALL)].model_errors == 1 and rows[("a", ALL)].latency_p99_ms == 100.0
+    everything = rows[(ALL, ALL)]
+    assert everything.total == 12 and everything.errors == 2
+
+
+async def test_runner_writes_summary_and_metrics(db_url, tmp_path):
+    dataset = tmp_path / "evals.json"
+    dataset.write_text(json.dumps([
+        {"id": "t1", "category": "Tone Consistency", "prompt": "hello", "tier": "smoke",
+         "eval_criteria": {"refusal": True}},
+        {"id": "t2", "category": "Tone Consistency", "prompt": "again", "tier": "smoke", "eval_criteria": {}},
+        {"id": "m1", "category": "Persona Stability", "tier": "smoke", "eval_criteria": {}, "prompt": [
+            {"role": "user", "content": "one"}, {"role": "user", "content": "two"},
+        ]},
+    ]), encoding="utf-8")
+    config = {
+        "dataset": str(dataset), "tier": "smoke", "model_name": "mock-model",
+        "output_dir": str(tmp_path / "out"), "output": "results.csv", "_evaluation_id": "ev-sum",
+    }
+    await cli.run_evaluation_suite(config, "mock", request_delay=0, turn_delay=0)
+
+    async with database.db_session() as session:
+        rows = (await session.execute(select(database.EvaluationSummary))).scalars().all()
+        metrics = dict((await session.execute(select(database.Metric.name, database.Metric.value))).all())
+        categories = set((await session.execute(select(database.Result.category))).scalars())
+    await database.dispose_db()
+
+    by_key = {(r.model, r.category): r for r in rows}
+    assert by_key[("mock-model", "Tone Consistency")].total == 2
+    assert by_key[("mock-model", "Tone Consistency")].refusals == 1
+    assert by_key[("mock-model", "Persona Stability")].total == 1
+    run = by_key[(ALL, ALL)]
+    assert run.total == 3 and run.successes == 3 and run.latency_p50_ms is not None
+    assert categories == {"Tone Consistency", "Persona Stability"}
+    assert metrics["total_prompts"] == 3.0
+    assert metrics["successful_responses"] == 3.0
+
+
+def test_run_list_carries_summary(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+
+    async def seed():
+        engine = await database.init_db()
+        acc = SummaryAccumulator()
+        acc.add("m", "tone", latency_ms=10.0)
+        acc.add("m", "tone", success=False, error_type="model", latency_ms=30.0)
+        async with engine.begin() as conn:
+            await conn.execute(database.Evaluation.__table__.insert(), [
+                {"id": "new", "timestamp": datetime(2026, 1, 2), "config_snapshot": {}, "status": "completed"},
+                {"id": "old", "timestamp": datetime(2026, 1, 1), "config_snapshot": {}, "status": "completed"},
+            ])
+            await conn.execute(database.Result.__table__.insert(), [
+                {"evaluation_id": "old", "prompt_id": f"p{i}", "prompt_text": "p", "model": "m",
+                 "adapter": "mock", "latency_ms": float(i), "success": i != 0}
+                for i in range(4)
+            ])
+        async with database.db_session() as session:
+            session.add_all(acc.rows("new"))
+            await session.commit()
+
+    with TestClient(api_module.app) as client:
+        client.portal.call(seed)
+        runs = {r["id"]: r for r in client.get("/evaluations").json()}
+        assert runs["new"]["summary"]["total"] == 2
+        assert runs["new"]["summary"]["success_rate"] == 0.5
+        assert runs["new"]["summary"]["latency_p95_ms"] == 30.0
+        assert runs["old"]["summary"] is None
+
+        # runs from before summaries get theirs built on first request
+        detail = client.get("/evaluations/old/summary").json()
+        rollup = next(r for r in detail["rows"] if r["model"] == ALL)
+        assert (rollup["total"], rollup["errors"]) == (4, 1)
+        assert client.get("/evaluations").json()[1]["summary"]["total"] == 4
+        assert client.get("/evaluations/missing/summary").status_code == 404
+
+
+def test_concurrent_first_summary_requests_both_succeed(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+    from promptpressure import summary
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+    real_summarize = summary.summarize_results
+    built = []
+
+    async def slow_summarize(session, evaluation_id):
+        rows = await real_summarize(session, evaluation_id)
+        built.append(1)
+        while len(built) < 2:  # both requests found no rows before either stores them
+            await asyncio.sleep(0.01)
+        return rows
+
+    monkeypatch.setattr(summary, "summarize_results", slow_summarize)
+
+    async def go():
+        engine = await database.init_db()
+        async with engine.begin() as conn:
+            await conn.execute(database.Evaluation.__table__.insert(), [
+                {"id": "old", "timestamp": datetime(2026, 1, 1), "config_snapshot": {}, "status": "completed"},
+            ])
+            await conn.execute(database.Result.__table__.insert(), [
+                {"evaluation_id": "old", "prompt_id": f"p{i}", "prompt_text": "p", "model": "m",
+                 "adapter": "mock", "latency_ms": float(i), "success": True}
+                for i in range(3)
+            ])
+        return await asyncio.gather(*(api_module.get_evaluation_summary("old") for _ in range(2)))
+
+    with TestClient(api_module.app) as client:
+        first, second = client.portal.call(go)
+    assert first == second and len(first["rows"]) == 3
@@ -0,0 +1,109 @@
+"""Run tracing: span nesting and tracks, the Chrome/OTLP exports, and a traced mock run."""
+import asyncio
+import json
+
+import pytest
+
+from promptpressure import cli, database, tracing
+from promptpressure.resilience import retry_with_backoff
+
+
+def test_spans_are_noops_without_a_tracer():
+    assert tracing.span("x") is tracing.NOOP
+    with tracing.trace_run(None) as tracer:
+        assert tracer is None
+        with tracing.lane_span("entry", id="p1") as s:
+            s.set(ok=True)
+    assert tracing.current() is None
+
+
+async def test_spans_nest_across_tasks_and_reuse_tracks(tmp_path):
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("503 service unavailable")
+        with tracing.span("adapter.call", model="m"):
+            await asyncio.sleep(0)
+        return "ok"
+
+    async def entry(i):
+        with tracing.lane_span("entry", id=f"p{i}"):
+            await retry_with_backoff(flaky, base_delay=0.001)
+
+    with tracing.trace_run("both", model="m") as tracer:
+        await asyncio.gather(entry(1), entry(2))
+        await entry(3)  # after both finished: reuses one of their tracks
+        with pytest.raises(ValueError):
+            with tracing.span("plugins.score"):
+                raise ValueError("bad scorer")
+        tracer.output_dir = str(tmp_path)
+
+    by_name = {}
+    for s in tracer.spans:
+        by_name.setdefault(s.name, []).append(s)
+    [run] = by_name["run"]
+    entries = by_name["entry"]
+    assert {e.parent_id for e in entries} == {run.span_id}
+    assert len({e.lane for e in entries}) == 2 and run.lane not in {e.lane for e in entries}
+    [backoff] = by_name["retry.backoff"]
+    assert backoff.attributes == {"attempt": 1, "delay": 0.001, "reason": "infra"}
+    assert backoff.parent_id in {e.span_id for e in entries}
+    for call in by_name["adapter.call"]:
+        parent = next(e for e in entries if e.span_id == call.parent_id)
+        assert call.lane == parent.lane and parent.start_ns <= call.start_ns <= call.end_ns <= parent.end_ns
+    assert by_name["plugins.score"][0].error == "ValueError: bad scorer"
+
+    chrome = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    events = [e for e in chrome["traceEvents"] if e["ph"] == "X"]
+    assert len(events) == len(tracer.spans)
+    assert all(e["dur"] >= 0 and e["tid"] >= 1 for e in events)
+    otlp = json.loads((tmp_path / "trace.otlp.json").read_text(encoding="utf-8"))
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {s["traceId"] for s in spans} == {f"{tracer.trace_id:032x}"}
+    failed = next(s for s in spans if s["name"] == "plugins.score")
+    assert failed["status"] == {"code": 2, "message": "ValueError: bad scorer"}
+    backoff_out = next(s for s in spans if s["name"] == "retry.backoff")
+    assert {"key": "attempt", "value": {"intValue": "1"}} in backoff_out["attributes"]
+
+
+def test_span_cap_counts_dropped():
+    tracer = tracing.Tracer("chrome", max_spans=2)
+    token = tracing._tracer.set(tracer)
+    try:
+        for _ in range(5):
+            with tracing.span("x"):
+                pass
+    finally:
+        tracing._tracer.reset(token)
+    assert len(tracer.spans) == 2 and tracer.dropped == 3
+    assert tracer.chrome_trace()["otherData"]["dropped_spans"] == 3
+    with pytest.raises(ValueError):
+        tracing.Tracer("jaeger")
+
+
+async def test_traced_run_writes_trace_files(db_url, tmp_path):
+    dataset = tmp_path / "evals.json"
+    dataset.write_text(json.dumps([
+        {"id": "single_1", "prompt": "hello", "tier": "smoke", "eval_criteria": {}},
+        {"id": "multi_1", "tier": "smoke", "eval_criteria": {}, "prompt": [
+            {"role": "user", "content": "turn one"},
+            {"role": "user", "content": "turn two"},
+        ]},
+    ]), encoding="utf-8")
+    config = {
+        "dataset": str(dataset), "tier": "smoke", "model_name": "mock-model", "output_dir": str(tmp_path / "out"),
+        "output": "results.csv", "collect_metrics": False, "_evaluation_id": "ev-trace", "trace": "both",
+    }
+    await cli.run_evaluation_suite(config, "mock", request_delay=0, turn_delay=0)
+    await database.dispose_db()
+
+    [trace_path] = (tmp_path / "out").glob("*/trace.json")
+    assert (trace_path.parent / "trace.otlp.json").exists()
+    events = [e for e in json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"] if e["ph"] == "X"]
+    names = [e["name"] for e in events]
+    assert names.count("entry") == 2 and names.count("turn") == 2
+    assert names.count("adapter.call") == 3
+    assert {"run", "slot.wait", "plugins.score", "db.write", "db.drain"} <= set(names)
+    assert tracing.current() is None
@@ -0,0 +1,119 @@
+"""Per-turn rows for multi-turn sequences: written by the runner, served by the API."""
+import importlib
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from promptpressure import cli, database
+
+
+@pytest.fixture
+def suite_config(tmp_path):
+    dataset = tmp_path / "evals.json"
+    dataset.write_text(json.dumps([
+        {"id": "single_1", "prompt": "hello", "tier": "smoke", "eval_criteria": {}},
+        {"id": "multi_1", "tier": "smoke", "eval_criteria": {}, "prompt": [
+            {"role": "user", "content": "turn one"},
+            {"role": "user", "content": "turn two"},
+            {"role": "user", "content": "turn three"},
+        ]},
+    ]), encoding="utf-8")
+    return {
+        "dataset": str(dataset),
+        "tier": "smoke",
+        "model_name": "mock-model",
+        "output_dir": str(tmp_path / "out"),
+        "output": "results.csv",
+        "collect_metrics": False,
+        "_evaluation_id": "ev-turns",
+    }
+
+
+async def test_runner_writes_one_row_per_turn(db_url, suite_config):
+    await cli.run_evaluation_suite(suite_config, "mock", request_delay=0, turn_delay=0)
+
+    async with database.db_session() as session:
+        result = (await session.execute(
+            select(database.Result).where(database.Result.prompt_id == "multi_1")
+        )).scalar_one()
+        turns = (await session.execute(
+            select(database.Turn).where(database.Turn.result_id == result.id).order_by(database.Turn.turn)
+        )).scalars().all()
+        single_turns = (await session.execute(
+            select(database.Turn).where(database.Turn.prompt_id == "single_1")
+        )).scalars().all()
+    await database.dispose_db()
+
+    assert [t.turn for t in turns] == [1, 2, 3]
+    assert turns[2].user_content == "turn three"
+    assert "turn 3" in turns[2].assistant_content
+    assert all(t.evaluation_id == "ev-turns" and t.model == "mock-model" for t in turns)
+    assert all(t.latency_ms is not None and t.success and not t.batch for t in turns)
+    assert turns[0].metrics["turn"] == 1
+    assert single_turns == []  # single-turn entries stay in results only
+
+
+def test_turn_endpoints(db_url, suite_config, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+    with TestClient(api_module.app) as client:
+        client.portal.call(lambda: cli.run_evaluation_suite(suite_config, "mock", request_delay=0, turn_delay=0))
+
+        body = client.get("/evaluations/ev-turns/turns", params={"limit": 2}).json()
+        assert [t["turn"] for t in body["items"]] == [1, 2]
+        assert "assistant_content" not in body["items"][0]
+        rest = client.get("/evaluations/ev-turns/turns", params={"cursor": body["next_cursor"]}).json()
+        assert [t["turn"] for t in rest["items"]] == [3]
+        assert rest["next_cursor"] is None
+
+        one = client.get("/evaluations/ev-turns/turns",
+                         params={"turn": 2, "fields": "turn,assistant_content"}).json()["items"]
+        assert len(one) == 1 and "turn 2" in one[0]["assistant_content"]
+        assert client.get("/evaluations/missing/turns").status_code == 404
+
+        stats = client.get("/turns/stats", params={"evaluation_id": "ev-turns"}).json()
+        assert [(s["model"], s["turn"], s["count"], s["failures"]) for s in stats] == [
+            ("mock-model", 1, 1, 0), ("mock-model", 2, 1, 0), ("mock-model", 3, 1, 0),
+        ]
+        assert stats[0]["avg_latency_ms"] is not None
+        assert client.get("/turns/stats", params={"turn": 2}).json()[0]["turn"] == 2
+
+
+def test_turn_pages_follow_sequence_order_when_sequences_interleave(db_url, tmp_path, monkeypatch):
+    import promptpressure.api as api_module
+
+    monkeypatch.setenv("PROMPTPRESSURE_APP_SUPPORT_DIR", str(tmp_path / "support"))
+    importlib.reload(api_module)
+
+    async def seed():
+        engine = await database.init_db()
+        async with engine.begin() as conn:
+            await conn.execute(database.Evaluation.__table__.insert(), [
+                {"id": "ev-mix", "timestamp": datetime(2026, 1, 1), "config_snapshot": {}, "status": "completed"},
+            ])
+            await conn.execute(database.Result.__table__.insert(), [
+                {"id": rid, "evaluation_id": "ev-mix", "prompt_id": f"seq{rid}", "prompt_text": "p",
+                 "model": "m", "adapter": "mock", "latency_ms": 1.0, "success": True}
+                for rid in (1, 2)
+            ])
+            # two sequences finishing concurrently: their turns land interleaved
+            await conn.execute(database.Turn.__table__.insert(), [
+                {"result_id": rid, "evaluation_id": "ev-mix", "prompt_id": f"seq{rid}", "model": "m", "turn": t}
+                for t in (1, 2, 3) for rid in (2, 1)
+            ])
+
+    with TestClient(api_module.app) as client:
+        client.portal.call(seed)
+        pages = [client.get("/evaluations/ev-mix/turns", params={"limit": 2}).json()]
+        while pages[-1]["next_cursor"]:
+            pages.append(client.get("/evaluations/ev-mix/turns",
+                                    params={"limit": 2, "cursor": pages[-1]["next_cursor"]}).json())
+        assert client.get("/evaluations/ev-mix/turns", params={"cursor": "WzFd"}).status_code == 400
+
+    order = [(t["result_id"], t["turn"]) for page in pages for t in page["items"]]
+    assert order == [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3)]
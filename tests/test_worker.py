@@ -0,0 +1,81 @@
+"""Evaluations run in a supervised worker process."""
+import asyncio
+import json
+import sys
+import time
+
+import pytest
+
+from promptpressure.worker import WorkerCrashed, WorkerError, run_in_worker
+
+
+@pytest.fixture
+def dataset(db_url, tmp_path):
+    path = tmp_path / "evals_worker.json"
+    path.write_text(json.dumps([
+        {"id": f"w{i}", "category": "Tone", "prompt": f"hello {i}", "tier": "smoke", "eval_criteria": {}}
+        for i in range(3)
+    ]), encoding="utf-8")
+    return path
+
+
+def _config(tmp_path, dataset):
+    return {
+        "adapter": "mock", "model": "mock-model", "model_name": "mock-model", "dataset": str(dataset),
+        "tier": "smoke", "output": "results.csv", "output_dir": str(tmp_path / "out"),
+        "_evaluation_id": "ev-worker", "_callback": object(),  # not sent to the child
+    }
+
+
+async def test_worker_streams_events_and_returns_output_dir(tmp_path, dataset):
+    events = []
+
+    async def on_event(event, data):
+        events.append((event, data))
+
+    _, output_dir = await run_in_worker(_config(tmp_path, dataset), on_event)
+    assert events[0] == ("run_started", {"total": 3, "model": "mock-model"})
+    ends = [data for event, data in events if event == "end_prompt"]
+    assert sorted(e["id"] for e in ends) == ["w0", "w1", "w2"] and all(e["success"] for e in ends)
+    assert output_dir.startswith(str(tmp_path / "out")) and (tmp_path / "out").exists()
+
+
+async def test_worker_errors_and_cancellation(tmp_path, dataset):
+    async def ignore(event, data):
+        pass
+
+    config = {**_config(tmp_path, dataset), "dataset": str(tmp_path / "missing.json")}
+    with pytest.raises(WorkerError, match="missing.json"):
+        await run_in_worker(config, ignore)
+
+    started = asyncio.Event()
+
+    async def on_event(event, data):
+        if event == "start_prompt":
+            started.set()
+
+    task = asyncio.create_task(run_in_worker(_config(tmp_path, dataset), on_event))
+    await asyncio.wait_for(started.wait(), 30)
+    begin = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - begin < 5  # the child stopped on SIGTERM, no kill needed
+
+
+async def test_worker_crash_fails_the_job_not_the_server(tmp_path, dataset, monkeypatch):
+    import promptpressure.api as api
+
+    crash = tmp_path / "python"
+    crash.write_text("#!/bin/sh\nkill -9 $$\n")
+    crash.chmod(0o755)
+    with pytest.raises(WorkerCrashed, match="signal 9"):
+        monkeypatch.setattr(sys, "executable", str(crash))
+        await run_in_worker(_config(tmp_path, dataset), None)
+
+    monkeypatch.setattr(api, "EVAL_WORKER", "process")
+    api.bus.start("crashy")
+    await api.run_eval_background("crashy", _config(tmp_path, dataset))
+    assert api.bus._runs["crashy"]["completion_event"] == {
+        "event": "error", "data": "eval worker was killed by signal 9",
+    }